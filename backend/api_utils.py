@@ -23,6 +23,8 @@ from logging_config import (
     log_exception, log_api_request, log_api_response
 )
 
+from http_session import get_http_session, send_with_auth
+
 # Import UDI Manager for data access
 from udi import get_udi_manager
 
@@ -105,7 +107,7 @@ def _validate_token(token: str) -> bool:
             "Content-Type": "application/json"
         }
         log_api_request(logger, "GET", test_url, params={'page_size': 1})
-        resp = requests.get(test_url, headers=headers, timeout=5, params={'page_size': 1})
+        resp = get_http_session().get(test_url, headers=headers, timeout=5, params={'page_size': 1})
         elapsed = time.time() - start_time
         log_api_response(logger, "GET", test_url, resp.status_code, elapsed)
         
@@ -170,7 +172,7 @@ def login() -> bool:
     try:
         start_time = time.time()
         log_api_request(logger, "POST", login_url, json={"username": username, "password": "***"})
-        resp = requests.post(
+        resp = get_http_session().post(
             login_url,
             headers={"Content-Type": "application/json"},
             json={"username": username, "password": password},
@@ -297,9 +299,9 @@ def fetch_data_from_url(url: str) -> Optional[Any]:
     """
     Fetch data from a given URL with authentication and retry logic.
     
-    Makes an authenticated GET request to the specified URL. If the
-    request fails with a 401 error, automatically refreshes the token
-    and retries once.
+    Makes an authenticated GET request to the specified URL on the shared
+    HTTP session. If the request fails with a 401 error, the token is
+    refreshed (once across concurrent callers) and the request is retried.
     
     Parameters:
         url (str): The URL to fetch data from.
@@ -312,7 +314,7 @@ def fetch_data_from_url(url: str) -> Optional[Any]:
     
     try:
         log_api_request(logger, "GET", url)
-        resp = requests.get(url, headers=_get_auth_headers(), timeout=30)
+        resp = send_with_auth("GET", url, _get_auth_headers, _refresh_token, timeout=30)
         elapsed = time.time() - start_time
         log_api_response(logger, "GET", url, resp.status_code, elapsed)
         
@@ -328,27 +330,11 @@ def fetch_data_from_url(url: str) -> Optional[Any]:
         log_function_return(logger, "fetch_data_from_url", f"<data: {type(data).__name__}>", elapsed)
         return data
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            logger.debug("Got 401 response, attempting token refresh")
-            if _refresh_token():
-                logger.info("Retrying request with new token...")
-                retry_start = time.time()
-                log_api_request(logger, "GET", url)
-                resp = requests.get(url, headers=_get_auth_headers(), timeout=30)
-                retry_elapsed = time.time() - retry_start
-                log_api_response(logger, "GET", url, resp.status_code, retry_elapsed)
-                
-                resp.raise_for_status()
-                data = resp.json()
-                total_elapsed = time.time() - start_time
-                log_function_return(logger, "fetch_data_from_url", f"<data: {type(data).__name__}>", total_elapsed)
-                return data
-            else:
-                logger.error("Token refresh failed")
-                return None
+        if e.response is not None and e.response.status_code == 401:
+            logger.error("Token refresh failed")
         else:
             log_exception(logger, e, f"fetch_data_from_url ({url})")
-            return None
+        return None
     except requests.exceptions.RequestException as e:
         log_exception(logger, e, f"fetch_data_from_url ({url})")
         return None
@@ -357,9 +343,9 @@ def patch_request(url: str, payload: Dict[str, Any]) -> requests.Response:
     """
     Send a PATCH request with authentication and retry logic.
     
-    Makes an authenticated PATCH request to the specified URL. If the
-    request fails with a 401 error, automatically refreshes the token
-    and retries once.
+    Makes an authenticated PATCH request to the specified URL on the shared
+    HTTP session. If the request fails with a 401 error, the token is
+    refreshed and the request is retried once.
     
     Parameters:
         url (str): The URL to send the PATCH request to.
@@ -372,27 +358,17 @@ def patch_request(url: str, payload: Dict[str, Any]) -> requests.Response:
         requests.exceptions.RequestException: If request fails.
     """
     try:
-        resp = requests.patch(
-            url, json=payload, headers=_get_auth_headers(), timeout=30
+        resp = send_with_auth(
+            "PATCH", url, _get_auth_headers, _refresh_token, json=payload, timeout=30
         )
         resp.raise_for_status()
         return resp
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            if _refresh_token():
-                logger.info("Retrying PATCH request with new token...")
-                resp = requests.patch(
-                    url, json=payload, headers=_get_auth_headers(), timeout=30
-                )
-                resp.raise_for_status()
-                return resp
-            else:
-                raise
-        else:
+        if e.response is not None and e.response.status_code != 401:
             logger.error(
                 f"Error patching data to {url}: {e.response.text}"
             )
-            raise
+        raise
     except requests.exceptions.RequestException as e:
         logger.error(f"Error patching data to {url}: {e}")
         raise
@@ -401,9 +377,9 @@ def post_request(url: str, payload: Dict[str, Any]) -> requests.Response:
     """
     Send a POST request with authentication and retry logic.
     
-    Makes an authenticated POST request to the specified URL. If the
-    request fails with a 401 error, automatically refreshes the token
-    and retries once.
+    Makes an authenticated POST request to the specified URL on the shared
+    HTTP session. If the request fails with a 401 error, the token is
+    refreshed and the request is retried once.
     
     Parameters:
         url (str): The URL to send the POST request to.
@@ -416,27 +392,17 @@ def post_request(url: str, payload: Dict[str, Any]) -> requests.Response:
         requests.exceptions.RequestException: If request fails.
     """
     try:
-        resp = requests.post(
-            url, json=payload, headers=_get_auth_headers(), timeout=30
+        resp = send_with_auth(
+            "POST", url, _get_auth_headers, _refresh_token, json=payload, timeout=30
         )
         resp.raise_for_status()
         return resp
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            if _refresh_token():
-                logger.info("Retrying POST request with new token...")
-                resp = requests.post(
-                    url, json=payload, headers=_get_auth_headers(), timeout=30
-                )
-                resp.raise_for_status()
-                return resp
-            else:
-                raise
-        else:
+        if e.response is not None and e.response.status_code != 401:
             logger.error(
                 f"Error posting data to {url}: {e.response.text}"
             )
-            raise
+        raise
     except requests.exceptions.RequestException as e:
         logger.error(f"Error posting data to {url}: {e}")
         raise
@@ -620,8 +586,8 @@ def get_dead_stream_urls() -> set:
         set: Set of dead stream URLs.
     """
     try:
-        from dead_streams_tracker import DeadStreamsTracker
-        tracker = DeadStreamsTracker()
+        from dead_streams_tracker import get_dead_streams_tracker
+        tracker = get_dead_streams_tracker()
         dead_streams = tracker.get_dead_streams()
         return set(dead_streams.keys())
     except Exception as e:
@@ -0,0 +1,734 @@
+#!/usr/bin/env python3
+"""
+Asyncio-based stream check engine for StreamFlow.
+
+The thread-based schedulers (SmartStreamScheduler, ParallelStreamChecker) hold
+one pool thread per in-flight check, blocked in ffmpeg and in time.sleep()
+between retries. This engine runs all checks of a run as coroutines on one
+event loop instead:
+- ffprobe/ffmpeg are driven through asyncio.create_subprocess_exec and their
+  output is parsed line by line with FFmpegOutputParser
+- the global limit is an asyncio.Semaphore; per-account limits use the shared
+  AccountStreamLimiter (so active viewers are still taken into account) with
+  waiters parked on an asyncio.Condition instead of polling in a thread
+- retry delays are asyncio.sleep() timers
+
+Hundreds of concurrent checks therefore need one event loop thread plus one
+thread for the channel completion callbacks (which do blocking API calls).
+The UDI lookups of a check (profile URL transformation, profile capacity,
+cached stats) run in the loop's default executor.
+
+The engine is selected with concurrent_streams.engine = 'asyncio'
+(default: 'thread').
+"""
+
+import asyncio
+import functools
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable
+
+from concurrent_stream_limiter import AccountStreamLimiter, SmartStreamScheduler, get_account_limiter
+from stream_check_utils import (
+    ADAPTIVE_MIN_DURATION,
+    ADAPTIVE_STOP_GRACE,
+    ADAPTIVE_TOLERANCE,
+    HLS_SEGMENTS,
+    BitrateConvergence,
+    FFmpegOutputParser,
+    STREAMING_RETAINED_LINES,
+    _apply_convergence,
+    _build_analysis_result,
+    _build_probe_command,
+    _build_streaming_command,
+    _convergence_bytes_read,
+    _is_valid_stream_url,
+    _log_analysis_result,
+    _log_bitrate_detection_failure,
+    _parse_probe_output,
+    _probe_rejects,
+    _record_tier_timing,
+    get_stream_info_and_bitrate_hls,
+    is_hls_url,
+)
+from logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Interval in seconds at which the stream first in line for an account slot
+# re-checks the limiter (slots can also free up when viewers stop watching)
+ACCOUNT_SLOT_POLL_INTERVAL = 1.0
+
+_child_watcher_lock = threading.Lock()
+_child_watcher_installed = False
+
+
+def _install_child_watcher() -> None:
+    """
+    Use a pidfd child watcher for asyncio subprocesses where available.
+
+    Before Python 3.12 the default ThreadedChildWatcher starts one thread per
+    subprocess, which would bring back a thread per running check. The pidfd
+    watcher waits for all children from the event loop (Linux 5.3+).
+    """
+    global _child_watcher_installed
+    with _child_watcher_lock:
+        if _child_watcher_installed or sys.version_info >= (3, 12) or not hasattr(os, 'pidfd_open'):
+            return
+        _child_watcher_installed = True
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+        except OSError:
+            logger.debug("pidfd_open not supported by the kernel, keeping the default child watcher")
+            return
+        asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+
+
+async def _kill_process(process: asyncio.subprocess.Process) -> None:
+    """Kill a subprocess if it is still running and reap it."""
+    if process.returncode is None:
+        # os.kill instead of process.kill(): Popen.send_signal() polls the
+        # child first and would reap it behind the child watcher's back
+        try:
+            os.kill(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+
+async def probe_stream_async(url: str, timeout: int = 10, user_agent: str = 'VLC/3.0.14',
+                             analyze_duration: float = 2.0, proxy: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Asyncio version of stream_check_utils.probe_stream().
+
+    Returns:
+        Dictionary containing video_codec, audio_codec, resolution, fps,
+        status ("OK", "Timeout" or "Error"), elapsed_time and conclusive
+    """
+    result_data = {
+        'video_codec': 'N/A',
+        'audio_codec': 'N/A',
+        'resolution': '0x0',
+        'fps': 0,
+        'status': 'Error',
+        'elapsed_time': 0,
+        'conclusive': False
+    }
+
+    start = time.time()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *_build_probe_command(url, user_agent, analyze_duration, proxy),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            await _kill_process(process)
+            logger.debug(f"  → Probe timed out after {timeout}s")
+            result_data['status'] = 'Timeout'
+            result_data['elapsed_time'] = timeout
+            return result_data
+
+        result_data['elapsed_time'] = time.time() - start
+        _parse_probe_output(process.returncode, stdout.decode(errors='replace'),
+                            stderr.decode(errors='replace'), result_data)
+    except json.JSONDecodeError as e:
+        logger.debug(f"  → Could not decode ffprobe output: {e}")
+        result_data['elapsed_time'] = time.time() - start
+    except Exception as e:
+        logger.error(f"Stream probe failed: {e}")
+
+    return result_data
+
+
+async def get_stream_info_and_bitrate_async(url: str, duration: int = 30, timeout: int = 30,
+                                            user_agent: str = 'VLC/3.0.14', stream_startup_buffer: int = 10,
+                                            proxy: Optional[str] = None, adaptive: bool = False,
+                                            min_duration: float = ADAPTIVE_MIN_DURATION,
+                                            tolerance: float = ADAPTIVE_TOLERANCE,
+                                            realtime: bool = True) -> Dict[str, Any]:
+    """
+    Asyncio version of stream_check_utils.get_stream_info_and_bitrate_streaming().
+
+    ffmpeg's stderr is read line by line from the event loop and fed to an
+    FFmpegOutputParser; ffmpeg is stopped once all metrics are known. With
+    adaptive, ffmpeg is also stopped once the bitrate estimate has converged
+    (see stream_check_utils.get_stream_info_and_bitrate_adaptive()). Without
+    realtime, the stream is read at network speed and the bitrate is
+    calculated over the media time read (see
+    stream_check_utils.get_stream_info_and_bitrate_streaming()).
+
+    Returns:
+        Dictionary with the same keys as get_stream_info_and_bitrate()
+        (plus the adaptive keys with adaptive or without realtime)
+    """
+    result_data = {
+        'video_codec': 'N/A',
+        'audio_codec': 'N/A',
+        'resolution': '0x0',
+        'fps': 0,
+        'bitrate_kbps': None,
+        'status': 'OK',
+        'elapsed_time': 0
+    }
+
+    if not _is_valid_stream_url(url):
+        result_data['status'] = 'Error'
+        return result_data
+
+    logger.debug(f"Analyzing stream with ffmpeg (asyncio) for {duration}s: {url[:50]}...")
+
+    actual_timeout = timeout + duration + stream_startup_buffer
+    parser = FFmpegOutputParser(duration)
+    convergence = None
+    if adaptive:
+        convergence = BitrateConvergence(min_duration=min(min_duration, duration), tolerance=tolerance)
+    elif not realtime:
+        # Only measures the media time read
+        convergence = BitrateConvergence(min_duration=None)
+    head_lines = []
+    tail_lines = []
+
+    async def read_line(stream: asyncio.StreamReader) -> Optional[str]:
+        raw = await stream.readline()
+        if not raw:
+            return None
+        line = raw.decode(errors='replace')
+        parser.feed(line)
+        if len(head_lines) < STREAMING_RETAINED_LINES:
+            head_lines.append(line)
+        else:
+            tail_lines.append(line)
+            if len(tail_lines) > STREAMING_RETAINED_LINES:
+                del tail_lines[0]
+        return line
+
+    async def read_output(stream: asyncio.StreamReader):
+        while True:
+            line = await read_line(stream)
+            if line is None:
+                return
+            if parser.complete:
+                logger.debug("  → All metrics known, stopping ffmpeg")
+                return
+            if convergence is not None:
+                convergence.feed(line)
+                if convergence.converged:
+                    logger.debug("  → Bitrate converged, stopping ffmpeg")
+                    return
+
+    async def read_statistics(stream: asyncio.StreamReader):
+        # After SIGTERM ffmpeg closes its inputs and reports the bytes read
+        while not parser.complete:
+            line = await read_line(stream)
+            if line is None:
+                return
+            convergence.feed(line)
+
+    try:
+        start = time.time()
+        process = await asyncio.create_subprocess_exec(
+            *_build_streaming_command(url, duration, user_agent, proxy, stream_copy=convergence is not None,
+                                      realtime=realtime),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            await asyncio.wait_for(read_output(process.stderr), actual_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timeout ({actual_timeout}s) while analyzing stream")
+            result_data['status'] = "Timeout"
+            result_data['elapsed_time'] = actual_timeout
+            return result_data
+        else:
+            if convergence is not None and convergence.converged and process.returncode is None:
+                try:
+                    os.kill(process.pid, signal.SIGTERM)
+                    await asyncio.wait_for(read_statistics(process.stderr), ADAPTIVE_STOP_GRACE)
+                except (ProcessLookupError, asyncio.TimeoutError):
+                    pass
+        finally:
+            await _kill_process(process)
+
+        elapsed = time.time() - start
+        result_data['elapsed_time'] = elapsed
+        parser.apply_to(result_data)
+        expected_duration = duration
+        if convergence is not None:
+            expected_duration = _apply_convergence(result_data, convergence, duration,
+                                                   bytes_read=_convergence_bytes_read(parser, convergence, realtime))
+
+        # ffmpeg stopped by us after a complete analysis is not a failure
+        stopped = parser.complete or (convergence is not None and convergence.converged)
+        returncode = 0 if stopped else process.returncode
+        # Without realtime, an early exit shows in the media time, not the wall clock time
+        analyzed = elapsed if realtime else convergence.media_duration
+        _log_bitrate_detection_failure(result_data, analyzed, expected_duration, returncode,
+                                       ''.join(head_lines) + ''.join(tail_lines))
+
+        logger.debug(f"  → Analysis completed in {elapsed:.2f}s")
+
+    except Exception as e:
+        logger.error(f"Stream analysis failed: {e}")
+        result_data['status'] = "Error"
+        result_data['elapsed_time'] = 0
+
+    return result_data
+
+
+async def analyze_stream_async(
+    stream_url: str,
+    stream_id: int,
+    stream_name: str = "Unknown",
+    ffmpeg_duration: int = 30,
+    timeout: int = 30,
+    retries: int = 1,
+    retry_delay: int = 10,
+    user_agent: str = 'VLC/3.0.14',
+    stream_startup_buffer: int = 10,
+    proxy: Optional[str] = None,
+    fast_probe: bool = False,
+    probe_timeout: int = 10,
+    probe_analyze_duration: float = 2.0,
+    adaptive_duration: bool = False,
+    adaptive_min_duration: float = ADAPTIVE_MIN_DURATION,
+    adaptive_tolerance: float = ADAPTIVE_TOLERANCE,
+    realtime: bool = True,
+    hls_fast_path: bool = False,
+    hls_segments: int = HLS_SEGMENTS,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Asyncio version of stream_check_utils.analyze_stream().
+
+    Takes the same arguments and returns the same result. The analysis always
+    parses ffmpeg's output incrementally, so streaming_parser is accepted but
+    ignored. Retries wait with asyncio.sleep() instead of blocking a thread.
+    The HLS fast path (blocking HTTP requests and ffprobe) runs in the
+    event loop's default executor.
+    """
+    logger.info(f"▶ Checking {stream_name}")
+
+    result = {
+        'stream_id': stream_id,
+        'stream_name': stream_name,
+        'stream_url': stream_url,
+        'timestamp': datetime.now().isoformat(),
+        'video_codec': 'N/A',
+        'audio_codec': 'N/A',
+        'resolution': '0x0',
+        'fps': 0,
+        'bitrate_kbps': None,
+        'status': 'Error'
+    }
+
+    total_attempts = retries + 1
+    for attempt in range(total_attempts):
+        if attempt > 0:
+            logger.info(f"  ↻ Retry {attempt + 1}/{total_attempts} for {stream_name}")
+            await asyncio.sleep(retry_delay)
+
+        try:
+            tier_timings = {}
+            result_data = None
+            if hls_fast_path and is_hls_url(stream_url):
+                result_data = await asyncio.get_running_loop().run_in_executor(
+                    None, get_stream_info_and_bitrate_hls, stream_url, hls_segments, timeout, user_agent, proxy
+                )
+                if result_data is not None:
+                    tier_timings['analysis'] = result_data['elapsed_time']
+                    _record_tier_timing('analysis', result_data['elapsed_time'])
+
+            if fast_probe and result_data is None:
+                probe_data = await probe_stream_async(
+                    url=stream_url,
+                    timeout=probe_timeout,
+                    user_agent=user_agent,
+                    analyze_duration=probe_analyze_duration,
+                    proxy=proxy
+                )
+                tier_timings['probe'] = probe_data['elapsed_time']
+                rejected = _probe_rejects(probe_data)
+                _record_tier_timing('probe', probe_data['elapsed_time'], rejected=rejected)
+                if rejected:
+                    result_data = dict(probe_data, bitrate_kbps=None)
+
+            if result_data is None:
+                result_data = await get_stream_info_and_bitrate_async(
+                    url=stream_url,
+                    duration=ffmpeg_duration,
+                    timeout=timeout,
+                    user_agent=user_agent,
+                    stream_startup_buffer=stream_startup_buffer,
+                    proxy=proxy,
+                    adaptive=adaptive_duration,
+                    min_duration=adaptive_min_duration,
+                    tolerance=adaptive_tolerance,
+                    realtime=realtime
+                )
+                tier_timings['analysis'] = result_data['elapsed_time']
+                _record_tier_timing('analysis', result_data['elapsed_time'])
+
+            result = _build_analysis_result(stream_id, stream_name, stream_url, result_data, tier_timings)
+            _log_analysis_result(result, result_data['elapsed_time'], stream_name)
+
+            if result['status'] == "OK":
+                break
+            if attempt < total_attempts - 1:
+                logger.warning(f"  ↻ Retrying {stream_name} in {retry_delay}s (attempt {attempt + 2}/{total_attempts})")
+        except Exception as e:
+            logger.error(f"  Exception during stream analysis (attempt {attempt + 1} of {total_attempts}): {e}")
+
+    return result
+
+
+class AsyncCheckEngine:
+    """
+    Asyncio-based scheduler with the same interface as SmartStreamScheduler.
+
+    Instead of a check_function, each stream is checked with
+    analyze_stream_async() (the proxy of the stream's M3U account is looked
+    up like in the thread mode). Every call runs its own event loop in the
+    calling thread.
+    """
+
+    def __init__(self, account_limiter: AccountStreamLimiter, global_limit: int = 10):
+        """
+        Initialize the asyncio check engine.
+
+        Args:
+            account_limiter: AccountStreamLimiter instance
+            global_limit: Global maximum concurrent streams (default: 10)
+        """
+        self.account_limiter = account_limiter
+        self.global_limit = global_limit
+        # Reuses the cached-result and error-result helpers of the thread scheduler
+        self._helpers = SmartStreamScheduler(account_limiter, global_limit=global_limit)
+        logger.info(f"AsyncCheckEngine initialized with global_limit={global_limit}")
+
+    def check_streams_with_limits(
+        self,
+        streams: List[Dict[str, Any]],
+        progress_callback: Optional[Callable] = None,
+        stagger_delay: float = 0.0,
+        result_cache=None,
+        **check_params
+    ) -> List[Dict[str, Any]]:
+        """
+        Check multiple streams concurrently with per-account limits.
+
+        Args:
+            streams: List of stream dictionaries to check (must include 'm3u_account')
+            progress_callback: Optional callback after each stream completes
+            stagger_delay: Minimum delay between starting two checks (default: 0.0)
+            result_cache: Optional StreamResultCache, streams with the same URL
+                share one analysis
+            **check_params: Additional parameters for analyze_stream_async
+
+        Returns:
+            List of stream analysis results
+        """
+        if not streams:
+            logger.info("No streams to check")
+            return []
+
+        results = []
+        self.check_channels_with_limits(
+            {None: streams},
+            on_channel_complete=lambda channel_key, channel_results: results.extend(channel_results),
+            progress_callback=progress_callback,
+            stagger_delay=stagger_delay,
+            result_cache=result_cache,
+            **check_params
+        )
+        return results
+
+    def check_channels_with_limits(
+        self,
+        channel_streams: Dict[Any, List[Dict[str, Any]]],
+        on_channel_complete: Callable,
+        progress_callback: Optional[Callable] = None,
+        stagger_delay: float = 0.0,
+        acquire_timeout: float = 300,
+        result_cache=None,
+        **check_params
+    ) -> Dict[str, Any]:
+        """
+        Check the streams of several channels on one event loop.
+
+        Same behavior and return value as
+        SmartStreamScheduler.check_channels_with_limits(): on_channel_complete
+        runs (one at a time, on a separate thread) as soon as the last stream of
+        a channel has finished.
+        """
+        _install_child_watcher()
+        return asyncio.run(self._check_channels(
+            channel_streams, on_channel_complete, progress_callback,
+            stagger_delay, acquire_timeout, result_cache, check_params
+        ))
+
+    async def _check_channels(self, channel_streams, on_channel_complete, progress_callback,
+                              stagger_delay, acquire_timeout, result_cache, check_params) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        start_time = time.time()
+        global_slots = asyncio.Semaphore(self.global_limit)
+        slot_freed = asyncio.Condition()
+        start_lock = asyncio.Lock()
+        last_start = [None]
+
+        remaining = {key: len(streams) for key, streams in channel_streams.items()}
+        channel_results = {key: [] for key in channel_streams}
+        total_streams = sum(remaining.values())
+        stats = {'checked': 0, 'cached': 0, 'shared': 0, 'skipped': 0}
+        completed_count = 0
+        busy_slot_seconds = 0.0
+        running = 0
+        peak_concurrency = 0
+
+        logger.info(
+            f"Starting asyncio check of {total_streams} streams from "
+            f"{len(channel_streams)} channels with {self.global_limit} concurrent checks"
+        )
+
+        finalizer = ThreadPoolExecutor(max_workers=1)
+        finalizer_futures = []
+
+        # Account ID -> streams waiting for an account slot, first in line first
+        account_waiters = {}
+        # Lookup URL -> future of the first check of the URL that has not reached its analysis yet
+        claims = {}
+
+        def finish_stream(channel_key, result):
+            nonlocal completed_count
+            completed_count += 1
+            if result is not None:
+                channel_results[channel_key].append(result)
+                if progress_callback:
+                    progress_callback(completed_count, total_streams, result)
+            remaining[channel_key] -= 1
+            if remaining[channel_key] == 0:
+                finalizer_futures.append(
+                    loop.run_in_executor(finalizer, on_channel_complete, channel_key, channel_results.pop(channel_key))
+                )
+
+        async def acquire_account_slot(account_id) -> bool:
+            """Wait for an account slot in queueing order.
+
+            Like the blocked_since times of SmartStreamScheduler, the acquire
+            timeout only runs while the stream is first in line for its account.
+            """
+            waiters = account_waiters.setdefault(account_id, deque())
+            token = object()
+            waiters.append(token)
+            deadline = None
+            try:
+                async with slot_freed:
+                    while True:
+                        wait_time = None
+                        if waiters[0] is token:
+                            acquired, _ = self.account_limiter.acquire(account_id, timeout=0)
+                            if acquired:
+                                return True
+                            if deadline is None:
+                                deadline = time.time() + acquire_timeout
+                            wait_time = min(ACCOUNT_SLOT_POLL_INTERVAL, deadline - time.time())
+                            if wait_time <= 0:
+                                return False
+                        try:
+                            await asyncio.wait_for(slot_freed.wait(), wait_time)
+                        except asyncio.TimeoutError:
+                            pass
+            finally:
+                # The next stream in line tries the account now
+                waiters.remove(token)
+                async with slot_freed:
+                    slot_freed.notify_all()
+
+        async def wait_for_stagger():
+            if stagger_delay <= 0:
+                return
+            async with start_lock:
+                if last_start[0] is not None:
+                    delay = last_start[0] + stagger_delay - time.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                last_start[0] = time.time()
+
+        async def check(channel_key, stream):
+            account_id = stream.get('m3u_account')
+            udi = self.account_limiter.udi_manager
+            claim = None
+
+            if result_cache is not None:
+                # Take the result of an earlier or running analysis of the URL without a slot
+                # (the profile URL transformation runs off the event loop)
+                lookup_url = await loop.run_in_executor(None, self._helpers._stream_url, stream)
+                while True:
+                    cached, in_flight = result_cache.lookup(lookup_url)
+                    if cached is None and in_flight is not None:
+                        try:
+                            cached = await asyncio.wrap_future(in_flight)
+                        except Exception as e:
+                            stats['shared'] += 1
+                            finish_stream(channel_key, self._helpers._error_result(stream, e))
+                            return
+                    if cached is None and lookup_url in claims:
+                        # Another check of the URL has started but not reached its analysis yet
+                        cached = await claims[lookup_url]
+                        if cached is None:
+                            continue
+                    if cached is not None:
+                        stats['shared'] += 1
+                        finish_stream(channel_key, result_cache.for_stream(cached, stream))
+                        return
+                    break
+                claim = claims[lookup_url] = loop.create_future()
+
+            result = stream_url = None
+            try:
+                result, stream_url = await run_check(stream, account_id, udi)
+            finally:
+                if claim is not None:
+                    # Waiting checks take the result of an analysis of their URL, or check the stream themselves
+                    del claims[lookup_url]
+                    analyzed = stream_url == lookup_url and result is not None and 'skipped_reason' not in result
+                    claim.set_result(result if analyzed else None)
+            finish_stream(channel_key, result)
+
+        async def run_check(stream, account_id, udi):
+            """Check a stream with an account and a global slot, or fall back to its cached stats.
+
+            Returns the result and the URL that was analyzed (None without an analysis).
+            """
+            nonlocal busy_slot_seconds, running, peak_concurrency
+            # UDI lookups (profile capacity, profile URL transformation, cached stats) run off the event loop
+            if account_id and udi:
+                can_run, reason = await loop.run_in_executor(None, udi.check_stream_can_run, stream)
+                if not can_run:
+                    logger.info(f"Skipping check for stream {stream['id']}: {reason}, using cached stats")
+                    result = await loop.run_in_executor(
+                        None, functools.partial(self._helpers._get_cached_result, stream, 'no_available_profile',
+                                                reason_detail=reason)
+                    )
+                    stats['cached' if result is not None else 'skipped'] += 1
+                    return result, None
+
+            if not await acquire_account_slot(account_id):
+                logger.error(f"Timeout acquiring slot for account {account_id}, skipping stream {stream['id']}")
+                stats['skipped'] += 1
+                return None, None
+
+            try:
+                async with global_slots:
+                    await wait_for_stagger()
+                    running += 1
+                    peak_concurrency = max(peak_concurrency, running)
+                    started = time.time()
+                    stream_url = None
+                    try:
+                        # Like SmartStreamScheduler._run_check, the URL is computed once the account slot is held
+                        stream_url, proxy = await loop.run_in_executor(
+                            None, lambda: (self._helpers._stream_url(stream), _get_stream_proxy(stream['id']))
+                        )
+
+                        def analyze():
+                            return analyze_stream_async(
+                                stream_url=stream_url,
+                                stream_id=stream['id'],
+                                stream_name=stream.get('name', 'Unknown'),
+                                proxy=proxy,
+                                **check_params
+                            )
+
+                        if result_cache is not None:
+                            result = await result_cache.get_or_compute_async(stream_url, stream, analyze)
+                        else:
+                            result = await analyze()
+                    except Exception as e:
+                        logger.error(f"Error checking stream {stream['id']} ({stream.get('name', 'Unknown')}): {e}",
+                                     exc_info=True)
+                        result = self._helpers._error_result(stream, e)
+                    finally:
+                        running -= 1
+                        busy_slot_seconds += time.time() - started
+            finally:
+                self.account_limiter.release(account_id)
+                async with slot_freed:
+                    slot_freed.notify_all()
+
+            stats['checked'] += 1
+            return result, stream_url
+
+        # Channels without streams to check are complete right away
+        for channel_key in [key for key, count in remaining.items() if count == 0]:
+            finalizer_futures.append(
+                loop.run_in_executor(finalizer, on_channel_complete, channel_key, channel_results.pop(channel_key))
+            )
+
+        try:
+            await asyncio.gather(*(
+                check(channel_key, stream)
+                for channel_key, streams in channel_streams.items()
+                for stream in streams
+            ))
+            check_time = time.time() - start_time
+            for outcome in await asyncio.gather(*finalizer_futures, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error completing channel check: {outcome}")
+        finally:
+            finalizer.shutdown(wait=True)
+
+        wall_time = time.time() - start_time
+        slot_capacity = self.global_limit * check_time
+        run_stats = {
+            'channels': len(channel_streams),
+            'streams': total_streams,
+            **stats,
+            'wall_time': round(wall_time, 3),
+            'check_time': round(check_time, 3),
+            'busy_slot_seconds': round(busy_slot_seconds, 3),
+            'slot_utilization': round(busy_slot_seconds / slot_capacity, 3) if slot_capacity > 0 else 0.0,
+            'peak_concurrency': peak_concurrency
+        }
+        logger.info(
+            f"Completed asyncio check of {total_streams} streams from {len(channel_streams)} channels "
+            f"in {wall_time:.1f}s (slot utilization {run_stats['slot_utilization']:.0%})"
+        )
+        return run_stats
+
+
+def _get_stream_proxy(stream_id: int) -> Optional[str]:
+    """Get the HTTP proxy of a stream's M3U account (from the UDI cache)."""
+    from api_utils import get_stream_proxy
+    return get_stream_proxy(stream_id)
+
+
+# Global instance
+_async_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_async_check_engine(global_limit: int = 10) -> AsyncCheckEngine:
+    """
+    Get or create the global asyncio check engine instance.
+
+    Args:
+        global_limit: Global maximum concurrent streams
+
+    Returns:
+        AsyncCheckEngine instance sharing the global account limiter
+    """
+    global _async_engine
+    with _engine_lock:
+        if _async_engine is None or _async_engine.global_limit != global_limit:
+            _async_engine = AsyncCheckEngine(get_account_limiter(), global_limit=global_limit)
+        return _async_engine
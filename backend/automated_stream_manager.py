@@ -10,6 +10,7 @@ This module handles the automated process of:
 Uses the Universal Data Index (UDI) as the single source of truth for data access.
 """
 
+import hashlib
 import json
 import logging
 import os
@@ -18,7 +19,7 @@ import time
 import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from collections import defaultdict
 
 # Pre-compiled regex pattern for whitespace conversion (performance optimization)
@@ -30,6 +31,23 @@ _WHITESPACE_PATTERN = re.compile(r'(?<!\\) +')
 # Used to substitute CHANNEL_NAME in patterns before compiling for validation
 _CHANNEL_NAME_PLACEHOLDER = 'PLACEHOLDER'
 
+# Maximum length of the literal substrings ("grams") used by the regex prefilter index.
+# Every indexed pattern is keyed by one gram of its longest required literal, and a stream
+# name is only tested against channels whose gram occurs in it.
+_PREFILTER_GRAM_LENGTH = 4
+
+# Regex parser internals used to extract required literals from patterns
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older Python versions
+    import sre_parse as _sre_parse
+
+# Repeat opcodes whose body is required when the minimum repeat count is >= 1
+_REQUIRED_REPEAT_OPS = tuple(
+    getattr(_sre_parse, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(_sre_parse, name)
+)
+
 # Import croniter for cron expression support
 try:
     from croniter import croniter
@@ -51,6 +69,9 @@ from udi import get_udi_manager
 # Import channel settings manager
 from channel_settings_manager import get_channel_settings_manager
 
+# Import partitioned changelog store
+from changelog_store import DEFAULT_RETENTION_DAYS as DEFAULT_CHANGELOG_RETENTION_DAYS, EntryKey, get_changelog_store
+
 # Setup centralized logging
 from logging_config import setup_logging, log_function_call, log_function_return, log_exception, log_state_change
 
@@ -58,7 +79,7 @@ logger = setup_logging(__name__)
 
 # Import DeadStreamsTracker
 try:
-    from dead_streams_tracker import DeadStreamsTracker
+    from dead_streams_tracker import get_dead_streams_tracker
     DEAD_STREAMS_TRACKER_AVAILABLE = True
 except ImportError:
     DEAD_STREAMS_TRACKER_AVAILABLE = False
@@ -68,23 +89,44 @@ except ImportError:
 CONFIG_DIR = Path(os.environ.get('CONFIG_DIR', '/app/data'))
 
 class ChangelogManager:
-    """Manages changelog entries for stream updates."""
+    """Manages changelog entries for stream updates.
+    
+    Entries are stored in a ChangelogStore (day partitions of JSON lines)
+    in a directory named after the changelog file, e.g. CONFIG_DIR/changelog/
+    for CONFIG_DIR/changelog.json. An existing changelog.json is imported
+    once and kept as changelog.json.migrated.
+    """
     
-    def __init__(self, changelog_file=None):
+    def __init__(self, changelog_file=None, retention_days: int = DEFAULT_CHANGELOG_RETENTION_DAYS):
         if changelog_file is None:
             changelog_file = CONFIG_DIR / "changelog.json"
         self.changelog_file = Path(changelog_file)
-        self.changelog = self._load_changelog()
+        self.store = get_changelog_store(self.changelog_file.with_suffix(''), retention_days=retention_days)
+        self._migrate_legacy_changelog()
     
-    def _load_changelog(self) -> List[Dict]:
-        """Load existing changelog or create empty one."""
-        if self.changelog_file.exists():
+    def _migrate_legacy_changelog(self):
+        """Import entries of a single-file changelog into the partitioned store.
+        
+        Errors are logged and leave the legacy file in place, so a failed
+        migration does not prevent the changelog from being used and is
+        retried on the next start.
+        """
+        if not self.changelog_file.is_file():
+            return
+        try:
             try:
                 with open(self.changelog_file, 'r') as f:
-                    return json.load(f)
+                    entries = json.load(f)
             except (json.JSONDecodeError, FileNotFoundError):
                 logger.warning(f"Could not load {self.changelog_file}, creating new changelog")
-        return []
+                entries = []
+            
+            if isinstance(entries, list) and entries:
+                self.store.append_many(entries)
+                logger.info(f"Migrated {len(entries)} changelog entries from {self.changelog_file} to {self.store.directory}")
+            self.changelog_file.replace(self.changelog_file.with_name(self.changelog_file.name + '.migrated'))
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy changelog {self.changelog_file}: {e}")
     
     def add_entry(self, action: str, details: Dict, timestamp: Optional[str] = None, subentries: Optional[List[Dict[str, Any]]] = None):
         """Add a new changelog entry.
@@ -108,36 +150,25 @@ class ChangelogManager:
         if subentries:
             entry["subentries"] = subentries
         
-        self.changelog.append(entry)
-        self._save_changelog()
+        self.store.append(entry)
         logger.info(f"Changelog entry added: {action}")
     
-    def _save_changelog(self):
-        """Save changelog to file."""
-        # Ensure parent directory exists
-        self.changelog_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.changelog_file, 'w') as f:
-            json.dump(self.changelog, f, indent=2)
+    def iter_recent_entries(self, days: int = 7, before: Optional[EntryKey] = None) -> Iterator[Tuple[EntryKey, Dict]]:
+        """Yield (key, entry) pairs of the last N days with channel updates, newest first.
+        
+        Args:
+            days: Number of days to look back
+            before: Only entries older than this key (pagination cursor)
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+        for key, entry in self.store.iter_entries(since=cutoff, before=before):
+            # Filter out entries without meaningful channel updates
+            if self._has_channel_updates(entry):
+                yield key, entry
     
     def get_recent_entries(self, days: int = 7) -> List[Dict]:
-        """Get changelog entries from the last N days, filtered and sorted."""
-        cutoff = datetime.now() - timedelta(days=days)
-        recent = []
-        
-        for entry in self.changelog:
-            try:
-                entry_time = datetime.fromisoformat(entry['timestamp'])
-                if entry_time >= cutoff:
-                    # Filter out entries without meaningful channel updates
-                    if self._has_channel_updates(entry):
-                        recent.append(entry)
-            except (ValueError, KeyError):
-                continue
-        
-        # Sort by timestamp in reverse chronological order (newest first)
-        recent.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        
-        return recent
+        """Get changelog entries from the last N days, filtered and sorted (newest first)."""
+        return [entry for _, entry in self.iter_recent_entries(days)]
     
     def add_playlist_update_entry(self, channels_updated: Dict[int, Dict], global_stats: Dict):
         """Add a playlist update & match entry with subentries.
@@ -277,6 +308,200 @@ class ChangelogManager:
         return True  # Include entries without explicit success flag
 
 
+def _longest_required_literal(compiled_pattern) -> Optional[str]:
+    """Get the longest literal substring that every match of a pattern must contain.
+    
+    Only literals that are unconditionally part of the pattern are considered
+    (top-level sequences, groups, and repeats with a minimum of one). Alternations,
+    character classes, lookarounds and optional parts never contribute.
+    
+    Args:
+        compiled_pattern: A compiled regex pattern
+        
+    Returns:
+        The longest required literal, or None if the pattern has none or uses
+        case-insensitive flags (the literal would not be an exact substring then)
+    """
+    if compiled_pattern.flags & re.IGNORECASE:
+        return None
+    
+    try:
+        parsed = _sre_parse.parse(compiled_pattern.pattern, compiled_pattern.flags)
+    except Exception:
+        return None
+    
+    literals = []
+    
+    def collect(items) -> bool:
+        run = []
+        for op, av in items:
+            if op is _sre_parse.LITERAL:
+                run.append(chr(av))
+                continue
+            if run:
+                literals.append(''.join(run))
+                run = []
+            if op is _sre_parse.SUBPATTERN:
+                _, add_flags, _, sub_items = av
+                if add_flags & _sre_parse.SRE_FLAG_IGNORECASE:
+                    return False
+                if not collect(sub_items):
+                    return False
+            elif op in _REQUIRED_REPEAT_OPS:
+                min_count, _, sub_items = av
+                if min_count >= 1 and not collect(sub_items):
+                    return False
+        if run:
+            literals.append(''.join(run))
+        return True
+    
+    if not collect(parsed) or not literals:
+        return None
+    return max(literals, key=len)
+
+
+
+class _CompiledPatternIndex:
+    """Compiled, ready-to-search view of a regex pattern configuration.
+    
+    Built once from the loaded ``channel_regex_config.json`` content. Every
+    pattern is stored with CHANNEL_NAME already substituted, case folded (when
+    matching is case-insensitive), whitespace-relaxed and compiled, so the hot
+    matching path only has to call ``search`` on precompiled objects.
+    
+    Entries are kept in configuration order and are additionally grouped per
+    M3U account on first use, so a stream only iterates the channels whose
+    ``m3u_accounts`` filter allows its account.
+    """
+    
+    def __init__(self, channel_patterns: Dict):
+        self.case_sensitive = channel_patterns.get("global_settings", {}).get("case_sensitive", False)
+        # List of (channel_id, allowed_accounts or None, [(compiled, original_pattern), ...])
+        self.entries: List[Tuple[str, Optional[Any], List[Tuple[Any, str]]]] = []
+        self._entries_by_account: Dict[Any, List] = {}
+        
+        for channel_id, config in channel_patterns.get("patterns", {}).items():
+            if not config.get("enabled", True):
+                continue
+            
+            # m3u_accounts semantics (see match_stream_to_channels):
+            # None or [] -> applies to all accounts, [1, 2] -> only those accounts
+            pattern_m3u_accounts = config.get("m3u_accounts")
+            allowed_accounts = None
+            if pattern_m3u_accounts is not None and len(pattern_m3u_accounts) > 0:
+                try:
+                    allowed_accounts = frozenset(pattern_m3u_accounts)
+                except TypeError:
+                    allowed_accounts = tuple(pattern_m3u_accounts)
+            
+            channel_name = config.get("name", "")
+            escaped_channel_name = re.escape(channel_name)
+            compiled_patterns = []
+            for pattern in config.get("regex", []):
+                search_pattern = pattern.replace('CHANNEL_NAME', escaped_channel_name)
+                if not self.case_sensitive:
+                    search_pattern = search_pattern.lower()
+                search_pattern = _WHITESPACE_PATTERN.sub(r'\\s+', search_pattern)
+                try:
+                    compiled_patterns.append((re.compile(search_pattern), pattern))
+                except re.error as e:
+                    logger.error(f"Invalid regex pattern '{pattern}' for channel {channel_id}: {e}")
+            
+            if compiled_patterns:
+                self.entries.append((channel_id, allowed_accounts, compiled_patterns))
+        
+        self._build_literal_prefilter()
+    
+    def _build_literal_prefilter(self):
+        """Build the gram -> entry positions index used to select candidate channels.
+        
+        Each pattern is keyed by the rarest gram of its longest required literal.
+        An entry is indexed under the grams of all of its patterns; if any pattern
+        has no required literal (e.g. '.*') the entry is always a candidate.
+        """
+        entry_literals = []
+        gram_frequency = defaultdict(int)
+        for channel_id, _, compiled_patterns in self.entries:
+            literals = []
+            for compiled, _ in compiled_patterns:
+                literal = _longest_required_literal(compiled)
+                if not literal:
+                    literals = None
+                    break
+                literals.append(literal)
+            entry_literals.append(literals)
+            for literal in literals or []:
+                gram_length = min(_PREFILTER_GRAM_LENGTH, len(literal))
+                for gram in {literal[i:i + gram_length] for i in range(len(literal) - gram_length + 1)}:
+                    gram_frequency[gram] += 1
+        
+        self._gram_index: Dict[str, List[int]] = defaultdict(list)
+        self._unindexed_positions: List[int] = []
+        for position, literals in enumerate(entry_literals):
+            if literals is None:
+                self._unindexed_positions.append(position)
+                continue
+            grams = set()
+            for literal in literals:
+                gram_length = min(_PREFILTER_GRAM_LENGTH, len(literal))
+                grams.add(min(
+                    (literal[i:i + gram_length] for i in range(len(literal) - gram_length + 1)),
+                    key=lambda gram: gram_frequency[gram]
+                ))
+            for gram in grams:
+                self._gram_index[gram].append(position)
+        self._gram_index = dict(self._gram_index)
+        self._gram_lengths = sorted({len(gram) for gram in self._gram_index})
+    
+    def candidate_entries(self, search_name: str, stream_m3u_account: Optional[Any]) -> List:
+        """Get the entries that can possibly match a (case folded) stream name.
+        
+        Uses the literal prefilter to skip channels whose required literals do not
+        occur in the name. Entries are returned in configuration order and already
+        filtered by M3U account, so matching them gives the same result as matching
+        entries_for_account().
+        """
+        gram_index = self._gram_index
+        positions = set(self._unindexed_positions)
+        name_length = len(search_name)
+        for gram_length in self._gram_lengths:
+            for i in range(name_length - gram_length + 1):
+                found = gram_index.get(search_name[i:i + gram_length])
+                if found:
+                    positions.update(found)
+        
+        if not positions:
+            return []
+        
+        entries = self.entries
+        candidates = []
+        for position in sorted(positions):
+            entry = entries[position]
+            allowed_accounts = entry[1]
+            if allowed_accounts is None or (stream_m3u_account is not None and stream_m3u_account in allowed_accounts):
+                candidates.append(entry)
+        return candidates
+    
+    def entries_for_account(self, stream_m3u_account: Optional[Any]) -> List:
+        """Get the entries that apply to streams of the given M3U account."""
+        try:
+            return self._entries_by_account[stream_m3u_account]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable account value, filter without caching
+            return [entry for entry in self.entries
+                    if entry[1] is None or (stream_m3u_account is not None and stream_m3u_account in entry[1])]
+        
+        if stream_m3u_account is None:
+            entries = [entry for entry in self.entries if entry[1] is None]
+        else:
+            entries = [entry for entry in self.entries
+                       if entry[1] is None or stream_m3u_account in entry[1]]
+        self._entries_by_account[stream_m3u_account] = entries
+        return entries
+
+
 class RegexChannelMatcher:
     """Handles regex-based channel matching for stream assignment."""
     
@@ -284,6 +509,10 @@ class RegexChannelMatcher:
         if config_file is None:
             config_file = CONFIG_DIR / "channel_regex_config.json"
         self.config_file = Path(config_file)
+        # Compiled matcher index, built lazily and invalidated when the config changes
+        self._index_lock = threading.Lock()
+        self._compiled_index: Optional[_CompiledPatternIndex] = None
+        self._patterns_fingerprint: Optional[str] = None
         self.channel_patterns = self._load_patterns()
     
     def _load_patterns(self) -> Dict:
@@ -371,6 +600,35 @@ class RegexChannelMatcher:
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.config_file, 'w') as f:
             json.dump(patterns, f, indent=2)
+        self._invalidate_compiled_index()
+    
+    @staticmethod
+    def _fingerprint_patterns(patterns: Dict) -> str:
+        """Get a stable fingerprint of a patterns configuration."""
+        return json.dumps(patterns, sort_keys=True, default=str)
+    
+    def _invalidate_compiled_index(self):
+        """Drop the compiled matcher index so it is rebuilt on next use."""
+        with self._index_lock:
+            self._compiled_index = None
+            self._patterns_fingerprint = None
+    
+    def _get_compiled_index(self) -> _CompiledPatternIndex:
+        """Get the compiled matcher index, building it if needed."""
+        index = self._compiled_index
+        if index is not None:
+            return index
+        
+        with self._index_lock:
+            if self._compiled_index is None:
+                start_time = time.time()
+                self._compiled_index = _CompiledPatternIndex(self.channel_patterns)
+                self._patterns_fingerprint = self._fingerprint_patterns(self.channel_patterns)
+                logger.debug(
+                    f"Built compiled regex index for {len(self._compiled_index.entries)} channels "
+                    f"in {time.time() - start_time:.3f}s"
+                )
+            return self._compiled_index
     
     def validate_regex_patterns(self, patterns: List[str]) -> Tuple[bool, Optional[str]]:
         """Validate a list of regex patterns.
@@ -444,7 +702,14 @@ class RegexChannelMatcher:
         This is useful when patterns have been updated by another process
         and we need to ensure we're using the latest patterns.
         """
-        self.channel_patterns = self._load_patterns()
+        new_patterns = self._load_patterns()
+        # Keep the compiled index when the configuration content did not change
+        with self._index_lock:
+            if (self._patterns_fingerprint is None or
+                    self._fingerprint_patterns(new_patterns) != self._patterns_fingerprint):
+                self._compiled_index = None
+                self._patterns_fingerprint = None
+            self.channel_patterns = new_patterns
         logger.debug("Reloaded regex patterns from config file")
     
     def _substitute_channel_variables(self, pattern: str, channel_name: str) -> str:
@@ -480,51 +745,73 @@ class RegexChannelMatcher:
         Returns:
             List of channel IDs that match the stream
         """
-        matches = []
-        case_sensitive = self.channel_patterns.get("global_settings", {}).get("case_sensitive", False)
+        index = self._get_compiled_index()
+        search_name = stream_name if index.case_sensitive else stream_name.lower()
+        return self._match_entries(stream_name, search_name, index.candidate_entries(search_name, stream_m3u_account))
+    
+    def match_streams(self, streams: List[Dict], channel_ids: Optional[List[str]] = None) -> Dict[Any, List[str]]:
+        """Match a batch of streams to channel IDs based on regex patterns.
         
-        search_name = stream_name if case_sensitive else stream_name.lower()
+        Uses the same rules as match_stream_to_channels (M3U account filtering,
+        case sensitivity, CHANNEL_NAME substitution) but resolves the compiled
+        index once for the whole batch. Without a channel restriction, the
+        literal prefilter selects the candidate channels for each stream.
         
-        for channel_id, config in self.channel_patterns.get("patterns", {}).items():
-            if not config.get("enabled", True):
+        Args:
+            streams: List of stream dicts with 'id', 'name' and optional 'm3u_account'.
+                     Streams without an id are skipped.
+            channel_ids: Optional list of channel IDs to restrict matching to.
+                         None matches against all configured channels.
+        
+        Returns:
+            Dict mapping stream ID to the list of matching channel IDs
+            (only streams with at least one match are included)
+        """
+        index = self._get_compiled_index()
+        case_sensitive = index.case_sensitive
+        allowed_channels = {str(cid) for cid in channel_ids} if channel_ids is not None else None
+        
+        entries_by_account = {}
+        results = {}
+        for stream in streams:
+            if not isinstance(stream, dict):
+                continue
+            stream_id = stream.get('id')
+            if stream_id is None:
                 continue
+            stream_name = stream.get('name') or ''
+            search_name = stream_name if case_sensitive else stream_name.lower()
+            stream_m3u_account = stream.get('m3u_account')
             
-            # Check if this regex pattern applies to the stream's M3U account
-            # Backward compatible behavior:
-            # - m3u_accounts not present (None) = old config, applies to all M3U accounts
-            # - m3u_accounts = [] (empty) = new config, explicitly applies to all M3U accounts
-            # - m3u_accounts = [1,2,3] = only applies to those specific M3U accounts
-            pattern_m3u_accounts = config.get("m3u_accounts")
-            if pattern_m3u_accounts is not None and len(pattern_m3u_accounts) > 0:
-                # Pattern is limited to specific M3U accounts
-                if stream_m3u_account is None or stream_m3u_account not in pattern_m3u_accounts:
-                    # Stream's M3U account is not in the allowed list, skip this pattern
-                    continue
-            # If m3u_accounts is None (old config) or empty list (new, all), pattern applies to all M3U accounts
+            if allowed_channels is None:
+                entries = index.candidate_entries(search_name, stream_m3u_account)
+            else:
+                # Restricted to a few channels, scanning them directly is cheapest
+                try:
+                    entries = entries_by_account[stream_m3u_account]
+                except KeyError:
+                    entries = [entry for entry in index.entries_for_account(stream_m3u_account)
+                               if entry[0] in allowed_channels]
+                    entries_by_account[stream_m3u_account] = entries
             
-            channel_name = config.get("name", "")
+            if not entries:
+                continue
             
-            for pattern in config.get("regex", []):
-                # Substitute channel name variable if present
-                substituted_pattern = self._substitute_channel_variables(pattern, channel_name)
-                
-                search_pattern = substituted_pattern if case_sensitive else substituted_pattern.lower()
-                
-                # Convert literal spaces in pattern to flexible whitespace regex (\s+)
-                # This allows matching streams with different whitespace characters
-                # (non-breaking spaces, tabs, double spaces, etc.)
-                # BUT: Don't convert escaped spaces (from re.escape) - they should remain literal
-                # We replace only non-escaped spaces using pre-compiled pattern for performance
-                search_pattern = _WHITESPACE_PATTERN.sub(r'\\s+', search_pattern)
-                
-                try:
-                    if re.search(search_pattern, search_name):
-                        matches.append(channel_id)
-                        logger.debug(f"Stream '{stream_name}' matched channel {channel_id} with pattern '{pattern}'")
-                        break  # Only match once per channel
-                except re.error as e:
-                    logger.error(f"Invalid regex pattern '{pattern}' for channel {channel_id}: {e}")
+            matches = self._match_entries(stream_name, search_name, entries)
+            if matches:
+                results[stream_id] = matches
         
+        return results
+    
+    def _match_entries(self, stream_name: str, search_name: str, entries: List) -> List[str]:
+        """Run compiled pattern entries against an already case-folded stream name."""
+        matches = []
+        for channel_id, _, compiled_patterns in entries:
+            for compiled, pattern in compiled_patterns:
+                if compiled.search(search_name):
+                    matches.append(channel_id)
+                    logger.debug(f"Stream '{stream_name}' matched channel {channel_id} with pattern '{pattern}'")
+                    break  # Only match once per channel
         return matches
     
     def get_patterns(self) -> Dict:
@@ -558,6 +845,109 @@ class RegexChannelMatcher:
         return isinstance(regex_patterns, list) and len(regex_patterns) > 0
 
 
+class DiscoveryMatchState:
+    """Persisted record of the channels each stream matched during discovery.
+    
+    Incremental stream discovery only re-matches streams that are new or whose
+    name or M3U account changed since they were last matched. The record is
+    tied to a fingerprint of the other matching inputs (regex configuration,
+    matching-enabled channels, enabled M3U accounts, dead stream removal); when
+    the fingerprint changes the record is discarded and all streams are matched.
+    Streams skipped as dead are forgotten, so they are matched again once
+    they are revived.
+    """
+    
+    def __init__(self, state_file=None):
+        if state_file is None:
+            state_file = CONFIG_DIR / "discovery_match_state.json"
+        self.state_file = Path(state_file)
+        self.fingerprint: Optional[str] = None
+        # {str(stream_id): {"name": ..., "m3u_account": ...}}
+        self.streams: Dict[str, Dict[str, Any]] = {}
+        self._load_state()
+    
+    def _load_state(self):
+        """Load the persisted record, if any."""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    data = json.load(f)
+                self.fingerprint = data.get('fingerprint')
+                self.streams = data.get('streams', {})
+            except (json.JSONDecodeError, OSError, AttributeError):
+                logger.warning(f"Could not load {self.state_file}, starting with a full re-match")
+                self.reset()
+    
+    def save(self):
+        """Save the record to file."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_file, 'w') as f:
+            json.dump({'fingerprint': self.fingerprint, 'streams': self.streams}, f)
+    
+    def reset(self):
+        """Forget all recorded matches."""
+        self.fingerprint = None
+        self.streams = {}
+    
+    @staticmethod
+    def make_fingerprint(patterns: Dict, channels: List[Dict], enabled_account_ids, dead_stream_removal: bool) -> str:
+        """Get a fingerprint of the matching inputs other than the streams themselves.
+        
+        Channel names are included because patterns may use CHANNEL_NAME.
+        """
+        payload = json.dumps({
+            'patterns': patterns,
+            'channels': sorted((str(ch.get('id')), ch.get('name', '')) for ch in channels),
+            'accounts': sorted(str(account_id) for account_id in enabled_account_ids),
+            'dead_stream_removal': dead_stream_removal,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def select_changed(self, streams: List[Dict], fingerprint: str) -> List[Dict]:
+        """Get the streams that need to be matched.
+        
+        Args:
+            streams: Streams eligible for matching
+            fingerprint: Fingerprint of the current matching inputs
+            
+        Returns:
+            All streams if the fingerprint changed, otherwise only the streams
+            that are new or were renamed or moved to another M3U account
+        """
+        if fingerprint != self.fingerprint:
+            if self.fingerprint is not None:
+                logger.info("Regex config, channel settings or enabled accounts changed - re-matching all streams")
+            self.reset()
+            self.fingerprint = fingerprint
+            return list(streams)
+        
+        changed = []
+        for stream in streams:
+            record = self.streams.get(str(stream.get('id')))
+            if (record is None or record.get('name') != stream.get('name') or
+                    record.get('m3u_account') != stream.get('m3u_account')):
+                changed.append(stream)
+        return changed
+    
+    def record(self, streams: List[Dict]):
+        """Record that the given streams were matched."""
+        for stream in streams:
+            self.streams[str(stream['id'])] = {
+                'name': stream.get('name'),
+                'm3u_account': stream.get('m3u_account'),
+            }
+    
+    def forget(self, stream_id):
+        """Drop the record of a stream, so it is matched again on the next run."""
+        self.streams.pop(str(stream_id), None)
+    
+    def prune(self, stream_ids):
+        """Drop the records of streams that no longer exist."""
+        current = {str(stream_id) for stream_id in stream_ids}
+        for key in [key for key in self.streams if key not in current]:
+            del self.streams[key]
+
+
 class AutomatedStreamManager:
     """Main automated stream management system."""
     
@@ -566,14 +956,17 @@ class AutomatedStreamManager:
             config_file = CONFIG_DIR / "automation_config.json"
         self.config_file = Path(config_file)
         self.config = self._load_config()
-        self.changelog = ChangelogManager()
+        self.changelog = ChangelogManager(
+            retention_days=self.config.get('changelog_retention_days', DEFAULT_CHANGELOG_RETENTION_DAYS)
+        )
         self.regex_matcher = RegexChannelMatcher()
+        self.match_state = DiscoveryMatchState()
         
         # Initialize dead streams tracker
         self.dead_streams_tracker = None
         if DEAD_STREAMS_TRACKER_AVAILABLE:
             try:
-                self.dead_streams_tracker = DeadStreamsTracker()
+                self.dead_streams_tracker = get_dead_streams_tracker()
                 logger.info("Dead streams tracker initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize dead streams tracker: {e}")
@@ -608,9 +1001,11 @@ class AutomatedStreamManager:
             "enabled_features": {
                 "auto_playlist_update": True,
                 "auto_stream_discovery": True,
+                "incremental_stream_discovery": True,  # Only match new/changed streams between config changes
                 "changelog_tracking": True
             },
-            "validate_existing_streams": False  # Validate existing streams in channels against regex patterns
+            "validate_existing_streams": False,  # Validate existing streams in channels against regex patterns
+            "changelog_retention_days": DEFAULT_CHANGELOG_RETENTION_DAYS  # Days of changelog kept on disk (0 keeps everything)
         }
         
         self._save_config(default_config)
@@ -768,8 +1163,9 @@ class AutomatedStreamManager:
             logger.info("Refreshing UDI cache after playlist update...")
             udi = get_udi_manager()
             udi.refresh_m3u_accounts()  # Check for new M3U accounts
-            udi.refresh_streams()
-            udi.refresh_channels()
+            # Streams and channels only apply what changed since the last cycle
+            udi.refresh_streams(incremental=True)
+            udi.refresh_channels(incremental=True)
             udi.refresh_channel_groups()  # Check for new/updated channel groups
             udi.refresh_channel_profiles()  # Sync profiles with Dispatcharr to prevent orphaned references
             logger.info("UDI cache refreshed successfully")
@@ -845,14 +1241,22 @@ class AutomatedStreamManager:
                 })
             return False
     
-    def discover_and_assign_streams(self, force: bool = False, skip_check_trigger: bool = False) -> Dict[str, int]:
+    def discover_and_assign_streams(self, force: bool = False, skip_check_trigger: bool = False,
+                                    full_rematch: bool = False) -> Dict[str, int]:
         """Discover new streams and assign them to channels based on regex patterns.
         
+        By default only streams that are new or changed since the last run are
+        matched (see DiscoveryMatchState). All streams are matched when the
+        matching inputs changed, when incremental discovery is disabled via
+        enabled_features.incremental_stream_discovery, or when force or
+        full_rematch is set.
+        
         Args:
             force: If True, bypass the auto_stream_discovery feature flag check.
                    Used for manual/quick action triggers from the UI.
             skip_check_trigger: If True, don't trigger immediate stream quality check.
                    Used when the caller will handle the check itself (e.g., check_single_channel).
+            full_rematch: If True, match all streams even if they are unchanged.
         """
         if not force and not self.config.get("enabled_features", {}).get("auto_stream_discovery", True):
             logger.info("Stream discovery is disabled in configuration")
@@ -1012,7 +1416,9 @@ class AutomatedStreamManager:
             assignment_details = defaultdict(list)  # Track stream details for changelog
             assignment_count = {}
             
-            # Process each stream
+            # Collect the streams that are eligible for matching
+            streams_to_match = []
+            all_stream_ids = []
             for stream in all_streams:
                 # Validate that stream is a dictionary before accessing attributes
                 if not isinstance(stream, dict):
@@ -1024,6 +1430,7 @@ class AutomatedStreamManager:
                 
                 if not stream_name or not stream_id:
                     continue
+                all_stream_ids.append(stream_id)
                 
                 # Skip streams marked as dead in the tracker (if dead stream removal is enabled)
                 # Dead streams should not be added to channels during subsequent matches
@@ -1033,23 +1440,44 @@ class AutomatedStreamManager:
                     dead_stream_removal_enabled = self._is_dead_stream_removal_enabled()
                     if dead_stream_removal_enabled:
                         logger.debug(f"Skipping dead stream {stream_id}: {stream_name} (URL: {stream_url})")
+                        # Match it again once it is revived
+                        self.match_state.forget(stream_id)
                         continue
                     else:
                         logger.debug(f"Including dead stream {stream_id}: {stream_name} (dead stream removal is disabled)")
                 
-                # Get stream's m3u_account for M3U account filtering
-                stream_m3u_account = stream.get('m3u_account')
-                
-                # Find matching channels (with M3U account filtering if applicable)
-                matching_channels = self.regex_matcher.match_stream_to_channels(stream_name, stream_m3u_account)
-                
-                for channel_id in matching_channels:
+                streams_to_match.append(stream)
+            
+            # Only match streams that are new or changed since the last run, unless
+            # the regex config, channel settings or enabled accounts changed
+            incremental = (not force and not full_rematch and
+                           self.config.get("enabled_features", {}).get("incremental_stream_discovery", True))
+            if not incremental:
+                self.match_state.reset()
+            fingerprint = DiscoveryMatchState.make_fingerprint(
+                self.regex_matcher.channel_patterns, all_channels, enabled_account_ids,
+                self._is_dead_stream_removal_enabled()
+            )
+            eligible_count = len(streams_to_match)
+            streams_to_match = self.match_state.select_changed(streams_to_match, fingerprint)
+            if incremental:
+                logger.info(f"Incremental discovery: matching {len(streams_to_match)} of {eligible_count} streams")
+            
+            # Find matching channels for the streams in one pass over the compiled index
+            # (with M3U account filtering if applicable)
+            match_start = time.time()
+            stream_matches = self.regex_matcher.match_streams(streams_to_match)
+            logger.debug(f"Matched {len(streams_to_match)} streams against regex patterns in {time.time() - match_start:.2f}s")
+            
+            for stream in streams_to_match:
+                stream_id = stream.get('id')
+                for channel_id in stream_matches.get(stream_id, []):
                     # Check if stream is already in this channel
                     if channel_id in channel_streams and stream_id not in channel_streams[channel_id]:
                         assignments[channel_id].append(stream_id)
                         assignment_details[channel_id].append({
                             "stream_id": stream_id,
-                            "stream_name": stream_name
+                            "stream_name": stream.get('name', '')
                         })
             
             # Get stream checker service for account limits configuration
@@ -1064,6 +1492,7 @@ class AutomatedStreamManager:
             
             # Prepare detailed changelog data
             detailed_assignments = []
+            failed_stream_ids = set()
             
             # Get dead stream removal config once for this discovery run
             dead_stream_removal_enabled = self._is_dead_stream_removal_enabled()
@@ -1113,6 +1542,16 @@ class AutomatedStreamManager:
                         
                     except Exception as e:
                         logger.error(f"Failed to assign streams to channel {channel_id}: {e}")
+                        # Match these streams again on the next run
+                        failed_stream_ids.update(stream_ids)
+            
+            # Remember the match results for the next incremental run
+            try:
+                self.match_state.record([s for s in streams_to_match if s.get('id') not in failed_stream_ids])
+                self.match_state.prune(all_stream_ids)
+                self.match_state.save()
+            except Exception as e:
+                logger.warning(f"Could not save discovery match state: {e}")
             
             # Add comprehensive changelog entry
             total_assigned = sum(assignment_count.values())
@@ -1389,6 +1828,21 @@ class AutomatedStreamManager:
                 streams_to_keep = []
                 streams_to_remove = []
                 
+                # Check which streams still match this channel's patterns in one batch,
+                # restricted to this channel (with M3U account filtering)
+                streams_to_validate = []
+                for stream in channel_streams:
+                    if not isinstance(stream, dict) or 'id' not in stream:
+                        continue
+                    full_stream = stream_lookup.get(stream['id'])
+                    if full_stream:
+                        streams_to_validate.append({
+                            'id': stream['id'],
+                            'name': stream.get('name', ''),
+                            'm3u_account': full_stream.get('m3u_account')
+                        })
+                stream_matches = self.regex_matcher.match_streams(streams_to_validate, channel_ids=[str(channel_id)])
+                
                 for stream in channel_streams:
                     if not isinstance(stream, dict) or 'id' not in stream:
                         continue
@@ -1403,13 +1857,7 @@ class AutomatedStreamManager:
                         streams_to_keep.append(stream_id)
                         continue
                     
-                    # Get stream's m3u_account for M3U account filtering
-                    stream_m3u_account = full_stream.get('m3u_account')
-                    
-                    # Check if stream matches any pattern for this channel (with M3U account filtering)
-                    matching_channels = self.regex_matcher.match_stream_to_channels(stream_name, stream_m3u_account)
-                    
-                    if str(channel_id) in matching_channels:
+                    if str(channel_id) in stream_matches.get(stream_id, []):
                         # Stream still matches, keep it
                         streams_to_keep.append(stream_id)
                     else:
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Time-Partitioned Changelog Store for StreamFlow.
+
+The changelog used to be one JSON list that was rewritten completely on
+every new entry and scanned completely on every /api/changelog request.
+This store keeps the entries in a directory of JSON-lines partitions:
+- One partition per day (YYYY-MM-DD.jsonl); a day that grows past
+  max_partition_bytes continues in YYYY-MM-DD.1.jsonl, YYYY-MM-DD.2.jsonl, ...
+- New entries are appended to the partition of their day
+- Partitions older than retention_days are deleted
+- Partitions are parsed only when a query reaches their day, and a few
+  recently used partitions are kept parsed in memory
+
+Every entry has a sort key (epoch timestamp, store name, partition, line)
+that orders entries across partitions and stores. Queries yield entries
+newest first together with their key, so callers can merge several stores
+and page through them with a cursor made from the key of the last entry.
+"""
+
+import base64
+import bisect
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Days of changelog kept on disk (0 keeps everything)
+DEFAULT_RETENTION_DAYS = 30
+
+# Size after which a day continues in a new partition file
+DEFAULT_MAX_PARTITION_BYTES = 8 * 1024 * 1024
+
+# Number of parsed partitions kept in memory
+DEFAULT_CACHED_PARTITIONS = 8
+
+PARTITION_SUFFIX = '.jsonl'
+
+# (epoch timestamp, store name, partition name, line number)
+EntryKey = Tuple[float, str, str, int]
+
+
+def entry_epoch(entry: Dict[str, Any]) -> Optional[float]:
+    """Epoch timestamp of a changelog entry, or None if it has no valid timestamp."""
+    try:
+        return datetime.fromisoformat(entry['timestamp']).timestamp()
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def encode_cursor(key: EntryKey) -> str:
+    """Encode the key of the last returned entry as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> EntryKey:
+    """
+    Decode a cursor created by encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        epoch, store, partition, line = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(epoch), str(store), str(partition), int(line)
+    except Exception as e:
+        raise ValueError(f"Invalid changelog cursor: {cursor}") from e
+
+
+class _Partition:
+    """One partition file and, while cached, its parsed entries sorted by key."""
+
+    def __init__(self, path: Path, day: str):
+        self.path = path
+        self.name = path.name[:-len(PARTITION_SUFFIX)]
+        self.day = day
+        self.size = path.stat().st_size if path.exists() else 0
+        self.lines: Optional[int] = None
+        self.entries: Optional[List[Tuple[EntryKey, Dict[str, Any]]]] = None
+
+
+class ChangelogStore:
+    """Directory of day partitions holding changelog entries."""
+
+    def __init__(self, directory, retention_days: int = DEFAULT_RETENTION_DAYS,
+                 max_partition_bytes: int = DEFAULT_MAX_PARTITION_BYTES,
+                 cached_partitions: int = DEFAULT_CACHED_PARTITIONS):
+        """
+        Initialize the store (only the file names are read here).
+
+        Args:
+            directory: Directory holding the partition files
+            retention_days: Days of entries kept on disk (0 keeps everything)
+            max_partition_bytes: Size after which a day continues in a new partition
+            cached_partitions: Number of parsed partitions kept in memory
+        """
+        self.directory = Path(directory)
+        self.name = self.directory.name
+        self.retention_days = retention_days
+        self.max_partition_bytes = max_partition_bytes
+        self.cached_partitions = cached_partitions
+        self.lock = threading.Lock()
+        # Day (YYYY-MM-DD) -> partitions of that day in write order
+        self._days: Dict[str, List[_Partition]] = {}
+        self._sorted_days: List[str] = []
+        self._cache: 'OrderedDict[str, _Partition]' = OrderedDict()
+        self._retention_checked_for: Optional[date] = None
+        self._scan()
+        with self.lock:
+            self._apply_retention()
+
+    def _scan(self):
+        """Register the partition files in the directory without parsing them."""
+        if not self.directory.is_dir():
+            return
+        partitions = []
+        for path in self.directory.glob(f'*{PARTITION_SUFFIX}'):
+            parts = path.name[:-len(PARTITION_SUFFIX)].split('.')
+            try:
+                date.fromisoformat(parts[0])
+                sequence = int(parts[1]) if len(parts) > 1 else 0
+            except ValueError:
+                logger.warning(f"Ignoring unexpected file in changelog directory: {path}")
+                continue
+            partitions.append((parts[0], sequence, path))
+        for day, _, path in sorted(partitions):
+            self._days.setdefault(day, []).append(_Partition(path, day))
+        self._sorted_days = sorted(self._days)
+
+    def _apply_retention(self):
+        """Delete partitions older than the retention period (at most once a day).
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        today = date.today()
+        if self.retention_days <= 0 or self._retention_checked_for == today:
+            return
+        self._retention_checked_for = today
+        cutoff = (today - timedelta(days=self.retention_days)).isoformat()
+        expired = self._sorted_days[:bisect.bisect_left(self._sorted_days, cutoff)]
+        for day in expired:
+            for partition in self._days.pop(day):
+                self._cache.pop(partition.name, None)
+                try:
+                    partition.path.unlink()
+                except FileNotFoundError:
+                    pass
+        if expired:
+            self._sorted_days = self._sorted_days[len(expired):]
+            logger.info(f"Removed {len(expired)} day(s) of changelog older than {self.retention_days} days from {self.directory}")
+
+    def _load(self, partition: _Partition) -> List[Tuple[EntryKey, Dict[str, Any]]]:
+        """Get the parsed entries of a partition, parsing and caching it if needed.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        if partition.entries is None:
+            entries = []
+            lines = 0
+            if partition.path.exists():
+                with open(partition.path, 'r') as f:
+                    for lines, line in enumerate(f, start=1):
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            logger.warning(f"Skipping unreadable changelog line {lines} in {partition.path}")
+                            continue
+                        epoch = entry_epoch(entry)
+                        if epoch is not None:
+                            entries.append(((epoch, self.name, partition.name, lines - 1), entry))
+            entries.sort(key=lambda item: item[0])
+            partition.entries = entries
+            partition.lines = lines
+
+        self._cache[partition.name] = partition
+        self._cache.move_to_end(partition.name)
+        while len(self._cache) > max(self.cached_partitions, 1):
+            _, evicted = self._cache.popitem(last=False)
+            evicted.entries = None
+        return partition.entries
+
+    def _writable_partition(self, day: str) -> _Partition:
+        """Get the partition new entries of a day are appended to.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        partitions = self._days.get(day)
+        if partitions is None:
+            partitions = self._days[day] = []
+            bisect.insort(self._sorted_days, day)
+        if not partitions or partitions[-1].size >= self.max_partition_bytes:
+            name = day if not partitions else f'{day}.{len(partitions)}'
+            partitions.append(_Partition(self.directory / f'{name}{PARTITION_SUFFIX}', day))
+        return partitions[-1]
+
+    def append(self, entry: Dict[str, Any]):
+        """Append one entry to the partition of its day."""
+        self.append_many([entry])
+
+    def append_many(self, entries: List[Dict[str, Any]]):
+        """Append entries, writing each affected partition once."""
+        with self.lock:
+            self._apply_retention()
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            pending: 'OrderedDict[str, List[Tuple[Optional[float], Dict[str, Any]]]]' = OrderedDict()
+            for entry in entries:
+                epoch = entry_epoch(entry)
+                day = date.fromtimestamp(epoch if epoch is not None else time.time()).isoformat()
+                pending.setdefault(day, []).append((epoch, entry))
+
+            for day, day_entries in pending.items():
+                while day_entries:
+                    partition = self._writable_partition(day)
+                    if partition.lines is None:
+                        self._load(partition)
+                    # Fill the partition up to its size limit, then roll over
+                    lines = []
+                    size = partition.size
+                    while day_entries and (size < self.max_partition_bytes or not lines):
+                        epoch, entry = day_entries.pop(0)
+                        line = json.dumps(entry, separators=(',', ':')) + '\n'
+                        size += len(line.encode())
+                        lines.append((epoch, entry, line))
+                    with open(partition.path, 'a') as f:
+                        f.write(''.join(line for _, _, line in lines))
+                    partition.size = size
+                    for epoch, entry, _ in lines:
+                        if epoch is not None and partition.entries is not None:
+                            key = (epoch, self.name, partition.name, partition.lines)
+                            bisect.insort(partition.entries, (key, entry), key=lambda item: item[0])
+                        partition.lines += 1
+
+    def iter_entries(self, since: Optional[float] = None,
+                     before: Optional[EntryKey] = None) -> Iterator[Tuple[EntryKey, Dict[str, Any]]]:
+        """
+        Yield (key, entry) pairs newest first.
+
+        Only partitions of days that can contain matching entries are read.
+
+        Args:
+            since: Only entries at or after this epoch timestamp
+            before: Only entries with a key smaller than this (pagination cursor)
+        """
+        with self.lock:
+            days = list(self._sorted_days)
+        if since is not None:
+            days = days[bisect.bisect_left(days, date.fromtimestamp(since).isoformat()):]
+        if before is not None:
+            days = days[:bisect.bisect_right(days, date.fromtimestamp(before[0]).isoformat())]
+
+        for day in reversed(days):
+            with self.lock:
+                entries = []
+                partitions = self._days.get(day, [])
+                for partition in partitions:
+                    entries.extend(self._load(partition))
+            if len(partitions) > 1:
+                entries.sort(key=lambda item: item[0])
+
+            end = len(entries)
+            if before is not None:
+                end = bisect.bisect_left(entries, before, key=lambda item: item[0])
+            for index in range(end - 1, -1, -1):
+                key, entry = entries[index]
+                if since is not None and key[0] < since:
+                    return
+                yield key, entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get partition statistics of the store."""
+        with self.lock:
+            partitions = [partition for day in self._sorted_days for partition in self._days[day]]
+            return {
+                'days': len(self._sorted_days),
+                'partitions': len(partitions),
+                'cached_partitions': len(self._cache),
+                'bytes': sum(partition.size for partition in partitions),
+                'oldest_day': self._sorted_days[0] if self._sorted_days else None,
+                'retention_days': self.retention_days
+            }
+
+
+# Shared store instances by directory
+_stores: Dict[Path, ChangelogStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_changelog_store(directory, retention_days: int = DEFAULT_RETENTION_DAYS) -> ChangelogStore:
+    """Get or create the shared changelog store of a directory."""
+    key = Path(directory).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ChangelogStore(directory, retention_days=retention_days)
+        else:
+            store.retention_days = retention_days
+        return store
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Persistent Channel Check Queue for StreamFlow.
+
+The check queue used to be an in-memory FIFO with a fixed capacity that
+dropped channels when full and lost all pending work on restart. This queue:
+- Orders channels by priority (higher = earlier) with aging: every
+  aging_interval seconds of waiting is worth one priority level, so
+  low-priority channels of a global action are not starved by a constant
+  stream of high-priority M3U update checks. Because aging applies to every
+  waiting channel at the same rate, the effective order never changes after
+  enqueueing and a plain heap keeps enqueue and dequeue O(log n)
+- Has no capacity limit and never queues a channel twice
+- Optionally journals every change next to a JSON snapshot (the same
+  scheme as the dead streams tracker), so queued and in-progress channels,
+  and the start of a running global action, survive a restart
+- Keeps a bounded history of completed and failed channels
+- Records how long channels waited in the queue
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Seconds of waiting that are worth one priority level
+DEFAULT_AGING_INTERVAL = 60.0
+
+# Number of completed and failed channels remembered
+DEFAULT_HISTORY_SIZE = 10000
+
+# Number of recent queue wait times used for latency metrics
+DEFAULT_LATENCY_SAMPLES = 1000
+
+# Seconds to wait after a change before the journal is flushed to disk
+DEFAULT_FLUSH_DELAY = 2.0
+
+# Number of journal entries after which the journal is folded into the snapshot
+DEFAULT_COMPACT_THRESHOLD = 1000
+
+
+class StreamCheckQueue:
+    """Priority queue manager for channel stream checking."""
+
+    def __init__(self, max_size: Optional[int] = None, queue_file=None,
+                 aging_interval: float = DEFAULT_AGING_INTERVAL,
+                 history_size: int = DEFAULT_HISTORY_SIZE,
+                 flush_delay: float = DEFAULT_FLUSH_DELAY,
+                 compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        """Initialize the queue, restoring persisted state if a queue file is given.
+
+        Args:
+            max_size: Ignored; the queue is unbounded (kept for compatibility)
+            queue_file: Path to the JSON snapshot; None keeps the queue in memory only
+            aging_interval: Seconds of waiting that are worth one priority level
+            history_size: Number of completed and failed channels remembered
+            flush_delay: Seconds to wait after a change before flushing the journal
+            compact_threshold: Journal entries after which the journal is
+                               folded into the JSON snapshot
+        """
+        self.queue_file = Path(queue_file) if queue_file is not None else None
+        self.journal_file = (self.queue_file.with_name(self.queue_file.name + '.journal')
+                             if self.queue_file is not None else None)
+        self.aging_interval = aging_interval
+        self.history_size = history_size
+        self.flush_delay = flush_delay
+        self.compact_threshold = compact_threshold
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        # Channel ID -> {'priority', 'enqueued_at', 'seq'} of queued channels
+        self.entries: Dict[int, Dict] = {}
+        # (sort key, seq, channel_id); entries whose seq no longer matches are stale
+        self._heap: List = []
+        self._seq = 0
+        # Channel ID -> {'priority', 'enqueued_at'} of channels being checked
+        self.in_progress: Dict[int, Dict] = {}
+        self.completed: 'OrderedDict[int, float]' = OrderedDict()
+        self.failed: 'OrderedDict[int, Dict]' = OrderedDict()
+        self.global_action_started_at: Optional[float] = None
+        self._wait_times = deque(maxlen=DEFAULT_LATENCY_SAMPLES)
+        self._journal = None
+        self._journal_entries = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self.stats = {
+            'total_queued': 0,
+            'total_completed': 0,
+            'total_failed': 0,
+            'current_channel': None,
+            'queue_size': 0
+        }
+        if self.queue_file is not None:
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Restore queued channels from the snapshot and journal.
+
+        Channels that were being checked when the process stopped are queued
+        again with their original priority and enqueue time.
+        """
+        state = {'entries': {}, 'global_action_started_at': None}
+        if self.queue_file.exists():
+            try:
+                with open(self.queue_file, 'r') as f:
+                    snapshot = json.load(f)
+                state['entries'] = {int(cid): entry for cid, entry in snapshot.get('entries', {}).items()}
+                state['global_action_started_at'] = snapshot.get('global_action_started_at')
+            except (json.JSONDecodeError, OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Could not load check queue from {self.queue_file}: {e}")
+
+        if self.journal_file.exists():
+            try:
+                with open(self.journal_file, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Partially written last line after a crash
+                            logger.warning(f"Skipping unreadable check queue journal entry in {self.journal_file}")
+                            continue
+                        self._apply(state, entry)
+                        self._journal_entries += 1
+            except OSError as e:
+                logger.warning(f"Could not replay check queue journal {self.journal_file}: {e}")
+
+        for channel_id, entry in state['entries'].items():
+            self._push(channel_id, entry['priority'], entry['enqueued_at'])
+        self.global_action_started_at = state['global_action_started_at']
+        self.stats['queue_size'] = len(self.entries)
+        if self.entries:
+            logger.info(f"Restored {len(self.entries)} channel(s) to the check queue from {self.queue_file}")
+
+    @staticmethod
+    def _apply(state: Dict, entry: Dict):
+        """Apply one journal entry to a persisted queue state."""
+        op = entry.get('op')
+        if op == 'add':
+            state['entries'][entry['id']] = {'priority': entry['priority'], 'enqueued_at': entry['at']}
+        elif op == 'done':
+            state['entries'].pop(entry['id'], None)
+        elif op == 'clear':
+            state['entries'].clear()
+            state['global_action_started_at'] = None
+        elif op == 'global_action':
+            state['global_action_started_at'] = entry['started_at']
+
+    def _append(self, entry: Dict):
+        """Append a change to the journal and schedule a flush.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        if self.journal_file is None:
+            return
+        try:
+            if self._journal is None:
+                self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.journal_file, 'a')
+            self._journal.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            # Hand the entry to the OS right away; fsync is debounced
+            self._journal.flush()
+            self._journal_entries += 1
+        except Exception as e:
+            logger.error(f"Failed to journal check queue change: {e}")
+            return
+
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _save(self):
+        """Save queued and in-progress channels to the snapshot and truncate the journal.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        if self.queue_file is None:
+            return
+        entries = {
+            str(channel_id): {'priority': entry['priority'], 'enqueued_at': entry['enqueued_at']}
+            for channel_id, entry in list(self.entries.items()) + list(self.in_progress.items())
+        }
+        try:
+            self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.queue_file.with_name(self.queue_file.name + '.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump({'entries': entries, 'global_action_started_at': self.global_action_started_at}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.queue_file)
+
+            # The snapshot now contains every journaled change
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            open(self.journal_file, 'w').close()
+            self._journal_entries = 0
+        except Exception as e:
+            logger.error(f"Failed to save check queue: {e}")
+
+    def flush(self):
+        """Flush the journal to disk, compacting it if it grew too long."""
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._journal_entries >= self.compact_threshold:
+                logger.debug(f"Compacting check queue journal ({self._journal_entries} entries)")
+                self._save()
+            elif self._journal is not None:
+                try:
+                    os.fsync(self._journal.fileno())
+                except Exception as e:
+                    logger.error(f"Failed to flush check queue journal: {e}")
+
+    def compact(self):
+        """Fold the journal into the JSON snapshot now."""
+        with self.lock:
+            self._save()
+
+    # ------------------------------------------------------------------
+    # Queue operations
+    # ------------------------------------------------------------------
+
+    def _push(self, channel_id: int, priority: int, enqueued_at: float):
+        """Queue a channel or move it up to a higher priority.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        self._seq += 1
+        self.entries[channel_id] = {'priority': priority, 'enqueued_at': enqueued_at, 'seq': self._seq}
+        sort_key = enqueued_at - priority * self.aging_interval
+        heapq.heappush(self._heap, (sort_key, self._seq, channel_id))
+
+    def set_aging_interval(self, aging_interval: float):
+        """Change the seconds of waiting worth one priority level.
+
+        Queued channels are re-sorted with the new interval.
+        """
+        with self.lock:
+            if aging_interval == self.aging_interval:
+                return
+            self.aging_interval = aging_interval
+            self._heap = [(entry['enqueued_at'] - entry['priority'] * aging_interval, entry['seq'], channel_id)
+                          for channel_id, entry in self.entries.items()]
+            heapq.heapify(self._heap)
+        logger.info(f"Check queue priority aging set to {aging_interval}s per priority level")
+
+    def add_channel(self, channel_id: int, priority: int = 0) -> bool:
+        """Add a channel to the checking queue.
+
+        A channel that is already queued is not added again, but moves up if
+        the new priority is higher.
+
+        Returns:
+            True if the channel was added, False if it was already queued,
+            in progress or completed
+        """
+        with self.lock:
+            queued = self.entries.get(channel_id)
+            if queued is not None:
+                if priority > queued['priority']:
+                    self._push(channel_id, priority, queued['enqueued_at'])
+                    self._append({'op': 'add', 'id': channel_id, 'priority': priority, 'at': queued['enqueued_at']})
+                    logger.debug(f"Raised priority of queued channel {channel_id} to {priority}")
+                return False
+            if channel_id in self.in_progress or channel_id in self.completed:
+                return False
+
+            enqueued_at = time.time()
+            self._push(channel_id, priority, enqueued_at)
+            self._append({'op': 'add', 'id': channel_id, 'priority': priority, 'at': enqueued_at})
+            self.stats['total_queued'] += 1
+            self.stats['queue_size'] = len(self.entries)
+            self.not_empty.notify()
+        logger.debug(f"Added channel {channel_id} to queue (priority: {priority})")
+        return True
+
+    def add_channels(self, channel_ids: List[int], priority: int = 0) -> int:
+        """Add multiple channels to the queue."""
+        added = 0
+        for channel_id in channel_ids:
+            if self.add_channel(channel_id, priority):
+                added += 1
+        logger.info(f"Added {added}/{len(channel_ids)} channels to checking queue")
+        return added
+
+    def remove_from_completed(self, channel_id: int) -> bool:
+        """Remove a channel from the completed set to allow re-queueing.
+
+        This is used when a channel receives new streams and needs to be
+        checked again, even if it was previously completed.
+        """
+        with self.lock:
+            if channel_id in self.completed:
+                del self.completed[channel_id]
+                logger.debug(f"Removed channel {channel_id} from completed set")
+                return True
+        return False
+
+    def get_next_channel(self, timeout: float = 1.0) -> Optional[int]:
+        """Get the next channel to check, waiting up to timeout seconds."""
+        deadline = time.monotonic() + timeout
+        with self.not_empty:
+            while True:
+                while self._heap:
+                    _, seq, channel_id = heapq.heappop(self._heap)
+                    entry = self.entries.get(channel_id)
+                    if entry is None or entry['seq'] != seq:
+                        continue
+                    del self.entries[channel_id]
+                    self.in_progress[channel_id] = {'priority': entry['priority'], 'enqueued_at': entry['enqueued_at']}
+                    self._wait_times.append(max(time.time() - entry['enqueued_at'], 0.0))
+                    self.stats['current_channel'] = channel_id
+                    self.stats['queue_size'] = len(self.entries)
+                    return channel_id
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.not_empty.wait(remaining)
+
+    def _finish(self, channel_id: int):
+        """Remove a channel from the in-progress set and the persisted queue.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        if self.in_progress.pop(channel_id, None) is not None:
+            self._append({'op': 'done', 'id': channel_id})
+        if self.stats['current_channel'] == channel_id:
+            self.stats['current_channel'] = None
+
+    def mark_completed(self, channel_id: int):
+        """Mark a channel check as completed."""
+        with self.lock:
+            self._finish(channel_id)
+            self.completed[channel_id] = time.time()
+            self.completed.move_to_end(channel_id)
+            while len(self.completed) > self.history_size:
+                self.completed.popitem(last=False)
+            self.stats['total_completed'] += 1
+        logger.debug(f"Marked channel {channel_id} as completed")
+
+    def mark_failed(self, channel_id: int, error: str):
+        """Mark a channel check as failed."""
+        with self.lock:
+            self._finish(channel_id)
+            self.failed[channel_id] = {
+                'error': error,
+                'timestamp': datetime.now().isoformat()
+            }
+            self.failed.move_to_end(channel_id)
+            while len(self.failed) > self.history_size:
+                self.failed.popitem(last=False)
+            self.stats['total_failed'] += 1
+        logger.warning(f"Marked channel {channel_id} as failed: {error}")
+
+    def set_global_action_started(self, started_at: Optional[float]):
+        """Record the start of a global action (None once it has finished).
+
+        The start time is persisted so that an interrupted global action can
+        be resumed after a restart.
+        """
+        with self.lock:
+            self.global_action_started_at = started_at
+            self._append({'op': 'global_action', 'started_at': started_at})
+
+    def _get_latency(self) -> Dict:
+        """Get queue wait time metrics in seconds.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        waits = sorted(self._wait_times)
+        oldest = min((entry['enqueued_at'] for entry in self.entries.values()), default=None)
+        return {
+            'samples': len(waits),
+            'avg_wait': round(sum(waits) / len(waits), 3) if waits else None,
+            'p95_wait': round(waits[min(int(len(waits) * 0.95), len(waits) - 1)], 3) if waits else None,
+            'max_wait': round(waits[-1], 3) if waits else None,
+            'oldest_queued_age': round(max(time.time() - oldest, 0.0), 3) if oldest is not None else None
+        }
+
+    def get_status(self) -> Dict:
+        """Get current queue status."""
+        with self.lock:
+            return {
+                'queue_size': len(self.entries),
+                'queued': len(self.entries),
+                'in_progress': len(self.in_progress),
+                'completed': len(self.completed),
+                'failed': len(self.failed),
+                'current_channel': self.stats['current_channel'],
+                'total_queued': self.stats['total_queued'],
+                'total_completed': self.stats['total_completed'],
+                'total_failed': self.stats['total_failed'],
+                'latency': self._get_latency(),
+                'persistent': self.queue_file is not None
+            }
+
+    def clear(self):
+        """Clear the queue and reset stats."""
+        with self.lock:
+            self.entries.clear()
+            self._heap = []
+            self.in_progress.clear()
+            self.completed.clear()
+            self.failed.clear()
+            self.global_action_started_at = None
+            self._wait_times.clear()
+            self.stats = {
+                'total_queued': 0,
+                'total_completed': 0,
+                'total_failed': 0,
+                'current_channel': None,
+                'queue_size': 0
+            }
+            self._append({'op': 'clear'})
+        logger.info("Queue cleared")
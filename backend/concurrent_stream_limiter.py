@@ -20,9 +20,9 @@ Example:
 
 import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import Dict, List, Optional, Any, Callable
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from logging_config import setup_logging
 
 logger = setup_logging(__name__)
@@ -275,12 +275,103 @@ class SmartStreamScheduler:
         self.global_limit = global_limit
         logger.info(f"SmartStreamScheduler initialized with global_limit={global_limit}")
     
+    def _get_cached_result(self, stream: Dict[str, Any], skipped_reason: str,
+                           reason_detail: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Build a result from the cached UDI stats of a stream that cannot be checked.
+        
+        Args:
+            stream: Stream dictionary
+            skipped_reason: Why the check was skipped
+            reason_detail: Optional detail for the skip reason
+            
+        Returns:
+            Result dictionary with the cached stats, or None if no stats are cached
+        """
+        if not self.account_limiter.udi_manager:
+            return None
+        
+        try:
+            cached_stream = self.account_limiter.udi_manager.get_stream_by_id(stream['id'])
+            if cached_stream and cached_stream.get('stream_stats'):
+                result = {
+                    'stream_id': stream['id'],
+                    'stream_name': stream.get('name', 'Unknown'),
+                    'stream_url': stream.get('url', ''),
+                    'cached': True,
+                    'skipped_reason': skipped_reason,
+                }
+                if reason_detail is not None:
+                    result['reason_detail'] = reason_detail
+                result.update(cached_stream.get('stream_stats', {}))
+                return result
+            logger.warning(f"No cached stats available for stream {stream['id']}, skipping")
+        except Exception as e:
+            logger.error(f"Error retrieving cached stats for stream {stream['id']}: {e}")
+        return None
+    
+    def _stream_url(self, stream: Dict[str, Any]) -> str:
+        """Get the URL to check for a stream (after the M3U profile URL transformation)."""
+        # Apply URL transformation if using M3U profile with search/replace patterns
+        if self.account_limiter.udi_manager:
+            return self.account_limiter.udi_manager.apply_profile_url_transformation(stream)
+        return stream.get('url', '')
+    
+    def _run_check(self, stream: Dict[str, Any], check_function: Callable,
+                   check_params: Dict[str, Any], result_cache=None) -> Dict[str, Any]:
+        """
+        Run check_function for a stream whose account slot is held, then release the slot.
+        
+        Args:
+            stream: Stream dictionary
+            check_function: Function to call for the stream
+            check_params: Additional parameters for check_function
+            result_cache: Optional StreamResultCache shared by streams with the same URL
+            
+        Returns:
+            Result of check_function
+        """
+        try:
+            stream_url = self._stream_url(stream)
+            
+            def run():
+                return check_function(
+                    stream_url=stream_url,
+                    stream_id=stream['id'],
+                    stream_name=stream.get('name', 'Unknown'),
+                    **check_params
+                )
+            
+            if result_cache is not None:
+                return result_cache.get_or_compute(stream_url, stream, run)
+            return run()
+        finally:
+            # Always release the account slot when done
+            self.account_limiter.release(stream.get('m3u_account'))
+    
+    @staticmethod
+    def _error_result(stream: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Build the result entry for a stream whose check raised an exception."""
+        return {
+            'stream_id': stream['id'],
+            'stream_name': stream.get('name', 'Unknown'),
+            'stream_url': stream.get('url', ''),
+            'status': 'ERROR',
+            'error': str(error),
+            'resolution': '0x0',
+            'bitrate_kbps': 0,
+            'fps': 0,
+            'video_codec': 'N/A',
+            'audio_codec': 'N/A'
+        }
+    
     def check_streams_with_limits(
         self,
         streams: List[Dict[str, Any]],
         check_function: Callable,
         progress_callback: Optional[Callable] = None,
         stagger_delay: float = 0.0,
+        result_cache=None,
         **check_params
     ) -> List[Dict[str, Any]]:
         """
@@ -295,6 +386,8 @@ class SmartStreamScheduler:
             check_function: Function to call for each stream
             progress_callback: Optional callback after each stream completes
             stagger_delay: Delay between starting tasks (default: 0.0)
+            result_cache: Optional StreamResultCache, streams with the same URL
+                share one analysis
             **check_params: Additional parameters for check_function
             
         Returns:
@@ -338,26 +431,7 @@ class SmartStreamScheduler:
                     
                     if not can_run:
                         logger.info(f"Skipping check for stream {stream['id']}: {reason}, using cached stats")
-                        
-                        # Get cached stream stats from UDI
-                        try:
-                            cached_stream = self.account_limiter.udi_manager.get_stream_by_id(stream['id'])
-                            if cached_stream and cached_stream.get('stream_stats'):
-                                # Return a result with cached stats
-                                return {
-                                    'stream_id': stream['id'],
-                                    'stream_name': stream.get('name', 'Unknown'),
-                                    'stream_url': stream.get('url', ''),
-                                    'cached': True,
-                                    'skipped_reason': 'no_available_profile',
-                                    'reason_detail': reason,
-                                    **cached_stream.get('stream_stats', {})
-                                }
-                            else:
-                                logger.warning(f"No cached stats available for stream {stream['id']}, skipping")
-                        except Exception as e:
-                            logger.error(f"Error retrieving cached stats for stream {stream['id']}: {e}")
-                        return None
+                        return self._get_cached_result(stream, 'no_available_profile', reason_detail=reason)
                 
                 # Acquire account slot before submitting to executor
                 # This ensures we don't exceed per-account limits at a global level
@@ -367,52 +441,14 @@ class SmartStreamScheduler:
                     if reason == 'active_viewers':
                         # Quota fully consumed by active viewers - use cached stats
                         logger.info(f"Skipping check for stream {stream['id']} - quota consumed by active viewers, using cached stats")
-                        
-                        # Get cached stream stats from UDI
-                        if self.account_limiter.udi_manager:
-                            try:
-                                cached_stream = self.account_limiter.udi_manager.get_stream_by_id(stream['id'])
-                                if cached_stream and cached_stream.get('stream_stats'):
-                                    # Return a result with cached stats
-                                    return {
-                                        'stream_id': stream['id'],
-                                        'stream_name': stream.get('name', 'Unknown'),
-                                        'stream_url': stream.get('url', ''),
-                                        'cached': True,
-                                        'skipped_reason': 'quota_consumed_by_active_viewers',
-                                        **cached_stream.get('stream_stats', {})
-                                    }
-                                else:
-                                    logger.warning(f"No cached stats available for stream {stream['id']}, skipping")
-                            except Exception as e:
-                                logger.error(f"Error retrieving cached stats for stream {stream['id']}: {e}")
-                        return None
+                        return self._get_cached_result(stream, 'quota_consumed_by_active_viewers')
                     else:
                         # Timeout - skip stream
                         logger.error(f"Timeout acquiring slot for account {account_id}, skipping stream {stream['id']}")
                         return None
                 
-                def wrapped_check():
-                    """Wrapper that ensures semaphore is released."""
-                    try:
-                        # Apply URL transformation if using M3U profile with search/replace patterns
-                        stream_url = stream.get('url', '')
-                        if self.account_limiter.udi_manager:
-                            stream_url = self.account_limiter.udi_manager.apply_profile_url_transformation(stream)
-                        
-                        result = check_function(
-                            stream_url=stream_url,
-                            stream_id=stream['id'],
-                            stream_name=stream.get('name', 'Unknown'),
-                            **check_params
-                        )
-                        return result
-                    finally:
-                        # Always release the account slot when done
-                        self.account_limiter.release(account_id)
-                
                 # Submit to executor
-                future = executor.submit(wrapped_check)
+                future = executor.submit(self._run_check, stream, check_function, check_params, result_cache)
                 return future
             
             # Submit all streams with stagger delay
@@ -461,24 +497,219 @@ class SmartStreamScheduler:
                     )
                     # Create a failed result entry
                     with lock:
-                        results.append({
-                            'stream_id': stream['id'],
-                            'stream_name': stream.get('name', 'Unknown'),
-                            'stream_url': stream.get('url', ''),
-                            'status': 'ERROR',
-                            'error': str(e),
-                            'resolution': '0x0',
-                            'bitrate_kbps': 0,
-                            'fps': 0,
-                            'video_codec': 'N/A',
-                            'audio_codec': 'N/A'
-                        })
+                        results.append(self._error_result(stream, e))
                         completed_count += 1
         
         logger.info(f"Completed smart parallel check of {completed_count}/{total_streams} streams")
         return results
 
 
+    def check_channels_with_limits(
+        self,
+        channel_streams: Dict[Any, List[Dict[str, Any]]],
+        check_function: Callable,
+        on_channel_complete: Callable,
+        progress_callback: Optional[Callable] = None,
+        stagger_delay: float = 0.0,
+        acquire_timeout: float = 300,
+        result_cache=None,
+        **check_params
+    ) -> Dict[str, Any]:
+        """
+        Check the streams of several channels through one shared worker pool.
+        
+        The streams of all channels are flattened into a single work list (in
+        channel order), so a channel with only a few streams does not leave
+        global slots idle while its slowest check finishes. A stream whose
+        account is at its limit is passed over until a slot frees up instead of
+        blocking the dispatch of streams from other accounts.
+        
+        on_channel_complete(channel_key, results) is called as soon as the last
+        stream of a channel has finished. The calls run one at a time on a
+        separate thread, so the pool keeps checking other channels meanwhile.
+        
+        With a result_cache, a stream whose URL has a cached result or is being
+        analyzed for another stream takes that result without using a slot.
+        
+        Args:
+            channel_streams: Streams to check, keyed by channel
+            check_function: Function to call for each stream
+            on_channel_complete: Callback with the results of a finished channel
+            progress_callback: Optional callback after each stream completes
+            stagger_delay: Minimum delay between starting two checks (default: 0.0)
+            acquire_timeout: Seconds a stream may wait for an account slot before
+                it is skipped (default: 300)
+            result_cache: Optional StreamResultCache shared by streams with the same URL
+            **check_params: Additional parameters for check_function
+            
+        Returns:
+            Run statistics: channels, streams, checked, cached, shared, skipped,
+            wall_time, check_time, busy_slot_seconds, slot_utilization and
+            peak_concurrency
+        """
+        start_time = time.time()
+        pending = deque()
+        remaining: Dict[Any, int] = {}
+        channel_results: Dict[Any, List[Dict[str, Any]]] = {}
+        for channel_key, streams in channel_streams.items():
+            remaining[channel_key] = len(streams)
+            channel_results[channel_key] = []
+            pending.extend((channel_key, stream) for stream in streams)
+        
+        total_streams = len(pending)
+        stats = {'checked': 0, 'cached': 0, 'shared': 0, 'skipped': 0}
+        completed_count = 0
+        busy_slot_seconds = 0.0
+        peak_concurrency = 0
+        blocked_since: Dict[int, float] = {}
+        
+        logger.info(
+            f"Starting cross-channel check of {total_streams} streams from "
+            f"{len(channel_streams)} channels with {self.global_limit} global workers"
+        )
+        
+        finalizer = ThreadPoolExecutor(max_workers=1)
+        finalizer_futures: List[Future] = []
+        
+        def finish_stream(channel_key, result):
+            nonlocal completed_count
+            completed_count += 1
+            if result is not None:
+                channel_results[channel_key].append(result)
+                if progress_callback:
+                    progress_callback(completed_count, total_streams, result)
+            remaining[channel_key] -= 1
+            if remaining[channel_key] == 0:
+                finalizer_futures.append(
+                    finalizer.submit(on_channel_complete, channel_key, channel_results.pop(channel_key))
+                )
+        
+        # Channels without streams to check are complete right away
+        for channel_key in [key for key, count in remaining.items() if count == 0]:
+            finalizer_futures.append(
+                finalizer.submit(on_channel_complete, channel_key, channel_results.pop(channel_key))
+            )
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.global_limit) as executor:
+                running: Dict[Future, tuple] = {}
+                # Analyses of other streams with the same URL -> streams waiting for them
+                shared: Dict[Future, List[tuple]] = {}
+                last_start = None
+                
+                while pending or running or shared:
+                    # Dispatch as many startable streams as there are free slots
+                    deferred = deque()
+                    blocked_accounts = set()
+                    while pending and len(running) < self.global_limit:
+                        now = time.time()
+                        if stagger_delay > 0 and last_start is not None and now - last_start < stagger_delay:
+                            break
+                        
+                        channel_key, stream = pending.popleft()
+                        account_id = stream.get('m3u_account')
+                        if account_id in blocked_accounts:
+                            deferred.append((channel_key, stream))
+                            continue
+                        
+                        if result_cache is not None:
+                            cached, in_flight = result_cache.lookup(self._stream_url(stream))
+                            if cached is not None:
+                                stats['shared'] += 1
+                                finish_stream(channel_key, result_cache.for_stream(cached, stream))
+                                continue
+                            if in_flight is not None:
+                                shared.setdefault(in_flight, []).append((channel_key, stream))
+                                continue
+                        
+                        if account_id and self.account_limiter.udi_manager:
+                            can_run, reason = self.account_limiter.udi_manager.check_stream_can_run(stream)
+                            if not can_run:
+                                logger.info(f"Skipping check for stream {stream['id']}: {reason}, using cached stats")
+                                result = self._get_cached_result(stream, 'no_available_profile', reason_detail=reason)
+                                stats['cached' if result is not None else 'skipped'] += 1
+                                finish_stream(channel_key, result)
+                                continue
+                        
+                        acquired, _ = self.account_limiter.acquire(account_id, timeout=0)
+                        if not acquired:
+                            waiting_since = blocked_since.setdefault(id(stream), now)
+                            if now - waiting_since >= acquire_timeout:
+                                logger.error(f"Timeout acquiring slot for account {account_id}, skipping stream {stream['id']}")
+                                stats['skipped'] += 1
+                                finish_stream(channel_key, None)
+                            else:
+                                blocked_accounts.add(account_id)
+                                deferred.append((channel_key, stream))
+                            continue
+                        
+                        blocked_since.pop(id(stream), None)
+                        future = executor.submit(self._run_check, stream, check_function, check_params, result_cache)
+                        running[future] = (channel_key, stream, time.time())
+                        last_start = now
+                        peak_concurrency = max(peak_concurrency, len(running))
+                    
+                    # Deferred streams keep their place at the front of the work list
+                    pending.extendleft(reversed(deferred))
+                    
+                    if not running and not shared:
+                        if pending:
+                            # Everything left is waiting for an account slot or the stagger delay
+                            time.sleep(0.1)
+                        continue
+                    
+                    done, _ = wait(list(running) + list(shared), timeout=0.1 if pending else None,
+                                   return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for channel_key, stream in shared.pop(future, []):
+                            try:
+                                result = result_cache.for_stream(future.result(), stream)
+                            except Exception as e:
+                                result = self._error_result(stream, e)
+                            stats['shared'] += 1
+                            finish_stream(channel_key, result)
+                        if future not in running:
+                            continue
+                        channel_key, stream, started = running.pop(future)
+                        busy_slot_seconds += time.time() - started
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            logger.error(
+                                f"Error checking stream {stream['id']} ({stream.get('name', 'Unknown')}): {e}",
+                                exc_info=True
+                            )
+                            result = self._error_result(stream, e)
+                        stats['checked'] += 1
+                        finish_stream(channel_key, result)
+            
+            check_time = time.time() - start_time
+        finally:
+            finalizer.shutdown(wait=True)
+        
+        for future in finalizer_futures:
+            if future.exception() is not None:
+                logger.error(f"Error completing channel check: {future.exception()}")
+        
+        wall_time = time.time() - start_time
+        slot_capacity = self.global_limit * check_time
+        run_stats = {
+            'channels': len(channel_streams),
+            'streams': total_streams,
+            **stats,
+            'wall_time': round(wall_time, 3),
+            'check_time': round(check_time, 3),
+            'busy_slot_seconds': round(busy_slot_seconds, 3),
+            'slot_utilization': round(busy_slot_seconds / slot_capacity, 3) if slot_capacity > 0 else 0.0,
+            'peak_concurrency': peak_concurrency
+        }
+        logger.info(
+            f"Completed cross-channel check of {total_streams} streams from {len(channel_streams)} channels "
+            f"in {wall_time:.1f}s (slot utilization {run_stats['slot_utilization']:.0%})"
+        )
+        return run_stats
+
+
 # Global instance
 _account_limiter = None
 _smart_scheduler = None
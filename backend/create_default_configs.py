@@ -51,11 +51,10 @@ def create_default_configs() -> None:
             json.dump(config, f, indent=2)
         print(f"Created {regex_path}")
 
-    # Create empty changelog
-    changelog_path = CONFIG_DIR / 'changelog.json'
+    # Create empty changelog (day partitions, see changelog_store.py)
+    changelog_path = CONFIG_DIR / 'changelog'
     if not changelog_path.exists():
-        with open(changelog_path, 'w', encoding='utf-8') as f:
-            json.dump([], f)
+        changelog_path.mkdir(parents=True, exist_ok=True)
         print(f"Created {changelog_path}")
 
     # Create default webhook config
@@ -4,14 +4,28 @@ Dead Streams Tracker for StreamFlow.
 
 This module tracks dead streams in a JSON file using stream URLs as unique keys.
 Stream URLs are used instead of names because multiple streams can have the same name.
+
+Changes are appended to a journal file next to the JSON snapshot instead of
+rewriting the whole snapshot on every transition:
+- Each change is one compact JSON line (dead_streams.json.journal)
+- The journal is fsynced after a short debounce delay, so bursts of changes
+  during a global action share one flush
+- When the journal grows past compact_threshold entries it is folded into
+  the snapshot (written atomically) and truncated
+- Loading replays the journal over the snapshot; replaying is idempotent, so
+  a crash during compaction does not lose or duplicate changes
+
+Dead streams are also indexed by channel_id and stream_id, and one shared
+tracker per file is available through get_dead_streams_tracker().
 """
 
 import json
 import os
 import threading
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Iterable, Optional, Set
 
 from logging_config import setup_logging, log_function_call, log_function_return, log_exception
 
@@ -21,49 +35,189 @@ logger = setup_logging(__name__)
 # Configuration directory
 CONFIG_DIR = Path(os.environ.get('CONFIG_DIR', '/app/data'))
 
+# Seconds to wait after a change before the journal is flushed to disk
+DEFAULT_FLUSH_DELAY = 2.0
+
+# Number of journal entries after which the journal is folded into the snapshot
+DEFAULT_COMPACT_THRESHOLD = 1000
+
 
 class DeadStreamsTracker:
     """Tracks dead streams in a JSON file using stream URLs as keys."""
     
-    def __init__(self, tracker_file=None):
+    def __init__(self, tracker_file=None, flush_delay: float = DEFAULT_FLUSH_DELAY,
+                 compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
         """Initialize the dead streams tracker.
         
         Args:
             tracker_file: Path to the JSON file for tracking dead streams.
                          Defaults to CONFIG_DIR/dead_streams.json
+            flush_delay: Seconds to wait after a change before flushing the journal
+            compact_threshold: Journal entries after which the journal is
+                               folded into the JSON snapshot
         """
         if tracker_file is None:
             tracker_file = CONFIG_DIR / 'dead_streams.json'
         self.tracker_file = Path(tracker_file)
+        self.journal_file = self.tracker_file.with_name(self.tracker_file.name + '.journal')
+        self.flush_delay = flush_delay
+        self.compact_threshold = compact_threshold
         self.lock = threading.Lock()
+        self._journal = None
+        self._journal_entries = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._by_channel: Dict[Any, Set[str]] = defaultdict(set)
+        self._by_stream_id: Dict[Any, Set[str]] = defaultdict(set)
         self.dead_streams = self._load_dead_streams()
+        for stream_url, stream_info in self.dead_streams.items():
+            self._index(stream_url, stream_info)
     
     def _load_dead_streams(self) -> Dict[str, Dict]:
-        """Load dead streams data from JSON file.
+        """Load dead streams data from the JSON snapshot and replay the journal.
         
         Returns:
             Dict mapping stream URLs to stream metadata
         """
+        dead_streams = {}
         if self.tracker_file.exists():
             try:
                 with open(self.tracker_file, 'r') as f:
-                    return json.load(f)
+                    dead_streams = json.load(f)
             except (json.JSONDecodeError, FileNotFoundError) as e:
                 logger.warning(f"Could not load dead streams from {self.tracker_file}: {e}")
-        return {}
+        
+        if self.journal_file.exists():
+            try:
+                with open(self.journal_file, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Partially written last line after a crash
+                            logger.warning(f"Skipping unreadable dead streams journal entry in {self.journal_file}")
+                            continue
+                        self._apply(dead_streams, entry)
+                        self._journal_entries += 1
+            except OSError as e:
+                logger.warning(f"Could not replay dead streams journal {self.journal_file}: {e}")
+        return dead_streams
+    
+    @staticmethod
+    def _apply(dead_streams: Dict[str, Dict], entry: Dict):
+        """Apply one journal entry to a dead streams dict."""
+        op = entry.get('op')
+        if op == 'dead':
+            dead_streams[entry['url']] = entry['info']
+        elif op == 'remove':
+            for url in entry['urls']:
+                dead_streams.pop(url, None)
+        elif op == 'clear':
+            dead_streams.clear()
+    
+    def _index(self, stream_url: str, stream_info: Dict):
+        """Add a dead stream to the channel and stream ID indexes.
+        
+        Note: This method assumes the lock is already held by the caller.
+        """
+        self._by_channel[stream_info.get('channel_id')].add(stream_url)
+        self._by_stream_id[stream_info.get('stream_id')].add(stream_url)
+    
+    def _unindex(self, stream_url: str, stream_info: Dict):
+        """Remove a dead stream from the channel and stream ID indexes.
+        
+        Note: This method assumes the lock is already held by the caller.
+        """
+        for index, key in ((self._by_channel, stream_info.get('channel_id')),
+                           (self._by_stream_id, stream_info.get('stream_id'))):
+            urls = index.get(key)
+            if urls is not None:
+                urls.discard(stream_url)
+                if not urls:
+                    del index[key]
+    
+    def _remove(self, stream_urls: Iterable[str]) -> Dict[str, Dict]:
+        """Remove dead streams from memory and journal the removal.
+        
+        Note: This method assumes the lock is already held by the caller.
+        
+        Returns:
+            Dict mapping the removed stream URLs to their metadata
+        """
+        removed = {}
+        for url in stream_urls:
+            stream_info = self.dead_streams.pop(url, None)
+            if stream_info is not None:
+                self._unindex(url, stream_info)
+                removed[url] = stream_info
+        if removed:
+            self._append({'op': 'remove', 'urls': list(removed)})
+        return removed
+    
+    def _append(self, entry: Dict):
+        """Append a change to the journal and schedule a flush.
+        
+        Note: This method assumes the lock is already held by the caller.
+        """
+        try:
+            if self._journal is None:
+                self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.journal_file, 'a')
+            self._journal.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            # Hand the entry to the OS right away; fsync is debounced
+            self._journal.flush()
+            self._journal_entries += 1
+        except Exception as e:
+            logger.error(f"Failed to journal dead streams change: {e}")
+            return
+        
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
     
     def _save_dead_streams(self):
-        """Save dead streams data to JSON file.
+        """Save dead streams data to the JSON snapshot and truncate the journal.
         
         Note: This method assumes the lock is already held by the caller.
         """
         try:
             self.tracker_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.tracker_file, 'w') as f:
+            temp_file = self.tracker_file.with_name(self.tracker_file.name + '.tmp')
+            with open(temp_file, 'w') as f:
                 json.dump(self.dead_streams, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.tracker_file)
+            
+            # The snapshot now contains every journaled change
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            open(self.journal_file, 'w').close()
+            self._journal_entries = 0
         except Exception as e:
             logger.error(f"Failed to save dead streams: {e}")
     
+    def flush(self):
+        """Flush the journal to disk, compacting it if it grew too long."""
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._journal_entries >= self.compact_threshold:
+                logger.debug(f"Compacting dead streams journal ({self._journal_entries} entries)")
+                self._save_dead_streams()
+            elif self._journal is not None:
+                try:
+                    os.fsync(self._journal.fileno())
+                except Exception as e:
+                    logger.error(f"Failed to flush dead streams journal: {e}")
+    
+    def compact(self):
+        """Fold the journal into the JSON snapshot now."""
+        with self.lock:
+            self._save_dead_streams()
+    
     def mark_as_dead(self, stream_url: str, stream_id: int, stream_name: str, channel_id: int = None) -> bool:
         """Mark a stream as dead.
         
@@ -78,14 +232,19 @@ class DeadStreamsTracker:
         """
         try:
             with self.lock:
-                self.dead_streams[stream_url] = {
+                stream_info = {
                     'stream_id': stream_id,
                     'stream_name': stream_name,
                     'marked_dead_at': datetime.now().isoformat(),
                     'url': stream_url,
                     'channel_id': channel_id
                 }
-                self._save_dead_streams()
+                previous = self.dead_streams.get(stream_url)
+                if previous is not None:
+                    self._unindex(stream_url, previous)
+                self.dead_streams[stream_url] = stream_info
+                self._index(stream_url, stream_info)
+                self._append({'op': 'dead', 'url': stream_url, 'info': stream_info})
             logger.warning(f"🔴 MARKED STREAM AS DEAD: {stream_name} (URL: {stream_url})")
             return True
         except Exception as e:
@@ -104,8 +263,7 @@ class DeadStreamsTracker:
         try:
             with self.lock:
                 if stream_url in self.dead_streams:
-                    stream_info = self.dead_streams.pop(stream_url)
-                    self._save_dead_streams()
+                    stream_info = self._remove([stream_url])[stream_url]
                     logger.info(f"🟢 REVIVED STREAM: {stream_info.get('stream_name', 'Unknown')} (URL: {stream_url})")
                     return True
                 else:
@@ -146,11 +304,7 @@ class DeadStreamsTracker:
             int: Number of dead streams for this channel
         """
         with self.lock:
-            count = 0
-            for stream_info in self.dead_streams.values():
-                if stream_info.get('channel_id') == channel_id:
-                    count += 1
-            return count
+            return len(self._by_channel.get(channel_id, ()))
     
     def get_dead_streams_for_channel(self, channel_id: int) -> Dict[str, Dict]:
         """Get dead streams for a specific channel.
@@ -162,11 +316,25 @@ class DeadStreamsTracker:
             Dict mapping stream URLs to stream metadata for this channel
         """
         with self.lock:
-            channel_dead_streams = {}
-            for stream_url, stream_info in self.dead_streams.items():
-                if stream_info.get('channel_id') == channel_id:
-                    channel_dead_streams[stream_url] = stream_info.copy()
-            return channel_dead_streams
+            return {
+                stream_url: self.dead_streams[stream_url].copy()
+                for stream_url in self._by_channel.get(channel_id, ())
+            }
+    
+    def get_dead_streams_for_stream_id(self, stream_id: int) -> Dict[str, Dict]:
+        """Get dead streams with a specific stream ID.
+        
+        Args:
+            stream_id: The stream ID in Dispatcharr
+            
+        Returns:
+            Dict mapping stream URLs to stream metadata for this stream ID
+        """
+        with self.lock:
+            return {
+                stream_url: self.dead_streams[stream_url].copy()
+                for stream_url in self._by_stream_id.get(stream_id, ())
+            }
     
     def remove_dead_streams_by_channel_id(self, channel_id: int) -> int:
         """Remove all dead streams for a specific channel from tracking.
@@ -186,22 +354,12 @@ class DeadStreamsTracker:
         removed_count = 0
         try:
             with self.lock:
-                # Find dead streams that belong to this channel by channel_id
-                dead_urls_to_remove = []
-                for dead_url, stream_info in self.dead_streams.items():
-                    if stream_info.get('channel_id') == channel_id:
-                        dead_urls_to_remove.append(dead_url)
-                
-                # Remove them from tracking and collect names for batch logging
-                removed_streams = []
-                for url in dead_urls_to_remove:
-                    stream_info = self.dead_streams.pop(url)
-                    removed_count += 1
-                    removed_streams.append(stream_info.get('stream_name', 'Unknown'))
+                # Remove the dead streams that belong to this channel by channel_id
+                removed = self._remove(list(self._by_channel.get(channel_id, ())))
+                removed_count = len(removed)
+                removed_streams = [stream_info.get('stream_name', 'Unknown') for stream_info in removed.values()]
                 
-                # Save if we removed any
                 if removed_count > 0:
-                    self._save_dead_streams()
                     # Log all removed streams in a single batch message
                     logger.info(f"🗑️ Removed {removed_count} dead stream(s) from channel {channel_id} before refresh: {', '.join(removed_streams)}")
             
@@ -225,21 +383,13 @@ class DeadStreamsTracker:
         removed_count = 0
         try:
             with self.lock:
-                # Find dead streams that belong to this channel
-                dead_urls_to_remove = []
-                for dead_url in self.dead_streams.keys():
-                    if dead_url in channel_stream_urls:
-                        dead_urls_to_remove.append(dead_url)
-                
-                # Remove them from tracking
-                for url in dead_urls_to_remove:
-                    stream_info = self.dead_streams.pop(url)
-                    removed_count += 1
+                # Remove the dead streams that belong to this channel
+                removed = self._remove(url for url in channel_stream_urls if url in self.dead_streams)
+                removed_count = len(removed)
+                for url, stream_info in removed.items():
                     logger.info(f"🗑️ Removed dead stream from channel tracking: {stream_info.get('stream_name', 'Unknown')} (URL: {url})")
                 
-                # Save if we removed any
                 if removed_count > 0:
-                    self._save_dead_streams()
                     logger.info(f"Removed {removed_count} dead stream(s) for channel before refresh")
             
             return removed_count
@@ -266,14 +416,12 @@ class DeadStreamsTracker:
                         dead_urls_to_remove.append(dead_url)
                 
                 # Remove them from tracking
-                for url in dead_urls_to_remove:
-                    stream_info = self.dead_streams.pop(url)
-                    removed_count += 1
+                removed = self._remove(dead_urls_to_remove)
+                removed_count = len(removed)
+                for url, stream_info in removed.items():
                     logger.info(f"🗑️ Removed dead stream from tracking (no longer in playlist): {stream_info.get('stream_name', 'Unknown')} (URL: {url})")
                 
-                # Save if we removed any
                 if removed_count > 0:
-                    self._save_dead_streams()
                     logger.info(f"Cleaned up {removed_count} dead stream(s) that are no longer in playlist")
             
             return removed_count
@@ -296,9 +444,33 @@ class DeadStreamsTracker:
                 if count > 0:
                     logger.info(f"🔄 Clearing ALL {count} dead stream(s) from tracker for global action")
                     self.dead_streams.clear()
-                    self._save_dead_streams()
+                    self._by_channel.clear()
+                    self._by_stream_id.clear()
+                    self._append({'op': 'clear'})
                     logger.info(f"✓ Cleared {count} dead stream(s) - they will be given a second chance")
                 return count
         except Exception as e:
             logger.error(f"❌ Error clearing all dead streams: {e}")
             return 0
+
+
+# Shared tracker instances by tracker file
+_trackers: Dict[Path, DeadStreamsTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_dead_streams_tracker(tracker_file=None) -> DeadStreamsTracker:
+    """Get or create the shared dead streams tracker for a tracker file.
+    
+    Args:
+        tracker_file: Path to the JSON file for tracking dead streams.
+                     Defaults to CONFIG_DIR/dead_streams.json
+    """
+    if tracker_file is None:
+        tracker_file = CONFIG_DIR / 'dead_streams.json'
+    key = Path(tracker_file).resolve()
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = DeadStreamsTracker(tracker_file)
+        return tracker
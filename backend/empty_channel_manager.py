@@ -7,12 +7,12 @@ This module can be reused across different parts of the application (manual oper
 automated checks, global actions, etc.)
 """
 
-import requests
 from typing import List, Tuple, Optional
 from logging_config import setup_logging
-from dead_streams_tracker import DeadStreamsTracker
+from dead_streams_tracker import get_dead_streams_tracker
 from udi import get_udi_manager
 from api_utils import _get_base_url
+from http_session import get_http_session
 
 logger = setup_logging(__name__)
 
@@ -53,7 +53,7 @@ def disable_empty_channels_in_profile(profile_id: int,
             return 0, 0
         
         # Initialize dead streams tracker
-        tracker = DeadStreamsTracker()
+        tracker = get_dead_streams_tracker()
         
         # If snapshot_channel_ids is provided, filter to only those channels
         if snapshot_channel_ids is not None:
@@ -120,7 +120,7 @@ def disable_empty_channels_in_profile(profile_id: int,
             try:
                 # PATCH /api/channels/profiles/{profile_id}/channels/{channel_id}/
                 url = f"{base_url}/api/channels/profiles/{profile_id}/channels/{channel_id}/"
-                resp = requests.patch(
+                resp = get_http_session().patch(
                     url,
                     headers=_get_auth_headers(),
                     json={'enabled': False},
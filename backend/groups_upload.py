@@ -14,6 +14,7 @@ from dotenv import load_dotenv, set_key
 from pathlib import Path
 
 from logging_config import setup_logging, log_function_call, log_function_return, log_exception
+from http_session import get_http_session, send_with_auth
 
 # Import Dispatcharr configuration manager
 from dispatcharr_config import get_dispatcharr_config
@@ -94,7 +95,7 @@ def login() -> bool:
     logger.info(f"Attempting to log in to {base_url}...")
 
     try:
-        resp = requests.post(
+        resp = get_http_session().post(
             login_url,
             headers={"Content-Type": "application/json"},
             json={"username": username, "password": password},
@@ -154,31 +155,17 @@ def _make_request(
         requests.exceptions.RequestException: If request fails.
     """
     try:
-        resp = requests.request(
-            method, url, headers=_get_auth_headers(), **kwargs
+        resp = send_with_auth(
+            method, url, _get_auth_headers, _refresh_token, **kwargs
         )
         resp.raise_for_status()
         return resp
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            if _refresh_token():
-                logger.info(
-                    f"Retrying {method} request to {url} "
-                    f"with new token..."
-                )
-                resp = requests.request(
-                    method, url, headers=_get_auth_headers(), **kwargs
-                )
-                resp.raise_for_status()
-                return resp
-            else:
-                raise
-        else:
-            logger.error(
-                f"HTTP Error: {e.response.status_code} for URL: {url}"
-            )
-            logger.error(f"Response: {e.response.text}")
-            raise
+        logger.error(
+            f"HTTP Error: {e.response.status_code} for URL: {url}"
+        )
+        logger.error(f"Response: {e.response.text}")
+        raise
     except requests.exceptions.RequestException as e:
         logger.error(f"Request failed: {e}")
         raise
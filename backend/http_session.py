@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP session for Dispatcharr API calls.
+
+All Dispatcharr requests go through a single process-wide requests.Session so
+that TCP/TLS connections are kept alive and reused instead of being opened for
+every call. The session provides:
+- A connection pool sized to the stream checker concurrency
+- A retry/backoff policy for connection errors and transient gateway errors
+- A single-flight token refresh path shared by all callers on 401 responses
+- Pool statistics (open connections, reuse rate, latency histogram)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Minimum number of pooled connections per host
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+# Retries for connection errors and 502/503/504 responses (idempotent methods only)
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+# Exponential backoff factor between retries (0.5 -> 0.5s, 1s, 2s, ...)
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))
+
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Upper bounds (in seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+
+class DispatcharrSession(requests.Session):
+    """requests.Session that records per-request latency and status statistics."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._stats_lock = threading.Lock()
+        self._active_requests = 0
+        self._total_requests = 0
+        self._failed_requests = 0
+        self._status_classes: Dict[str, int] = {}
+        self._latency_counts = [0] * len(LATENCY_BUCKETS)
+        self._latency_sum = 0.0
+
+    def request(self, method, url, *args, **kwargs):
+        with self._stats_lock:
+            self._active_requests += 1
+        start_time = time.perf_counter()
+        status_class = "error"
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            status_class = f"{response.status_code // 100}xx"
+            return response
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self._record(elapsed, status_class)
+
+    def _record(self, elapsed: float, status_class: str) -> None:
+        with self._stats_lock:
+            self._active_requests -= 1
+            self._total_requests += 1
+            if status_class == "error":
+                self._failed_requests += 1
+            self._status_classes[status_class] = self._status_classes.get(status_class, 0) + 1
+            self._latency_sum += elapsed
+            for i, upper in enumerate(LATENCY_BUCKETS):
+                if elapsed <= upper:
+                    self._latency_counts[i] += 1
+                    break
+
+    def request_stats(self) -> Dict[str, Any]:
+        """Return request counters and the latency histogram."""
+        with self._stats_lock:
+            total = self._total_requests
+            return {
+                "active_requests": self._active_requests,
+                "total_requests": total,
+                "failed_requests": self._failed_requests,
+                "status_classes": dict(self._status_classes),
+                "latency": {
+                    "avg_seconds": round(self._latency_sum / total, 4) if total else 0.0,
+                    "buckets": [
+                        {"le": "+Inf" if upper == float("inf") else upper, "count": count}
+                        for upper, count in zip(LATENCY_BUCKETS, self._latency_counts)
+                    ],
+                },
+            }
+
+
+_session: Optional[DispatcharrSession] = None
+_session_lock = threading.Lock()
+_pool_size = HTTP_POOL_SIZE
+# Connection/request counters of adapters replaced by configure_pool_size()
+_retired_connections = 0
+_retired_requests = 0
+
+# Serializes token refreshes so concurrent 401 responses trigger a single re-login
+_token_refresh_lock = threading.Lock()
+
+
+def _build_adapter(pool_size: int) -> HTTPAdapter:
+    """Build a pooled adapter with the shared retry policy."""
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    return HTTPAdapter(pool_connections=10, pool_maxsize=pool_size, max_retries=retry)
+
+
+def _mount(session: requests.Session, pool_size: int) -> None:
+    adapter = _build_adapter(pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+def get_http_session() -> DispatcharrSession:
+    """Get the process-wide HTTP session (created on first use).
+
+    Returns:
+        The shared DispatcharrSession instance.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = DispatcharrSession()
+                _mount(session, _pool_size)
+                _session = session
+                logger.debug(f"Created shared HTTP session (pool size: {_pool_size})")
+    return _session
+
+
+def configure_pool_size(concurrency: int) -> int:
+    """Size the connection pool to the given request concurrency.
+
+    The pool never shrinks below HTTP_POOL_SIZE. When the size changes the
+    adapters are replaced; idle connections of the old pool are closed and
+    in-flight requests finish on their existing connections.
+
+    Args:
+        concurrency: Expected number of concurrent requests (e.g. checker workers)
+
+    Returns:
+        The effective pool size.
+    """
+    global _pool_size, _retired_connections, _retired_requests
+    target = max(HTTP_POOL_SIZE, int(concurrency or 0))
+    with _session_lock:
+        if target == _pool_size:
+            return _pool_size
+        _pool_size = target
+        if _session is not None:
+            old_adapter = _session.get_adapter("http://")
+            connections, requests_sent, _ = _pool_counters(old_adapter)
+            _retired_connections += connections
+            _retired_requests += requests_sent
+            _mount(_session, target)
+            old_adapter.close()
+        logger.info(f"HTTP connection pool size set to {target}")
+    return _pool_size
+
+
+def _pool_counters(adapter: HTTPAdapter):
+    """Return (connections opened, requests sent, idle connections) for an adapter."""
+    connections = requests_sent = idle = 0
+    pools = adapter.poolmanager.pools
+    for key in list(pools.keys()):
+        try:
+            pool = pools[key]
+        except KeyError:
+            continue
+        connections += pool.num_connections
+        requests_sent += pool.num_requests
+        if pool.pool is not None:
+            idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return connections, requests_sent, idle
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool and request statistics for the shared session.
+
+    Returns:
+        Dict with pool size, open/idle connections, connection reuse rate and
+        the request latency histogram.
+    """
+    session = get_http_session()
+    with _session_lock:
+        connections, requests_sent, idle = _pool_counters(session.get_adapter("http://"))
+        connections += _retired_connections
+        requests_sent += _retired_requests
+        pool_size = _pool_size
+
+    stats = session.request_stats()
+    reused = max(requests_sent - connections, 0)
+    stats.update({
+        "pool_size": pool_size,
+        "max_retries": HTTP_MAX_RETRIES,
+        "idle_connections": idle,
+        "open_connections": idle + stats["active_requests"],
+        "connections_created": connections,
+        "reuse_rate": round(reused / requests_sent, 4) if requests_sent else 0.0,
+    })
+    return stats
+
+
+def refresh_token_once(used_headers: Optional[Dict[str, str]], refresh_token: Callable[[], bool]) -> bool:
+    """Refresh the token after a 401, unless another request already did.
+
+    Concurrent requests can all receive a 401 for the same expired token.
+    Only the first one logs in again; the others see that the token changed
+    since their request was made and just retry.
+
+    Args:
+        used_headers: The headers the failed request was sent with
+        refresh_token: Callable performing the actual login
+
+    Returns:
+        True if a valid token should now be available, False otherwise.
+    """
+    with _token_refresh_lock:
+        current_token = os.getenv("DISPATCHARR_TOKEN")
+        if current_token and (used_headers or {}).get("Authorization") != f"Bearer {current_token}":
+            logger.debug("Token was already refreshed by another request")
+            return True
+        return refresh_token()
+
+
+def send_with_auth(method: str, url: str, get_headers: Callable[[], Dict[str, str]],
+                   refresh_token: Callable[[], bool], **kwargs) -> requests.Response:
+    """Send an authenticated request on the shared session.
+
+    On a 401 response the token is refreshed through refresh_token_once() and
+    the request is retried once with fresh headers. Status errors are left to
+    the caller (e.g. via raise_for_status()).
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        get_headers: Callable returning the authorization headers
+        refresh_token: Callable performing the actual login
+        **kwargs: Passed through to requests (json, params, timeout, ...)
+
+    Returns:
+        The final response.
+    """
+    session = get_http_session()
+    headers = get_headers()
+    resp = session.request(method, url, headers=headers, **kwargs)
+    if resp.status_code == 401 and refresh_token_once(headers, refresh_token):
+        logger.info(f"Retrying {method} request with new token...")
+        resp = session.request(method, url, headers=get_headers(), **kwargs)
+    return resp
@@ -45,6 +45,8 @@ class M3UPriorityConfig:
         """Initialize the M3U priority configuration manager."""
         self._lock = threading.Lock()
         self._config: Dict[str, Any] = {}
+        # Incremented on every change so consumers can cache derived data
+        self.version = 0
         
         # Reload CONFIG_DIR from environment in case it was changed (for testing)
         global CONFIG_DIR, M3U_PRIORITY_CONFIG_FILE
@@ -128,6 +130,7 @@ class M3UPriorityConfig:
                 self._config['accounts'] = {}
             
             self._config['accounts'][str(account_id)] = priority_mode
+            self.version += 1
             logger.info(f"Set priority_mode for M3U account {account_id} to {priority_mode}")
             return self._save_config()
     
@@ -174,6 +177,7 @@ class M3UPriorityConfig:
         
         with self._lock:
             self._config['global_priority_mode'] = priority_mode
+            self.version += 1
             logger.info(f"Set global priority_mode to {priority_mode}")
             return self._save_config()
 
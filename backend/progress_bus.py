@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+In-Memory Progress Bus for StreamFlow.
+
+Stream checker progress used to be written (and fsynced) to a JSON file on
+every update and polled by the frontend. The bus keeps the latest payload of
+each event type in memory instead:
+- publish() replaces the latest payload of an event type and wakes up
+  waiting subscribers; it never touches the disk
+- Subscribers (the Server-Sent Events endpoint) wait for changes and receive
+  only the latest payload of every type that changed since their last read,
+  so any number of updates between two reads is sent as one batch
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+
+class ProgressBus:
+    """Latest-value event bus with blocking reads for streaming subscribers."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._sequence = 0
+        # Event type -> (sequence number of the last publish, payload)
+        self._latest: Dict[str, Tuple[int, Any]] = {}
+
+    def publish(self, event_type: str, data: Any):
+        """Replace the latest payload of an event type and wake up subscribers."""
+        with self._condition:
+            self._sequence += 1
+            self._latest[event_type] = (self._sequence, data)
+            self._condition.notify_all()
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last publish."""
+        with self._condition:
+            return self._sequence
+
+    def get_latest(self, event_type: str) -> Any:
+        """Get the latest payload of an event type (None if never published)."""
+        with self._condition:
+            entry = self._latest.get(event_type)
+            return entry[1] if entry else None
+
+    def wait_for_events(self, since: int, timeout: Optional[float] = None) -> Tuple[int, Dict[str, Any]]:
+        """
+        Wait until something was published after a sequence number.
+
+        Args:
+            since: Sequence number the subscriber has already seen
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Tuple of (current sequence number, latest payload of every event
+            type published after since); the dict is empty on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._sequence <= since:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            events = {
+                event_type: data
+                for event_type, (sequence, data) in self._latest.items()
+                if sequence > since
+            }
+            return self._sequence, events
+
+
+# Global instance
+_progress_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Get or create the global progress bus instance."""
+    global _progress_bus
+    with _bus_lock:
+        if _progress_bus is None:
+            _progress_bus = ProgressBus()
+        return _progress_bus
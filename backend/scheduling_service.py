@@ -9,7 +9,6 @@ import json
 import os
 import re
 import uuid
-import requests
 import threading
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
@@ -19,6 +18,7 @@ from typing import Dict, List, Optional, Any
 from logging_config import setup_logging
 from udi import get_udi_manager
 from dispatcharr_config import get_dispatcharr_config
+from http_session import get_http_session
 
 logger = setup_logging(__name__)
 
@@ -198,7 +198,7 @@ class SchedulingService:
                 }
                 
                 logger.info(f"Fetching EPG grid data from {url}")
-                response = requests.get(url, headers=headers, timeout=30)
+                response = get_http_session().get(url, headers=headers, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -16,12 +16,20 @@ system and provides a clean, maintainable API for stream quality analysis.
 
 import json
 import logging
+import os
 import re
 import subprocess
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
+from urllib.parse import urljoin, urlparse
 
+import requests
+
+from http_session import get_http_session
 from logging_config import setup_logging
 
 logger = setup_logging(__name__)
@@ -30,6 +38,35 @@ logger = setup_logging(__name__)
 EARLY_EXIT_THRESHOLD = 0.8  # Consider ffmpeg exited early if elapsed < 80% of expected duration
 MAX_ERROR_LINES_TO_LOG = 5  # Maximum number of error lines to log from ffmpeg output
 MAX_DEBUG_LINES_TO_LOG = 10  # Maximum number of debug lines to log from ffmpeg output
+PROBE_SIZE_BYTES = 1000000  # Maximum bytes read by the fast probe tier
+STREAMING_RETAINED_LINES = 100  # Lines kept from the start and the end of streamed ffmpeg output
+ADAPTIVE_MIN_DURATION = 5  # Seconds of media analyzed before an adaptive analysis may stop
+ADAPTIVE_TOLERANCE = 0.05  # Maximum relative spread of the recent bitrate estimates to consider them converged
+ADAPTIVE_WINDOW = 6  # Number of recent progress samples (about 0.5s apart) compared for convergence
+ADAPTIVE_STOP_GRACE = 2.0  # Seconds ffmpeg gets after converging to close its inputs and report the bytes read
+ADAPTIVE_RESULT_KEYS = ('bitrate_samples', 'bitrate_confidence', 'measured_duration')
+HLS_SEGMENTS = 3  # Media segments downloaded by the HLS fast path
+SEGMENTED_INPUT_FORMATS = {'hls', 'applehttp', 'dash'}  # Demuxers that read each playlist/segment through its own I/O context
+PROBE_SHOW_ENTRIES = 'stream=codec_type,codec_name,width,height,avg_frame_rate'
+
+# Error messages looked for in ffmpeg output when bitrate detection fails
+FFMPEG_ERROR_PATTERNS = [
+    "Connection refused", "Connection timed out", "Invalid data found",
+    "Server returned", "404 Not Found", "403 Forbidden", "401 Unauthorized",
+    "No route to host", "could not find codec", "Protocol not found",
+    "Error opening input", "Operation timed out", "I/O error",
+    "HTTP error", "SSL", "TLS", "Certificate"
+]
+
+# Per-tier timing of the check pipeline (fast probe -> full analysis)
+_tier_stats_lock = threading.Lock()
+_tier_stats = {
+    'probe_checks': 0,
+    'probe_rejected': 0,
+    'probe_seconds': 0.0,
+    'analysis_checks': 0,
+    'analysis_seconds': 0.0,
+}
 
 # FourCC to common codec name mapping
 FOURCC_TO_CODEC = {
@@ -278,7 +315,478 @@ def get_stream_info(url: str, timeout: int = 30, user_agent: str = 'VLC/3.0.14')
         return None, None
 
 
-def get_stream_info_and_bitrate(url: str, duration: int = 30, timeout: int = 30, user_agent: str = 'VLC/3.0.14', stream_startup_buffer: int = 10, proxy: Optional[str] = None) -> Dict[str, Any]:
+def probe_stream(url: str, timeout: int = 10, user_agent: str = 'VLC/3.0.14', analyze_duration: float = 2.0, proxy: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Cheap connect/probe check of a stream using ffprobe.
+
+    ffprobe opens the URL (failing on HTTP errors), reads the first bytes and
+    probes the container and codecs with a short analyzeduration/probesize.
+    A stream that cannot be opened or has no streams is treated as dead
+    without running the full bitrate analysis. Only a finished ffprobe run
+    is conclusive: a timeout or unreadable output says nothing about a
+    slow-starting stream, which then gets the full analysis (see
+    _probe_rejects()).
+
+    Args:
+        url: Stream URL to probe
+        timeout: Timeout in seconds for the probe
+        user_agent: User agent string to use for HTTP requests
+        analyze_duration: Seconds of media ffprobe may analyze
+        proxy: HTTP proxy URL (e.g., 'http://proxy:8080')
+
+    Returns:
+        Dictionary containing video_codec, audio_codec, resolution, fps,
+        status ("OK", "Timeout" or "Error"), elapsed_time and conclusive
+        (True if ffprobe finished and its output was parsed)
+    """
+    result_data = {
+        'video_codec': 'N/A',
+        'audio_codec': 'N/A',
+        'resolution': '0x0',
+        'fps': 0,
+        'status': 'Error',
+        'elapsed_time': 0,
+        'conclusive': False
+    }
+
+    command = _build_probe_command(url, user_agent, analyze_duration, proxy)
+
+    start = time.time()
+    try:
+        result = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=timeout,
+            text=True
+        )
+        result_data['elapsed_time'] = time.time() - start
+        _parse_probe_output(result.returncode, result.stdout, result.stderr, result_data)
+
+    except subprocess.TimeoutExpired:
+        logger.debug(f"  → Probe timed out after {timeout}s")
+        result_data['status'] = 'Timeout'
+        result_data['elapsed_time'] = timeout
+    except json.JSONDecodeError as e:
+        logger.debug(f"  → Could not decode ffprobe output: {e}")
+        result_data['elapsed_time'] = time.time() - start
+    except Exception as e:
+        logger.error(f"Stream probe failed: {e}")
+
+    return result_data
+
+
+def _build_probe_command(url: str, user_agent: str, analyze_duration: float, proxy: Optional[str]) -> List[str]:
+    """Build the ffprobe command line of the fast probe tier."""
+    command = ['ffprobe', '-v', 'error', '-user_agent', user_agent]
+    if proxy and proxy.strip():
+        command.extend(['-http_proxy', proxy.strip()])
+    command.extend([
+        '-analyzeduration', str(int(analyze_duration * 1000000)),
+        '-probesize', str(PROBE_SIZE_BYTES),
+        '-show_entries', PROBE_SHOW_ENTRIES,
+        '-of', 'json',
+        url
+    ])
+    return command
+
+
+def _parse_probe_output(returncode: int, stdout: str, stderr: str, result_data: Dict[str, Any]) -> None:
+    """
+    Fill result_data from the JSON output of the probe command.
+
+    Sets status to "OK" if ffprobe found at least one stream. Raises
+    json.JSONDecodeError if the output is not valid JSON.
+    """
+    streams = []
+    if returncode == 0 and stdout:
+        streams = json.loads(stdout).get('streams', [])
+    result_data['conclusive'] = True
+    if not streams:
+        error = (stderr or '').strip().splitlines()
+        logger.debug(f"  → Probe failed (exit code {returncode}): {error[-1] if error else 'no streams found'}")
+        return
+
+    video = next((st for st in streams if st.get('codec_type') == 'video'), None)
+    audio = next((st for st in streams if st.get('codec_type') == 'audio'), None)
+    if video:
+        result_data['video_codec'] = _sanitize_codec_name(video.get('codec_name') or 'N/A')
+        if video.get('width') and video.get('height'):
+            result_data['resolution'] = f"{video['width']}x{video['height']}"
+        try:
+            num, den = str(video.get('avg_frame_rate', '0/0')).split('/')
+            if float(den):
+                result_data['fps'] = round(float(num) / float(den), 2)
+        except ValueError:
+            pass
+    if audio:
+        result_data['audio_codec'] = _sanitize_codec_name(audio.get('codec_name') or 'N/A')
+    result_data['status'] = 'OK'
+
+
+def _probe_rejects(probe_data: Dict[str, Any]) -> bool:
+    """
+    Tell whether a fast probe result rejects the stream without the full analysis.
+
+    Only a conclusive failure does: ffprobe finished and could not open the
+    stream or found no streams in it. Timeouts and probes that could not be
+    run or parsed fall through to the full analysis, which allows for
+    timeout plus stream_startup_buffer.
+    """
+    return probe_data.get('conclusive', False) and probe_data['status'] != 'OK'
+
+
+def _record_tier_timing(tier: str, elapsed: float, rejected: bool = False) -> None:
+    """Add the timing of one check tier run to the pipeline statistics."""
+    with _tier_stats_lock:
+        _tier_stats[f'{tier}_checks'] += 1
+        _tier_stats[f'{tier}_seconds'] += elapsed
+        if rejected:
+            _tier_stats['probe_rejected'] += 1
+
+
+def get_check_tier_stats() -> Dict[str, Any]:
+    """
+    Get timing statistics of the check pipeline tiers.
+
+    The estimated time saved assumes every stream rejected by the probe tier
+    would otherwise have taken the average full analysis time.
+
+    Returns:
+        Dictionary with per-tier check counts, total and average seconds,
+        the number of streams rejected by the probe and the estimated seconds saved
+    """
+    with _tier_stats_lock:
+        stats = dict(_tier_stats)
+    avg_probe = stats['probe_seconds'] / stats['probe_checks'] if stats['probe_checks'] else 0.0
+    avg_analysis = stats['analysis_seconds'] / stats['analysis_checks'] if stats['analysis_checks'] else 0.0
+    return {
+        'probe_checks': stats['probe_checks'],
+        'probe_rejected': stats['probe_rejected'],
+        'probe_seconds': round(stats['probe_seconds'], 2),
+        'avg_probe_seconds': round(avg_probe, 2),
+        'analysis_checks': stats['analysis_checks'],
+        'analysis_seconds': round(stats['analysis_seconds'], 2),
+        'avg_analysis_seconds': round(avg_analysis, 2),
+        'estimated_seconds_saved': round(max(0.0, stats['probe_rejected'] * (avg_analysis - avg_probe)), 2),
+    }
+
+
+def reset_check_tier_stats() -> None:
+    """Reset the check pipeline tier statistics."""
+    with _tier_stats_lock:
+        for key in _tier_stats:
+            _tier_stats[key] = 0 if key.endswith(('_checks', '_rejected')) else 0.0
+
+
+class FFmpegOutputParser:
+    """
+    Incremental parser for ffmpeg stderr output.
+
+    Lines are fed one at a time, so the output never has to be held in memory
+    as a whole. Extracts the input video/audio codecs, resolution and FPS
+    (from the Input section only) and the bitrate, using the same methods as
+    get_stream_bitrate():
+    1. Primary: "Statistics:" line with "bytes read"
+    2. Fallback 1: progress output (e.g., "bitrate=3333.3kbits/s")
+    3. Fallback 2: other "bytes read" lines
+
+    ffmpeg prints a Statistics line for every I/O context it closes.
+    Segmented inputs (HLS, DASH) close one per playlist or segment, so the
+    bytes read are summed over all Statistics lines. The main input closes
+    last: for other inputs its Statistics line after "progress=end"
+    completes the analysis, for segmented inputs only ffmpeg's final
+    "Exiting normally" line does (the segment lines cannot be told apart).
+    """
+
+    def __init__(self, duration: int):
+        """
+        Initialize the parser.
+
+        Args:
+            duration: Analysis duration in seconds, used to derive the bitrate
+                      from the number of bytes read
+        """
+        self.duration = duration
+        self.video_codec = 'N/A'
+        self.audio_codec = 'N/A'
+        self.resolution = '0x0'
+        self.fps = 0
+        self.bitrate_kbps: Optional[float] = None
+        self.bytes_read: Optional[int] = None
+        self.progress_bitrate: Optional[float] = None
+        self.progress_ended = False
+        # Set once all inputs were closed after the end of processing
+        self.complete = False
+        self.segmented_input = False
+        # Track whether we're in the Input or Output section of FFmpeg output
+        # This ensures we only parse input stream codecs, not decoded output formats
+        self.in_input_section = False
+
+    def feed(self, line: str) -> None:
+        """Parse one line of ffmpeg output."""
+        # Track when we enter the Input section
+        if 'Input #' in line:
+            self.in_input_section = True
+            format_match = re.search(r'Input #\d+, (.+?), from ', line)
+            if format_match:
+                formats = {name.strip() for name in format_match.group(1).split(',')}
+                self.segmented_input = bool(formats & SEGMENTED_INPUT_FORMATS)
+            logger.debug(f"  → Entered Input section: {line.strip()}")
+            return
+
+        # Track when we enter the Output section - stop parsing stream info
+        if 'Output #' in line:
+            self.in_input_section = False
+            logger.debug(f"  → Entered Output section (will skip stream parsing): {line.strip()}")
+            return
+
+        # Only process Stream lines from the Input section to get actual input codecs
+        # (e.g., "aac", "ac3") instead of decoded output formats (e.g., "pcm_s16le")
+        if self.in_input_section and 'Stream #' in line:
+            if 'Video:' in line:
+                self._parse_video_line(line)
+            if 'Audio:' in line:
+                self._parse_audio_line(line)
+
+        # -progress output marks the end of processing with "progress=end"
+        if line.startswith('progress=end'):
+            self.progress_ended = True
+
+        # Printed by ffmpeg after closing all inputs when it was stopped by a signal
+        if line.startswith('Exiting normally') and self.progress_ended:
+            self.complete = True
+
+        # Extract bitrate using multiple methods (same as get_stream_bitrate)
+        # Method 1: Statistics line with bytes read
+        if "Statistics:" in line and "bytes read" in line:
+            try:
+                parts = line.split("bytes read")
+                size_str = parts[0].strip().split()[-1]
+                context_bytes = int(size_str)
+                if context_bytes > 0:
+                    self.bytes_read = (self.bytes_read or 0) + context_bytes
+                if self.bytes_read and self.duration > 0:
+                    self.bitrate_kbps = (self.bytes_read * 8) / 1000 / self.duration
+                    logger.debug(f"  → Calculated bitrate (method 1): {self.bitrate_kbps:.2f} kbps from {self.bytes_read} bytes")
+            except ValueError:
+                pass
+            if self.progress_ended and not self.segmented_input:
+                self.complete = True
+
+        # Method 2: Parse progress output
+        if "bitrate=" in line and "kbits/s" in line:
+            try:
+                bitrate_match = re.search(r'bitrate=\s*(\d+\.?\d*)\s*kbits/s', line)
+                if bitrate_match:
+                    self.progress_bitrate = float(bitrate_match.group(1))
+                    logger.debug(f"  → Found progress bitrate (method 2): {self.progress_bitrate:.2f} kbps")
+            except (ValueError, AttributeError):
+                pass
+
+        # Method 3: Alternative bytes read pattern
+        if self.bitrate_kbps is None and "bytes read" in line and "Statistics:" not in line:
+            try:
+                bytes_match = re.search(r'(\d+)\s+bytes read', line)
+                if bytes_match:
+                    total_bytes = int(bytes_match.group(1))
+                    if total_bytes > 0:
+                        self.bytes_read = total_bytes
+                    if total_bytes > 0 and self.duration > 0:
+                        calculated_bitrate = (total_bytes * 8) / 1000 / self.duration
+                        logger.debug(f"  → Calculated bitrate (method 3): {calculated_bitrate:.2f} kbps from {total_bytes} bytes")
+                        self.bitrate_kbps = calculated_bitrate
+            except (ValueError, AttributeError):
+                pass
+
+    def _parse_video_line(self, line: str) -> None:
+        # Extract video codec, resolution, and FPS
+        # Example: "Stream #0:0: Video: h264, yuv420p, 1920x1080, 25 fps"
+        # Example with wrapped codec: "Stream #0:0(und): Video: wrapped_avframe (avc1 / 0x31637661), yuv420p, 1920x1080, 25 fps"
+        try:
+            # Use robust codec extraction that handles wrapped codecs
+            # This will look inside parentheses if codec is a wrapper like 'wrapped_avframe'
+            video_codec = _extract_codec_from_line(line, 'Video')
+            if video_codec:
+                # Sanitize and normalize the extracted codec
+                video_codec = _sanitize_codec_name(video_codec)
+                # Only update if we got a valid codec (not N/A)
+                # This prevents overwriting a detected codec with N/A
+                if video_codec != 'N/A':
+                    self.video_codec = video_codec
+                    logger.debug(f"  → Final video codec: {self.video_codec}")
+
+            # Extract resolution
+            res_match = re.search(r'(\d{2,5})x(\d{2,5})', line)
+            if res_match:
+                width, height = res_match.groups()
+                self.resolution = f"{width}x{height}"
+                logger.debug(f"  → Detected resolution: {self.resolution}")
+
+            # Extract FPS
+            fps_match = re.search(r'(\d+\.?\d*)\s*fps', line)
+            if fps_match:
+                self.fps = round(float(fps_match.group(1)), 2)
+                logger.debug(f"  → Detected FPS: {self.fps}")
+        except (ValueError, AttributeError) as e:
+            logger.debug(f"  → Error parsing video stream line: {e}")
+
+    def _parse_audio_line(self, line: str) -> None:
+        # Extract audio codec
+        # Example: "Stream #0:1: Audio: aac, 48000 Hz, stereo"
+        # Example with wrapped codec: "Stream #0:1(und): Audio: wrapped_avframe (aac)"
+        try:
+            # Use robust codec extraction that handles wrapped codecs
+            audio_codec = _extract_codec_from_line(line, 'Audio')
+            if audio_codec:
+                # Sanitize and normalize the extracted codec
+                audio_codec = _sanitize_codec_name(audio_codec)
+                # Only update if we got a valid codec (not N/A)
+                # This prevents overwriting a detected codec with N/A
+                if audio_codec != 'N/A':
+                    self.audio_codec = audio_codec
+                    logger.debug(f"  → Final audio codec: {self.audio_codec}")
+        except (ValueError, AttributeError) as e:
+            logger.debug(f"  → Error parsing audio stream line: {e}")
+
+    def apply_to(self, result_data: Dict[str, Any]) -> None:
+        """Copy the parsed metrics into a result dictionary."""
+        result_data['video_codec'] = self.video_codec
+        result_data['audio_codec'] = self.audio_codec
+        result_data['resolution'] = self.resolution
+        result_data['fps'] = self.fps
+        result_data['bitrate_kbps'] = self.bitrate_kbps
+        # Use progress bitrate as final fallback
+        if result_data['bitrate_kbps'] is None and self.progress_bitrate is not None:
+            result_data['bitrate_kbps'] = self.progress_bitrate
+            logger.debug(f"  → Using last progress bitrate as fallback: {result_data['bitrate_kbps']:.2f} kbps")
+
+
+class BitrateConvergence:
+    """
+    Running bitrate estimate of an adaptive analysis with convergence detection.
+
+    Fed with ffmpeg's -progress output of a stream copy analysis (see
+    _build_streaming_command()). Every progress block reports the bytes
+    written and the media time processed so far, which gives one bitrate
+    sample. The estimate has converged once at least min_duration seconds of
+    media were analyzed and the last window samples lie within tolerance of
+    their mean. Without a min_duration the tracker only measures the media
+    time and never converges (non-realtime analyses).
+
+    ffmpeg reports the input bytes read only when it closes the input, so
+    the samples are remuxed output sizes. They only decide when the bitrate
+    is stable (a constant container overhead does not change their spread);
+    the reported bitrate is the input bytes read over the media time (see
+    _apply_convergence()), like the fixed-duration analysis.
+    """
+
+    def __init__(self, min_duration: Optional[float] = ADAPTIVE_MIN_DURATION, tolerance: float = ADAPTIVE_TOLERANCE,
+                 window: int = ADAPTIVE_WINDOW):
+        """
+        Initialize the convergence tracker.
+
+        Args:
+            min_duration: Seconds of media to analyze before the estimate may converge
+                          (None: never converge)
+            tolerance: Maximum relative spread of the recent samples (0.05 = 5%)
+            window: Number of recent samples compared
+        """
+        self.min_duration = min_duration
+        self.tolerance = tolerance
+        self.recent = deque(maxlen=max(2, window))
+        self.samples = 0
+        self.media_duration = 0.0
+        self.bitrate_kbps: Optional[float] = None
+        self.converged = False
+        self._total_size: Optional[int] = None
+        self._out_time: Optional[float] = None
+
+    def feed(self, line: str) -> None:
+        """Parse one line of ffmpeg output (only -progress key=value lines are used)."""
+        key, separator, value = line.strip().partition('=')
+        if not separator:
+            return
+        try:
+            if key == 'total_size':
+                self._total_size = int(value)
+            elif key in ('out_time_us', 'out_time_ms'):
+                # Both keys are in microseconds
+                self._out_time = int(value) / 1000000
+            elif key == 'progress':
+                self._add_sample()
+        except ValueError:
+            # "N/A" before the first packet was written
+            pass
+
+    def _add_sample(self) -> None:
+        if not self._out_time or self._out_time <= 0:
+            return
+        self.media_duration = self._out_time
+        if not self._total_size:
+            return
+        self.bitrate_kbps = (self._total_size * 8) / 1000 / self._out_time
+        self.samples += 1
+        self.recent.append(self.bitrate_kbps)
+        if (not self.converged and self.min_duration is not None and self.media_duration >= self.min_duration
+                and len(self.recent) == self.recent.maxlen and self.spread <= self.tolerance):
+            self.converged = True
+            logger.debug(f"  → Bitrate converged at {self.bitrate_kbps:.2f} kbps after "
+                         f"{self.media_duration:.1f}s of media ({self.samples} samples)")
+
+    @property
+    def spread(self) -> float:
+        """Relative spread (max - min) / mean of the recent samples."""
+        if not self.recent:
+            return float('inf')
+        mean = sum(self.recent) / len(self.recent)
+        return (max(self.recent) - min(self.recent)) / mean if mean > 0 else float('inf')
+
+    @property
+    def confidence(self) -> float:
+        """Confidence in the estimate from 0 to 1: 1 - spread, scaled down while the window is not full."""
+        if not self.recent:
+            return 0.0
+        return round(max(0.0, 1.0 - self.spread) * len(self.recent) / self.recent.maxlen, 3)
+
+
+def _is_valid_stream_url(url: Any) -> bool:
+    """Check that a URL is a non-empty http(s)/rtmp(s) URL before passing it to ffmpeg."""
+    if not url or not isinstance(url, str):
+        logger.error("Invalid URL: must be a non-empty string")
+        return False
+    
+    # Basic URL validation - must start with http://, https://, or rtmp://
+    url_lower = url.lower()
+    if not (url_lower.startswith('http://') or url_lower.startswith('https://') or 
+            url_lower.startswith('rtmp://') or url_lower.startswith('rtmps://')):
+        logger.error(f"Invalid URL protocol: {url[:50]}... (must be http://, https://, rtmp://, or rtmps://)")
+        return False
+    return True
+
+
+def _log_bitrate_detection_failure(result_data: Dict[str, Any], elapsed: float, duration: int, returncode: int, output: str) -> None:
+    """Log why no bitrate was detected, including ffmpeg errors found in its output."""
+    if result_data['bitrate_kbps'] is not None:
+        return
+    
+    # Check if ffmpeg exited early with errors
+    expected_min_time = duration * EARLY_EXIT_THRESHOLD
+    exited_early = elapsed < expected_min_time
+    
+    logger.warning(f"  ⚠ Failed to detect bitrate from ffmpeg output (analyzed for {elapsed:.2f}s, expected ~{duration}s)")
+    
+    if exited_early or returncode != 0:
+        if returncode != 0:
+            logger.warning(f"  ⚠ ffmpeg exited with code {returncode}")
+        else:
+            logger.warning(f"  ⚠ ffmpeg completed in {elapsed:.2f}s (expected ~{duration}s)")
+        
+        # Look for and log error messages using helper function
+        _log_ffmpeg_errors(output, logger, FFMPEG_ERROR_PATTERNS)
+
+
+def get_stream_info_and_bitrate(url: str, duration: int = 30, timeout: int = 30, user_agent: str = 'VLC/3.0.14', stream_startup_buffer: int = 10, proxy: Optional[str] = None, realtime: bool = True) -> Dict[str, Any]:
     """
     Get complete stream information using ffmpeg in a single call.
     
@@ -286,6 +794,11 @@ def get_stream_info_and_bitrate(url: str, duration: int = 30, timeout: int = 30,
     single ffmpeg call that extracts all needed information: codec, resolution, FPS, 
     and bitrate. This reduces network overhead and processing time.
 
+    ffmpeg reads the input at its native rate ('-re'), so the analysis takes
+    duration seconds. Without realtime the stream is read at network speed
+    instead and duration seconds of media are measured (see
+    get_stream_info_and_bitrate_streaming()).
+
     Args:
         url: Stream URL to analyze (will be validated and sanitized)
         duration: Duration in seconds to analyze the stream
@@ -293,6 +806,7 @@ def get_stream_info_and_bitrate(url: str, duration: int = 30, timeout: int = 30,
         user_agent: User agent string to use for HTTP requests
         stream_startup_buffer: Buffer in seconds for stream startup (default: 10s)
         proxy: HTTP proxy URL for FFmpeg (e.g., 'http://proxy:8080')
+        realtime: Read the input at its native rate
 
     Returns:
         Dictionary containing:
@@ -304,24 +818,11 @@ def get_stream_info_and_bitrate(url: str, duration: int = 30, timeout: int = 30,
         - status: "OK", "Timeout", or "Error"
         - elapsed_time: Time taken for the operation
     """
+    if not realtime:
+        return _run_streaming_analysis(url, duration, timeout, user_agent, stream_startup_buffer, proxy, realtime=False)
+
     # Validate and sanitize URL to prevent command injection
-    if not url or not isinstance(url, str):
-        logger.error("Invalid URL: must be a non-empty string")
-        return {
-            'video_codec': 'N/A',
-            'audio_codec': 'N/A',
-            'resolution': '0x0',
-            'fps': 0,
-            'bitrate_kbps': None,
-            'status': 'Error',
-            'elapsed_time': 0
-        }
-    
-    # Basic URL validation - must start with http://, https://, or rtmp://
-    url_lower = url.lower()
-    if not (url_lower.startswith('http://') or url_lower.startswith('https://') or 
-            url_lower.startswith('rtmp://') or url_lower.startswith('rtmps://')):
-        logger.error(f"Invalid URL protocol: {url[:50]}... (must be http://, https://, rtmp://, or rtmps://)")
+    if not _is_valid_stream_url(url):
         return {
             'video_codec': 'N/A',
             'audio_codec': 'N/A',
@@ -372,146 +873,14 @@ def get_stream_info_and_bitrate(url: str, duration: int = 30, timeout: int = 30,
         result_data['elapsed_time'] = elapsed
         
         output = result.stderr
-        total_bytes = 0
-        progress_bitrate = None
-        
-        # Track whether we're in the Input or Output section of FFmpeg output
-        # This ensures we only parse input stream codecs, not decoded output formats
-        in_input_section = False
         
         # Parse ffmpeg output to extract all information
-        # Only process Stream lines from the Input section to get actual input codecs
-        # (e.g., "aac", "ac3") instead of decoded output formats (e.g., "pcm_s16le")
+        parser = FFmpegOutputParser(duration)
         for line in output.splitlines():
-            # Track when we enter the Input section
-            if 'Input #' in line:
-                in_input_section = True
-                logger.debug(f"  → Entered Input section: {line.strip()}")
-                continue
-            
-            # Track when we enter the Output section - stop parsing stream info
-            if 'Output #' in line:
-                in_input_section = False
-                logger.debug(f"  → Entered Output section (will skip stream parsing): {line.strip()}")
-                continue
-            
-            # Extract video codec, resolution, and FPS from Input stream lines only
-            # Example: "Stream #0:0: Video: h264, yuv420p, 1920x1080, 25 fps"
-            # Example with wrapped codec: "Stream #0:0(und): Video: wrapped_avframe (avc1 / 0x31637661), yuv420p, 1920x1080, 25 fps"
-            # Only process Stream lines when in_input_section to avoid parsing output codecs
-            if in_input_section and 'Stream #' in line and 'Video:' in line:
-                try:
-                    # Use robust codec extraction that handles wrapped codecs
-                    # This will look inside parentheses if codec is a wrapper like 'wrapped_avframe'
-                    video_codec = _extract_codec_from_line(line, 'Video')
-                    if video_codec:
-                        # Sanitize and normalize the extracted codec
-                        video_codec = _sanitize_codec_name(video_codec)
-                        # Only update if we got a valid codec (not N/A)
-                        # This prevents overwriting a detected codec with N/A
-                        if video_codec != 'N/A':
-                            result_data['video_codec'] = video_codec
-                            logger.debug(f"  → Final video codec: {result_data['video_codec']}")
-                    
-                    # Extract resolution
-                    res_match = re.search(r'(\d{2,5})x(\d{2,5})', line)
-                    if res_match:
-                        width, height = res_match.groups()
-                        result_data['resolution'] = f"{width}x{height}"
-                        logger.debug(f"  → Detected resolution: {result_data['resolution']}")
-                    
-                    # Extract FPS
-                    fps_match = re.search(r'(\d+\.?\d*)\s*fps', line)
-                    if fps_match:
-                        result_data['fps'] = round(float(fps_match.group(1)), 2)
-                        logger.debug(f"  → Detected FPS: {result_data['fps']}")
-                except (ValueError, AttributeError) as e:
-                    logger.debug(f"  → Error parsing video stream line: {e}")
-            
-            # Extract audio codec from Input stream lines only
-            # Example: "Stream #0:1: Audio: aac, 48000 Hz, stereo"
-            # Example with wrapped codec: "Stream #0:1(und): Audio: wrapped_avframe (aac)"
-            # Only process Stream lines when in_input_section to avoid parsing decoded output (e.g., pcm_s16le)
-            if in_input_section and 'Stream #' in line and 'Audio:' in line:
-                try:
-                    # Use robust codec extraction that handles wrapped codecs
-                    audio_codec = _extract_codec_from_line(line, 'Audio')
-                    if audio_codec:
-                        # Sanitize and normalize the extracted codec
-                        audio_codec = _sanitize_codec_name(audio_codec)
-                        # Only update if we got a valid codec (not N/A)
-                        # This prevents overwriting a detected codec with N/A
-                        if audio_codec != 'N/A':
-                            result_data['audio_codec'] = audio_codec
-                            logger.debug(f"  → Final audio codec: {result_data['audio_codec']}")
-                except (ValueError, AttributeError) as e:
-                    logger.debug(f"  → Error parsing audio stream line: {e}")
-            
-            # Extract bitrate using multiple methods (same as get_stream_bitrate)
-            # Method 1: Statistics line with bytes read
-            if "Statistics:" in line and "bytes read" in line:
-                try:
-                    parts = line.split("bytes read")
-                    size_str = parts[0].strip().split()[-1]
-                    total_bytes = int(size_str)
-                    if total_bytes > 0 and duration > 0:
-                        result_data['bitrate_kbps'] = (total_bytes * 8) / 1000 / duration
-                        logger.debug(f"  → Calculated bitrate (method 1): {result_data['bitrate_kbps']:.2f} kbps from {total_bytes} bytes")
-                except ValueError:
-                    pass
-
-            # Method 2: Parse progress output
-            if "bitrate=" in line and "kbits/s" in line:
-                try:
-                    bitrate_match = re.search(r'bitrate=\s*(\d+\.?\d*)\s*kbits/s', line)
-                    if bitrate_match:
-                        progress_bitrate = float(bitrate_match.group(1))
-                        logger.debug(f"  → Found progress bitrate (method 2): {progress_bitrate:.2f} kbps")
-                except (ValueError, AttributeError):
-                    pass
-
-            # Method 3: Alternative bytes read pattern
-            if result_data['bitrate_kbps'] is None and "bytes read" in line and "Statistics:" not in line:
-                try:
-                    bytes_match = re.search(r'(\d+)\s+bytes read', line)
-                    if bytes_match:
-                        total_bytes = int(bytes_match.group(1))
-                        if total_bytes > 0 and duration > 0:
-                            calculated_bitrate = (total_bytes * 8) / 1000 / duration
-                            logger.debug(f"  → Calculated bitrate (method 3): {calculated_bitrate:.2f} kbps from {total_bytes} bytes")
-                            result_data['bitrate_kbps'] = calculated_bitrate
-                except (ValueError, AttributeError):
-                    pass
-
-        # Use progress bitrate as final fallback
-        if result_data['bitrate_kbps'] is None and progress_bitrate is not None:
-            result_data['bitrate_kbps'] = progress_bitrate
-            logger.debug(f"  → Using last progress bitrate as fallback: {result_data['bitrate_kbps']:.2f} kbps")
-
-        # Check if ffmpeg exited early with errors
-        expected_min_time = duration * EARLY_EXIT_THRESHOLD
-        exited_early = elapsed < expected_min_time
+            parser.feed(line)
+        parser.apply_to(result_data)
         
-        # Log warnings if detection failed
-        if result_data['bitrate_kbps'] is None:
-            logger.warning(f"  ⚠ Failed to detect bitrate from ffmpeg output (analyzed for {elapsed:.2f}s, expected ~{duration}s)")
-            
-            if exited_early or result.returncode != 0:
-                if result.returncode != 0:
-                    logger.warning(f"  ⚠ ffmpeg exited with code {result.returncode}")
-                else:
-                    logger.warning(f"  ⚠ ffmpeg completed in {elapsed:.2f}s (expected ~{duration}s)")
-                
-                # Look for and log error messages using helper function
-                error_patterns = [
-                    "Connection refused", "Connection timed out", "Invalid data found",
-                    "Server returned", "404 Not Found", "403 Forbidden", "401 Unauthorized",
-                    "No route to host", "could not find codec", "Protocol not found",
-                    "Error opening input", "Operation timed out", "I/O error",
-                    "HTTP error", "SSL", "TLS", "Certificate"
-                ]
-                
-                _log_ffmpeg_errors(output, logger, error_patterns)
+        _log_bitrate_detection_failure(result_data, elapsed, duration, result.returncode, output)
 
         logger.debug(f"  → Analysis completed in {elapsed:.2f}s")
         
@@ -527,7 +896,264 @@ def get_stream_info_and_bitrate(url: str, duration: int = 30, timeout: int = 30,
     return result_data
 
 
-def get_stream_bitrate(url: str, duration: int = 30, timeout: int = 30, user_agent: str = 'VLC/3.0.14', stream_startup_buffer: int = 10) -> Tuple[Optional[float], str, float]:
+def _convergence_bytes_read(parser: FFmpegOutputParser, convergence: BitrateConvergence,
+                             realtime: bool) -> Optional[int]:
+    """
+    Input bytes read to pass to _apply_convergence(), or None.
+
+    A converged analysis uses them only if the main input reported its
+    statistics after ffmpeg was terminated (the parser is complete);
+    otherwise the sum so far may be a few segments of an HLS input and the
+    output estimate is used. Non-realtime analyses run to the end.
+    """
+    if convergence.converged:
+        return parser.bytes_read if parser.complete else None
+    return None if realtime else parser.bytes_read
+
+
+def _build_streaming_command(url: str, duration: int, user_agent: str, proxy: Optional[str],
+                             stream_copy: bool = False, realtime: bool = True) -> List[str]:
+    """
+    Build the ffmpeg command line used with the streaming output parser.
+
+    With stream_copy the input is remuxed to MPEG-TS on the null device
+    instead of being decoded, so that -progress reports the bytes written
+    (the null muxer reports no size) for BitrateConvergence. Without
+    realtime, '-re' is left out and the input is read as fast as the
+    network delivers it.
+    """
+    command = ['ffmpeg', '-re'] if realtime else ['ffmpeg']
+    command.extend(['-v', 'verbose', '-nostats', '-progress', 'pipe:2', '-user_agent', user_agent])
+    if proxy and proxy.strip():
+        logger.debug(f"Using HTTP proxy for FFmpeg: {proxy.strip()}")
+        command.extend(['-http_proxy', proxy.strip()])
+    command.extend(['-i', url, '-t', str(duration)])
+    if stream_copy:
+        command.extend(['-map', '0:v?', '-map', '0:a?', '-c', 'copy', '-f', 'mpegts', os.devnull])
+    else:
+        command.extend(['-f', 'null', '-'])
+    return command
+
+
+def _apply_convergence(result_data: Dict[str, Any], convergence: BitrateConvergence, duration: int,
+                       bytes_read: Optional[int] = None) -> int:
+    """
+    Record the outcome of an adaptive or non-realtime analysis in a result dictionary.
+
+    bytes_read is passed for converged and for non-realtime analyses: ffmpeg
+    was stopped before the requested duration, or wall clock time says
+    nothing about the media duration read. The input bytes read are then
+    divided by the presentation timestamp span reported by -progress instead
+    of the requested duration. The analysis duration expected by the early
+    exit detection is the media time analyzed when the estimate converged.
+
+    Returns:
+        Expected analysis duration in seconds
+    """
+    if bytes_read and convergence.media_duration > 0:
+        result_data['bitrate_kbps'] = (bytes_read * 8) / 1000 / convergence.media_duration
+        logger.debug(f"  → Calculated bitrate from {bytes_read} bytes over "
+                     f"{convergence.media_duration:.2f}s of media: {result_data['bitrate_kbps']:.2f} kbps")
+    elif convergence.converged:
+        # The main input did not report its statistics before ffmpeg was killed
+        result_data['bitrate_kbps'] = convergence.bitrate_kbps
+        logger.debug(f"  → Using converged output bitrate estimate: {convergence.bitrate_kbps:.2f} kbps")
+    elif result_data['bitrate_kbps'] is None and convergence.bitrate_kbps is not None:
+        result_data['bitrate_kbps'] = convergence.bitrate_kbps
+        logger.debug(f"  → Using last running bitrate estimate as fallback: {convergence.bitrate_kbps:.2f} kbps")
+    result_data['bitrate_samples'] = convergence.samples
+    result_data['bitrate_confidence'] = convergence.confidence
+    result_data['measured_duration'] = round(convergence.media_duration, 2)
+    if convergence.converged:
+        return max(1, int(convergence.media_duration))
+    return duration
+
+
+def get_stream_info_and_bitrate_streaming(url: str, duration: int = 30, timeout: int = 30, user_agent: str = 'VLC/3.0.14', stream_startup_buffer: int = 10, proxy: Optional[str] = None, realtime: bool = True) -> Dict[str, Any]:
+    """
+    Get complete stream information using ffmpeg, parsing its output as it arrives.
+    
+    Same result as get_stream_info_and_bitrate(), but ffmpeg's stderr is read
+    line by line with Popen and fed to an FFmpegOutputParser instead of being
+    buffered as a whole (debug output of an HD stream is tens of MB). ffmpeg
+    runs with '-v verbose' (enough for the stream info and the "Statistics"
+    line) and reports progress via '-progress'. Once processing has ended and
+    the input statistics are known, ffmpeg is stopped without waiting for the
+    rest of its shutdown. Only the first and last lines of output are kept
+    for error logging.
+
+    Without realtime, ffmpeg runs without '-re' and copies the stream instead
+    of decoding it (decoding would limit the read speed), so a check takes
+    as long as the network needs to deliver duration seconds of media. The
+    bitrate is the number of bytes read divided by the presentation
+    timestamp span of the media processed, not by the wall clock time.
+
+    Args:
+        url: Stream URL to analyze (will be validated and sanitized)
+        duration: Duration in seconds to analyze the stream
+        timeout: Base timeout in seconds (actual timeout includes duration + overhead)
+        user_agent: User agent string to use for HTTP requests
+        stream_startup_buffer: Buffer in seconds for stream startup (default: 10s)
+        proxy: HTTP proxy URL for FFmpeg (e.g., 'http://proxy:8080')
+        realtime: Read the input at its native rate
+
+    Returns:
+        Dictionary with the same keys as get_stream_info_and_bitrate()
+        (plus bitrate_samples, bitrate_confidence and measured_duration
+        without realtime)
+    """
+    return _run_streaming_analysis(url, duration, timeout, user_agent, stream_startup_buffer, proxy, realtime=realtime)
+
+
+def get_stream_info_and_bitrate_adaptive(url: str, duration: int = 30, timeout: int = 30, user_agent: str = 'VLC/3.0.14', stream_startup_buffer: int = 10, proxy: Optional[str] = None, min_duration: float = ADAPTIVE_MIN_DURATION, tolerance: float = ADAPTIVE_TOLERANCE, realtime: bool = True) -> Dict[str, Any]:
+    """
+    Get complete stream information, stopping once the bitrate has converged.
+    
+    Like get_stream_info_and_bitrate_streaming(), but the stream is copied
+    instead of decoded and the running bitrate estimate from ffmpeg's
+    progress output is watched (see BitrateConvergence). ffmpeg is stopped as
+    soon as the estimate has converged, so stable streams take a few seconds
+    instead of the full duration, which becomes the maximum.
+
+    Args:
+        url: Stream URL to analyze (will be validated and sanitized)
+        duration: Maximum duration in seconds to analyze the stream
+        timeout: Base timeout in seconds (actual timeout includes duration + overhead)
+        user_agent: User agent string to use for HTTP requests
+        stream_startup_buffer: Buffer in seconds for stream startup (default: 10s)
+        proxy: HTTP proxy URL for FFmpeg (e.g., 'http://proxy:8080')
+        min_duration: Seconds of media to analyze before the bitrate may converge
+        tolerance: Maximum relative spread of the recent bitrate samples (0.05 = 5%)
+        realtime: Read the input at its native rate (see
+                  get_stream_info_and_bitrate_streaming())
+
+    Returns:
+        Dictionary with the keys of get_stream_info_and_bitrate() plus:
+        - bitrate_samples: Number of bitrate samples taken
+        - bitrate_confidence: Agreement of the last samples (0 to 1)
+        - measured_duration: Seconds of media analyzed
+    """
+    convergence = BitrateConvergence(min_duration=min(min_duration, duration), tolerance=tolerance)
+    return _run_streaming_analysis(url, duration, timeout, user_agent, stream_startup_buffer, proxy, convergence,
+                                   realtime=realtime)
+
+
+def _run_streaming_analysis(url: str, duration: int, timeout: int, user_agent: str, stream_startup_buffer: int,
+                            proxy: Optional[str], convergence: Optional[BitrateConvergence] = None,
+                            realtime: bool = True) -> Dict[str, Any]:
+    """Run ffmpeg with the streaming output parser (and optionally convergence detection)."""
+    result_data = {
+        'video_codec': 'N/A',
+        'audio_codec': 'N/A',
+        'resolution': '0x0',
+        'fps': 0,
+        'bitrate_kbps': None,
+        'status': 'OK',
+        'elapsed_time': 0
+    }
+    
+    # Validate and sanitize URL to prevent command injection
+    if not _is_valid_stream_url(url):
+        result_data['status'] = 'Error'
+        return result_data
+    
+    mode = "adaptive" if convergence else "streaming parser"
+    if not realtime:
+        mode += ", non-realtime"
+        if convergence is None:
+            # Only measures the media time read
+            convergence = BitrateConvergence(min_duration=None)
+    logger.debug(f"Analyzing stream with ffmpeg ({mode}) for {duration}s: {url[:50]}...")
+    
+    command = _build_streaming_command(url, duration, user_agent, proxy, stream_copy=convergence is not None,
+                                       realtime=realtime)
+    
+    actual_timeout = timeout + duration + stream_startup_buffer
+    parser = FFmpegOutputParser(duration)
+    head_lines = []
+    tail_lines = deque(maxlen=STREAMING_RETAINED_LINES)
+    timed_out = threading.Event()
+    stop_timer = None
+    
+    try:
+        start = time.time()
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace'
+        )
+        
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+        
+        watchdog = threading.Timer(actual_timeout, kill_on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            for line in process.stderr:
+                parser.feed(line)
+                if len(head_lines) < STREAMING_RETAINED_LINES:
+                    head_lines.append(line)
+                else:
+                    tail_lines.append(line)
+                if parser.complete:
+                    logger.debug("  → All metrics known, stopping ffmpeg")
+                    break
+                if convergence is not None:
+                    convergence.feed(line)
+                    if stop_timer is None and convergence.converged:
+                        # SIGTERM lets ffmpeg close its inputs and report the bytes read;
+                        # reading goes on until the parser saw the main input close
+                        logger.debug("  → Bitrate converged, stopping ffmpeg")
+                        process.terminate()
+                        stop_timer = threading.Timer(ADAPTIVE_STOP_GRACE, process.kill)
+                        stop_timer.daemon = True
+                        stop_timer.start()
+        finally:
+            if stop_timer is not None:
+                stop_timer.cancel()
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+            process.stderr.close()
+            returncode = process.wait()
+        
+        if timed_out.is_set():
+            logger.warning(f"Timeout ({actual_timeout}s) while analyzing stream")
+            result_data['status'] = "Timeout"
+            result_data['elapsed_time'] = actual_timeout
+            return result_data
+        
+        elapsed = time.time() - start
+        result_data['elapsed_time'] = elapsed
+        parser.apply_to(result_data)
+        expected_duration = duration
+        if convergence is not None:
+            expected_duration = _apply_convergence(result_data, convergence, duration,
+                                                   bytes_read=_convergence_bytes_read(parser, convergence, realtime))
+        
+        # ffmpeg stopped by us after a complete analysis is not a failure
+        if parser.complete or (convergence is not None and convergence.converged):
+            returncode = 0
+        # Without realtime, an early exit shows in the media time, not the wall clock time
+        analyzed = elapsed if realtime else convergence.media_duration
+        _log_bitrate_detection_failure(result_data, analyzed, expected_duration, returncode,
+                                       ''.join(head_lines) + ''.join(tail_lines))
+        
+        logger.debug(f"  → Analysis completed in {elapsed:.2f}s")
+        
+    except Exception as e:
+        logger.error(f"Stream analysis failed: {e}")
+        result_data['status'] = "Error"
+        result_data['elapsed_time'] = 0
+
+    return result_data
+
+
+def get_stream_bitrate(url: str, duration: int = 30, timeout: int = 30, user_agent: str = 'VLC/3.0.14', stream_startup_buffer: int = 10, realtime: bool = True) -> Tuple[Optional[float], str, float]:
     """
     Get stream bitrate using ffmpeg to analyze actual stream data.
 
@@ -536,12 +1162,17 @@ def get_stream_bitrate(url: str, duration: int = 30, timeout: int = 30, user_age
     2. Fallback 1: Parse progress output lines (e.g., "bitrate=3333.3kbits/s")
     3. Fallback 2: Calculate from total bytes transferred
 
+    Without realtime, the stream is read at network speed and the bitrate is
+    calculated over the media time read (see
+    get_stream_info_and_bitrate_streaming()).
+
     Args:
         url: Stream URL to analyze
         duration: Duration in seconds to analyze the stream
         timeout: Base timeout in seconds (actual timeout includes duration + overhead)
         user_agent: User agent string to use for HTTP requests
         stream_startup_buffer: Buffer in seconds for stream startup (default: 10s)
+        realtime: Read the input at its native rate
 
     Returns:
         Tuple of (bitrate_kbps, status, elapsed_time)
@@ -549,6 +1180,11 @@ def get_stream_bitrate(url: str, duration: int = 30, timeout: int = 30, user_age
         status: "OK", "Timeout", or "Error"
         elapsed_time: Time taken for the operation
     """
+    if not realtime:
+        result_data = _run_streaming_analysis(url, duration, timeout, user_agent, stream_startup_buffer, None,
+                                              realtime=False)
+        return result_data['bitrate_kbps'], result_data['status'], result_data['elapsed_time']
+
     logger.debug(f"Analyzing bitrate for {duration}s...")
     command = [
         'ffmpeg', '-re', '-v', 'debug', '-user_agent', user_agent,
@@ -663,6 +1299,252 @@ def get_stream_bitrate(url: str, duration: int = 30, timeout: int = 30, user_age
     return bitrate, status, elapsed
 
 
+_HLS_ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+def is_hls_url(url: Any) -> bool:
+    """Check whether a stream URL points to an HLS playlist (.m3u8)."""
+    return isinstance(url, str) and urlparse(url).path.lower().endswith('.m3u8')
+
+
+def _parse_hls_attributes(value: str) -> Dict[str, str]:
+    """Parse an HLS attribute list (KEY=VALUE,KEY="quoted, value")."""
+    return {match.group(1): match.group(2).strip('"') for match in _HLS_ATTRIBUTE.finditer(value)}
+
+
+def parse_hls_playlist(text: str, base_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse an HLS master or media playlist.
+
+    Only the tags used by the HLS fast path are read; URIs are resolved
+    against base_url.
+
+    Args:
+        text: Playlist content
+        base_url: URL the playlist was loaded from (after redirects)
+
+    Returns:
+        None if text is not an HLS playlist, otherwise a dictionary with:
+        - variants: [{'url', 'bandwidth', 'resolution'}] of a master playlist
+        - segments: [{'url', 'duration'}] of a media playlist
+        - init_url: URL of the EXT-X-MAP initialization section (fMP4) or None
+        - ended: True for playlists with EXT-X-ENDLIST (VOD)
+        - supported: False if segments are encrypted or byte ranges
+    """
+    lines = text.splitlines()
+    if not lines or not lines[0].strip().startswith('#EXTM3U'):
+        return None
+
+    playlist = {'variants': [], 'segments': [], 'init_url': None, 'ended': False, 'supported': True}
+    variant = None
+    duration = None
+    for line in lines[1:]:
+        line = line.strip()
+        if not line:
+            continue
+        tag, _, value = line.partition(':')
+        try:
+            if tag == '#EXT-X-STREAM-INF':
+                attributes = _parse_hls_attributes(value)
+                variant = {'bandwidth': int(attributes.get('BANDWIDTH') or 0), 'resolution': attributes.get('RESOLUTION')}
+            elif tag == '#EXTINF':
+                duration = float(value.split(',', 1)[0])
+            elif tag == '#EXT-X-MAP':
+                uri = _parse_hls_attributes(value).get('URI')
+                if uri:
+                    playlist['init_url'] = urljoin(base_url, uri)
+            elif tag == '#EXT-X-KEY':
+                if _parse_hls_attributes(value).get('METHOD', 'NONE') != 'NONE':
+                    playlist['supported'] = False
+            elif tag == '#EXT-X-BYTERANGE':
+                playlist['supported'] = False
+            elif tag == '#EXT-X-ENDLIST':
+                playlist['ended'] = True
+            elif not line.startswith('#'):
+                if variant is not None:
+                    playlist['variants'].append(dict(variant, url=urljoin(base_url, line)))
+                elif duration is not None:
+                    playlist['segments'].append({'url': urljoin(base_url, line), 'duration': duration})
+                variant = None
+                duration = None
+        except ValueError:
+            logger.debug(f"  → Ignoring malformed playlist line: {line[:80]}")
+    return playlist
+
+
+def _probe_segment(data: bytes, timeout: int, result_data: Dict[str, Any]) -> None:
+    """Fill codecs, resolution, FPS and status of result_data by probing a downloaded segment."""
+    command = ['ffprobe', '-v', 'error', '-show_entries', PROBE_SHOW_ENTRIES, '-of', 'json', '-i', 'pipe:0']
+    result = subprocess.run(
+        command,
+        input=data,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=timeout
+    )
+    _parse_probe_output(result.returncode, result.stdout.decode(errors='replace'),
+                        result.stderr.decode(errors='replace'), result_data)
+
+
+def get_stream_info_and_bitrate_hls(url: str, segments: int = HLS_SEGMENTS, timeout: int = 30, user_agent: str = 'VLC/3.0.14', proxy: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get complete stream information of an HLS stream from a few downloaded segments.
+
+    The media playlist lists the duration of every segment, so the bitrate
+    is the size of the downloaded segments divided by their duration and
+    ffmpeg does not have to read the stream in real time. The playlists are
+    fetched over the shared HTTP session; of a master playlist the variant
+    with the highest bandwidth is used. The last segments of a live playlist
+    (the first ones of a VOD playlist) are downloaded concurrently and only
+    the first of them is probed with ffprobe for codecs, resolution and FPS.
+
+    Args:
+        url: URL of the HLS playlist (master or media)
+        segments: Number of media segments to download
+        timeout: Timeout in seconds for each HTTP request and the probe
+        user_agent: User agent string to use for HTTP requests
+        proxy: HTTP proxy URL (e.g., 'http://proxy:8080')
+
+    Returns:
+        None if the URL is not an HLS playlist the fast path can measure
+        (e.g. encrypted segments) or a playlist or segment request failed,
+        so ffmpeg has to be used. Otherwise a dictionary with the keys of
+        get_stream_info_and_bitrate() plus:
+        - bitrate_samples: Number of segments downloaded
+        - measured_duration: Seconds of media downloaded
+    """
+    result_data = {
+        'video_codec': 'N/A',
+        'audio_codec': 'N/A',
+        'resolution': '0x0',
+        'fps': 0,
+        'bitrate_kbps': None,
+        'status': 'Error',
+        'elapsed_time': 0
+    }
+
+    if not _is_valid_stream_url(url):
+        return result_data
+
+    logger.debug(f"Analyzing HLS stream from {segments} segments: {url[:50]}...")
+
+    session = get_http_session()
+    request_kwargs = {'headers': {'User-Agent': user_agent}, 'timeout': timeout}
+    if proxy and proxy.strip():
+        request_kwargs['proxies'] = {'http': proxy.strip(), 'https': proxy.strip()}
+
+    def fetch(resource_url: str) -> requests.Response:
+        response = session.get(resource_url, **request_kwargs)
+        response.raise_for_status()
+        return response
+
+    start = time.time()
+    try:
+        response = fetch(url)
+        playlist = parse_hls_playlist(response.text, response.url)
+        if playlist is not None and playlist['variants']:
+            variant = max(playlist['variants'], key=lambda v: v['bandwidth'])
+            logger.debug(f"  → Using variant {variant['resolution'] or 'N/A'} ({variant['bandwidth']} bps)")
+            response = fetch(variant['url'])
+            playlist = parse_hls_playlist(response.text, response.url)
+        if playlist is None or not playlist['segments'] or not playlist['supported']:
+            logger.debug("  → Not a measurable HLS media playlist, falling back to ffmpeg")
+            return None
+
+        count = max(1, segments)
+        chosen = playlist['segments'][:count] if playlist['ended'] else playlist['segments'][-count:]
+        urls = [segment['url'] for segment in chosen]
+        if playlist['init_url']:
+            urls.insert(0, playlist['init_url'])
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            contents = list(executor.map(lambda resource_url: fetch(resource_url).content, urls))
+        init_section = contents.pop(0) if playlist['init_url'] else b''
+
+        total_bytes = sum(len(content) for content in contents)
+        duration = sum(segment['duration'] for segment in chosen)
+        if total_bytes > 0 and duration > 0:
+            result_data['bitrate_kbps'] = (total_bytes * 8) / 1000 / duration
+            logger.debug(f"  → Calculated bitrate: {result_data['bitrate_kbps']:.2f} kbps from {total_bytes} bytes "
+                         f"in {len(chosen)} segments ({duration:.2f}s)")
+        result_data['bitrate_samples'] = len(chosen)
+        result_data['measured_duration'] = round(duration, 2)
+
+        _probe_segment(init_section + contents[0], timeout, result_data)
+
+    except subprocess.TimeoutExpired:
+        logger.warning(f"Timeout ({timeout}s) while probing HLS segment")
+        result_data['status'] = 'Timeout'
+    except requests.RequestException as e:
+        # Transient HTTP errors or servers rejecting this client: let ffmpeg decide
+        logger.debug(f"  → HLS request failed ({e}), falling back to ffmpeg")
+        return None
+    except Exception as e:
+        logger.error(f"HLS stream analysis failed: {e}")
+        result_data['status'] = 'Error'
+
+    result_data['elapsed_time'] = time.time() - start
+    logger.debug(f"  → Analysis completed in {result_data['elapsed_time']:.2f}s")
+    return result_data
+
+
+def _build_analysis_result(stream_id: int, stream_name: str, stream_url: str,
+                           result_data: Dict[str, Any], tier_timings: Dict[str, float]) -> Dict[str, Any]:
+    """Build the analyze_stream() result from the data of one check attempt."""
+    return {
+        'stream_id': stream_id,
+        'stream_name': stream_name,
+        'stream_url': stream_url,
+        'timestamp': datetime.now().isoformat(),
+        'video_codec': result_data['video_codec'],
+        'audio_codec': result_data['audio_codec'],
+        'resolution': result_data['resolution'],
+        'fps': result_data['fps'],
+        'bitrate_kbps': result_data['bitrate_kbps'],
+        'status': result_data['status'],
+        'tier_timings': tier_timings,
+        'rejected_by_probe': 'analysis' not in tier_timings,
+        # Only reported by adaptive, non-realtime and HLS analyses
+        **{key: result_data[key] for key in ADAPTIVE_RESULT_KEYS if key in result_data}
+    }
+
+
+def _log_analysis_result(result: Dict[str, Any], elapsed: float, stream_name: str) -> None:
+    """Log the outcome of one analyze_stream() attempt."""
+    # Log results
+    # In debug mode, show detailed multi-line logs
+    # In non-debug mode, use one-liner for failures
+    if logger.isEnabledFor(logging.DEBUG):
+        # Debug mode: verbose multi-line logging
+        if result['video_codec'] != 'N/A' or result['resolution'] != '0x0':
+            logger.info(f"    ✓ Video: {result['video_codec']}, {result['resolution']}, {result['fps']} FPS")
+        else:
+            logger.warning("    ✗ No video info found")
+
+        if result['audio_codec'] != 'N/A':
+            logger.info(f"    ✓ Audio: {result['audio_codec']}")
+        else:
+            logger.warning("    ✗ No audio info found")
+
+        if result['status'] == "OK":
+            if result['bitrate_kbps'] is not None:
+                logger.info(f"    ✓ Bitrate: {result['bitrate_kbps']:.2f} kbps (elapsed: {elapsed:.2f}s)")
+            else:
+                logger.warning(f"    ⚠ Bitrate detection failed (elapsed: {elapsed:.2f}s)")
+            logger.info(f"  ✓ Stream analysis complete for {stream_name}")
+        else:
+            logger.warning(f"    ✗ Status: {result['status']} (elapsed: {elapsed:.2f}s)")
+    else:
+        # Non-debug mode: one-liner for results
+        if result['status'] == "OK":
+            # Success: one line with key metrics
+            bitrate_str = f"{result['bitrate_kbps']:.2f} kbps" if result['bitrate_kbps'] is not None else "N/A"
+            logger.info(f"  ✓ {stream_name}: {result['resolution']}, {result['fps']} FPS, {bitrate_str}, {result['video_codec']}/{result['audio_codec']} ({elapsed:.2f}s)")
+        else:
+            # Failure: one-liner with status and elapsed time
+            failed_tier = " at probe" if result['rejected_by_probe'] else ""
+            logger.warning(f"  ✗ {stream_name}: Check failed{failed_tier} - {result['status']} ({elapsed:.2f}s)")
+
+
 def analyze_stream(
     stream_url: str,
     stream_id: int,
@@ -673,7 +1555,17 @@ def analyze_stream(
     retry_delay: int = 10,
     user_agent: str = 'VLC/3.0.14',
     stream_startup_buffer: int = 10,
-    proxy: Optional[str] = None
+    proxy: Optional[str] = None,
+    fast_probe: bool = False,
+    probe_timeout: int = 10,
+    probe_analyze_duration: float = 2.0,
+    streaming_parser: bool = False,
+    adaptive_duration: bool = False,
+    adaptive_min_duration: float = ADAPTIVE_MIN_DURATION,
+    adaptive_tolerance: float = ADAPTIVE_TOLERANCE,
+    realtime: bool = True,
+    hls_fast_path: bool = False,
+    hls_segments: int = HLS_SEGMENTS
 ) -> Dict[str, Any]:
     """
     Perform complete stream analysis including codec, resolution, FPS, bitrate, and audio.
@@ -682,6 +1574,16 @@ def analyze_stream(
     all information, reducing network overhead and processing time compared to the previous
     two-step process (ffprobe + ffmpeg).
 
+    With fast_probe enabled, each attempt first runs a cheap ffprobe check
+    (see probe_stream()). Streams conclusively failing it are reported as
+    failed without running the full ffmpeg analysis, which costs at least
+    ffmpeg_duration seconds; a probe timeout falls through to the analysis.
+
+    With hls_fast_path enabled, HLS streams (.m3u8 URLs) are measured from a
+    few downloaded segments instead (see get_stream_info_and_bitrate_hls());
+    the fast probe is skipped for them. Other URLs and playlists the fast
+    path cannot measure use the ffmpeg analysis.
+
     Args:
         stream_url: URL of the stream to analyze
         stream_id: Unique identifier for the stream
@@ -694,6 +1596,21 @@ def analyze_stream(
         user_agent: User agent string to use for HTTP requests
         stream_startup_buffer: Buffer in seconds for stream startup (default: 10s)
         proxy: HTTP proxy URL for FFmpeg (e.g., 'http://proxy:8080')
+        fast_probe: Run the fast probe tier before the full analysis
+        probe_timeout: Timeout in seconds for the fast probe
+        probe_analyze_duration: Seconds of media analyzed by the fast probe
+        streaming_parser: Parse ffmpeg output incrementally while it runs
+                          (see get_stream_info_and_bitrate_streaming())
+        adaptive_duration: Stop the analysis once the bitrate estimate has
+                           converged, ffmpeg_duration becomes the maximum
+                           (see get_stream_info_and_bitrate_adaptive())
+        adaptive_min_duration: Seconds of media analyzed before the bitrate may converge
+        adaptive_tolerance: Maximum relative spread of the recent bitrate samples
+        realtime: Read the stream at its native rate ('-re'); when disabled it is
+                  read at network speed and ffmpeg_duration seconds of media are
+                  measured (see get_stream_info_and_bitrate_streaming())
+        hls_fast_path: Measure HLS streams from downloaded segments
+        hls_segments: Number of segments downloaded by the HLS fast path
 
     Returns:
         Dictionary containing analysis results with keys:
@@ -707,6 +1624,12 @@ def analyze_stream(
         - fps: Frames per second (float)
         - bitrate_kbps: Bitrate in kbps (float or None)
         - status: "OK", "Timeout", or "Error"
+        - tier_timings: Seconds spent in the 'probe' and 'analysis' tiers
+        - rejected_by_probe: True if the last attempt failed the fast probe
+        - bitrate_samples, bitrate_confidence, measured_duration: Only with
+          adaptive_duration or without realtime (see
+          get_stream_info_and_bitrate_adaptive()); bitrate_samples and
+          measured_duration also from the HLS fast path
     """
     # In debug mode, show detailed entry log; in non-debug mode, be more concise
     if logger.isEnabledFor(logging.DEBUG):
@@ -741,64 +1664,62 @@ def analyze_stream(
                 time.sleep(retry_delay)
 
             try:
-                # Use single ffmpeg call to get all stream information
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.info("  Analyzing stream (single ffmpeg call)...")
-                result_data = get_stream_info_and_bitrate(
-                    url=stream_url,
-                    duration=ffmpeg_duration,
-                    timeout=timeout,
-                    user_agent=user_agent,
-                    stream_startup_buffer=stream_startup_buffer,
-                    proxy=proxy
-                )
-
-                # Build result dictionary with metadata
-                result = {
-                    'stream_id': stream_id,
-                    'stream_name': stream_name,
-                    'stream_url': stream_url,
-                    'timestamp': datetime.now().isoformat(),
-                    'video_codec': result_data['video_codec'],
-                    'audio_codec': result_data['audio_codec'],
-                    'resolution': result_data['resolution'],
-                    'fps': result_data['fps'],
-                    'bitrate_kbps': result_data['bitrate_kbps'],
-                    'status': result_data['status']
-                }
-
-                # Log results
-                # In debug mode, show detailed multi-line logs
-                # In non-debug mode, use one-liner for failures
-                if logger.isEnabledFor(logging.DEBUG):
-                    # Debug mode: verbose multi-line logging
-                    if result['video_codec'] != 'N/A' or result['resolution'] != '0x0':
-                        logger.info(f"    ✓ Video: {result['video_codec']}, {result['resolution']}, {result['fps']} FPS")
-                    else:
-                        logger.warning("    ✗ No video info found")
-
-                    if result['audio_codec'] != 'N/A':
-                        logger.info(f"    ✓ Audio: {result['audio_codec']}")
-                    else:
-                        logger.warning("    ✗ No audio info found")
-
-                    if result['status'] == "OK":
-                        if result['bitrate_kbps'] is not None:
-                            logger.info(f"    ✓ Bitrate: {result['bitrate_kbps']:.2f} kbps (elapsed: {result_data['elapsed_time']:.2f}s)")
-                        else:
-                            logger.warning(f"    ⚠ Bitrate detection failed (elapsed: {result_data['elapsed_time']:.2f}s)")
-                        logger.info(f"  ✓ Stream analysis complete for {stream_name}")
-                    else:
-                        logger.warning(f"    ✗ Status: {result['status']} (elapsed: {result_data['elapsed_time']:.2f}s)")
-                else:
-                    # Non-debug mode: one-liner for results
-                    if result['status'] == "OK":
-                        # Success: one line with key metrics
-                        bitrate_str = f"{result['bitrate_kbps']:.2f} kbps" if result['bitrate_kbps'] is not None else "N/A"
-                        logger.info(f"  ✓ {stream_name}: {result['resolution']}, {result['fps']} FPS, {bitrate_str}, {result['video_codec']}/{result['audio_codec']} ({result_data['elapsed_time']:.2f}s)")
+                tier_timings = {}
+                result_data = None
+                if hls_fast_path and is_hls_url(stream_url):
+                    # HLS fast path: playlists and a few segments instead of probe + ffmpeg
+                    result_data = get_stream_info_and_bitrate_hls(
+                        url=stream_url,
+                        segments=hls_segments,
+                        timeout=timeout,
+                        user_agent=user_agent,
+                        proxy=proxy
+                    )
+                    if result_data is not None:
+                        tier_timings['analysis'] = result_data['elapsed_time']
+                        _record_tier_timing('analysis', result_data['elapsed_time'])
+
+                if fast_probe and result_data is None:
+                    # Tier 1: cheap connect/probe check, dead streams stop here
+                    probe_data = probe_stream(
+                        url=stream_url,
+                        timeout=probe_timeout,
+                        user_agent=user_agent,
+                        analyze_duration=probe_analyze_duration,
+                        proxy=proxy
+                    )
+                    tier_timings['probe'] = probe_data['elapsed_time']
+                    rejected = _probe_rejects(probe_data)
+                    _record_tier_timing('probe', probe_data['elapsed_time'], rejected=rejected)
+                    if rejected:
+                        result_data = dict(probe_data, bitrate_kbps=None)
+                
+                if result_data is None:
+                    # Tier 2: single ffmpeg call to get all stream information
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.info("  Analyzing stream (single ffmpeg call)...")
+                    analysis_kwargs = {'realtime': realtime}
+                    if adaptive_duration:
+                        analysis_function = get_stream_info_and_bitrate_adaptive
+                        analysis_kwargs.update(min_duration=adaptive_min_duration, tolerance=adaptive_tolerance)
+                    elif streaming_parser:
+                        analysis_function = get_stream_info_and_bitrate_streaming
                     else:
-                        # Failure: one-liner with status and elapsed time
-                        logger.warning(f"  ✗ {stream_name}: Check failed - {result['status']} ({result_data['elapsed_time']:.2f}s)")
+                        analysis_function = get_stream_info_and_bitrate
+                    result_data = analysis_function(
+                        url=stream_url,
+                        duration=ffmpeg_duration,
+                        timeout=timeout,
+                        user_agent=user_agent,
+                        stream_startup_buffer=stream_startup_buffer,
+                        proxy=proxy,
+                        **analysis_kwargs
+                    )
+                    tier_timings['analysis'] = result_data['elapsed_time']
+                    _record_tier_timing('analysis', result_data['elapsed_time'])
+
+                result = _build_analysis_result(stream_id, stream_name, stream_url, result_data, tier_timings)
+                _log_analysis_result(result, result_data['elapsed_time'], stream_name)
                 
                 # Break on success
                 if result['status'] == "OK":
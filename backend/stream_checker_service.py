@@ -27,21 +27,37 @@ import time
 from collections import defaultdict, deque, Counter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
-import queue
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 
 from api_utils import (
     fetch_channel_streams,
     update_channel_streams,
-    _get_base_url,
-    patch_request
+    _get_base_url
 )
 
+# Import shared HTTP session pool sizing
+from http_session import configure_pool_size
+
 # Import UDI for direct data access
 from udi import get_udi_manager
 
 # Import dead streams tracker
-from dead_streams_tracker import DeadStreamsTracker
+from dead_streams_tracker import get_dead_streams_tracker
+
+# Import batched stream stats write-back
+from stream_stats_writer import get_stream_stats_writer
+
+# Import shared stream analysis result cache
+from stream_result_cache import get_stream_result_cache
+
+# Import persistent channel check queue
+from check_queue import StreamCheckQueue
+
+# Import in-memory progress bus
+from progress_bus import ProgressBus, get_progress_bus
+
+# Import batch stream scoring
+from stream_scoring import build_columns, compute_scores, parse_height, quality_preference_boost
 
 # Import channel settings manager
 from channel_settings_manager import get_channel_settings_manager
@@ -49,6 +65,9 @@ from channel_settings_manager import get_channel_settings_manager
 # Import profile config
 from profile_config import get_profile_config
 
+# Import changelog retention default
+from changelog_store import DEFAULT_RETENTION_DAYS as DEFAULT_CHANGELOG_RETENTION_DAYS
+
 # Import centralized stream stats utilities
 from stream_stats_utils import (
     parse_bitrate_value,
@@ -105,7 +124,19 @@ class StreamCheckConfig:
             'stream_startup_buffer': 10,  # seconds buffer for stream startup (max time before stream starts)
             'retries': 1,  # retry attempts
             'retry_delay': 10,  # seconds between retries
-            'user_agent': 'VLC/3.0.14'  # user agent for ffmpeg/ffprobe
+            'user_agent': 'VLC/3.0.14',  # user agent for ffmpeg/ffprobe
+            'fast_probe': True,  # run a quick ffprobe check first, dead streams skip the full analysis
+            'probe_timeout': 10,  # timeout in seconds for the fast probe
+            'probe_analyze_duration': 2,  # seconds of media analyzed by the fast probe
+            'streaming_parser': True,  # parse ffmpeg output while it runs instead of buffering it
+            'adaptive_duration': False,  # stop once the bitrate estimate has converged (ffmpeg_duration becomes the maximum)
+            'adaptive_min_duration': 5,  # seconds of media analyzed before the bitrate may be considered converged
+            'adaptive_tolerance': 0.05,  # maximum relative spread of the recent bitrate samples (0.05 = 5%)
+            'realtime': True,  # read streams at their native rate (-re); False reads at network speed and measures ffmpeg_duration seconds of media
+            'hls_fast_path': False,  # measure HLS (.m3u8) streams from downloaded segments instead of running ffmpeg
+            'hls_segments': 3,  # number of segments downloaded concurrently by the HLS fast path
+            'result_cache_ttl': 600,  # seconds an analysis result is reused for streams with the same URL within a check run (0 = disabled)
+            'result_cache_size': 5000  # maximum number of cached stream URLs
         },
         'scoring': {
             'weights': {
@@ -118,14 +149,16 @@ class StreamCheckConfig:
             'prefer_h265': True  # prefer h265 over h264
         },
         'queue': {
-            'max_size': 1000,
             'check_on_update': True,  # check channels when they receive M3U updates
-            'max_channels_per_run': 50  # limit channels per check cycle
+            'max_channels_per_run': 50,  # limit channels per check cycle
+            'priority_aging_seconds': 60  # seconds of waiting worth one priority level (prevents starvation)
         },
         'concurrent_streams': {
             'global_limit': 10,  # Maximum concurrent stream checks globally (0 = unlimited)
             'enabled': True,  # Enable concurrent checking via Celery
-            'stagger_delay': 1.0  # Delay in seconds between dispatching tasks to prevent simultaneous starts
+            'stagger_delay': 1.0,  # Delay in seconds between dispatching tasks to prevent simultaneous starts
+            'cross_channel': True,  # Check the streams of all queued channels through one shared worker pool
+            'engine': 'thread'  # 'thread' (one pool thread per check) or 'asyncio' (all checks on one event loop)
         },
         'dead_stream_handling': {
             'enabled': True,  # Enable dead stream removal
@@ -142,7 +175,8 @@ class StreamCheckConfig:
         'stream_ordering': {
             'provider_diversification': False,  # Enable provider diversification for better redundancy
             'diversification_mode': 'round_robin'  # Mode: 'round_robin' or 'weighted'
-        }
+        },
+        'changelog_retention_days': DEFAULT_CHANGELOG_RETENTION_DAYS  # Days of checker changelog kept on disk (0 keeps everything)
     }
     
     def __init__(self, config_file: Optional[str] = None) -> None:
@@ -293,7 +327,7 @@ class StreamCheckConfig:
         """
         Get configuration value using dot notation.
         
-        Supports nested keys like 'queue.max_size'.
+        Supports nested keys like 'queue.priority_aging_seconds'.
         
         Parameters:
             key (str): Configuration key (supports dot notation).
@@ -328,37 +362,187 @@ class StreamCheckConfig:
         return self.config.get('automation_controls', {}).get('scheduled_global_action', False)
 
 
+# Seconds to wait after a change before dirty channel update records are written
+DEFAULT_UPDATES_FLUSH_INTERVAL = 2.0
+
+# Number of journal entries after which channel_updates.json is rewritten
+DEFAULT_UPDATES_COMPACT_THRESHOLD = 1000
+
+
+def encode_stream_ids(stream_ids) -> str:
+    """Encode a set of stream IDs as sorted ranges, e.g. [101, 102, 103, 250] -> "101-103,250"."""
+    ranges = []
+    for stream_id in sorted({int(stream_id) for stream_id in stream_ids}):
+        if ranges and stream_id == ranges[-1][1] + 1:
+            ranges[-1][1] = stream_id
+        else:
+            ranges.append([stream_id, stream_id])
+    return ','.join(str(start) if start == end else f'{start}-{end}' for start, end in ranges)
+
+
+def decode_stream_ids(encoded: str) -> List[int]:
+    """Decode stream ID ranges created by encode_stream_ids() into a sorted list."""
+    stream_ids = []
+    for part in encoded.split(',') if encoded else []:
+        start, _, end = part.partition('-')
+        stream_ids.extend(range(int(start), int(end or start) + 1))
+    return stream_ids
+
+
 class ChannelUpdateTracker:
-    """Tracks which channels have received M3U updates."""
+    """Tracks which channels have received M3U updates.
+    
+    Changes are kept in memory and written behind: changed channels are
+    collected in a dirty set and appended to a journal next to
+    channel_updates.json once per flush interval, so marking thousands of
+    channels (e.g. for a global action) costs a single write. The journal is
+    folded into the JSON file once it holds more entries than there are
+    channels. Checked stream IDs are stored as compact ranges.
+    """
     
-    def __init__(self, tracker_file=None):
+    def __init__(self, tracker_file=None, flush_interval: float = DEFAULT_UPDATES_FLUSH_INTERVAL,
+                 compact_threshold: int = DEFAULT_UPDATES_COMPACT_THRESHOLD):
+        """Initialize the tracker.
+        
+        Args:
+            tracker_file: Path to the JSON file. Defaults to CONFIG_DIR/channel_updates.json
+            flush_interval: Seconds to wait after a change before writing it
+            compact_threshold: Minimum journal entries before the journal is
+                               folded into the JSON file
+        """
         if tracker_file is None:
             tracker_file = CONFIG_DIR / 'channel_updates.json'
         self.tracker_file = Path(tracker_file)
-        self.updates = self._load_updates()
+        self.journal_file = self.tracker_file.with_name(self.tracker_file.name + '.journal')
+        self.flush_interval = flush_interval
+        self.compact_threshold = compact_threshold
         self.lock = threading.Lock()
-        # Ensure the file is created on initialization
-        self._save_updates()
+        self._dirty: Set[str] = set()
+        self._global_check_dirty = False
+        self._journal = None
+        self._journal_entries = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self.updates = self._load_updates()
+        if not self.tracker_file.exists():
+            # Ensure the file is created on initialization
+            with self.lock:
+                self._save_updates()
     
     def _load_updates(self) -> Dict:
-        """Load update tracking data."""
+        """Load update tracking data from the JSON file and replay the journal."""
+        updates = {'channels': {}, 'last_global_check': None}
         if self.tracker_file.exists():
             try:
                 with open(self.tracker_file, 'r') as f:
-                    return json.load(f)
+                    updates = json.load(f)
             except (json.JSONDecodeError, FileNotFoundError):
                 logger.warning(f"Could not load updates from {self.tracker_file}, creating new")
-        return {'channels': {}, 'last_global_check': None}
+        updates.setdefault('channels', {})
+        
+        if self.journal_file.exists():
+            try:
+                with open(self.journal_file, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Partially written last line after a crash
+                            logger.warning(f"Skipping unreadable channel updates journal entry in {self.journal_file}")
+                            continue
+                        if 'channel' in entry:
+                            if entry['record'] is None:
+                                updates['channels'].pop(entry['channel'], None)
+                            else:
+                                updates['channels'][entry['channel']] = entry['record']
+                        if 'last_global_check' in entry:
+                            updates['last_global_check'] = entry['last_global_check']
+                        self._journal_entries += 1
+            except OSError as e:
+                logger.warning(f"Could not replay channel updates journal {self.journal_file}: {e}")
+        
+        # Convert checked stream ID lists written by older versions
+        for info in updates['channels'].values():
+            if 'checked_stream_ids' in info:
+                info['checked_streams'] = encode_stream_ids(info.pop('checked_stream_ids') or [])
+        return updates
     
     def _save_updates(self):
-        """Save update tracking data."""
+        """Write all update tracking data to the JSON file and truncate the journal.
+        
+        Note: This method assumes the lock is already held by the caller.
+        """
         try:
             self.tracker_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.tracker_file, 'w') as f:
-                json.dump(self.updates, f, indent=2)
+            temp_file = self.tracker_file.with_name(self.tracker_file.name + '.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(self.updates, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.tracker_file)
+            
+            # The JSON file now contains every journaled change
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self._journal_entries:
+                open(self.journal_file, 'w').close()
+                self._journal_entries = 0
         except Exception as e:
             logger.error(f"Failed to save channel updates: {e}")
     
+    def _mark_dirty(self, channel_keys=(), global_check: bool = False):
+        """Remember changed channels and schedule a flush.
+        
+        Note: This method assumes the lock is already held by the caller.
+        """
+        self._dirty.update(channel_keys)
+        self._global_check_dirty = self._global_check_dirty or global_check
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush(self):
+        """Write pending changes to disk now."""
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty and not self._global_check_dirty:
+                return
+            
+            channels = self.updates.get('channels', {})
+            entries = [{'channel': key, 'record': channels.get(key)} for key in self._dirty]
+            if self._global_check_dirty:
+                entries.append({'last_global_check': self.updates.get('last_global_check')})
+            self._dirty = set()
+            self._global_check_dirty = False
+            
+            if self._journal_entries + len(entries) >= max(self.compact_threshold, len(channels)):
+                logger.debug(f"Compacting channel updates journal ({self._journal_entries + len(entries)} entries)")
+                self._save_updates()
+                return
+            try:
+                if self._journal is None:
+                    self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._journal = open(self.journal_file, 'a')
+                self._journal.write(''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries))
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+                self._journal_entries += len(entries)
+            except Exception as e:
+                logger.error(f"Failed to journal channel updates: {e}")
+    
+    def _channel(self, channel_key: str) -> Dict:
+        """Get the record of a channel, creating an empty one if needed.
+        
+        Note: This method assumes the lock is already held by the caller.
+        """
+        channels = self.updates.setdefault('channels', {})
+        if channel_key not in channels:
+            channels[channel_key] = {}
+        return channels[channel_key]
+    
     def mark_channel_updated(self, channel_id: int, timestamp: str = None, stream_count: int = None):
         """Mark a channel as having received an update.
         
@@ -367,36 +551,7 @@ class ChannelUpdateTracker:
             timestamp: When the update occurred (defaults to now)
             stream_count: Number of streams in the channel after update
         """
-        if timestamp is None:
-            timestamp = datetime.now().isoformat()
-        
-        with self.lock:
-            if 'channels' not in self.updates:
-                self.updates['channels'] = {}
-            
-            channel_key = str(channel_id)
-            
-            # Always mark channel as needing check if stream count changed
-            # This ensures new streams are analyzed even during invulnerability period
-            if channel_key in self.updates['channels']:
-                channel_info = self.updates['channels'][channel_key]
-                # Preserve checked_stream_ids if they exist
-                checked_stream_ids = channel_info.get('checked_stream_ids', [])
-                
-                self.updates['channels'][channel_key] = {
-                    'last_update': timestamp,
-                    'needs_check': True,
-                    'stream_count': stream_count,
-                    'checked_stream_ids': checked_stream_ids
-                }
-            else:
-                self.updates['channels'][channel_key] = {
-                    'last_update': timestamp,
-                    'needs_check': True,
-                    'stream_count': stream_count,
-                    'checked_stream_ids': []
-                }
-            self._save_updates()
+        self._mark_updated([channel_id], timestamp, {channel_id: stream_count})
     
     def mark_channels_updated(self, channel_ids: List[int], timestamp: str = None, stream_counts: Dict[int, int] = None):
         """Mark multiple channels as updated.
@@ -406,47 +561,40 @@ class ChannelUpdateTracker:
             timestamp: When the update occurred (defaults to now)
             stream_counts: Optional dict mapping channel_id to stream count
         """
+        marked_count = self._mark_updated(channel_ids, timestamp, stream_counts)
+        logger.info(f"Marked {marked_count} channels as updated")
+    
+    def _mark_updated(self, channel_ids: List[int], timestamp: Optional[str],
+                      stream_counts: Optional[Dict[int, int]]) -> int:
+        """Mark channels as needing a check, keeping their checked streams.
+        
+        Returns:
+            Number of marked channels
+        """
         if timestamp is None:
             timestamp = datetime.now().isoformat()
         
         if stream_counts is None:
             stream_counts = {}
         
-        marked_count = 0
-        
         with self.lock:
-            if 'channels' not in self.updates:
-                self.updates['channels'] = {}
-            
+            channels = self.updates.setdefault('channels', {})
+            keys = []
             for channel_id in channel_ids:
                 channel_key = str(channel_id)
-                stream_count = stream_counts.get(channel_id)
-                
                 # Always mark channel if stream count changed (new streams added)
-                # Preserve checked_stream_ids if they exist
-                if channel_key in self.updates['channels']:
-                    channel_info = self.updates['channels'][channel_key]
-                    checked_stream_ids = channel_info.get('checked_stream_ids', [])
-                    
-                    self.updates['channels'][channel_key] = {
-                        'last_update': timestamp,
-                        'needs_check': True,
-                        'stream_count': stream_count,
-                        'checked_stream_ids': checked_stream_ids
-                    }
-                else:
-                    self.updates['channels'][channel_key] = {
-                        'last_update': timestamp,
-                        'needs_check': True,
-                        'stream_count': stream_count,
-                        'checked_stream_ids': []
-                    }
-                marked_count += 1
+                # Preserve checked streams if they exist
+                channels[channel_key] = {
+                    'last_update': timestamp,
+                    'needs_check': True,
+                    'stream_count': stream_counts.get(channel_id),
+                    'checked_streams': channels.get(channel_key, {}).get('checked_streams', '')
+                }
+                keys.append(channel_key)
             
-            if marked_count > 0:
-                self._save_updates()
-        
-        logger.info(f"Marked {marked_count} channels as updated")
+            if keys:
+                self._mark_dirty(keys)
+        return len(keys)
     
     def get_channels_needing_check(self) -> List[int]:
         """Get list of channel IDs that need checking (read-only, doesn't clear flag).
@@ -526,8 +674,9 @@ class ChannelUpdateTracker:
             if excluded_count > 0:
                 logger.info(f"Excluding {excluded_count} channel(s) with checking disabled (channel or group level)")
             
+            if channels:
+                self._mark_dirty(str(cid) for cid in channels)
             if filtered_channels:
-                self._save_updates()
                 logger.debug(f"Atomically retrieved and cleared {len(filtered_channels)} channels needing check")
             
             return filtered_channels
@@ -545,27 +694,16 @@ class ChannelUpdateTracker:
             timestamp = datetime.now().isoformat()
         
         with self.lock:
-            if 'channels' not in self.updates:
-                self.updates['channels'] = {}
-            
             channel_key = str(channel_id)
-            if channel_key in self.updates['channels']:
-                # Update existing entry
-                self.updates['channels'][channel_key]['needs_check'] = False
-                self.updates['channels'][channel_key]['last_check'] = timestamp
-                if stream_count is not None:
-                    self.updates['channels'][channel_key]['stream_count'] = stream_count
-                if checked_stream_ids is not None:
-                    self.updates['channels'][channel_key]['checked_stream_ids'] = checked_stream_ids
-            else:
-                # Create new entry
-                self.updates['channels'][channel_key] = {
-                    'needs_check': False,
-                    'last_check': timestamp,
-                    'stream_count': stream_count,
-                    'checked_stream_ids': checked_stream_ids if checked_stream_ids is not None else []
-                }
-            self._save_updates()
+            is_new = channel_key not in self.updates.get('channels', {})
+            channel_info = self._channel(channel_key)
+            channel_info['needs_check'] = False
+            channel_info['last_check'] = timestamp
+            if stream_count is not None or is_new:
+                channel_info['stream_count'] = stream_count
+            if checked_stream_ids is not None or is_new:
+                channel_info['checked_streams'] = encode_stream_ids(checked_stream_ids or [])
+            self._mark_dirty([channel_key])
     
     def get_checked_stream_ids(self, channel_id: int) -> List[int]:
         """Get the list of stream IDs that have been checked for a channel.
@@ -574,13 +712,11 @@ class ChannelUpdateTracker:
             channel_id: The channel ID to query
             
         Returns:
-            List of stream IDs that have been checked (empty list if none or channel not tracked)
+            Sorted list of stream IDs that have been checked (empty list if none or channel not tracked)
         """
         with self.lock:
-            channel_key = str(channel_id)
-            if channel_key in self.updates.get('channels', {}):
-                return self.updates['channels'][channel_key].get('checked_stream_ids', [])
-            return []
+            channel_info = self.updates.get('channels', {}).get(str(channel_id), {})
+            return decode_stream_ids(channel_info.get('checked_streams', ''))
     
     def mark_channel_for_force_check(self, channel_id: int):
         """Mark a channel for force checking (bypasses 2-hour immunity).
@@ -588,16 +724,20 @@ class ChannelUpdateTracker:
         Args:
             channel_id: The channel ID to mark for force check
         """
+        self.mark_channels_for_force_check([channel_id])
+    
+    def mark_channels_for_force_check(self, channel_ids: List[int]):
+        """Mark multiple channels for force checking (bypasses 2-hour immunity).
+        
+        Args:
+            channel_ids: The channel IDs to mark for force check
+        """
         with self.lock:
-            if 'channels' not in self.updates:
-                self.updates['channels'] = {}
-            
-            channel_key = str(channel_id)
-            if channel_key not in self.updates['channels']:
-                self.updates['channels'][channel_key] = {}
-            
-            self.updates['channels'][channel_key]['force_check'] = True
-            self._save_updates()
+            keys = [str(channel_id) for channel_id in channel_ids]
+            for channel_key in keys:
+                self._channel(channel_key)['force_check'] = True
+            if keys:
+                self._mark_dirty(keys)
     
     def should_force_check(self, channel_id: int) -> bool:
         """Check if a channel should be force checked (bypassing immunity).
@@ -624,7 +764,7 @@ class ChannelUpdateTracker:
             channel_key = str(channel_id)
             if channel_key in self.updates.get('channels', {}):
                 self.updates['channels'][channel_key]['force_check'] = False
-                self._save_updates()
+                self._mark_dirty([channel_key])
     
     def mark_global_check(self, timestamp: str = None):
         """Mark that a global check was initiated.
@@ -638,153 +778,59 @@ class ChannelUpdateTracker:
         
         with self.lock:
             self.updates['last_global_check'] = timestamp
-            self._save_updates()
+            self._mark_dirty(global_check=True)
     
     def get_last_global_check(self) -> Optional[str]:
         """Get timestamp of last global check."""
         return self.updates.get('last_global_check')
 
 
-class StreamCheckQueue:
-    """Queue manager for channel stream checking."""
-    
-    def __init__(self, max_size=1000):
-        self.queue = queue.Queue(maxsize=max_size)
-        self.queued = set()  # Track channels already in queue
-        self.in_progress = set()
-        self.completed = set()
-        self.failed = {}
-        self.lock = threading.Lock()
-        self.stats = {
-            'total_queued': 0,
-            'total_completed': 0,
-            'total_failed': 0,
-            'current_channel': None,
-            'queue_size': 0
-        }
-    
-    def add_channel(self, channel_id: int, priority: int = 0):
-        """Add a channel to the checking queue."""
-        with self.lock:
-            # Check if channel is already queued, in progress, or completed
-            if channel_id not in self.queued and channel_id not in self.in_progress and channel_id not in self.completed:
-                try:
-                    self.queue.put((priority, channel_id), block=False)
-                    self.queued.add(channel_id)
-                    self.stats['total_queued'] += 1
-                    self.stats['queue_size'] = self.queue.qsize()
-                    logger.debug(f"Added channel {channel_id} to queue (priority: {priority})")
-                    return True
-                except queue.Full:
-                    logger.warning(f"Queue is full, cannot add channel {channel_id}")
-                    return False
-        return False
-    
-    def add_channels(self, channel_ids: List[int], priority: int = 0):
-        """Add multiple channels to the queue."""
-        added = 0
-        for channel_id in channel_ids:
-            if self.add_channel(channel_id, priority):
-                added += 1
-        logger.info(f"Added {added}/{len(channel_ids)} channels to checking queue")
-        return added
-    
-    def remove_from_completed(self, channel_id: int):
-        """Remove a channel from the completed set to allow re-queueing.
-        
-        This is used when a channel receives new streams and needs to be
-        checked again, even if it was previously completed.
-        """
-        with self.lock:
-            if channel_id in self.completed:
-                self.completed.discard(channel_id)
-                logger.debug(f"Removed channel {channel_id} from completed set")
-                return True
-        return False
-    
-    def get_next_channel(self, timeout: float = 1.0) -> Optional[int]:
-        """Get the next channel to check."""
-        try:
-            priority, channel_id = self.queue.get(timeout=timeout)
-            with self.lock:
-                self.queued.discard(channel_id)  # Remove from queued set
-                self.in_progress.add(channel_id)
-                self.stats['current_channel'] = channel_id
-                self.stats['queue_size'] = self.queue.qsize()
-            return channel_id
-        except queue.Empty:
-            return None
-    
-    def mark_completed(self, channel_id: int):
-        """Mark a channel check as completed."""
-        with self.lock:
-            if channel_id in self.in_progress:
-                self.in_progress.remove(channel_id)
-            self.completed.add(channel_id)
-            self.stats['total_completed'] += 1
-            if self.stats['current_channel'] == channel_id:
-                self.stats['current_channel'] = None
-            logger.debug(f"Marked channel {channel_id} as completed")
-    
-    def mark_failed(self, channel_id: int, error: str):
-        """Mark a channel check as failed."""
-        with self.lock:
-            if channel_id in self.in_progress:
-                self.in_progress.remove(channel_id)
-            self.failed[channel_id] = {
-                'error': error,
-                'timestamp': datetime.now().isoformat()
-            }
-            self.stats['total_failed'] += 1
-            if self.stats['current_channel'] == channel_id:
-                self.stats['current_channel'] = None
-            logger.warning(f"Marked channel {channel_id} as failed: {error}")
-    
-    def get_status(self) -> Dict:
-        """Get current queue status."""
-        with self.lock:
-            return {
-                'queue_size': self.queue.qsize(),
-                'queued': len(self.queued),
-                'in_progress': len(self.in_progress),
-                'completed': len(self.completed),
-                'failed': len(self.failed),
-                'current_channel': self.stats['current_channel'],
-                'total_queued': self.stats['total_queued'],
-                'total_completed': self.stats['total_completed'],
-                'total_failed': self.stats['total_failed']
-            }
-    
-    def clear(self):
-        """Clear the queue and reset stats."""
-        with self.lock:
-            while not self.queue.empty():
-                try:
-                    self.queue.get_nowait()
-                except queue.Empty:
-                    break
-            self.queued.clear()
-            self.in_progress.clear()
-            self.completed.clear()
-            self.failed.clear()
-            self.stats = {
-                'total_queued': 0,
-                'total_completed': 0,
-                'total_failed': 0,
-                'current_channel': None,
-                'queue_size': 0
-            }
-        logger.info("Queue cleared")
-
-
 class StreamCheckerProgress:
-    """Manages progress tracking for stream checker operations."""
+    """Manages progress tracking for stream checker operations.
     
-    def __init__(self, progress_file=None):
+    Progress is kept in memory and published on the progress bus for the
+    Server-Sent Events endpoint. It is written to the progress file at most
+    every persist_interval seconds (for crash recovery), never on every update.
+    """
+    
+    def __init__(self, progress_file=None, persist_interval: float = 5.0, bus: Optional[ProgressBus] = None):
         if progress_file is None:
             progress_file = CONFIG_DIR / 'stream_checker_progress.json'
         self.progress_file = Path(progress_file)
+        self.persist_interval = persist_interval
+        self.bus = bus if bus is not None else get_progress_bus()
         self.lock = threading.Lock()
+        self._last_persisted = 0.0
+        # Recover the progress persisted before a restart
+        self._progress = self._load()
+    
+    def _load(self) -> Optional[Dict]:
+        """Load progress persisted by a previous run."""
+        if self.progress_file.exists():
+            try:
+                with open(self.progress_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                pass
+        return None
+    
+    def _persist(self, force: bool = False):
+        """Write the progress to the progress file if the persist interval has passed.
+        
+        Note: This method assumes the lock is already held by the caller.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_persisted < self.persist_interval:
+            return
+        self._last_persisted = now
+        try:
+            self.progress_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.progress_file.with_name(self.progress_file.name + '.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(self._progress, f)
+            os.replace(temp_file, self.progress_file)
+        except Exception as e:
+            logger.warning(f"Failed to write progress file: {e}")
     
     def update(self, channel_id: int, channel_name: str, current: int, total: int,
                current_stream: str = '', status: str = 'checking', step: str = '', step_detail: str = ''):
@@ -801,7 +847,7 @@ class StreamCheckerProgress:
             step_detail: Additional detail about the current step
         """
         with self.lock:
-            progress_data = {
+            self._progress = {
                 'channel_id': channel_id,
                 'channel_name': channel_name,
                 'current_stream': current,
@@ -813,35 +859,30 @@ class StreamCheckerProgress:
                 'step_detail': step_detail,
                 'timestamp': datetime.now().isoformat()
             }
-            
-            self.progress_file.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                with open(self.progress_file, 'w') as f:
-                    json.dump(progress_data, f)
-                    f.flush()
-                    os.fsync(f.fileno())
-            except Exception as e:
-                logger.warning(f"Failed to write progress file: {e}")
+            self.bus.publish('progress', self._progress)
+            self._persist()
     
     def clear(self):
         """Clear progress tracking."""
         with self.lock:
+            self._progress = None
+            self.bus.publish('progress', None)
             if self.progress_file.exists():
                 try:
                     self.progress_file.unlink()
                 except Exception as e:
                     logger.warning(f"Failed to delete progress file: {e}")
     
+    def flush(self):
+        """Write the current progress to the progress file now."""
+        with self.lock:
+            if self._progress is not None:
+                self._persist(force=True)
+    
     def get(self) -> Optional[Dict]:
         """Get current progress."""
         with self.lock:
-            if self.progress_file.exists():
-                try:
-                    with open(self.progress_file, 'r') as f:
-                        return json.load(f)
-                except (json.JSONDecodeError, FileNotFoundError):
-                    pass
-        return None
+            return self._progress
 
 
 class StreamCheckerService:
@@ -854,25 +895,35 @@ class StreamCheckerService:
         self.config = StreamCheckConfig()
         logger.debug(f"Config loaded: pipeline_mode={self.config.get('pipeline_mode')}")
         
+        # Size the Dispatcharr connection pool to the number of concurrent checks
+        configure_pool_size(self.config.get('concurrent_streams.global_limit', 10))
+        
         self.update_tracker = ChannelUpdateTracker()
         logger.debug("Update tracker initialized")
         
         self.check_queue = StreamCheckQueue(
-            max_size=self.config.get('queue.max_size', 1000)
+            queue_file=CONFIG_DIR / 'stream_check_queue.json',
+            aging_interval=self.config.get('queue.priority_aging_seconds', 60)
         )
-        logger.debug(f"Check queue initialized with max_size={self.config.get('queue.max_size', 1000)}")
+        logger.debug(f"Check queue initialized with {self.check_queue.get_status()['queue_size']} queued channel(s)")
         
         self.progress = StreamCheckerProgress()
         logger.debug("Progress tracker initialized")
         
-        self.dead_streams_tracker = DeadStreamsTracker()
+        self.dead_streams_tracker = get_dead_streams_tracker()
         logger.debug("Dead streams tracker initialized")
         
+        self.stats_writer = get_stream_stats_writer()
+        logger.debug("Stream stats writer initialized")
+        
         # Initialize changelog manager
         self.changelog = None
         if CHANGELOG_AVAILABLE:
             try:
-                self.changelog = ChangelogManager(changelog_file=CONFIG_DIR / "stream_checker_changelog.json")
+                self.changelog = ChangelogManager(
+                    changelog_file=CONFIG_DIR / "stream_checker_changelog.json",
+                    retention_days=self.config.get('changelog_retention_days', DEFAULT_CHANGELOG_RETENTION_DAYS)
+                )
                 logger.info("Stream checker changelog manager initialized")
             except Exception as e:
                 log_exception(logger, e, "changelog initialization")
@@ -886,6 +937,16 @@ class StreamCheckerService:
         self.running = False
         self.checking = False
         self.global_action_in_progress = False
+        
+        # Slot utilization of the last cross-channel check run and of the last global action
+        self.last_check_run_stats = None
+        self.last_global_action_stats = None
+        self._global_action_started_at = None
+        self._global_action_runs = []
+        if self.check_queue.global_action_started_at is not None:
+            # Resume the channel checks of a global action interrupted by a restart
+            self._global_action_started_at = self.check_queue.global_action_started_at
+            logger.info(f"Resuming interrupted global action with {self.check_queue.get_status()['queue_size']} channel(s) left to check")
         self.worker_thread = None
         self.scheduler_thread = None
         self.lock = threading.Lock()
@@ -911,6 +972,7 @@ class StreamCheckerService:
             
             log_state_change(logger, "stream_checker_service", "stopped", "starting")
             self.running = True
+            self._publish_status()
             
             # Start worker thread for processing queue
             self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
@@ -935,6 +997,7 @@ class StreamCheckerService:
             
             self.running = False
             logger.info("Stream checker service stopping...")
+        self._publish_status()
         
         # Wait for threads to finish
         if self.worker_thread and self.worker_thread.is_alive():
@@ -942,6 +1005,8 @@ class StreamCheckerService:
         if self.scheduler_thread and self.scheduler_thread.is_alive():
             self.scheduler_thread.join(timeout=5)
         
+        self.check_queue.flush()
+        self.update_tracker.flush()
         self.progress.clear()
         logger.info("Stream checker service stopped")
     
@@ -959,6 +1024,9 @@ class StreamCheckerService:
                     if self.batch_start_time is not None:
                         # Queue is empty and we have an active batch - finalize it
                         self._finalize_batch_changelog()
+                    if self._global_action_started_at is not None and not self.global_action_in_progress:
+                        # All channels queued by the global action have been checked
+                        self._finish_global_action_stats()
                     logger.debug("No channel in queue (timeout)")
                     continue
                 
@@ -966,6 +1034,23 @@ class StreamCheckerService:
                 if self.batch_start_time is None:
                     self._start_batch_changelog()
                 
+                if (self.config.get('concurrent_streams.enabled', True) and
+                        self.config.get('concurrent_streams.cross_channel', True)):
+                    # Check all queued channels through one shared stream-level pool
+                    channel_ids = [channel_id]
+                    max_channels = self.config.get('queue.max_channels_per_run', 50)
+                    while len(channel_ids) < max_channels:
+                        next_channel_id = self.check_queue.get_next_channel(timeout=0)
+                        if next_channel_id is None:
+                            break
+                        channel_ids.append(next_channel_id)
+                    
+                    if len(channel_ids) > 1:
+                        logger.debug(f"Worker processing {len(channel_ids)} channels in one pool")
+                        self._check_channels_cross_channel(channel_ids)
+                        logger.debug(f"Worker completed {len(channel_ids)} channels")
+                        continue
+                
                 logger.debug(f"Worker processing channel {channel_id}")
                 # Check this channel
                 self._check_channel(channel_id)
@@ -1046,6 +1131,7 @@ class StreamCheckerService:
             
             added = self.check_queue.add_channels(channels_to_queue, priority=10)
             logger.info(f"Queued {added}/{len(channels_to_queue)} updated channels for checking")
+            self._publish_status()
         else:
             logger.debug("No channels need checking")
     
@@ -1165,6 +1251,12 @@ class StreamCheckerService:
         try:
             # Set global action flag to prevent concurrent operations
             self.global_action_in_progress = True
+            self._global_action_started_at = time.time()
+            self._global_action_runs = []
+            self.check_queue.set_global_action_started(self._global_action_started_at)
+            self._publish_status()
+            # Analyze every URL once per global action
+            get_stream_result_cache().clear()
             logger.info("=" * 80)
             logger.info("STARTING GLOBAL ACTION")
             logger.info("Regular automation paused during global action")
@@ -1229,7 +1321,8 @@ class StreamCheckerService:
             logger.info("Step 5/6: Matching and assigning streams...")
             try:
                 if automation_manager is not None:
-                    assignments = automation_manager.discover_and_assign_streams()
+                    # Full re-match: previously dead streams are eligible again
+                    assignments = automation_manager.discover_and_assign_streams(full_rematch=True)
                     if assignments:
                         logger.info(f"✓ Assigned streams to {len(assignments)} channels")
                     else:
@@ -1255,6 +1348,7 @@ class StreamCheckerService:
         finally:
             # Always clear the flag, even if there was an error
             self.global_action_in_progress = False
+            self._publish_status()
     
     def _queue_all_channels(self, force_check: bool = False):
         """Queue all channels for checking (global check).
@@ -1329,8 +1423,7 @@ class StreamCheckerService:
                 
                 if force_check:
                     # Mark all enabled channels for force check (bypasses immunity)
-                    for channel_id in filtered_channel_ids:
-                        self.update_tracker.mark_channel_for_force_check(channel_id)
+                    self.update_tracker.mark_channels_for_force_check(filtered_channel_ids)
                 
                 # Remove channels from completed set to allow re-queueing
                 # This is necessary for global checks to re-check all channels
@@ -1362,6 +1455,10 @@ class StreamCheckerService:
         Returns:
             bool: True if stream is dead, False otherwise
         """
+        return utils_is_stream_dead(stream_data, self._get_dead_stream_thresholds())
+    
+    def _get_dead_stream_thresholds(self) -> Dict:
+        """Get the dead stream thresholds passed to the is_stream_dead utility."""
         # Get dead stream handling configuration
         dead_stream_config = self.config.get('dead_stream_handling', {})
         
@@ -1369,16 +1466,14 @@ class StreamCheckerService:
         # (except for the 0x0 resolution and 0 bitrate cases which are always dead)
         if not dead_stream_config.get('enabled', True):
             # Only check for absolute failures (0x0 resolution, 0 bitrate)
-            basic_config = {
+            return {
                 'min_resolution_width': 0,
                 'min_resolution_height': 0,
                 'min_bitrate_kbps': 0,
                 'min_score': 0
             }
-            return utils_is_stream_dead(stream_data, basic_config)
         
-        # Pass the configuration to the utility function
-        return utils_is_stream_dead(stream_data, dead_stream_config)
+        return dead_stream_config
     
     def _calculate_channel_averages(self, analyzed_streams: List[Dict], dead_stream_ids: set) -> Dict[str, str]:
         """Calculate channel-level average statistics from analyzed streams.
@@ -1416,7 +1511,7 @@ class StreamCheckerService:
             if not m3u_account_id:
                 return None
             
-            m3u_account = udi.get_m3u_account_by_id(m3u_account_id)
+            m3u_account = udi.get_m3u_account_scoring_info(m3u_account_id)
             if not m3u_account:
                 return None
             
@@ -1427,22 +1522,17 @@ class StreamCheckerService:
     
     
     def _update_stream_stats(self, stream_data: Dict) -> bool:
-        """Update stream stats for a single stream on the server and sync with UDI cache.
+        """Queue a stats update for a single analyzed stream.
         
-        This method:
-        1. Constructs the stats payload from analyzed stream data
-        2. Merges with existing stats on Dispatcharr
-        3. PATCHes the updated stats to Dispatcharr
-        4. Updates the UDI cache to keep it in sync
+        The stats payload is constructed from the analyzed stream data and added
+        to the stream stats writer. Queued updates are written back when the
+        channel check finishes (see _check_channel): each stream's stats are
+        merged with its existing stats on Dispatcharr, PATCHed, and the UDI
+        cache is updated in one batch so it reflects what was written.
         
-        This ensures that the UDI cache always reflects the latest stats written to Dispatcharr,
-        preventing inconsistencies between changelog data and actual Dispatcharr data.
+        Returns:
+            True if an update was queued
         """
-        base_url = _get_base_url()
-        if not base_url:
-            logger.error("DISPATCHARR_BASE_URL not set.")
-            return False
-        
         stream_id = stream_data.get("stream_id")
         if not stream_id:
             logger.warning("No stream_id in stream data. Skipping stats update.")
@@ -1464,45 +1554,16 @@ class StreamCheckerService:
             logger.debug(f"No data to update for stream {stream_id}. Skipping.")
             return False
         
-        # Construct the URL for the specific stream
-        stream_url = f"{base_url}/api/channels/streams/{int(stream_id)}/"
-        
+        logger.info(f"Queueing stream {stream_id} stats update: {stream_stats_payload}")
+        self.stats_writer.enqueue(int(stream_id), stream_stats_payload)
+        return True
+    
+    def _flush_stream_stats(self) -> None:
+        """Write all queued stream stats back to Dispatcharr and the UDI."""
         try:
-            # Fetch the existing stream data from UDI
-            udi = get_udi_manager()
-            existing_stream_data = udi.get_stream_by_id(int(stream_id))
-            if not existing_stream_data:
-                logger.warning(f"Could not fetch existing data for stream {stream_id}. Skipping stats update.")
-                return False
-            
-            # Get the existing stream_stats or an empty dict
-            existing_stats = existing_stream_data.get("stream_stats") or {}
-            if isinstance(existing_stats, str):
-                try:
-                    existing_stats = json.loads(existing_stats)
-                except json.JSONDecodeError:
-                    existing_stats = {}
-            
-            # Merge the existing stats with the new payload
-            updated_stats = {**existing_stats, **stream_stats_payload}
-            
-            # Send the PATCH request with the updated stream_stats
-            patch_payload = {"stream_stats": updated_stats}
-            logger.info(f"Updating stream {stream_id} stats with: {stream_stats_payload}")
-            patch_request(stream_url, patch_payload)
-            
-            # Update UDI cache with the new stats to keep it in sync with Dispatcharr
-            # This ensures changelog and verification read the correct, up-to-date data
-            updated_stream_data = existing_stream_data.copy()
-            updated_stream_data['stream_stats'] = updated_stats
-            udi.update_stream(int(stream_id), updated_stream_data)
-            logger.debug(f"Updated UDI cache for stream {stream_id} with new stats")
-            
-            return True
-        
+            self.stats_writer.flush()
         except Exception as e:
-            logger.error(f"Error updating stats for stream {stream_id}: {e}")
-            return False
+            logger.error(f"Error flushing stream stats: {e}")
     
     def _start_batch_changelog(self):
         """Start a new batch for changelog entries."""
@@ -1708,10 +1769,150 @@ class StreamCheckerService:
         """
         concurrent_enabled = self.config.get('concurrent_streams.enabled', True)
         
-        if concurrent_enabled:
-            return self._check_channel_concurrent(channel_id, skip_batch_changelog=skip_batch_changelog)
-        else:
-            return self._check_channel_sequential(channel_id, skip_batch_changelog=skip_batch_changelog)
+        try:
+            if concurrent_enabled:
+                return self._check_channel_concurrent(channel_id, skip_batch_changelog=skip_batch_changelog)
+            else:
+                return self._check_channel_sequential(channel_id, skip_batch_changelog=skip_batch_changelog)
+        finally:
+            # Write back the stats of all streams analyzed for this channel in one batch
+            self._flush_stream_stats()
+    
+    def _check_channels_cross_channel(self, channel_ids: List[int]):
+        """Check several queued channels through one shared stream-level worker pool.
+        
+        Instead of checking one channel at a time, the streams of all channels
+        are checked by SmartStreamScheduler.check_channels_with_limits, which
+        keeps all global slots busy while still respecting the per-account
+        limits. Each channel is scored and reordered as soon as its last stream
+        has been checked.
+        
+        Args:
+            channel_ids: IDs of the channels to check (already taken from the queue)
+        """
+        from concurrent_stream_limiter import initialize_account_limits
+        
+        log_function_call(logger, "_check_channels_cross_channel", channels=len(channel_ids))
+        self.checking = True
+        self._publish_status()
+        logger.info(f"=" * 80)
+        logger.info(f"Checking {len(channel_ids)} channels (cross-channel parallel mode)")
+        logger.info(f"=" * 80)
+        
+        try:
+            udi = get_udi_manager()
+            
+            jobs = {}
+            for channel_id in channel_ids:
+                log_state_change(logger, f"channel_{channel_id}", "queued", "checking")
+                job = None
+                try:
+                    job = self._prepare_concurrent_check(channel_id, udi)
+                except Exception as e:
+                    logger.error(f"Error checking channel {channel_id}: {e}", exc_info=True)
+                    self._record_channel_check_failure(channel_id, None, e)
+                    continue
+                if not job.get('done'):
+                    jobs[channel_id] = job
+            
+            if not jobs:
+                return
+            
+            global_limit = self.config.get('concurrent_streams.global_limit', 10)
+            stagger_delay = self.config.get('concurrent_streams.stagger_delay', 1.0)
+            
+            accounts = udi.get_m3u_accounts()
+            if accounts:
+                initialize_account_limits(accounts)
+                logger.debug(f"Initialized concurrent stream limits for {len(accounts)} M3U accounts")
+            
+            check_engine, engine_params = self._get_check_engine(
+                global_limit, force_check=any(job['force_check'] for job in jobs.values())
+            )
+            
+            def progress_callback(completed, total, result):
+                # DO NOT update stream stats here - a channel's stats are pushed
+                # once all of its checks are complete (see on_channel_complete)
+                channel_id = stream_channels.get(result.get('stream_id'))
+                channel_name = jobs[channel_id]['channel_name'] if channel_id in jobs else 'Multiple channels'
+                self.progress.update(
+                    channel_id=channel_id,
+                    channel_name=channel_name,
+                    current=completed,
+                    total=total,
+                    current_stream=result.get('stream_name', 'Unknown'),
+                    status='analyzing',
+                    step='Analyzing streams across channels',
+                    step_detail=f'Completed {completed}/{total} streams of {len(jobs)} channels'
+                )
+            
+            def on_channel_complete(channel_id, results):
+                job = jobs[channel_id]
+                try:
+                    self._complete_concurrent_check(job, results, udi)
+                except Exception as e:
+                    logger.error(f"Error checking channel {channel_id}: {e}", exc_info=True)
+                    self._record_channel_check_failure(channel_id, job['channel_data'], e)
+                finally:
+                    self._flush_stream_stats()
+            
+            # Attribute progress to a channel by stream ID
+            stream_channels = {}
+            for channel_id, job in jobs.items():
+                for stream in job['streams_to_check']:
+                    stream_channels.setdefault(stream['id'], channel_id)
+            
+            run_stats = check_engine.check_channels_with_limits(
+                channel_streams={channel_id: job['streams_to_check'] for channel_id, job in jobs.items()},
+                on_channel_complete=on_channel_complete,
+                progress_callback=progress_callback,
+                stagger_delay=stagger_delay,
+                **engine_params,
+                **self._get_analysis_params()
+            )
+            run_stats['global_limit'] = global_limit
+            run_stats['completed_at'] = datetime.now().isoformat()
+            self.last_check_run_stats = run_stats
+            if self._global_action_started_at is not None:
+                self._global_action_runs.append(run_stats)
+            
+            logger.info(
+                f"✓ Checked {run_stats['streams']} streams from {run_stats['channels']} channels in "
+                f"{run_stats['wall_time']:.1f}s, slot utilization {run_stats['slot_utilization']:.0%} "
+                f"(peak {run_stats['peak_concurrency']}/{global_limit} slots)"
+            )
+        except Exception as e:
+            logger.error(f"Error in cross-channel check: {e}", exc_info=True)
+        finally:
+            self.checking = False
+            self.progress.clear()
+            self._publish_status()
+            self._flush_stream_stats()
+            log_function_return(logger, "_check_channels_cross_channel")
+    
+    def _finish_global_action_stats(self):
+        """Record the wall time and slot utilization of the global action that just finished."""
+        wall_time = time.time() - self._global_action_started_at
+        runs = self._global_action_runs
+        busy_slot_seconds = sum(run['busy_slot_seconds'] for run in runs)
+        slot_capacity = sum(run['global_limit'] * run['check_time'] for run in runs)
+        
+        self.last_global_action_stats = {
+            'started_at': datetime.fromtimestamp(self._global_action_started_at).isoformat(),
+            'wall_time': round(wall_time, 3),
+            'check_runs': len(runs),
+            'channels': sum(run['channels'] for run in runs),
+            'streams': sum(run['streams'] for run in runs),
+            'check_time': round(sum(run['check_time'] for run in runs), 3),
+            'busy_slot_seconds': round(busy_slot_seconds, 3),
+            'slot_utilization': round(busy_slot_seconds / slot_capacity, 3) if slot_capacity > 0 else None
+        }
+        self._global_action_started_at = None
+        self._global_action_runs = []
+        self.check_queue.set_global_action_started(None)
+        
+        logger.info(f"Global action completed in {wall_time:.1f}s: {self.last_global_action_stats}")
+        self._publish_status()
     
     def _check_channel_concurrent(self, channel_id: int, skip_batch_changelog: bool = False):
         """Check and reorder streams for a specific channel using parallel thread pool.
@@ -1721,119 +1922,29 @@ class StreamCheckerService:
             skip_batch_changelog: If True, don't add this check to the batch changelog
         """
         import time as time_module
-        from stream_check_utils import analyze_stream
-        from concurrent_stream_limiter import get_smart_scheduler, get_account_limiter, initialize_account_limits
+        from concurrent_stream_limiter import initialize_account_limits
         
         start_time = time_module.time()
         log_function_call(logger, "_check_channel_concurrent", channel_id=channel_id)
         
         log_state_change(logger, f"channel_{channel_id}", "queued", "checking")
         self.checking = True
+        self._publish_status()
         logger.info(f"=" * 80)
         logger.info(f"Checking channel {channel_id} (parallel mode)")
         logger.info(f"=" * 80)
         
-        # Get dead stream removal configuration early (used later in finally block)
-        dead_stream_removal_enabled = self.config.get('dead_stream_handling', {}).get('enabled', True)
-        
+        job = None
         try:
-            # Get channel information from UDI
-            logger.debug(f"Updating progress for channel {channel_id} initialization")
-            self.progress.update(
-                channel_id=channel_id,
-                channel_name='Loading...',
-                current=0,
-                total=0,
-                status='initializing',
-                step='Fetching channel info',
-                step_detail='Retrieving channel data from UDI'
-            )
-            
             udi = get_udi_manager()
-            base_url = _get_base_url()
-            logger.debug(f"Fetching channel data for channel {channel_id} from UDI")
-            channel_data = udi.get_channel_by_id(channel_id)
-            if not channel_data:
-                logger.error(f"UDI returned None for channel {channel_id}")
-                raise Exception(f"Could not fetch channel {channel_id}")
+            job = self._prepare_concurrent_check(channel_id, udi)
+            if job.get('done'):
+                return job['result']
             
-            channel_name = channel_data.get('name', f'Channel {channel_id}')
-            
-            # Get streams for this channel
-            self.progress.update(
-                channel_id=channel_id,
-                channel_name=channel_name,
-                current=0,
-                total=0,
-                status='initializing',
-                step='Fetching streams',
-                step_detail=f'Loading streams for {channel_name}'
-            )
-            
-            streams = fetch_channel_streams(channel_id)
-            if not streams or len(streams) == 0:
-                logger.info(f"No streams found for channel {channel_name}")
-                self.check_queue.mark_completed(channel_id)
-                self.update_tracker.mark_channel_checked(channel_id)
-                return {
-                    'dead_streams_count': 0,
-                    'revived_streams_count': 0
-                }
-            
-            logger.info(f"Found {len(streams)} streams for channel {channel_name}")
-            
-            # Check if channel has active viewers or if its playlist has reached max concurrent streams
-            limit_check_result = self._check_channel_limits(channel_id, channel_name, streams)
-            if limit_check_result is not None:
-                self.check_queue.mark_completed(channel_id)
-                self.update_tracker.mark_channel_checked(channel_id)
-                return limit_check_result
-            
-            # Check if this is a force check (bypasses 2-hour immunity)
-            force_check = self.update_tracker.should_force_check(channel_id)
-            
-            # Get list of already checked streams to avoid re-analyzing
-            checked_stream_ids = self.update_tracker.get_checked_stream_ids(channel_id)
-            current_stream_ids = [s['id'] for s in streams]
-            
-            # Identify which streams need analysis (new or unchecked)
-            if force_check:
-                streams_to_check = streams
-                streams_already_checked = []
-                logger.info(f"Force check enabled: analyzing all {len(streams)} streams (bypassing 2-hour immunity)")
-                self.update_tracker.clear_force_check(channel_id)
-            else:
-                streams_to_check = [s for s in streams if s['id'] not in checked_stream_ids]
-                streams_already_checked = [s for s in streams if s['id'] in checked_stream_ids]
-                
-                if streams_to_check:
-                    logger.info(f"Found {len(streams_to_check)} new/unchecked streams (out of {len(streams)} total)")
-                else:
-                    logger.info(f"All {len(streams)} streams have been recently checked, using cached scores")
-                    
-                    # Optimization: Skip check entirely if all conditions are met:
-                    # 1. No new streams to analyze (all have been checked)
-                    # 2. Stream count matches previous check (no additions/deletions)
-                    # 3. Set of stream IDs is identical (no stream replacements)
-                    previous_stream_count = len(checked_stream_ids)
-                    current_stream_count = len(current_stream_ids)
-                    
-                    if (current_stream_count == previous_stream_count and 
-                        set(current_stream_ids) == set(checked_stream_ids)):
-                        logger.info(f"Channel {channel_name} unchanged since last check - skipping reorder")
-                        self.check_queue.mark_completed(channel_id)
-                        # Update timestamp but keep existing checked_stream_ids
-                        self.update_tracker.mark_channel_checked(
-                            channel_id,
-                            stream_count=current_stream_count,
-                            checked_stream_ids=checked_stream_ids
-                        )
-                        return
-                    else:
-                        logger.info(f"Channel composition changed (prev: {previous_stream_count}, curr: {current_stream_count}) - will reorder")
+            channel_name = job['channel_name']
+            streams_to_check = job['streams_to_check']
             
             # Get configuration for analysis
-            analysis_params = self.config.get('stream_analysis', {})
             global_limit = self.config.get('concurrent_streams.global_limit', 10)
             stagger_delay = self.config.get('concurrent_streams.stagger_delay', 1.0)
             
@@ -1844,14 +1955,12 @@ class StreamCheckerService:
                 logger.debug(f"Initialized concurrent stream limits for {len(accounts)} M3U accounts")
             
             # Initialize smart scheduler with account-aware limiting
-            smart_scheduler = get_smart_scheduler(global_limit=global_limit)
+            smart_scheduler, engine_params = self._get_check_engine(global_limit, force_check=job['force_check'])
             
             # Prepare for concurrent execution
-            analyzed_streams = []
-            dead_stream_ids = set()  # Use set for O(1) lookups
-            revived_stream_ids = []
             total_streams = len(streams_to_check)
             completed_count = [0]  # Use list for mutable closure
+            results = []
             
             # Progress callback for parallel checker
             def progress_callback(completed, total, result):
@@ -1886,309 +1995,24 @@ class StreamCheckerService:
                     step_detail=f'Using smart scheduler with per-account limits'
                 )
                 
-                # Create a wrapper function that includes proxy support
-                def analyze_stream_with_proxy(stream_url, stream_id, stream_name, **kwargs):
-                    """Wrapper function that adds proxy support to analyze_stream for concurrent checking."""
-                    # Get HTTP proxy for this stream from its M3U account
-                    from api_utils import get_stream_proxy
-                    proxy = get_stream_proxy(stream_id)
-                    
-                    # Call analyze_stream with proxy parameter
-                    return analyze_stream(
-                        stream_url=stream_url,
-                        stream_id=stream_id,
-                        stream_name=stream_name,
-                        proxy=proxy,
-                        **kwargs
-                    )
-                
                 # Check streams in parallel with account-aware limits
                 results = smart_scheduler.check_streams_with_limits(
                     streams=streams_to_check,
-                    check_function=analyze_stream_with_proxy,
                     progress_callback=progress_callback,
                     stagger_delay=stagger_delay,
-                    ffmpeg_duration=analysis_params.get('ffmpeg_duration', 30),
-                    timeout=analysis_params.get('timeout', 30),
-                    retries=analysis_params.get('retries', 1),
-                    retry_delay=analysis_params.get('retry_delay', 10),
-                    user_agent=analysis_params.get('user_agent', 'VLC/3.0.14'),
-                    stream_startup_buffer=analysis_params.get('stream_startup_buffer', 10)
-                )
-                
-                # Process results - ALL checks are complete at this point
-                # This is the correct place to update stats and track dead streams
-                for analyzed in results:
-                    # Update stream stats on Dispatcharr with ffmpeg-extracted data
-                    # Now that all parallel checks are complete, we can safely push the info
-                    self._update_stream_stats(analyzed)
-                    
-                    # Check if stream is dead
-                    is_dead = self._is_stream_dead(analyzed)
-                    stream_id = analyzed.get('stream_id')
-                    stream_url = analyzed.get('stream_url', '')
-                    stream_name = analyzed.get('stream_name', 'Unknown')
-                    was_dead = self.dead_streams_tracker.is_dead(stream_url)
-                    
-                    if is_dead and not was_dead:
-                        if self.dead_streams_tracker.mark_as_dead(stream_url, stream_id, stream_name, channel_id):
-                            dead_stream_ids.add(stream_id)
-                            logger.warning(f"Stream {stream_id} detected as DEAD: {stream_name}")
-                        else:
-                            logger.error(f"Failed to mark stream {stream_id} as dead in tracker")
-                    elif not is_dead and was_dead:
-                        if self.dead_streams_tracker.mark_as_alive(stream_url):
-                            revived_stream_ids.append(stream_id)
-                            logger.info(f"Stream {stream_id} REVIVED: {stream_name}")
-                    elif is_dead and was_dead:
-                        logger.debug(f"Stream {stream_id} remains dead (already marked)")
-                        # Add to dead_stream_ids so the stream removal logic (line 1455) will filter it out
-                        dead_stream_ids.add(stream_id)
-                    
-                    # Calculate score
-                    score = self._calculate_stream_score(analyzed, channel_id)
-                    analyzed['score'] = score
-                    analyzed['channel_id'] = channel_id
-                    analyzed['channel_name'] = channel_name
-                    analyzed_streams.append(analyzed)
-                
-                logger.info(f"Completed smart parallel analysis of {len(results)} streams with account-aware limits")
-            
-            # Process already-checked streams (use cached data)
-            for stream in streams_already_checked:
-                stream_data = udi.get_stream_by_id(stream['id'])
-                if stream_data:
-                    stream_stats = stream_data.get('stream_stats', {})
-                    if stream_stats is None:
-                        stream_stats = {}
-                    if isinstance(stream_stats, str):
-                        try:
-                            stream_stats = json.loads(stream_stats)
-                            if stream_stats is None:
-                                stream_stats = {}
-                        except json.JSONDecodeError:
-                            stream_stats = {}
-                    
-                    analyzed = {
-                        'channel_id': channel_id,
-                        'channel_name': channel_name,
-                        'stream_id': stream['id'],
-                        'stream_name': stream.get('name', 'Unknown'),
-                        'stream_url': stream.get('url', ''),
-                        'resolution': stream_stats.get('resolution', '0x0'),
-                        'fps': stream_stats.get('source_fps', 0),
-                        'video_codec': stream_stats.get('video_codec', 'N/A'),
-                        'audio_codec': stream_stats.get('audio_codec', 'N/A'),
-                        'bitrate_kbps': stream_stats.get('ffmpeg_output_bitrate', 0),
-                        'status': 'OK'
-                    }
-                    
-                    # Check if cached stream is dead
-                    stream_url = stream.get('url', '')
-                    stream_name = stream.get('name', 'Unknown')
-                    is_dead = self._is_stream_dead(analyzed)
-                    was_dead = self.dead_streams_tracker.is_dead(stream_url)
-                    
-                    # Handle dead/alive state transitions (same logic as newly-checked streams)
-                    if is_dead and not was_dead:
-                        # Newly detected as dead
-                        if self.dead_streams_tracker.mark_as_dead(stream_url, stream['id'], stream_name, channel_id):
-                            dead_stream_ids.add(stream['id'])
-                            logger.warning(f"Cached stream {stream['id']} detected as DEAD: {stream_name}")
-                        else:
-                            logger.error(f"Failed to mark cached stream {stream['id']} as dead in tracker")
-                    elif not is_dead and was_dead:
-                        # Stream was revived!
-                        if self.dead_streams_tracker.mark_as_alive(stream_url):
-                            revived_stream_ids.append(stream['id'])
-                            logger.info(f"Cached stream {stream['id']} REVIVED: {stream_name}")
-                        else:
-                            logger.error(f"Failed to mark cached stream {stream['id']} as alive")
-                    elif is_dead and was_dead:
-                        # Stream remains dead (already marked)
-                        logger.debug(f"Cached stream {stream['id']} remains dead (already marked)")
-                        dead_stream_ids.add(stream['id'])
-                    
-                    score = self._calculate_stream_score(analyzed, channel_id)
-                    analyzed['score'] = score
-                    analyzed_streams.append(analyzed)
-            
-            # Sort streams by score (highest first)
-            self.progress.update(
-                channel_id=channel_id,
-                channel_name=channel_name,
-                current=len(streams),
-                total=len(streams),
-                status='processing',
-                step='Calculating scores',
-                step_detail='Sorting streams by quality score'
-            )
-            analyzed_streams.sort(key=lambda x: x.get('score', 0), reverse=True)
-            
-            # Apply provider diversification if enabled
-            if self.config.get('stream_ordering', {}).get('provider_diversification', False):
-                analyzed_streams = self._apply_provider_diversification(analyzed_streams, channel_id)
-            
-            # Remove dead streams from the channel (if enabled in config)
-            # Dead streams are checked during all channel checks (normal and global)
-            # If they're still dead, they're removed; if revived, they remain
-            if dead_stream_ids:
-                if dead_stream_removal_enabled:
-                    logger.warning(f"🔴 Removing {len(dead_stream_ids)} dead streams from channel {channel_name}")
-                    analyzed_streams = [s for s in analyzed_streams if s.get('stream_id') not in dead_stream_ids]
-                else:
-                    logger.info(f"⚠️ Found {len(dead_stream_ids)} dead streams in channel {channel_name}, but removal is disabled in config")
-            
-            if revived_stream_ids:
-                logger.info(f"{len(revived_stream_ids)} streams were revived in channel {channel_name}")
-            
-            # Update channel with reordered streams
-            self.progress.update(
-                channel_id=channel_id,
-                channel_name=channel_name,
-                current=len(streams),
-                total=len(streams),
-                status='updating',
-                step='Reordering streams',
-                step_detail='Applying new stream order to channel'
-            )
-            reordered_ids = [s.get('stream_id') for s in analyzed_streams if s.get('stream_id') is not None]
-            # Dead streams have already been filtered from analyzed_streams if removal is enabled
-            # If removal is disabled, allow them to remain in the channel
-            update_channel_streams(channel_id, reordered_ids, allow_dead_streams=(not dead_stream_removal_enabled))
-            
-            # Verify the update
-            self.progress.update(
-                channel_id=channel_id,
-                channel_name=channel_name,
-                current=len(streams),
-                total=len(streams),
-                status='verifying',
-                step='Verifying update',
-                step_detail='Confirming stream order was applied'
-            )
-            time_module.sleep(0.5)
-            udi.refresh_channel_by_id(channel_id)
-            
-            logger.info(f"✓ Channel {channel_name} checked and streams reordered (parallel mode)")
-            
-            # Add to batch changelog instead of creating individual entry
-            if self.changelog:
-                try:
-                    # Get channel logo URL
-                    logo_url = None
-                    logo_id = channel_data.get('logo_id')
-                    if logo_id:
-                        logo = udi.get_logo_by_id(logo_id)
-                        if logo:
-                            logo_url = logo.get('cache_url') or logo.get('url')
-                    
-                    # Calculate channel-level averages from analyzed streams
-                    averages = self._calculate_channel_averages(analyzed_streams, dead_stream_ids)
-                    
-                    stream_stats = []
-                    for analyzed in analyzed_streams[:10]:  # Limit to first 10
-                        stream_id = analyzed.get('stream_id')
-                        is_dead = stream_id in dead_stream_ids
-                        is_revived = stream_id in revived_stream_ids
-                        
-                        # Extract and format stats using centralized utilities
-                        extracted_stats = extract_stream_stats(analyzed)
-                        formatted_stats = format_stream_stats_for_display(extracted_stats)
-                        
-                        # Get M3U account name for this stream using helper method
-                        m3u_account_name = self._get_m3u_account_name(stream_id, udi)
-                        
-                        stream_stat = {
-                            'stream_id': stream_id,
-                            'stream_name': analyzed.get('stream_name'),
-                            'resolution': formatted_stats['resolution'],
-                            'fps': formatted_stats['fps'],
-                            'video_codec': formatted_stats['video_codec'],
-                            'bitrate': formatted_stats['bitrate'],
-                            'm3u_account': m3u_account_name
-                        }
-                        
-                        # Mark dead streams as "dead" instead of showing score:0
-                        if is_dead:
-                            stream_stat['status'] = 'dead'
-                        elif is_revived:
-                            stream_stat['status'] = 'revived'
-                            stream_stat['score'] = round(analyzed.get('score', 0), 2)
-                        else:
-                            stream_stat['score'] = round(analyzed.get('score', 0), 2)
-                        
-                        stream_stats.append({k: v for k, v in stream_stat.items() if v not in [None, "N/A"]})
-                    
-                    # Add to batch instead of creating individual changelog entry
-                    # Only add to batch if not explicitly skipped (e.g., when called from check_single_channel)
-                    if not skip_batch_changelog:
-                        self._add_to_batch_changelog({
-                            'channel_id': channel_id,
-                            'channel_name': channel_name,
-                            'logo_url': logo_url,
-                            'total_streams': len(streams),
-                            'streams_analyzed': len(analyzed_streams),
-                            'dead_streams_detected': len(dead_stream_ids),
-                            'streams_revived': len(revived_stream_ids),
-                            'avg_resolution': averages['avg_resolution'],
-                            'avg_bitrate': averages['avg_bitrate'],
-                            'avg_fps': averages['avg_fps'],
-                            'success': True,
-                            'stream_stats': stream_stats
-                        })
-                except Exception as e:
-                    logger.warning(f"Failed to add to batch changelog: {e}")
-            
-            # Mark as completed
-            self.check_queue.mark_completed(channel_id)
-            # Update current_stream_ids to exclude dead streams that were removed
-            # This prevents dead stream IDs from being saved in checked_stream_ids
-            # which would cause them to be skipped by 2-hour immunity even after revival
-            # Note: Using list comprehension instead of set operations to preserve order
-            # Only exclude dead streams if removal is enabled
-            if dead_stream_removal_enabled:
-                final_stream_ids = [sid for sid in current_stream_ids if sid not in dead_stream_ids]
-            else:
-                final_stream_ids = current_stream_ids  # Keep all streams if removal is disabled
-            self.update_tracker.mark_channel_checked(
-                channel_id, 
-                stream_count=len(streams),
-                checked_stream_ids=final_stream_ids
-            )
-            
-            # Return statistics for callers that need them
-            return {
-                'dead_streams_count': len(dead_stream_ids),
-                'revived_streams_count': len(revived_stream_ids)
-            }
+                    **engine_params,
+                    **self._get_analysis_params()
+                )
+                
+                logger.info(f"Completed smart parallel analysis of {len(results)} streams with account-aware limits")
+            
+            return self._complete_concurrent_check(job, results, udi, skip_batch_changelog=skip_batch_changelog)
             
         except Exception as e:
             logger.error(f"Error checking channel {channel_id}: {e}", exc_info=True)
-            self.check_queue.mark_failed(channel_id, str(e))
-            
-            # Only add to batch changelog if not explicitly skipped
-            if self.changelog and not skip_batch_changelog:
-                try:
-                    try:
-                        channel_name = channel_data.get('name', f'Channel {channel_id}')
-                    except:
-                        channel_name = f'Channel {channel_id}'
-                    
-                    # Add failed check to batch
-                    self._add_to_batch_changelog({
-                        'channel_id': channel_id,
-                        'channel_name': channel_name,
-                        'total_streams': 0,
-                        'streams_analyzed': 0,
-                        'dead_streams_detected': 0,
-                        'streams_revived': 0,
-                        'success': False,
-                        'error': str(e),
-                        'stream_stats': []
-                    })
-                except Exception as changelog_error:
-                    logger.warning(f"Failed to add to batch changelog: {changelog_error}")
+            self._record_channel_check_failure(
+                channel_id, job.get('channel_data') if job else None, e, skip_batch_changelog
+            )
             
             # Return empty stats on error
             return {
@@ -2199,7 +2023,543 @@ class StreamCheckerService:
         finally:
             self.checking = False
             self.progress.clear()
+            self._publish_status()
             log_function_return(logger, "_check_channel_concurrent")
+    
+    def _get_check_engine(self, global_limit: int, force_check: bool = False) -> Tuple[Any, Dict[str, Any]]:
+        """Get the scheduler of the configured check engine.
+        
+        concurrent_streams.engine selects 'thread' (SmartStreamScheduler, one
+        pool thread per running check) or 'asyncio' (AsyncCheckEngine, all
+        checks on one event loop).
+        
+        Args:
+            global_limit: Maximum number of concurrent checks
+            force_check: Whether the checked channels are force checked
+            
+        Returns:
+            Tuple of (scheduler, extra keyword arguments for its check methods)
+        """
+        result_cache = self._get_result_cache(force_check)
+        if self.config.get('concurrent_streams.engine', 'thread') == 'asyncio':
+            from async_check_engine import get_async_check_engine
+            return get_async_check_engine(global_limit=global_limit), {'result_cache': result_cache}
+        
+        from concurrent_stream_limiter import get_smart_scheduler
+        return get_smart_scheduler(global_limit=global_limit), {
+            'check_function': self._analyze_stream_with_proxy,
+            'result_cache': result_cache
+        }
+    
+    def _get_result_cache(self, force_check: bool = False):
+        """Get the shared stream result cache configured from stream_analysis.
+        
+        Force checks outside a global action (check_single_channel, queue
+        requests with force_check) always analyze the streams again. The
+        global action force checks every channel, but clears the cache when
+        it starts, so its results are only shared within that run.
+        
+        Args:
+            force_check: Whether the checked channels are force checked
+            
+        Returns:
+            StreamResultCache, or None if result_cache_ttl is 0 or the cache is bypassed
+        """
+        if force_check and not self.global_action_in_progress:
+            return None
+        ttl = self.config.get('stream_analysis.result_cache_ttl', 600)
+        if not ttl or ttl <= 0:
+            return None
+        result_cache = get_stream_result_cache()
+        result_cache.configure(ttl=ttl, max_entries=self.config.get('stream_analysis.result_cache_size', 5000))
+        return result_cache
+    
+    def _analyze_stream_cached(self, stream_url: str, stream: Dict[str, Any], result_cache) -> Dict[str, Any]:
+        """Analyze a stream with the stream_analysis config, through the result cache (if given).
+        
+        Args:
+            stream_url: Stream URL after the profile URL transformation
+            stream: Stream being analyzed
+            result_cache: StreamResultCache from _get_result_cache(), or None
+            
+        Returns:
+            Analysis result for the stream
+        """
+        def analyze():
+            return self._analyze_stream_with_proxy(
+                stream_url, stream['id'], stream.get('name', 'Unknown'), **self._get_analysis_params()
+            )
+        
+        if result_cache is None:
+            return analyze()
+        return result_cache.get_or_compute(stream_url, stream, analyze)
+    
+    def _get_analysis_params(self) -> Dict[str, Any]:
+        """Get the analyze_stream keyword arguments from the stream_analysis config."""
+        analysis_params = self.config.get('stream_analysis', {})
+        return {
+            'ffmpeg_duration': analysis_params.get('ffmpeg_duration', 30),
+            'timeout': analysis_params.get('timeout', 30),
+            'retries': analysis_params.get('retries', 1),
+            'retry_delay': analysis_params.get('retry_delay', 10),
+            'user_agent': analysis_params.get('user_agent', 'VLC/3.0.14'),
+            'stream_startup_buffer': analysis_params.get('stream_startup_buffer', 10),
+            'fast_probe': analysis_params.get('fast_probe', True),
+            'probe_timeout': analysis_params.get('probe_timeout', 10),
+            'probe_analyze_duration': analysis_params.get('probe_analyze_duration', 2),
+            'streaming_parser': analysis_params.get('streaming_parser', True),
+            'adaptive_duration': analysis_params.get('adaptive_duration', False),
+            'adaptive_min_duration': analysis_params.get('adaptive_min_duration', 5),
+            'adaptive_tolerance': analysis_params.get('adaptive_tolerance', 0.05),
+            'realtime': analysis_params.get('realtime', True),
+            'hls_fast_path': analysis_params.get('hls_fast_path', False),
+            'hls_segments': analysis_params.get('hls_segments', 3)
+        }
+    
+    @staticmethod
+    def _analyze_stream_with_proxy(stream_url, stream_id, stream_name, **kwargs):
+        """Wrapper function that adds proxy support to analyze_stream for concurrent checking."""
+        from stream_check_utils import analyze_stream
+        from api_utils import get_stream_proxy
+        
+        # Get HTTP proxy for this stream from its M3U account
+        proxy = get_stream_proxy(stream_id)
+        
+        # Call analyze_stream with proxy parameter
+        return analyze_stream(
+            stream_url=stream_url,
+            stream_id=stream_id,
+            stream_name=stream_name,
+            proxy=proxy,
+            **kwargs
+        )
+    
+    def _prepare_concurrent_check(self, channel_id: int, udi) -> Dict[str, Any]:
+        """Load a channel and decide which of its streams need to be analyzed.
+        
+        Channels that need no analysis (no streams, viewer/playlist limits,
+        unchanged since the last check) are completed here.
+        
+        Args:
+            channel_id: ID of the channel to check
+            udi: UDI manager instance
+            
+        Returns:
+            Check job with the channel data, its streams and the streams to analyze.
+            If the channel was completed here, 'done' is True and 'result' holds
+            the value to return for the check.
+        """
+        # Get channel information from UDI
+        logger.debug(f"Updating progress for channel {channel_id} initialization")
+        self.progress.update(
+            channel_id=channel_id,
+            channel_name='Loading...',
+            current=0,
+            total=0,
+            status='initializing',
+            step='Fetching channel info',
+            step_detail='Retrieving channel data from UDI'
+        )
+        
+        base_url = _get_base_url()
+        logger.debug(f"Fetching channel data for channel {channel_id} from UDI")
+        channel_data = udi.get_channel_by_id(channel_id)
+        if not channel_data:
+            logger.error(f"UDI returned None for channel {channel_id}")
+            raise Exception(f"Could not fetch channel {channel_id}")
+        
+        channel_name = channel_data.get('name', f'Channel {channel_id}')
+        job = {
+            'channel_id': channel_id,
+            'channel_data': channel_data,
+            'channel_name': channel_name,
+            'done': False
+        }
+        
+        # Get streams for this channel
+        self.progress.update(
+            channel_id=channel_id,
+            channel_name=channel_name,
+            current=0,
+            total=0,
+            status='initializing',
+            step='Fetching streams',
+            step_detail=f'Loading streams for {channel_name}'
+        )
+        
+        streams = fetch_channel_streams(channel_id)
+        if not streams or len(streams) == 0:
+            logger.info(f"No streams found for channel {channel_name}")
+            self.check_queue.mark_completed(channel_id)
+            self.update_tracker.mark_channel_checked(channel_id)
+            job.update(done=True, result={
+                'dead_streams_count': 0,
+                'revived_streams_count': 0
+            })
+            return job
+        
+        logger.info(f"Found {len(streams)} streams for channel {channel_name}")
+        
+        # Check if channel has active viewers or if its playlist has reached max concurrent streams
+        limit_check_result = self._check_channel_limits(channel_id, channel_name, streams)
+        if limit_check_result is not None:
+            self.check_queue.mark_completed(channel_id)
+            self.update_tracker.mark_channel_checked(channel_id)
+            job.update(done=True, result=limit_check_result)
+            return job
+        
+        # Check if this is a force check (bypasses 2-hour immunity)
+        force_check = self.update_tracker.should_force_check(channel_id)
+        
+        # Get list of already checked streams to avoid re-analyzing
+        checked_stream_ids = self.update_tracker.get_checked_stream_ids(channel_id)
+        current_stream_ids = [s['id'] for s in streams]
+        
+        # Identify which streams need analysis (new or unchecked)
+        if force_check:
+            streams_to_check = streams
+            streams_already_checked = []
+            logger.info(f"Force check enabled: analyzing all {len(streams)} streams (bypassing 2-hour immunity)")
+            self.update_tracker.clear_force_check(channel_id)
+        else:
+            checked = set(checked_stream_ids)
+            streams_to_check = [s for s in streams if s['id'] not in checked]
+            streams_already_checked = [s for s in streams if s['id'] in checked]
+            
+            if streams_to_check:
+                logger.info(f"Found {len(streams_to_check)} new/unchecked streams (out of {len(streams)} total)")
+            else:
+                logger.info(f"All {len(streams)} streams have been recently checked, using cached scores")
+                
+                # Optimization: Skip check entirely if all conditions are met:
+                # 1. No new streams to analyze (all have been checked)
+                # 2. Stream count matches previous check (no additions/deletions)
+                # 3. Set of stream IDs is identical (no stream replacements)
+                previous_stream_count = len(checked_stream_ids)
+                current_stream_count = len(current_stream_ids)
+                
+                if (current_stream_count == previous_stream_count and 
+                    set(current_stream_ids) == set(checked_stream_ids)):
+                    logger.info(f"Channel {channel_name} unchanged since last check - skipping reorder")
+                    self.check_queue.mark_completed(channel_id)
+                    # Update timestamp but keep existing checked_stream_ids
+                    self.update_tracker.mark_channel_checked(
+                        channel_id,
+                        stream_count=current_stream_count,
+                        checked_stream_ids=checked_stream_ids
+                    )
+                    job.update(done=True, result=None)
+                    return job
+                else:
+                    logger.info(f"Channel composition changed (prev: {previous_stream_count}, curr: {current_stream_count}) - will reorder")
+        
+        job.update(
+            streams=streams,
+            force_check=force_check,
+            streams_to_check=streams_to_check,
+            streams_already_checked=streams_already_checked,
+            current_stream_ids=current_stream_ids
+        )
+        return job
+    
+    def _complete_concurrent_check(self, job: Dict[str, Any], results: List[Dict], udi,
+                                   skip_batch_changelog: bool = False) -> Dict[str, int]:
+        """Score and reorder a channel once all of its stream checks have finished.
+        
+        Args:
+            job: Check job from _prepare_concurrent_check
+            results: Analysis results of the job's streams_to_check
+            udi: UDI manager instance
+            skip_batch_changelog: If True, don't add this check to the batch changelog
+            
+        Returns:
+            Dead and revived stream counts of the channel
+        """
+        import time as time_module
+        
+        channel_id = job['channel_id']
+        channel_data = job['channel_data']
+        channel_name = job['channel_name']
+        streams = job['streams']
+        current_stream_ids = job['current_stream_ids']
+        
+        # Get dead stream removal configuration
+        dead_stream_removal_enabled = self.config.get('dead_stream_handling', {}).get('enabled', True)
+        
+        analyzed_streams = []
+        dead_stream_ids = set()  # Use set for O(1) lookups
+        revived_stream_ids = []
+        
+        # Process results - ALL checks are complete at this point
+        # This is the correct place to update stats and track dead streams
+        for analyzed in results:
+            # Update stream stats on Dispatcharr with ffmpeg-extracted data
+            # Now that all parallel checks are complete, we can safely push the info
+            self._update_stream_stats(analyzed)
+            
+            # Check if stream is dead
+            is_dead = self._is_stream_dead(analyzed)
+            stream_id = analyzed.get('stream_id')
+            stream_url = analyzed.get('stream_url', '')
+            stream_name = analyzed.get('stream_name', 'Unknown')
+            was_dead = self.dead_streams_tracker.is_dead(stream_url)
+            
+            if is_dead and not was_dead:
+                if self.dead_streams_tracker.mark_as_dead(stream_url, stream_id, stream_name, channel_id):
+                    dead_stream_ids.add(stream_id)
+                    logger.warning(f"Stream {stream_id} detected as DEAD: {stream_name}")
+                else:
+                    logger.error(f"Failed to mark stream {stream_id} as dead in tracker")
+            elif not is_dead and was_dead:
+                if self.dead_streams_tracker.mark_as_alive(stream_url):
+                    revived_stream_ids.append(stream_id)
+                    logger.info(f"Stream {stream_id} REVIVED: {stream_name}")
+            elif is_dead and was_dead:
+                logger.debug(f"Stream {stream_id} remains dead (already marked)")
+                # Add to dead_stream_ids so the stream removal logic (line 1455) will filter it out
+                dead_stream_ids.add(stream_id)
+            
+            analyzed['channel_id'] = channel_id
+            analyzed['channel_name'] = channel_name
+            analyzed_streams.append(analyzed)
+    
+        # Process already-checked streams (use cached data)
+        for stream in job['streams_already_checked']:
+            stream_data = udi.get_stream_by_id(stream['id'])
+            if stream_data:
+                stream_stats = stream_data.get('stream_stats', {})
+                if stream_stats is None:
+                    stream_stats = {}
+                if isinstance(stream_stats, str):
+                    try:
+                        stream_stats = json.loads(stream_stats)
+                        if stream_stats is None:
+                            stream_stats = {}
+                    except json.JSONDecodeError:
+                        stream_stats = {}
+                
+                analyzed = {
+                    'channel_id': channel_id,
+                    'channel_name': channel_name,
+                    'stream_id': stream['id'],
+                    'stream_name': stream.get('name', 'Unknown'),
+                    'stream_url': stream.get('url', ''),
+                    'resolution': stream_stats.get('resolution', '0x0'),
+                    'fps': stream_stats.get('source_fps', 0),
+                    'video_codec': stream_stats.get('video_codec', 'N/A'),
+                    'audio_codec': stream_stats.get('audio_codec', 'N/A'),
+                    'bitrate_kbps': stream_stats.get('ffmpeg_output_bitrate', 0),
+                    'status': 'OK'
+                }
+                
+                # Check if cached stream is dead
+                stream_url = stream.get('url', '')
+                stream_name = stream.get('name', 'Unknown')
+                is_dead = self._is_stream_dead(analyzed)
+                was_dead = self.dead_streams_tracker.is_dead(stream_url)
+                
+                # Handle dead/alive state transitions (same logic as newly-checked streams)
+                if is_dead and not was_dead:
+                    # Newly detected as dead
+                    if self.dead_streams_tracker.mark_as_dead(stream_url, stream['id'], stream_name, channel_id):
+                        dead_stream_ids.add(stream['id'])
+                        logger.warning(f"Cached stream {stream['id']} detected as DEAD: {stream_name}")
+                    else:
+                        logger.error(f"Failed to mark cached stream {stream['id']} as dead in tracker")
+                elif not is_dead and was_dead:
+                    # Stream was revived!
+                    if self.dead_streams_tracker.mark_as_alive(stream_url):
+                        revived_stream_ids.append(stream['id'])
+                        logger.info(f"Cached stream {stream['id']} REVIVED: {stream_name}")
+                    else:
+                        logger.error(f"Failed to mark cached stream {stream['id']} as alive")
+                elif is_dead and was_dead:
+                    # Stream remains dead (already marked)
+                    logger.debug(f"Cached stream {stream['id']} remains dead (already marked)")
+                    dead_stream_ids.add(stream['id'])
+                
+                analyzed_streams.append(analyzed)
+        
+        # Score all streams of the channel in one pass
+        self._assign_stream_scores(analyzed_streams, channel_id)
+        
+        # Sort streams by score (highest first)
+        self.progress.update(
+            channel_id=channel_id,
+            channel_name=channel_name,
+            current=len(streams),
+            total=len(streams),
+            status='processing',
+            step='Calculating scores',
+            step_detail='Sorting streams by quality score'
+        )
+        analyzed_streams.sort(key=lambda x: x.get('score', 0), reverse=True)
+        
+        # Apply provider diversification if enabled
+        if self.config.get('stream_ordering', {}).get('provider_diversification', False):
+            analyzed_streams = self._apply_provider_diversification(analyzed_streams, channel_id)
+        
+        # Remove dead streams from the channel (if enabled in config)
+        # Dead streams are checked during all channel checks (normal and global)
+        # If they're still dead, they're removed; if revived, they remain
+        if dead_stream_ids:
+            if dead_stream_removal_enabled:
+                logger.warning(f"🔴 Removing {len(dead_stream_ids)} dead streams from channel {channel_name}")
+                analyzed_streams = [s for s in analyzed_streams if s.get('stream_id') not in dead_stream_ids]
+            else:
+                logger.info(f"⚠️ Found {len(dead_stream_ids)} dead streams in channel {channel_name}, but removal is disabled in config")
+        
+        if revived_stream_ids:
+            logger.info(f"{len(revived_stream_ids)} streams were revived in channel {channel_name}")
+        
+        # Update channel with reordered streams
+        self.progress.update(
+            channel_id=channel_id,
+            channel_name=channel_name,
+            current=len(streams),
+            total=len(streams),
+            status='updating',
+            step='Reordering streams',
+            step_detail='Applying new stream order to channel'
+        )
+        reordered_ids = [s.get('stream_id') for s in analyzed_streams if s.get('stream_id') is not None]
+        # Dead streams have already been filtered from analyzed_streams if removal is enabled
+        # If removal is disabled, allow them to remain in the channel
+        update_channel_streams(channel_id, reordered_ids, allow_dead_streams=(not dead_stream_removal_enabled))
+        
+        # Verify the update
+        self.progress.update(
+            channel_id=channel_id,
+            channel_name=channel_name,
+            current=len(streams),
+            total=len(streams),
+            status='verifying',
+            step='Verifying update',
+            step_detail='Confirming stream order was applied'
+        )
+        time_module.sleep(0.5)
+        udi.refresh_channel_by_id(channel_id)
+        
+        logger.info(f"✓ Channel {channel_name} checked and streams reordered (parallel mode)")
+        
+        # Add to batch changelog instead of creating individual entry
+        if self.changelog:
+            try:
+                # Get channel logo URL
+                logo_url = None
+                logo_id = channel_data.get('logo_id')
+                if logo_id:
+                    logo = udi.get_logo_by_id(logo_id)
+                    if logo:
+                        logo_url = logo.get('cache_url') or logo.get('url')
+                
+                # Calculate channel-level averages from analyzed streams
+                averages = self._calculate_channel_averages(analyzed_streams, dead_stream_ids)
+                
+                stream_stats = []
+                for analyzed in analyzed_streams[:10]:  # Limit to first 10
+                    stream_id = analyzed.get('stream_id')
+                    is_dead = stream_id in dead_stream_ids
+                    is_revived = stream_id in revived_stream_ids
+                    
+                    # Extract and format stats using centralized utilities
+                    extracted_stats = extract_stream_stats(analyzed)
+                    formatted_stats = format_stream_stats_for_display(extracted_stats)
+                    
+                    # Get M3U account name for this stream using helper method
+                    m3u_account_name = self._get_m3u_account_name(stream_id, udi)
+                    
+                    stream_stat = {
+                        'stream_id': stream_id,
+                        'stream_name': analyzed.get('stream_name'),
+                        'resolution': formatted_stats['resolution'],
+                        'fps': formatted_stats['fps'],
+                        'video_codec': formatted_stats['video_codec'],
+                        'bitrate': formatted_stats['bitrate'],
+                        'm3u_account': m3u_account_name
+                    }
+                    
+                    # Mark dead streams as "dead" instead of showing score:0
+                    if is_dead:
+                        stream_stat['status'] = 'dead'
+                    elif is_revived:
+                        stream_stat['status'] = 'revived'
+                        stream_stat['score'] = round(analyzed.get('score', 0), 2)
+                    else:
+                        stream_stat['score'] = round(analyzed.get('score', 0), 2)
+                    
+                    stream_stats.append({k: v for k, v in stream_stat.items() if v not in [None, "N/A"]})
+                
+                # Add to batch instead of creating individual changelog entry
+                # Only add to batch if not explicitly skipped (e.g., when called from check_single_channel)
+                if not skip_batch_changelog:
+                    self._add_to_batch_changelog({
+                        'channel_id': channel_id,
+                        'channel_name': channel_name,
+                        'logo_url': logo_url,
+                        'total_streams': len(streams),
+                        'streams_analyzed': len(analyzed_streams),
+                        'dead_streams_detected': len(dead_stream_ids),
+                        'streams_revived': len(revived_stream_ids),
+                        'avg_resolution': averages['avg_resolution'],
+                        'avg_bitrate': averages['avg_bitrate'],
+                        'avg_fps': averages['avg_fps'],
+                        'success': True,
+                        'stream_stats': stream_stats
+                    })
+            except Exception as e:
+                logger.warning(f"Failed to add to batch changelog: {e}")
+        
+        # Mark as completed
+        self.check_queue.mark_completed(channel_id)
+        # Update current_stream_ids to exclude dead streams that were removed
+        # This prevents dead stream IDs from being saved in checked_stream_ids
+        # which would cause them to be skipped by 2-hour immunity even after revival
+        # Note: Using list comprehension instead of set operations to preserve order
+        # Only exclude dead streams if removal is enabled
+        if dead_stream_removal_enabled:
+            final_stream_ids = [sid for sid in current_stream_ids if sid not in dead_stream_ids]
+        else:
+            final_stream_ids = current_stream_ids  # Keep all streams if removal is disabled
+        self.update_tracker.mark_channel_checked(
+            channel_id, 
+            stream_count=len(streams),
+            checked_stream_ids=final_stream_ids
+        )
+        
+        # Return statistics for callers that need them
+        return {
+            'dead_streams_count': len(dead_stream_ids),
+            'revived_streams_count': len(revived_stream_ids)
+        }
+    
+    def _record_channel_check_failure(self, channel_id: int, channel_data: Optional[Dict],
+                                      error: Exception, skip_batch_changelog: bool = False):
+        """Mark a channel check as failed and add the failure to the batch changelog."""
+        self.check_queue.mark_failed(channel_id, str(error))
+        
+        # Only add to batch changelog if not explicitly skipped
+        if self.changelog and not skip_batch_changelog:
+            try:
+                try:
+                    channel_name = channel_data.get('name', f'Channel {channel_id}')
+                except:
+                    channel_name = f'Channel {channel_id}'
+                
+                # Add failed check to batch
+                self._add_to_batch_changelog({
+                    'channel_id': channel_id,
+                    'channel_name': channel_name,
+                    'total_streams': 0,
+                    'streams_analyzed': 0,
+                    'dead_streams_detected': 0,
+                    'streams_revived': 0,
+                    'success': False,
+                    'error': str(error),
+                    'stream_stats': []
+                })
+            except Exception as changelog_error:
+                logger.warning(f"Failed to add to batch changelog: {changelog_error}")
 
     
     def _check_channel_sequential(self, channel_id: int, skip_batch_changelog: bool = False):
@@ -2215,6 +2575,7 @@ class StreamCheckerService:
         
         log_state_change(logger, f"channel_{channel_id}", "queued", "checking")
         self.checking = True
+        self._publish_status()
         logger.info(f"=" * 80)
         logger.info(f"Checking channel {channel_id} (sequential mode)")
         logger.info(f"=" * 80)
@@ -2291,8 +2652,9 @@ class StreamCheckerService:
                 # Clear the force check flag after acknowledging it
                 self.update_tracker.clear_force_check(channel_id)
             else:
-                streams_to_check = [s for s in streams if s['id'] not in checked_stream_ids]
-                streams_already_checked = [s for s in streams if s['id'] in checked_stream_ids]
+                checked = set(checked_stream_ids)
+                streams_to_check = [s for s in streams if s['id'] not in checked]
+                streams_already_checked = [s for s in streams if s['id'] in checked]
                 
                 if streams_to_check:
                     logger.info(f"Found {len(streams_to_check)} new/unchecked streams (out of {len(streams)} total)")
@@ -2320,10 +2682,8 @@ class StreamCheckerService:
                     else:
                         logger.info(f"Channel composition changed (prev: {previous_stream_count}, curr: {current_stream_count}) - will reorder")
             
-            # Import stream analysis functions from stream_check_utils
-            from stream_check_utils import analyze_stream
-            
             # Analyze new/unchecked streams
+            result_cache = self._get_result_cache(force_check)
             analyzed_streams = []
             dead_stream_ids = set()  # Use set for O(1) lookups
             revived_stream_ids = []
@@ -2341,30 +2701,11 @@ class StreamCheckerService:
                     step_detail=f'Checking bitrate, resolution, codec ({idx}/{total_streams})'
                 )
                 
-                # Analyze stream
-                analysis_params = self.config.get('stream_analysis', {})
-                
-                # Apply URL transformation if using M3U profile with search/replace patterns
-                stream_url = stream.get('url', '')
-                if udi:
-                    stream_url = udi.apply_profile_url_transformation(stream)
-                
-                # Get HTTP proxy for this stream from its M3U account
-                from api_utils import get_stream_proxy
-                proxy = get_stream_proxy(stream['id'])
+                # Apply URL transformation just before the check, with the profile available now
+                stream_url = udi.apply_profile_url_transformation(stream)
                 
-                analyzed = analyze_stream(
-                    stream_url=stream_url,
-                    stream_id=stream['id'],
-                    stream_name=stream.get('name', 'Unknown'),
-                    ffmpeg_duration=analysis_params.get('ffmpeg_duration', 20),
-                    timeout=analysis_params.get('timeout', 30),
-                    retries=analysis_params.get('retries', 1),
-                    retry_delay=analysis_params.get('retry_delay', 10),
-                    user_agent=analysis_params.get('user_agent', 'VLC/3.0.14'),
-                    stream_startup_buffer=analysis_params.get('stream_startup_buffer', 10),
-                    proxy=proxy
-                )
+                # Analyze stream
+                analyzed = self._analyze_stream_cached(stream_url, stream, result_cache)
                 
                 # Update stream stats on dispatcharr with ffmpeg-extracted data
                 self._update_stream_stats(analyzed)
@@ -2467,29 +2808,13 @@ class StreamCheckerService:
                 else:
                     # If we can't fetch cached data, analyze this stream
                     logger.warning(f"Could not fetch cached data for stream {stream['id']}, will analyze")
-                    analysis_params = self.config.get('stream_analysis', {})
                     
                     # Apply URL transformation if using M3U profile with search/replace patterns
                     stream_url = stream.get('url', '')
                     if udi:
                         stream_url = udi.apply_profile_url_transformation(stream)
                     
-                    # Get HTTP proxy for this stream from its M3U account
-                    from api_utils import get_stream_proxy
-                    proxy = get_stream_proxy(stream['id'])
-                    
-                    analyzed = analyze_stream(
-                        stream_url=stream_url,
-                        stream_id=stream['id'],
-                        stream_name=stream.get('name', 'Unknown'),
-                        ffmpeg_duration=analysis_params.get('ffmpeg_duration', 20),
-                        timeout=analysis_params.get('timeout', 30),
-                        retries=analysis_params.get('retries', 1),
-                        retry_delay=analysis_params.get('retry_delay', 10),
-                        user_agent=analysis_params.get('user_agent', 'VLC/3.0.14'),
-                        stream_startup_buffer=analysis_params.get('stream_startup_buffer', 10),
-                        proxy=proxy
-                    )
+                    analyzed = self._analyze_stream_cached(stream_url, stream, result_cache)
                     self._update_stream_stats(analyzed)
                     score = self._calculate_stream_score(analyzed, channel_id)
                     analyzed['score'] = score
@@ -2706,6 +3031,7 @@ class StreamCheckerService:
         finally:
             self.checking = False
             self.progress.clear()
+            self._publish_status()
     
     def _calculate_stream_score(self, stream_data: Dict, channel_id: Optional[int] = None) -> float:
         """Calculate a quality score for a stream based on analysis.
@@ -2789,6 +3115,57 @@ class StreamCheckerService:
         
         return round(score, 2)
     
+    def _calculate_stream_scores(self, stream_datas: List[Dict], channel_id=None) -> Dict[str, List]:
+        """Calculate the quality scores of many streams in one pass.
+        
+        Gives the same scores as calling _calculate_stream_score for every
+        stream, but reads the configuration and each channel's quality
+        preference once and computes the weighted sum column-wise (see
+        stream_scoring).
+        
+        Args:
+            stream_datas: Stream analysis data
+            channel_id: Channel ID applied to all streams, or a list with the
+                channel ID of each stream (None for no quality preference)
+            
+        Returns:
+            Dictionary with 'score' and the per-component breakdown
+            ('bitrate', 'resolution', 'fps', 'codec', 'priority',
+            'quality_preference'), one list entry per stream
+        """
+        if isinstance(channel_id, (list, tuple)):
+            channel_ids = channel_id
+        else:
+            channel_ids = [channel_id] * len(stream_datas)
+        
+        columns = build_columns(stream_datas, prefer_h265=self.config.get('scoring.prefer_h265', True))
+        
+        dead_thresholds = self._get_dead_stream_thresholds()
+        dead = [utils_is_stream_dead(stream_data, dead_thresholds) for stream_data in stream_datas]
+        
+        priority_boosts = [
+            self._get_priority_boost(stream_data['stream_id'], stream_data) if stream_data.get('stream_id') else 0.0
+            for stream_data in stream_datas
+        ]
+        
+        quality_preferences = {}
+        quality_boosts = []
+        for stream_channel_id, height in zip(channel_ids, columns['height']):
+            if not stream_channel_id:
+                quality_boosts.append(0.0)
+                continue
+            if stream_channel_id not in quality_preferences:
+                quality_preferences[stream_channel_id] = self._get_quality_preference(stream_channel_id)
+            quality_boosts.append(quality_preference_boost(quality_preferences[stream_channel_id], height))
+        
+        return compute_scores(columns, self.config.get('scoring.weights', {}), priority_boosts, quality_boosts, dead)
+    
+    def _assign_stream_scores(self, analyzed_streams: List[Dict], channel_id=None):
+        """Set 'score' on analyzed streams using _calculate_stream_scores."""
+        scores = self._calculate_stream_scores(analyzed_streams, channel_id)['score']
+        for analyzed, score in zip(analyzed_streams, scores):
+            analyzed['score'] = score
+    
     def _get_priority_boost(self, stream_id: int, stream_data: Dict) -> float:
         """Calculate priority boost for a stream based on its M3U account priority.
         
@@ -2810,13 +3187,13 @@ class StreamCheckerService:
             if not m3u_account_id:
                 return 0.0
             
-            # Get M3U account to check priority settings
-            m3u_account = udi.get_m3u_account_by_id(m3u_account_id)
+            # Get M3U account priority settings from the precomputed scoring table
+            m3u_account = udi.get_m3u_account_scoring_info(m3u_account_id)
             if not m3u_account:
                 return 0.0
             
-            priority = m3u_account.get('priority', 0)
-            priority_mode = m3u_account.get('priority_mode', 'disabled')
+            priority = m3u_account['priority']
+            priority_mode = m3u_account['priority_mode']
             
             # If priority is 0 or mode is disabled, no boost
             if priority == 0 or priority_mode == 'disabled':
@@ -2846,16 +3223,8 @@ class StreamCheckerService:
             logger.error(f"Error calculating priority boost for stream {stream_id}: {e}")
             return 0.0
     
-    def _get_quality_preference_boost(self, stream_data: Dict, channel_id: int) -> float:
-        """Calculate quality preference boost/penalty for a stream based on channel settings.
-        
-        Args:
-            stream_data: Stream data dictionary containing resolution and other info
-            channel_id: The channel ID to get quality preferences for
-            
-        Returns:
-            Quality preference boost/penalty value (-10.0 to 0.5)
-        """
+    def _get_quality_preference(self, channel_id: int) -> str:
+        """Get the effective quality preference of a channel ('default' on errors)."""
         try:
             from channel_settings_manager import get_channel_settings_manager
             
@@ -2868,40 +3237,29 @@ class StreamCheckerService:
             
             # Get effective settings with inheritance
             effective_settings = settings_manager.get_channel_effective_settings(channel_id, channel_group_id)
-            quality_pref = effective_settings.get('quality_preference', 'default')
-            
-            if quality_pref == 'default':
-                return 0.0
-            
-            resolution = stream_data.get('resolution', 'N/A')
-            if 'x' in str(resolution):
-                try:
-                    width, height = map(int, resolution.split('x'))
-                    
-                    if quality_pref == 'prefer_4k' and height >= 2160:
-                        # Extra bonus for 4K streams
-                        logger.debug(f"Applying 4K preference bonus (+0.5) to stream for channel {channel_id}")
-                        return 0.5
-                    elif quality_pref == 'avoid_4k' and height >= 2160:
-                        # Penalty for 4K streams (prefer Full HD instead)
-                        logger.debug(f"Applying 4K avoidance penalty (-0.5) to stream for channel {channel_id}")
-                        return -0.5
-                    elif quality_pref == 'max_1080p' and height > 1080:
-                        # Heavy penalty for streams above 1080p (effectively exclude them)
-                        logger.debug(f"Applying max 1080p penalty (-10.0) to stream for channel {channel_id}")
-                        return -10.0
-                    elif quality_pref == 'max_720p' and height > 720:
-                        # Heavy penalty for streams above 720p (effectively exclude them)
-                        logger.debug(f"Applying max 720p penalty (-10.0) to stream for channel {channel_id}")
-                        return -10.0
-                        
-                except (ValueError, AttributeError):
-                    pass
-            
-            return 0.0
+            return effective_settings.get('quality_preference', 'default')
         except Exception as e:
-            logger.error(f"Error calculating quality preference boost for channel {channel_id}: {e}")
+            logger.error(f"Error getting quality preference for channel {channel_id}: {e}")
+            return 'default'
+    
+    def _get_quality_preference_boost(self, stream_data: Dict, channel_id: int) -> float:
+        """Calculate quality preference boost/penalty for a stream based on channel settings.
+        
+        Args:
+            stream_data: Stream data dictionary containing resolution and other info
+            channel_id: The channel ID to get quality preferences for
+            
+        Returns:
+            Quality preference boost/penalty value (-10.0 to 0.5)
+        """
+        quality_pref = self._get_quality_preference(channel_id)
+        if quality_pref == 'default':
             return 0.0
+        
+        boost = quality_preference_boost(quality_pref, parse_height(stream_data.get('resolution', 'N/A')))
+        if boost:
+            logger.debug(f"Applying quality preference '{quality_pref}' boost ({boost:+}) to stream for channel {channel_id}")
+        return boost
     
     def get_status(self) -> Dict:
         """Get current service status."""
@@ -2919,6 +3277,8 @@ class StreamCheckerService:
             queue_status.get('in_progress', 0) > 0
         )
         
+        from stream_check_utils import get_check_tier_stats
+        
         return {
             'running': self.running,
             'checking': self.checking,
@@ -2928,6 +3288,11 @@ class StreamCheckerService:
             'queue': queue_status,
             'progress': progress,
             'last_global_check': self.update_tracker.get_last_global_check(),
+            'stats_write_back': self.stats_writer.get_stats(),
+            'check_tiers': get_check_tier_stats(),
+            'last_check_run': self.last_check_run_stats,
+            'last_global_action': self.last_global_action_stats,
+            'analysis_cache': get_stream_result_cache().get_stats(),
             'config': {
                 'automation_controls': self.config.get('automation_controls', {}),
                 'check_interval': self.config.get('check_interval'),
@@ -2936,6 +3301,17 @@ class StreamCheckerService:
             }
         }
     
+    def _publish_status(self):
+        """Publish the service status on the progress bus.
+        
+        Called on state changes (start/stop, check start/end, global action,
+        queue changes) only; per-stream progress is published separately.
+        """
+        try:
+            self.progress.bus.publish('status', self.get_status())
+        except Exception as e:
+            logger.warning(f"Could not publish stream checker status: {e}")
+    
     def queue_channel(self, channel_id: int, priority: int = 10, force_check: bool = False) -> bool:
         """Manually queue a channel for checking.
         
@@ -2950,7 +3326,9 @@ class StreamCheckerService:
         if force_check:
             self.update_tracker.mark_channel_for_force_check(channel_id)
             logger.info(f"Marked channel {channel_id} for force check (bypasses 2-hour immunity)")
-        return self.check_queue.add_channel(channel_id, priority)
+        added = self.check_queue.add_channel(channel_id, priority)
+        self._publish_status()
+        return added
     
     def queue_channels(self, channel_ids: List[int], priority: int = 10, force_check: bool = False) -> int:
         """Manually queue multiple channels for checking.
@@ -2964,10 +3342,11 @@ class StreamCheckerService:
             Number of channels successfully queued
         """
         if force_check:
-            for channel_id in channel_ids:
-                self.update_tracker.mark_channel_for_force_check(channel_id)
+            self.update_tracker.mark_channels_for_force_check(channel_ids)
             logger.info(f"Marked {len(channel_ids)} channels for force check (bypasses 2-hour immunity)")
-        return self.check_queue.add_channels(channel_ids, priority)
+        added = self.check_queue.add_channels(channel_ids, priority)
+        self._publish_status()
+        return added
     
     def check_single_channel(self, channel_id: int, program_name: Optional[str] = None) -> Dict:
         """Check a single channel immediately and return results.
@@ -3282,6 +3661,7 @@ class StreamCheckerService:
         """Clear the checking queue."""
         self.check_queue.clear()
         logger.info("Checking queue cleared")
+        self._publish_status()
     
     def trigger_check_updated_channels(self):
         """Trigger immediate check of channels with M3U updates.
@@ -3382,13 +3762,15 @@ class StreamCheckerService:
             # Save the config manually since we bypassed the update method
             self.config._save_config()
         else:
-            # Use the normal update method for other changes
+            # Use the normal update method for other changes (it saves the file)
             self.config.update(updates)
         
-        # Save configuration to file (only if we didn't already save it above)
-        if 'account_stream_limits' not in updates:
-            self._save_config()
-        
+        if 'concurrent_streams' in updates:
+            configure_pool_size(self.config.get('concurrent_streams.global_limit', 10))
+
+        if 'queue' in updates and 'priority_aging_seconds' in updates['queue']:
+            self.check_queue.set_aging_interval(self.config.get('queue.priority_aging_seconds', 60))
+
         # Log the changes
         if config_changes:
             logger.info(f"Configuration updated: {'; '.join(config_changes)}")
@@ -3402,11 +3784,6 @@ class StreamCheckerService:
             # The scheduler will check config_changed and skip channel queueing
             self.check_trigger.set()
             logger.info("Configuration changes will be applied immediately")
-        
-        # Reload queue max size if changed
-        if 'queue' in updates and 'max_size' in updates['queue']:
-            # Can't resize existing queue, but will apply on next restart
-            logger.info("Queue max size updated, will apply on next restart")
     
     def trigger_global_action(self):
         """Manually trigger a global action (Update, Match, Check all channels).
@@ -3617,6 +3994,8 @@ class StreamCheckerService:
             'details': []
         }
         
+        # Convert the streams of every channel to analyzed format with existing stats
+        channel_jobs = []
         for channel in channels:
             channel_id = channel.get('id')
             channel_name = channel.get('name', f'Channel {channel_id}')
@@ -3629,7 +4008,6 @@ class StreamCheckerService:
             if not current_streams or len(current_streams) <= 1:
                 continue  # Skip channels with 0 or 1 streams
             
-            # Convert to analyzed format with existing scores/stats
             analyzed_streams = []
             for stream in current_streams:
                 stream_stats = stream.get('stream_stats', {})
@@ -3651,12 +4029,15 @@ class StreamCheckerService:
                     'audio_codec': stream_stats.get('audio_codec', 'N/A'),
                     'bitrate_kbps': stream_stats.get('ffmpeg_output_bitrate', 0),
                 }
-                
-                # Calculate score based on existing data
-                score = self._calculate_stream_score(analyzed, channel_id)
-                analyzed['score'] = score
                 analyzed_streams.append(analyzed)
-            
+            channel_jobs.append((channel_id, channel_name, analyzed_streams))
+        
+        # Score the streams of all channels in one pass
+        all_streams = [analyzed for _, _, analyzed_streams in channel_jobs for analyzed in analyzed_streams]
+        stream_channel_ids = [channel_id for channel_id, _, analyzed_streams in channel_jobs for _ in analyzed_streams]
+        self._assign_stream_scores(all_streams, stream_channel_ids)
+        
+        for channel_id, channel_name, analyzed_streams in channel_jobs:
             # Sort by score (highest first)
             analyzed_streams.sort(key=lambda x: x.get('score', 0), reverse=True)
             
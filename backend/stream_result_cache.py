@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Stream Analysis Result Cache for StreamFlow.
+
+The same provider stream URL is often listed in several channels (and under
+several names). Channel checks only skip streams the channel itself has
+already checked, so during a global action the same URL would be analyzed with
+ffmpeg once per channel. This module keeps a process-wide cache of analysis
+results keyed by the stream URL after the M3U profile URL transformation:
+- Entries expire after a TTL and the least recently used entries are evicted
+  when the size bound is reached
+- Checks of a URL that is already being analyzed wait for that analysis
+  (single-flight) instead of starting a second ffmpeg run
+- Hit, miss and eviction counters are exposed through get_stats()
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+
+class StreamResultCache:
+    """LRU cache of stream analysis results with TTL and single-flight analysis."""
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 5000):
+        """
+        Initialize the result cache.
+
+        Args:
+            ttl: Seconds an analysis result stays valid (default: 3600)
+            max_entries: Maximum number of cached URLs (default: 5000)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._stats = {'hits': 0, 'shared': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+
+    def configure(self, ttl: float, max_entries: int):
+        """Update TTL and size bound (entries over the new bound are evicted)."""
+        with self.lock:
+            self.ttl = ttl
+            self.max_entries = max_entries
+            self._evict()
+
+    @staticmethod
+    def for_stream(result: Dict[str, Any], stream: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a cached result for another stream with the same URL."""
+        shared = dict(result)
+        shared['stream_id'] = stream['id']
+        shared['stream_name'] = stream.get('name', 'Unknown')
+        return shared
+
+    def _get_fresh(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get a valid cached result and mark it as recently used.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.time():
+            del self._entries[url]
+            self._stats['expired'] += 1
+            return None
+        self._entries.move_to_end(url)
+        return result
+
+    def _evict(self):
+        """Evict least recently used entries over the size bound.
+
+        Note: This method assumes the lock is already held by the caller.
+        """
+        while len(self._entries) > max(self.max_entries, 0):
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def lookup(self, url: str) -> Tuple[Optional[Dict[str, Any]], Optional[Future]]:
+        """
+        Look up a URL without starting an analysis.
+
+        Returns:
+            Tuple of (cached result or None, future of the running analysis of
+            the URL or None)
+        """
+        with self.lock:
+            result = self._get_fresh(url)
+            if result is not None:
+                self._stats['hits'] += 1
+                return result, None
+            future = self._in_flight.get(url)
+            if future is not None:
+                self._stats['shared'] += 1
+            return None, future
+
+    def _begin(self, url: str) -> Tuple[Optional[Dict[str, Any]], Future, bool]:
+        """
+        Get the cached result, join the running analysis, or register a new one.
+
+        Returns:
+            Tuple of (cached result or None, analysis future, True if the caller
+            has to run the analysis and complete the future)
+        """
+        with self.lock:
+            result = self._get_fresh(url)
+            if result is not None:
+                self._stats['hits'] += 1
+                return result, None, False
+            future = self._in_flight.get(url)
+            if future is not None:
+                self._stats['shared'] += 1
+                return None, future, False
+            future = Future()
+            self._in_flight[url] = future
+            self._stats['misses'] += 1
+            return None, future, True
+
+    def _complete(self, url: str, future: Future, result: Optional[Dict[str, Any]] = None,
+                  error: Optional[BaseException] = None):
+        """Store the result of an analysis and wake up the checks waiting for it."""
+        with self.lock:
+            self._in_flight.pop(url, None)
+            if error is None and self.ttl > 0:
+                self._entries[url] = (time.time() + self.ttl, result)
+                self._entries.move_to_end(url)
+                self._evict()
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def get_or_compute(self, url: str, stream: Dict[str, Any],
+                       compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the analysis result of a URL, running compute() only if no valid
+        result is cached and no other check is analyzing the URL.
+
+        Args:
+            url: Stream URL after the profile URL transformation
+            stream: Stream the result is for
+            compute: Function running the analysis
+
+        Returns:
+            Analysis result for the stream
+        """
+        result, future, is_leader = self._begin(url)
+        if result is not None:
+            return self.for_stream(result, stream)
+        if not is_leader:
+            return self.for_stream(future.result(), stream)
+
+        try:
+            result = compute()
+        except BaseException as e:
+            self._complete(url, future, error=e)
+            raise
+        self._complete(url, future, result=result)
+        return result
+
+    async def get_or_compute_async(self, url: str, stream: Dict[str, Any],
+                                   compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Asyncio version of get_or_compute() for coroutine analyses."""
+        result, future, is_leader = self._begin(url)
+        if result is not None:
+            return self.for_stream(result, stream)
+        if not is_leader:
+            return self.for_stream(await asyncio.wrap_future(future), stream)
+
+        try:
+            result = await compute()
+        except BaseException as e:
+            self._complete(url, future, error=e)
+            raise
+        self._complete(url, future, result=result)
+        return result
+
+    def clear(self):
+        """Remove all cached results (running analyses are not affected)."""
+        with self.lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, in_flight, hits, shared (checks served by
+            a running analysis), misses, evictions, expired and hit_rate
+        """
+        with self.lock:
+            lookups = self._stats['hits'] + self._stats['shared'] + self._stats['misses']
+            served = self._stats['hits'] + self._stats['shared']
+            return {
+                'entries': len(self._entries),
+                'in_flight': len(self._in_flight),
+                **self._stats,
+                'hit_rate': round(served / lookups, 3) if lookups else 0.0,
+                'ttl': self.ttl,
+                'max_entries': self.max_entries
+            }
+
+
+# Global instance
+_result_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_stream_result_cache() -> StreamResultCache:
+    """Get or create the global stream result cache instance."""
+    global _result_cache
+    with _cache_lock:
+        if _result_cache is None:
+            _result_cache = StreamResultCache()
+        return _result_cache
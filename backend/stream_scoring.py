@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Batch stream scoring for StreamFlow.
+
+StreamCheckerService._calculate_stream_score() scores one stream at a time.
+This module scores many streams (one channel or several) in one pass:
+- Analysis fields are gathered into columns, parsing each distinct
+  resolution and codec string only once
+- The weighted sum is computed column-wise with NumPy when it is available
+  and with a tight pure-Python loop otherwise
+- Every component of the score is returned as well, for debugging
+
+The arithmetic is done in the same order as in _calculate_stream_score(),
+so the scores are bit-identical to it.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with pandas
+    np = None
+
+# Score assigned to streams without bitrate that still have resolution and FPS
+FALLBACK_SCORE = 0.40
+
+# Weighted components of a score, in the order they are summed
+SCORE_COMPONENTS = ('bitrate', 'resolution', 'fps', 'codec', 'priority', 'quality_preference')
+
+
+def parse_height(resolution: Any) -> Optional[int]:
+    """Vertical resolution of a 'WIDTHxHEIGHT' string, or None if it cannot be parsed."""
+    if 'x' not in str(resolution):
+        return None
+    try:
+        width, height = map(int, resolution.split('x'))
+    except (ValueError, AttributeError):
+        return None
+    return height
+
+
+def resolution_score(height: Optional[int]) -> float:
+    """Resolution score (0-1) for a vertical resolution."""
+    if height is None:
+        return 0.0
+    if height >= 1080:
+        return 1.0
+    if height >= 720:
+        return 0.7
+    if height >= 576:
+        return 0.5
+    return 0.3
+
+
+def codec_score(codec: str, prefer_h265: bool) -> float:
+    """Codec score (0-1) for a lower-cased video codec name."""
+    if not codec:
+        return 0.0
+    if 'h265' in codec or 'hevc' in codec:
+        return 1.0 if prefer_h265 else 0.8
+    if 'h264' in codec or 'avc' in codec:
+        return 0.8 if prefer_h265 else 1.0
+    if codec != 'n/a':
+        return 0.5
+    return 0.0
+
+
+def quality_preference_boost(quality_preference: str, height: Optional[int]) -> float:
+    """Channel quality preference boost/penalty for a vertical resolution."""
+    if quality_preference == 'default' or height is None:
+        return 0.0
+    if quality_preference == 'prefer_4k' and height >= 2160:
+        return 0.5
+    if quality_preference == 'avoid_4k' and height >= 2160:
+        return -0.5
+    if quality_preference == 'max_1080p' and height > 1080:
+        return -10.0
+    if quality_preference == 'max_720p' and height > 720:
+        return -10.0
+    return 0.0
+
+
+def _positive_number(value: Any) -> float:
+    """The value as float if it is a positive number, otherwise 0.0."""
+    if isinstance(value, (int, float)) and value > 0:
+        return float(value)
+    return 0.0
+
+
+def build_columns(stream_datas: Sequence[Dict[str, Any]], prefer_h265: bool = True) -> Dict[str, List]:
+    """
+    Gather the scoring inputs of analyzed streams into columns.
+
+    Returns:
+        Dictionary of equally long lists: bitrate, height, fps, codec_score
+        and fallback (stream without bitrate that still has resolution/FPS)
+    """
+    heights = {}
+    codecs = {}
+    columns = {'bitrate': [], 'height': [], 'fps': [], 'codec_score': [], 'fallback': []}
+
+    for stream_data in stream_datas:
+        bitrate = stream_data.get('bitrate_kbps', 0)
+        resolution = stream_data.get('resolution', 'N/A')
+        fps = stream_data.get('fps', 0)
+
+        try:
+            height = heights[resolution]
+        except KeyError:
+            height = heights[resolution] = parse_height(resolution)
+        except TypeError:
+            # Unhashable resolution value
+            height = parse_height(resolution)
+
+        codec = stream_data.get('video_codec', '')
+        codec = codec.lower() if isinstance(codec, str) else ''
+        if codec not in codecs:
+            codecs[codec] = codec_score(codec, prefer_h265)
+
+        columns['bitrate'].append(_positive_number(bitrate))
+        columns['height'].append(height)
+        columns['fps'].append(_positive_number(fps))
+        columns['codec_score'].append(codecs[codec])
+        # Like _calculate_stream_score(), a missing resolution does not prevent the fallback
+        columns['fallback'].append(
+            bitrate == 0 and stream_data.get('resolution') not in ['0x0', 'N/A', ''] and
+            isinstance(fps, (int, float)) and fps > 0
+        )
+
+    return columns
+
+
+def compute_scores(columns: Dict[str, List], weights: Dict[str, float],
+                   priority_boosts: Sequence[float], quality_boosts: Sequence[float],
+                   dead: Sequence[bool]) -> Dict[str, List]:
+    """
+    Compute stream scores from columns built by build_columns().
+
+    Args:
+        columns: Scoring input columns
+        weights: scoring.weights configuration
+        priority_boosts: M3U account priority boost per stream
+        quality_boosts: Channel quality preference boost per stream
+        dead: Whether each stream is dead (score 0.0)
+
+    Returns:
+        Dictionary with 'score' and the weighted value of every component in
+        SCORE_COMPONENTS (one list entry per stream)
+    """
+    w_bitrate = weights.get('bitrate', 0.40)
+    w_resolution = weights.get('resolution', 0.35)
+    w_fps = weights.get('fps', 0.15)
+    w_codec = weights.get('codec', 0.10)
+    resolution_scores = [resolution_score(height) for height in columns['height']]
+
+    if np is not None:
+        bitrate = np.asarray(columns['bitrate'], dtype=np.float64)
+        fps = np.asarray(columns['fps'], dtype=np.float64)
+        components = {
+            'bitrate': np.where(bitrate > 0, np.minimum(bitrate / 8000, 1.0) * w_bitrate, 0.0),
+            'resolution': np.asarray(resolution_scores, dtype=np.float64) * w_resolution,
+            'fps': np.where(fps > 0, np.minimum(fps / 60, 1.0) * w_fps, 0.0),
+            'codec': np.asarray(columns['codec_score'], dtype=np.float64) * w_codec,
+            'priority': np.asarray(priority_boosts, dtype=np.float64),
+            'quality_preference': np.asarray(quality_boosts, dtype=np.float64),
+        }
+        total = np.zeros(len(bitrate), dtype=np.float64)
+        for name in SCORE_COMPONENTS:
+            total = total + components[name]
+        components = {name: values.tolist() for name, values in components.items()}
+        totals = total.tolist()
+    else:
+        components = {
+            'bitrate': [min(b / 8000, 1.0) * w_bitrate if b > 0 else 0.0 for b in columns['bitrate']],
+            'resolution': [r * w_resolution for r in resolution_scores],
+            'fps': [min(f / 60, 1.0) * w_fps if f > 0 else 0.0 for f in columns['fps']],
+            'codec': [c * w_codec for c in columns['codec_score']],
+            'priority': list(priority_boosts),
+            'quality_preference': list(quality_boosts),
+        }
+        totals = [
+            0.0 + b + r + f + c + p + q
+            for b, r, f, c, p, q in zip(*(components[name] for name in SCORE_COMPONENTS))
+        ]
+
+    # Python's round() (not np.round) to match _calculate_stream_score exactly
+    scores = [
+        0.0 if is_dead else FALLBACK_SCORE if fallback else round(total, 2)
+        for total, is_dead, fallback in zip(totals, dead, columns['fallback'])
+    ]
+    return {'score': scores, **components}
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Batched write-back of stream statistics to Dispatcharr.
+
+Stream checks used to PATCH every analyzed stream individually and rewrite
+the whole UDI streams file after each PATCH. The StreamStatsWriter collects
+the stats of a channel check instead and writes them back in one flush:
+- Updates for the same stream are coalesced (latest values win)
+- PATCH requests are sent concurrently with a bounded number in flight
+- The UDI cache and storage are updated once per flush
+
+Queue depth and flush latency are exposed via get_stats().
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from logging_config import setup_logging
+
+from api_utils import _get_base_url, patch_request
+
+from udi import get_udi_manager
+
+logger = setup_logging(__name__)
+
+# Maximum number of concurrent stats PATCH requests per flush
+STREAM_STATS_WRITE_WORKERS = int(os.getenv("STREAM_STATS_WRITE_WORKERS", "8"))
+
+
+class StreamStatsWriter:
+    """Coalescing write-back queue for stream stats updates."""
+
+    def __init__(self, max_workers: int = STREAM_STATS_WRITE_WORKERS):
+        """
+        Initialize the writer.
+
+        Args:
+            max_workers: Maximum number of PATCH requests in flight during a flush
+        """
+        self.max_workers = max(1, max_workers)
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so batches are applied to the UDI in order
+        self._flush_lock = threading.Lock()
+        self._in_flight = 0
+        self._total_flushes = 0
+        self._total_written = 0
+        self._total_failed = 0
+        self._total_coalesced = 0
+        self._last_flush_size = 0
+        self._last_flush_seconds = 0.0
+        self._total_flush_seconds = 0.0
+        self._max_flush_seconds = 0.0
+
+    def enqueue(self, stream_id: int, stats: Dict[str, Any]) -> None:
+        """
+        Queue a stats update for a stream.
+
+        Args:
+            stream_id: The stream ID
+            stats: Stats fields to merge into the stream's stream_stats
+        """
+        stream_id = int(stream_id)
+        with self._lock:
+            if stream_id in self._pending:
+                self._pending[stream_id].update(stats)
+                self._total_coalesced += 1
+            else:
+                self._pending[stream_id] = dict(stats)
+
+    def pending_count(self) -> int:
+        """Return the number of streams waiting to be written."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write all queued stats to Dispatcharr and the UDI.
+
+        Each stream's new stats are merged with its existing stream_stats from
+        the UDI and PATCHed concurrently. Streams whose PATCH succeeded are
+        updated in the UDI in a single batch.
+
+        Returns:
+            Number of streams written successfully
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = {}
+            if not batch:
+                return 0
+
+            start_time = time.time()
+            written = self._write_batch(batch)
+            elapsed = time.time() - start_time
+
+            with self._lock:
+                self._total_flushes += 1
+                self._total_written += len(written)
+                self._total_failed += len(batch) - len(written)
+                self._last_flush_size = len(batch)
+                self._last_flush_seconds = elapsed
+                self._total_flush_seconds += elapsed
+                self._max_flush_seconds = max(self._max_flush_seconds, elapsed)
+
+            logger.info(
+                f"Flushed stats for {len(written)}/{len(batch)} streams in {elapsed:.2f}s"
+            )
+            return len(written)
+
+    def _write_batch(self, batch: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """PATCH a batch of stats updates and apply the successful ones to the UDI.
+
+        Returns:
+            The updated stream dicts that were written
+        """
+        base_url = _get_base_url()
+        if not base_url:
+            logger.error("DISPATCHARR_BASE_URL not set.")
+            return []
+
+        udi = get_udi_manager()
+        updates = []
+        for stream_id, stats in batch.items():
+            existing_stream_data = udi.get_stream_by_id(stream_id)
+            if not existing_stream_data:
+                logger.warning(f"Could not fetch existing data for stream {stream_id}. Skipping stats update.")
+                continue
+
+            existing_stats = existing_stream_data.get("stream_stats") or {}
+            if isinstance(existing_stats, str):
+                try:
+                    existing_stats = json.loads(existing_stats)
+                except json.JSONDecodeError:
+                    existing_stats = {}
+
+            updated_stream_data = existing_stream_data.copy()
+            updated_stream_data['stream_stats'] = {**existing_stats, **stats}
+            updates.append(updated_stream_data)
+
+        if not updates:
+            return []
+
+        workers = min(self.max_workers, len(updates))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda s: self._patch_stream(base_url, s), updates))
+        written = [stream for stream, ok in zip(updates, results) if ok]
+
+        # Keep the UDI cache in sync with what was written to Dispatcharr
+        if written:
+            udi.update_streams(written)
+        return written
+
+    def _patch_stream(self, base_url: str, stream_data: Dict[str, Any]) -> bool:
+        stream_id = stream_data['id']
+        with self._lock:
+            self._in_flight += 1
+        try:
+            patch_request(
+                f"{base_url}/api/channels/streams/{int(stream_id)}/",
+                {"stream_stats": stream_data['stream_stats']}
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error updating stats for stream {stream_id}: {e}")
+            return False
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue and flush statistics.
+
+        Returns:
+            Dict with queue depth, in-flight requests, totals and flush latency
+        """
+        with self._lock:
+            flushes = self._total_flushes
+            return {
+                'queue_depth': len(self._pending),
+                'in_flight': self._in_flight,
+                'max_workers': self.max_workers,
+                'total_flushes': flushes,
+                'total_written': self._total_written,
+                'total_failed': self._total_failed,
+                'total_coalesced': self._total_coalesced,
+                'last_flush_size': self._last_flush_size,
+                'last_flush_seconds': round(self._last_flush_seconds, 3),
+                'avg_flush_seconds': round(self._total_flush_seconds / flushes, 3) if flushes else 0.0,
+                'max_flush_seconds': round(self._max_flush_seconds, 3),
+            }
+
+
+# Global instance
+_stream_stats_writer: Optional[StreamStatsWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_stream_stats_writer() -> StreamStatsWriter:
+    """
+    Get or create the global stream stats writer instance.
+
+    Returns:
+        StreamStatsWriter instance
+    """
+    global _stream_stats_writer
+    with _writer_lock:
+        if _stream_stats_writer is None:
+            _stream_stats_writer = StreamStatsWriter()
+        return _stream_stats_writer
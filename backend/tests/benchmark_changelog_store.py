@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the partitioned changelog store.
+
+For each history size (spread over 30 days) this measures:
+- The median add_entry() time
+- 1-day and 7-day queries on a freshly opened store (cold) and on a warm one,
+  with the number of partitions the cold query parses
+- For comparison, one full rewrite of the history as a single indented
+  JSON file (what every add_entry() cost before the store was partitioned)
+
+Usage:
+    python tests/benchmark_changelog_store.py [--sizes 1000,10000,100000] [--appends N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automated_stream_manager import ChangelogManager
+from changelog_store import ChangelogStore
+
+
+def build_entry(timestamp, channel_id):
+    """Build a single channel check entry."""
+    return {
+        'timestamp': timestamp.isoformat(),
+        'action': 'single_channel_check',
+        'details': {'channel_id': channel_id, 'total_streams': 10, 'dead_streams': 1},
+        'subentries': [{'group': 'check', 'items': [{
+            'type': 'check', 'channel_id': channel_id, 'channel_name': f'Channel {channel_id}',
+            'stats': {'total_streams': 10, 'dead_streams': 1, 'avg_resolution': '1920x1080'}
+        }]}]
+    }
+
+
+def measure(directory, size, appends):
+    """Measure appends and queries against a history of the given size."""
+    now = datetime.now()
+    history = [build_entry(now - timedelta(days=30) * (i / size), i % 500) for i in range(size)]
+    history.reverse()
+    manager = ChangelogManager(directory / f'changelog_{size}.json')
+    manager.store.append_many(history)
+
+    append_times = []
+    for i in range(appends):
+        start = time.perf_counter()
+        manager.add_entry('single_channel_check', history[i]['details'], subentries=history[i]['subentries'])
+        append_times.append(time.perf_counter() - start)
+
+    results = {'append_ms': statistics.median(append_times) * 1000}
+    for days in (1, 7):
+        cold_store = ChangelogStore(manager.store.directory)
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+        with patch.object(cold_store, '_load', wraps=cold_store._load) as mock_load:
+            start = time.perf_counter()
+            sum(1 for _ in cold_store.iter_entries(since=cutoff))
+            results[f'cold_{days}d_ms'] = (time.perf_counter() - start) * 1000
+        results[f'partitions_{days}d'] = mock_load.call_count
+
+        start = time.perf_counter()
+        manager.get_recent_entries(days)
+        results[f'warm_{days}d_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with open(directory / 'legacy.json', 'w') as f:
+        json.dump(history, f, indent=2)
+    results['legacy_rewrite_ms'] = (time.perf_counter() - start) * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated history sizes (default: 1000,10000,100000)")
+    parser.add_argument("--appends", type=int, default=200, help="Timed appends per size (default: 200)")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+
+    # Per-entry info logging would dominate the append timings
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print(f"Changelog store benchmark: {args.appends} appends per history size")
+    print("=" * 80)
+
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        results = {size: measure(temp_dir, size, args.appends) for size in sizes}
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"{'history':>8} {'append ms':>10} {'legacy rewrite ms':>18} {'1d cold ms':>11} {'1d warm ms':>11} "
+          f"{'7d cold ms':>11} {'7d warm ms':>11} {'7d partitions':>14}")
+    for size, r in results.items():
+        print(f"{size:>8} {r['append_ms']:>10.3f} {r['legacy_rewrite_ms']:>18.1f} {r['cold_1d_ms']:>11.1f} "
+              f"{r['warm_1d_ms']:>11.1f} {r['cold_7d_ms']:>11.1f} {r['warm_7d_ms']:>11.1f} {r['partitions_7d']:>14}")
+
+    # Only the partitions of the requested days (plus today) should be parsed
+    bounded = all(r['partitions_1d'] <= 2 and r['partitions_7d'] <= 8 for r in results.values())
+    print(f"Queries read only the requested days: {bounded}")
+    return 0 if bounded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the thread and asyncio stream check engines.
+
+A fake ``ffmpeg`` that waits --check-seconds and then prints a short
+analysis log is put on PATH. For each concurrency level (default: 50, 200,
+500) that many streams are checked at once (global_limit = number of streams,
+no account limits, no retries) with:
+- thread: SmartStreamScheduler + analyze_stream (streaming parser)
+- asyncio: AsyncCheckEngine
+
+and the following is reported:
+- Wall time and scheduling overhead (wall time minus the fake check duration)
+- Peak thread count and peak RSS growth (sampled every 20ms)
+- Peak Python heap (tracemalloc)
+
+Usage:
+    python tests/benchmark_check_engines.py [--levels 50,200,500] [--check-seconds 2]
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+
+from async_check_engine import AsyncCheckEngine
+from concurrent_stream_limiter import AccountStreamLimiter, SmartStreamScheduler
+from stream_check_utils import analyze_stream
+
+
+FAKE_FFMPEG = """#!/bin/sh
+sleep {seconds}
+cat >&2 <<'EOF'
+Input #0, mpegts, from 'http://bench.example.com/live.ts':
+  Stream #0:0[0x100]: Video: h264 (High), yuv420p, 1920x1080, 25 fps, 25 tbr
+  Stream #0:1[0x101]: Audio: aac (LC), 48000 Hz, stereo, fltp
+Output #0, null, to 'pipe:':
+progress=end
+[AVIOContext @ 0x1] Statistics: 7500000 bytes read, 0 seeks
+EOF
+"""
+
+
+def read_rss_kb() -> int:
+    """Current resident set size of this process in kB (Linux only, 0 elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class Sampler(threading.Thread):
+    """Samples thread count and RSS until stopped."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stop_event = threading.Event()
+        self.base_rss = read_rss_kb()
+        self.peak_rss = self.base_rss
+        self.peak_threads = threading.active_count()
+
+    def run(self):
+        while not self.stop_event.wait(0.02):
+            self.peak_rss = max(self.peak_rss, read_rss_kb())
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+
+
+def check_analysis(stream_url, stream_id, stream_name, **kwargs):
+    return analyze_stream(stream_url=stream_url, stream_id=stream_id, stream_name=stream_name, **kwargs)
+
+
+def run_engine(name: str, count: int):
+    """Check count streams at once with the given engine; return measurements."""
+    streams = [
+        {'id': i, 'name': f'Stream {i}', 'url': f'http://bench.example.com/{i}.ts', 'm3u_account': None}
+        for i in range(count)
+    ]
+    params = dict(ffmpeg_duration=1, timeout=30, retries=0, retry_delay=0, streaming_parser=True)
+    limiter = AccountStreamLimiter()
+
+    sampler = Sampler()
+    sampler.start()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if name == "thread":
+        results = SmartStreamScheduler(limiter, global_limit=count).check_streams_with_limits(
+            streams, check_function=check_analysis, **params
+        )
+    else:
+        with patch('async_check_engine._get_stream_proxy', return_value=None):
+            results = AsyncCheckEngine(limiter, global_limit=count).check_streams_with_limits(streams, **params)
+    wall_time = time.perf_counter() - start
+    heap_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    sampler.stop_event.set()
+    sampler.join()
+
+    ok = sum(1 for result in results if result.get('status') == 'OK')
+    return wall_time, sampler.peak_threads, (sampler.peak_rss - sampler.base_rss) / 1024, heap_peak / 1e6, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", default="50,200,500", help="Comma-separated concurrency levels")
+    parser.add_argument("--check-seconds", type=float, default=2.0, help="Duration of one fake check (default: 2)")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",") if level]
+
+    # Per-stream logging would dominate the measurement
+    logging.disable(logging.INFO)
+
+    bin_dir = tempfile.mkdtemp()
+    try:
+        script = os.path.join(bin_dir, "ffmpeg")
+        with open(script, "w") as f:
+            f.write(FAKE_FFMPEG.format(seconds=args.check_seconds))
+        os.chmod(script, os.stat(script).st_mode | stat.S_IEXEC)
+        os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+
+        print("=" * 90)
+        print(f"Check engine benchmark (fake ffmpeg: {args.check_seconds}s per check)")
+        print("=" * 90)
+        print(f"{'checks':>7} {'engine':>8} {'wall (s)':>9} {'overhead (s)':>13} {'threads':>8} "
+              f"{'RSS +MB':>8} {'heap MB':>8} {'ok':>5}")
+        for count in levels:
+            for name in ("thread", "asyncio"):
+                wall_time, threads, rss_mb, heap_mb, ok = run_engine(name, count)
+                print(f"{count:>7} {name:>8} {wall_time:>9.2f} {wall_time - args.check_seconds:>13.2f} "
+                      f"{threads:>8} {rss_mb:>8.1f} {heap_mb:>8.1f} {ok:>5}")
+    finally:
+        shutil.rmtree(bin_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark for buffered vs. streaming ffmpeg output parsing.
+
+A fake ``ffmpeg`` executable that replays a recorded ffmpeg log on stderr is
+put on PATH, and both get_stream_info_and_bitrate (subprocess.run, buffers all
+output) and get_stream_info_and_bitrate_streaming (Popen, parses line by line)
+are run against it. For each the following is reported:
+- Wall time of one analysis
+- Peak Python memory (tracemalloc) while the analysis runs
+
+Without --log a synthetic ``-v debug`` log is generated: input/output stream
+sections followed by --lines of per-packet debug chatter and the final
+statistics, which is what a 30s debug run of a busy stream typically looks like.
+
+Usage:
+    python tests/benchmark_ffmpeg_output_parsing.py [--log PATH] [--lines N] [--runs N]
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream_check_utils import get_stream_info_and_bitrate, get_stream_info_and_bitrate_streaming
+
+
+LOG_HEADER = [
+    "Input #0, mpegts, from 'http://bench.example.com/live/1.ts':",
+    "  Duration: N/A, start: 1.400000, bitrate: N/A",
+    "  Stream #0:0[0x100]: Video: h264 (High) ([27][0][0][0] / 0x001B), yuv420p(tv, bt709), 1920x1080, 50 fps, 50 tbr",
+    "  Stream #0:1[0x101]: Audio: aac (LC) ([15][0][0][0] / 0x000F), 48000 Hz, stereo, fltp, 128 kb/s",
+    "Output #0, null, to 'pipe:':",
+    "  Stream #0:0: Video: wrapped_avframe, yuv420p, 1920x1080, q=2-31, 200 kb/s, 50 fps",
+    "  Stream #0:1: Audio: pcm_s16le, 48000 Hz, stereo, s16, 1536 kb/s",
+]
+
+LOG_FOOTER = [
+    "bitrate=N/A",
+    "progress=end",
+    "[AVIOContext @ 0x55d0c8a4b2c0] Statistics: 18750000 bytes read, 0 seeks",
+    "[http @ 0x55d0c8a4c1c0] Closing connection",
+    "Exiting normally, received signal 2.",
+]
+
+
+def build_log(lines: int) -> str:
+    """Build a synthetic ffmpeg -v debug log with the given number of packet lines."""
+    body = [
+        f"[mpegts @ 0x55d0c8a4b2c0] pid=100 pes_code=0x1e0 pts={i * 1800} dts={i * 1800} size={1000 + i % 9000}"
+        for i in range(lines)
+    ]
+    return "\n".join(LOG_HEADER + body + LOG_FOOTER) + "\n"
+
+
+def install_fake_ffmpeg(bin_dir: str, log_path: str):
+    """Write an ffmpeg script that prints the recorded log to stderr and exits."""
+    script = os.path.join(bin_dir, "ffmpeg")
+    with open(script, "w") as f:
+        f.write(f"#!/bin/sh\ncat '{log_path}' >&2\n")
+    os.chmod(script, os.stat(script).st_mode | stat.S_IEXEC)
+
+
+def bench(func, runs: int):
+    """Return (mean seconds, peak bytes, result) over the given number of runs."""
+    total = 0.0
+    peak = 0
+    result = None
+    for _ in range(runs):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = func("http://bench.example.com/live/1.ts", duration=30, timeout=60)
+        total += time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return total / runs, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="Recorded ffmpeg stderr log to replay (default: synthetic log)")
+    parser.add_argument("--lines", type=int, default=200000, help="Packet lines in the synthetic log (default: 200000)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per parser (default: 3)")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        log_path = args.log
+        if not log_path:
+            log_path = os.path.join(temp_dir, "ffmpeg.log")
+            with open(log_path, "w") as f:
+                f.write(build_log(args.lines))
+        install_fake_ffmpeg(temp_dir, log_path)
+        os.environ["PATH"] = temp_dir + os.pathsep + os.environ.get("PATH", "")
+
+        print("=" * 80)
+        print(f"ffmpeg output parsing benchmark ({os.path.getsize(log_path) / 1e6:.1f} MB log, {args.runs} runs)")
+        print("=" * 80)
+        print(f"{'parser':>10} {'time (s)':>10} {'peak MB':>10} {'bitrate':>10} {'resolution':>12}")
+        for name, func in (
+            ("buffered", get_stream_info_and_bitrate),
+            ("streaming", get_stream_info_and_bitrate_streaming),
+        ):
+            mean_time, peak, result = bench(func, args.runs)
+            print(f"{name:>10} {mean_time:>10.3f} {peak / 1e6:>10.2f} "
+                  f"{str(result.get('bitrate_kbps')):>10} {str(result.get('resolution')):>12}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
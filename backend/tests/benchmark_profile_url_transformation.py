@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for M3U profile URL transformation.
+
+Transforms the URLs of a synthetic channel set with:
+- Legacy: uncompiled re.search/re.sub and the 99-step $N conversion loop
+  on every call (the previous apply_profile_url_transformation)
+- Cached: UDIManager.apply_profile_url_transformation with compiled
+  per-profile transformers
+
+Profiles are passed explicitly, so only the transformation itself is timed.
+All paths are checked to produce identical URLs.
+
+Usage:
+    python tests/benchmark_profile_url_transformation.py [--channels N] [--streams-per-channel N] [--profiles N]
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from udi.manager import UDIManager
+
+PATTERNS = [
+    (r'^http://([^/]+)/live/(\w+)/(\w+)/', 'http://$1/live/free$2/free$3/'),
+    (r':8080/', ':8888/'),
+    (r'/(\d+)\.ts$', '/$1.m3u8'),
+    (r'^https?://[^/]+/', 'http://mirror.example.com/'),
+]
+
+
+def legacy_transform(url, profile):
+    """The previous per-call transformation (without profile lookup)."""
+    search_pattern = profile.get('search_pattern')
+    replace_pattern = profile.get('replace_pattern')
+    if not url or not search_pattern or not replace_pattern:
+        return url
+    search_pattern = search_pattern.strip()
+    replace_pattern = replace_pattern.strip()
+    if not search_pattern or not replace_pattern:
+        return url
+    try:
+        if not re.search(search_pattern, url):
+            return url
+        python_replace_pattern = replace_pattern
+        for i in range(99, 0, -1):
+            python_replace_pattern = python_replace_pattern.replace(f'${i}', f'\\{i}')
+        transformed_url = re.sub(search_pattern, python_replace_pattern, url)
+        if not transformed_url.startswith(('http://', 'https://', 'rtmp://', 'rtmps://')):
+            return url
+        return transformed_url
+    except re.error:
+        return url
+
+
+def build_corpus(num_channels, streams_per_channel, num_profiles, seed=42):
+    """Build profiles and channels with streams assigned to profiles."""
+    rng = random.Random(seed)
+    profiles = []
+    for profile_id in range(1, num_profiles + 1):
+        search_pattern, replace_pattern = PATTERNS[profile_id % len(PATTERNS)]
+        profiles.append({'id': profile_id, 'search_pattern': search_pattern, 'replace_pattern': replace_pattern})
+
+    channels = []
+    stream_id = 0
+    for _ in range(num_channels):
+        streams = []
+        for _ in range(streams_per_channel):
+            stream_id += 1
+            streams.append({
+                'id': stream_id,
+                'url': f"http://host{rng.randint(1, 20)}.example.com:8080/live/"
+                       f"user{rng.randint(1, 999)}/pass{rng.randint(1, 999)}/{stream_id}.ts",
+                'profile': rng.choice(profiles),
+            })
+        channels.append(streams)
+    return profiles, channels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, default=2000, help="Number of channels (default: 2000)")
+    parser.add_argument("--streams-per-channel", type=int, default=10, help="Streams per channel (default: 10)")
+    parser.add_argument("--profiles", type=int, default=8, help="Number of M3U profiles (default: 8)")
+    args = parser.parse_args()
+
+    # Per-stream debug logging would dominate the measurement
+    logging.disable(logging.INFO)
+
+    profiles, channels = build_corpus(args.channels, args.streams_per_channel, args.profiles)
+    total = sum(len(streams) for streams in channels)
+    udi = UDIManager()
+    udi._initialized = True
+    udi._m3u_accounts_cache = [{'id': 1, 'profiles': profiles}]
+
+    print("=" * 80)
+    print(f"Profile URL transformation benchmark: {total} streams, {args.profiles} profiles")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    legacy = {s['id']: legacy_transform(s['url'], s['profile']) for streams in channels for s in streams}
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cached = {s['id']: udi.apply_profile_url_transformation(s, s['profile']) for streams in channels for s in streams}
+    cached_time = time.perf_counter() - start
+
+    identical = legacy == cached
+    print(f"{'path':>8} {'total (ms)':>11} {'per URL (us)':>13} {'speedup':>8}")
+    for name, elapsed in (("legacy", legacy_time), ("cached", cached_time)):
+        print(f"{name:>8} {elapsed * 1000:>11.1f} {elapsed / total * 1e6:>13.2f} {legacy_time / elapsed:>7.1f}x")
+    print(f"Identical output: {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
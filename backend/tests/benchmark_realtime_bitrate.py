@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Validation benchmark for the non-realtime bitrate measurement.
+
+Recorded sample streams (MPEG-TS files) are served from a local HTTP server
+and measured with:
+- realtime: get_stream_info_and_bitrate() with '-re' (the current method,
+  bytes read over the requested duration)
+- fast: get_stream_info_and_bitrate(realtime=False), read at network speed
+  with the bytes read divided by the presentation timestamp span
+
+and the bitrates, wall times and their relative difference are reported.
+Without sample files, a constant and a variable bitrate sample are
+generated with ffmpeg. Requires ffmpeg; skipped when it is not installed.
+
+Usage:
+    python tests/benchmark_realtime_bitrate.py [--duration 10] [--tolerance 0.05] [sample.ts ...]
+"""
+
+import argparse
+import functools
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream_check_utils import check_ffmpeg_installed, get_stream_info_and_bitrate
+
+# name -> ffmpeg video encoding arguments of the generated samples
+GENERATED_SAMPLES = {
+    'cbr.ts': ['-c:v', 'mpeg2video', '-b:v', '3M', '-minrate', '3M', '-maxrate', '3M', '-bufsize', '1M'],
+    'vbr.ts': ['-c:v', 'mpeg2video', '-q:v', '4'],
+}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class SampleServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # ffmpeg closes the connection once it has read enough
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def generate_samples(directory: str, seconds: int):
+    """Encode test pattern samples of the given length into directory."""
+    paths = []
+    for name, video_args in GENERATED_SAMPLES.items():
+        path = os.path.join(directory, name)
+        subprocess.run(
+            ['ffmpeg', '-v', 'error', '-y',
+             '-f', 'lavfi', '-i', f'testsrc2=size=1280x720:rate=25:duration={seconds}',
+             '-f', 'lavfi', '-i', f'sine=frequency=440:duration={seconds}',
+             *video_args, '-c:a', 'mp2', '-b:a', '192k', '-f', 'mpegts', path],
+            check=True
+        )
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("samples", nargs="*", help="Recorded MPEG-TS files (default: generated samples)")
+    parser.add_argument("--duration", type=int, default=10, help="Seconds of media measured (default: 10)")
+    parser.add_argument("--tolerance", type=float, default=0.05,
+                        help="Maximum relative bitrate difference (default: 0.05)")
+    args = parser.parse_args()
+
+    if not check_ffmpeg_installed():
+        print("ffmpeg is not installed, skipping")
+        return 0
+
+    logging.disable(logging.WARNING)
+    serve_dir = tempfile.mkdtemp()
+    server = None
+    try:
+        if args.samples:
+            for path in args.samples:
+                shutil.copy(path, serve_dir)
+            names = [os.path.basename(path) for path in args.samples]
+        else:
+            # Longer than measured, so both methods can read the full duration
+            names = [os.path.basename(path) for path in generate_samples(serve_dir, args.duration + 5)]
+
+        server = SampleServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=serve_dir))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+        print("=" * 80)
+        print(f"Realtime vs. network speed bitrate measurement ({args.duration}s of media)")
+        print("=" * 80)
+        print(f"{'sample':<24} {'realtime kbps':>13} {'fast kbps':>10} {'diff':>7} {'realtime s':>11} {'fast s':>7}")
+
+        failed = 0
+        for name in names:
+            url = base_url + name
+            realtime = get_stream_info_and_bitrate(url, duration=args.duration)
+            fast = get_stream_info_and_bitrate(url, duration=args.duration, realtime=False)
+            if realtime['bitrate_kbps'] is None or fast['bitrate_kbps'] is None:
+                print(f"{name:<24} no bitrate (realtime: {realtime['status']}, fast: {fast['status']})")
+                failed += 1
+                continue
+            diff = (fast['bitrate_kbps'] - realtime['bitrate_kbps']) / realtime['bitrate_kbps']
+            failed += abs(diff) > args.tolerance
+            print(f"{name:<24} {realtime['bitrate_kbps']:>13.1f} {fast['bitrate_kbps']:>10.1f} {diff:>+7.1%} "
+                  f"{realtime['elapsed_time']:>11.2f} {fast['elapsed_time']:>7.2f}")
+
+        print(f"Within {args.tolerance:.0%}: {len(names) - failed}/{len(names)}")
+        return 1 if failed else 0
+    finally:
+        if server is not None:
+            server.shutdown()
+        shutil.rmtree(serve_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
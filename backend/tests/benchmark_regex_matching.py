@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark for stream-to-channel regex matching.
+
+Builds a synthetic corpus (default: 100k streams, 5k channels) and compares:
+- Full scan: every stream is tested against every channel's compiled patterns
+- Prefilter: only channels whose required literal occurs in the stream name
+  are tested (RegexChannelMatcher.match_streams)
+
+The full scan is O(streams x channels), so it is timed on a sample of streams
+and extrapolated. Both paths are checked to produce identical matches on the
+sample.
+
+Usage:
+    python tests/benchmark_regex_matching.py [--streams N] [--channels N] [--sample N]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automated_stream_manager import RegexChannelMatcher
+
+PREFIXES = ["US", "UK", "PL", "DE", "FR", "ES", "IT", "NL", "CA", "AU"]
+QUALITIES = ["", " HD", " FHD", " 4K", " SD", " RAW"]
+SYLLABLES = ["sky", "fox", "max", "net", "one", "pro", "tv", "box", "star", "nova",
+             "sport", "news", "kids", "film", "plus", "live", "gold", "prime", "zone", "art"]
+
+PATTERN_TEMPLATES = [
+    [".*CHANNEL_NAME.*"],
+    ["^(?:{prefix})[:|] CHANNEL_NAME(?: (?:HD|FHD|4K))?$"],
+    ["CHANNEL_NAME", "{prefix}: CHANNEL_NAME HD"],
+    ["^{prefix}[:|] CHANNEL_NAME"],
+]
+
+
+def build_corpus(num_channels: int, num_streams: int, seed: int = 42):
+    """Build a synthetic regex config and stream list."""
+    rng = random.Random(seed)
+
+    names = set()
+    while len(names) < num_channels:
+        names.add(" ".join(rng.choice(SYLLABLES).capitalize() for _ in range(rng.randint(2, 3)))
+                  + f" {rng.randint(1, 99)}")
+    names = sorted(names)
+
+    patterns = {}
+    for channel_id, name in enumerate(names, start=1):
+        template = rng.choice(PATTERN_TEMPLATES)
+        pattern_data = {
+            "name": name,
+            "regex": [t.format(prefix=rng.choice(PREFIXES)) for t in template],
+            "enabled": True
+        }
+        if rng.random() < 0.2:
+            pattern_data["m3u_accounts"] = rng.sample(range(1, 6), 2)
+        patterns[str(channel_id)] = pattern_data
+
+    streams = []
+    for stream_id in range(1, num_streams + 1):
+        if rng.random() < 0.7:
+            base = rng.choice(names)
+        else:
+            base = " ".join(rng.choice(SYLLABLES).capitalize() for _ in range(3))
+        streams.append({
+            "id": stream_id,
+            "name": f"{rng.choice(PREFIXES)}: {base}{rng.choice(QUALITIES)}",
+            "m3u_account": rng.randint(1, 5)
+        })
+
+    config = {
+        "patterns": patterns,
+        "global_settings": {"case_sensitive": False, "require_exact_match": False}
+    }
+    return config, streams
+
+
+def full_scan(matcher: RegexChannelMatcher, streams):
+    """Match streams against every applicable channel (no prefilter)."""
+    index = matcher._get_compiled_index()
+    results = {}
+    for stream in streams:
+        search_name = stream["name"] if index.case_sensitive else stream["name"].lower()
+        matches = matcher._match_entries(stream["name"], search_name,
+                                         index.entries_for_account(stream["m3u_account"]))
+        if matches:
+            results[stream["id"]] = matches
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=100000, help="Number of streams (default: 100000)")
+    parser.add_argument("--channels", type=int, default=5000, help="Number of channels (default: 5000)")
+    parser.add_argument("--sample", type=int, default=1000, help="Streams used for the full scan (default: 1000)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"Regex matching benchmark: {args.streams} streams, {args.channels} channels")
+    print("=" * 80)
+
+    config, streams = build_corpus(args.channels, args.streams)
+    temp_dir = tempfile.mkdtemp()
+    try:
+        config_file = Path(temp_dir) / "channel_regex_config.json"
+        with open(config_file, "w") as f:
+            json.dump(config, f)
+        matcher = RegexChannelMatcher(config_file=config_file)
+
+        start = time.perf_counter()
+        matcher._get_compiled_index()
+        build_time = time.perf_counter() - start
+        print(f"Index build:            {build_time:8.3f}s")
+
+        sample = streams[:args.sample]
+        start = time.perf_counter()
+        scan_results = full_scan(matcher, sample)
+        scan_time = time.perf_counter() - start
+        scan_estimate = scan_time * len(streams) / max(len(sample), 1)
+        print(f"Full scan ({len(sample)} streams): {scan_time:8.3f}s  (~{scan_estimate:.1f}s extrapolated)")
+
+        prefilter_sample = matcher.match_streams(sample)
+        if prefilter_sample != scan_results:
+            print("ERROR: prefilter results differ from full scan")
+            return 1
+        print(f"Results identical on sample ({sum(len(m) for m in scan_results.values())} matches)")
+
+        start = time.perf_counter()
+        results = matcher.match_streams(streams)
+        prefilter_time = time.perf_counter() - start
+        print(f"Prefilter ({len(streams)} streams): {prefilter_time:8.3f}s  "
+              f"({sum(len(m) for m in results.values())} matches)")
+        print(f"Speedup:                {scan_estimate / max(prefilter_time, 1e-9):8.1f}x")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
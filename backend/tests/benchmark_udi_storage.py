@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark for UDI storage backends.
+
+For each stream count (default: 10k, 100k, 500k) a synthetic stream list is
+saved with the JSON and the SQLite backend and the following is timed:
+- Startup load: load_streams() of the full data set
+- Single update: update_stream() of one random stream (mean per call)
+- Lookup: get_stream_by_id() of one random stream (mean per call)
+
+The JSON backend rewrites the whole file on every update, so it is timed on
+fewer updates than the SQLite backend.
+
+Usage:
+    python tests/benchmark_udi_storage.py [--sizes 10000,100000,500000] [--updates N] [--json-updates N]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from udi.storage import UDIStorage
+from udi.sqlite_storage import UDISQLiteStorage
+
+
+def build_streams(count: int, seed: int = 42):
+    """Build a synthetic list of Dispatcharr-like stream records."""
+    rng = random.Random(seed)
+    return [
+        {
+            'id': stream_id,
+            'name': f"US: Channel {stream_id % 5000} {rng.choice(['HD', 'FHD', 'SD', '4K'])}",
+            'url': f"http://provider{stream_id % 7}.example.com/live/user/pass/{stream_id}.ts",
+            'm3u_account': stream_id % 7 + 1,
+            'channel_group': stream_id % 300,
+            'tvg_id': f"channel{stream_id % 5000}.us",
+            'is_custom': False,
+            'stream_stats': {
+                'resolution': '1920x1080',
+                'source_fps': 25,
+                'video_codec': 'h264',
+                'audio_codec': 'aac',
+                'ffmpeg_output_bitrate': rng.randint(1000, 8000),
+            },
+        }
+        for stream_id in range(1, count + 1)
+    ]
+
+
+def bench_backend(storage, streams, num_updates: int, rng: random.Random):
+    """Return (save, load, mean update, mean lookup) timings in seconds."""
+    start = time.perf_counter()
+    storage.save_streams(streams)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    storage.load_streams()
+    load_time = time.perf_counter() - start
+
+    ids = [rng.randint(1, len(streams)) for _ in range(num_updates)]
+    start = time.perf_counter()
+    for stream_id in ids:
+        record = dict(streams[stream_id - 1])
+        record['stream_stats'] = {**record['stream_stats'], 'source_fps': 50}
+        storage.update_stream(stream_id, record)
+    update_time = (time.perf_counter() - start) / max(num_updates, 1)
+
+    start = time.perf_counter()
+    for stream_id in ids:
+        storage.get_stream_by_id(stream_id)
+    lookup_time = (time.perf_counter() - start) / max(num_updates, 1)
+
+    return save_time, load_time, update_time, lookup_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,500000", help="Comma-separated stream counts")
+    parser.add_argument("--updates", type=int, default=1000, help="SQLite updates per size (default: 1000)")
+    parser.add_argument("--json-updates", type=int, default=5, help="JSON updates per size (default: 5)")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    print("=" * 80)
+    print("UDI storage benchmark (times per call, in milliseconds unless noted)")
+    print("=" * 80)
+    print(f"{'streams':>8} {'backend':>8} {'save (s)':>10} {'load (s)':>10} {'update':>10} {'lookup':>10}")
+
+    for size in sizes:
+        streams = build_streams(size)
+        for name, factory, num_updates in (
+            ("json", UDIStorage, args.json_updates),
+            ("sqlite", UDISQLiteStorage, args.updates),
+        ):
+            temp_dir = tempfile.mkdtemp()
+            try:
+                storage = factory(Path(temp_dir))
+                save_time, load_time, update_time, lookup_time = bench_backend(
+                    storage, streams, num_updates, random.Random(size)
+                )
+                if hasattr(storage, 'close'):
+                    storage.close()
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            print(f"{size:>8} {name:>8} {save_time:>10.3f} {load_time:>10.3f} "
+                  f"{update_time * 1000:>10.3f} {lookup_time * 1000:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
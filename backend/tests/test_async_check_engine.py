@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio check engine.
+
+Verifies that:
+- ffmpeg/ffprobe output from asyncio subprocesses is parsed like in thread mode
+- ffmpeg is stopped once all metrics are known and killed on timeout
+- The engine respects the global and per-account limits
+- The account slot timeout only runs for the stream first in line
+- Channel completion callbacks receive each channel's results
+- Retries wait without blocking other checks
+- UDI and proxy lookups run off the event loop, the URL once the account slot is held
+"""
+
+import asyncio
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_check_engine import (
+    AsyncCheckEngine,
+    analyze_stream_async,
+    get_stream_info_and_bitrate_async,
+    probe_stream_async,
+)
+from concurrent_stream_limiter import AccountStreamLimiter
+
+
+FFMPEG_SCRIPT = """#!/bin/sh
+cat >&2 <<'EOF'
+Input #0, mpegts, from 'http://test.stream':
+  Stream #0:0[0x100]: Video: h264 (High), yuv420p, 1280x720, 25 fps, 25 tbr
+  Stream #0:1[0x101]: Audio: aac (LC), 48000 Hz, stereo, fltp
+Output #0, null, to 'pipe:':
+progress=end
+[AVIOContext @ 0x1] Statistics: 7500000 bytes read, 0 seeks
+EOF
+exec sleep {linger}
+"""
+
+FFPROBE_SCRIPT = """#!/bin/sh
+echo '{"streams": [{"codec_type": "video", "codec_name": "h264", "width": 1280, "height": 720, "avg_frame_rate": "25/1"}]}'
+"""
+
+
+def _install(bin_dir, name, content):
+    path = os.path.join(bin_dir, name)
+    with open(path, 'w') as f:
+        f.write(content)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+class TestAsyncSubprocessChecks(unittest.TestCase):
+    """Test the asyncio ffmpeg/ffprobe drivers against fake binaries."""
+
+    def setUp(self):
+        self.bin_dir = tempfile.mkdtemp()
+        _install(self.bin_dir, 'ffprobe', FFPROBE_SCRIPT)
+        self.path_patch = patch.dict(os.environ, {'PATH': self.bin_dir + os.pathsep + os.environ.get('PATH', '')})
+        self.path_patch.start()
+
+    def tearDown(self):
+        self.path_patch.stop()
+        shutil.rmtree(self.bin_dir, ignore_errors=True)
+
+    def test_analysis_stops_when_metrics_known(self):
+        """ffmpeg is stopped after the statistics line instead of running to the end."""
+        _install(self.bin_dir, 'ffmpeg', FFMPEG_SCRIPT.format(linger=30))
+
+        start = time.time()
+        result = asyncio.run(get_stream_info_and_bitrate_async('http://test.stream', duration=10))
+
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(result['status'], 'OK')
+        self.assertEqual(result['resolution'], '1280x720')
+        self.assertEqual(result['video_codec'], 'h264')
+        self.assertEqual(result['bitrate_kbps'], 6000.0)
+
+    def test_adaptive_analysis_stops_when_bitrate_converged(self):
+        """With adaptive, ffmpeg is stopped once stable and the input bytes read give the bitrate."""
+        # Remuxed output at 4000 kbps; the 4400 kbps input is only reported when ffmpeg is terminated
+        progress = ''.join(f"total_size={500 * i * 1000}\nout_time_us={i * 1000000}\nprogress=continue\n"
+                           for i in range(1, 7))
+        script = FFMPEG_SCRIPT.replace('progress=end\n', progress).replace(
+            '[AVIOContext @ 0x1] Statistics: 7500000 bytes read, 0 seeks\n', '').replace(
+            '#!/bin/sh\n', "#!/bin/sh\ntrap 'printf \"progress=end\\n[AVIOContext @ 0x1] Statistics: 3300000 bytes read, 0 seeks\\n\" >&2; "
+                            "kill $! 2>/dev/null; exit 255' TERM\n").replace('exec sleep {linger}', 'sleep {linger} &\nwait')
+        _install(self.bin_dir, 'ffmpeg', script.format(linger=30))
+
+        start = time.time()
+        result = asyncio.run(get_stream_info_and_bitrate_async('http://test.stream', duration=30, adaptive=True,
+                                                               min_duration=5))
+
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(result['bitrate_kbps'], 4400.0)
+        self.assertEqual(result['measured_duration'], 6.0)
+        self.assertEqual(result['bitrate_samples'], 7)  # ffmpeg's final progress block after SIGTERM
+
+    def test_non_realtime_bitrate_over_media_time(self):
+        """Without realtime, ffmpeg runs without -re and the bytes read are divided by the media time."""
+        args_file = os.path.join(self.bin_dir, 'args')
+        script = FFMPEG_SCRIPT.replace('progress=end\n', 'out_time_us=6000000\nprogress=end\n')
+        _install(self.bin_dir, 'ffmpeg', script.replace('#!/bin/sh\n', f'#!/bin/sh\necho "$@" > {args_file}\n')
+                 .format(linger=30))
+
+        result = asyncio.run(get_stream_info_and_bitrate_async('http://test.stream', duration=10, realtime=False))
+
+        self.assertEqual(result['bitrate_kbps'], 10000.0)
+        self.assertEqual(result['measured_duration'], 6.0)
+        with open(args_file) as f:
+            self.assertNotIn('-re', f.read().split())
+
+    def test_analysis_timeout(self):
+        """A hanging ffmpeg is killed after timeout + duration + startup buffer."""
+        _install(self.bin_dir, 'ffmpeg', "#!/bin/sh\nexec sleep 30\n")
+
+        result = asyncio.run(get_stream_info_and_bitrate_async(
+            'http://test.stream', duration=1, timeout=0, stream_startup_buffer=0
+        ))
+
+        self.assertEqual(result['status'], 'Timeout')
+
+    def test_probe(self):
+        """ffprobe JSON output is parsed into the probe result."""
+        result = asyncio.run(probe_stream_async('http://test.stream'))
+
+        self.assertEqual(result['status'], 'OK')
+        self.assertEqual(result['resolution'], '1280x720')
+        self.assertEqual(result['fps'], 25.0)
+
+    def test_analyze_stream_async(self):
+        """The full async analysis returns the same result fields as analyze_stream."""
+        _install(self.bin_dir, 'ffmpeg', FFMPEG_SCRIPT.format(linger=0))
+
+        result = asyncio.run(analyze_stream_async('http://test.stream', 7, 'Test', ffmpeg_duration=10, fast_probe=True, retries=0))
+
+        self.assertEqual(result['stream_id'], 7)
+        self.assertEqual(result['status'], 'OK')
+        self.assertEqual(result['bitrate_kbps'], 6000.0)
+        self.assertFalse(result['rejected_by_probe'])
+        self.assertEqual(set(result['tier_timings']), {'probe', 'analysis'})
+
+    def test_analyze_stream_async_hls_fast_path(self):
+        """HLS URLs are measured by the fast path without running ffprobe or ffmpeg."""
+        _install(self.bin_dir, 'ffmpeg', "#!/bin/sh\nexit 1\n")
+        hls_result = {'video_codec': 'h264', 'audio_codec': 'aac', 'resolution': '1280x720', 'fps': 25.0,
+                      'bitrate_kbps': 1500.0, 'status': 'OK', 'elapsed_time': 0.4, 'bitrate_samples': 3,
+                      'measured_duration': 12.0}
+
+        with patch('async_check_engine.get_stream_info_and_bitrate_hls', return_value=hls_result) as mock_hls:
+            result = asyncio.run(analyze_stream_async('http://test.stream/live.m3u8', 7, 'Test', fast_probe=True,
+                                                      retries=0, hls_fast_path=True, hls_segments=3))
+
+        mock_hls.assert_called_once()
+        self.assertEqual(mock_hls.call_args.args[:2], ('http://test.stream/live.m3u8', 3))
+        self.assertEqual(result['bitrate_kbps'], 1500.0)
+        self.assertEqual(result['measured_duration'], 12.0)
+        self.assertEqual(set(result['tier_timings']), {'analysis'})
+
+
+class TestAsyncCheckEngine(unittest.TestCase):
+    """Test scheduling in the asyncio check engine."""
+
+    def setUp(self):
+        self.limiter = AccountStreamLimiter()
+        self.running = {'total': 0, 1: 0, 2: 0}
+        self.peak = {'total': 0, 1: 0, 2: 0}
+
+    async def _fake_analysis(self, stream_url, stream_id, stream_name, **kwargs):
+        account_id = 1 if stream_id < 100 else 2
+        for key in ('total', account_id):
+            self.running[key] += 1
+            self.peak[key] = max(self.peak[key], self.running[key])
+        await asyncio.sleep(0.05)
+        for key in ('total', account_id):
+            self.running[key] -= 1
+        return {'stream_id': stream_id, 'stream_name': stream_name, 'status': 'OK'}
+
+    @staticmethod
+    def _streams(ids, account_id):
+        return [{'id': i, 'name': f'Stream {i}', 'url': f'http://test.com/{i}', 'm3u_account': account_id}
+                for i in ids]
+
+    @patch('async_check_engine._get_stream_proxy', return_value=None)
+    def test_limits_and_channel_results(self, _mock_proxy):
+        """Global and account limits hold and each channel gets its own results."""
+        self.limiter.set_account_limit(1, 2)
+        engine = AsyncCheckEngine(self.limiter, global_limit=5)
+        completed = {}
+
+        with patch('async_check_engine.analyze_stream_async', side_effect=self._fake_analysis):
+            stats = engine.check_channels_with_limits(
+                {10: self._streams(range(1, 7), 1), 20: self._streams(range(101, 111), 2)},
+                on_channel_complete=lambda key, results: completed.update(
+                    {key: sorted(r['stream_id'] for r in results)})
+            )
+
+        self.assertEqual(completed[10], list(range(1, 7)))
+        self.assertEqual(completed[20], list(range(101, 111)))
+        self.assertEqual(self.peak[1], 2)
+        self.assertEqual(self.peak['total'], 5)
+        self.assertEqual(stats['checked'], 16)
+        self.assertEqual(stats['peak_concurrency'], 5)
+        self.assertEqual(self.limiter.account_checking_counts[1], 0)
+
+    @patch('async_check_engine._get_stream_proxy', return_value=None)
+    def test_queued_streams_not_timed_out(self, _mock_proxy):
+        """Streams queued behind an account limit wait their turn instead of timing out."""
+        self.limiter.set_account_limit(1, 1)
+        engine = AsyncCheckEngine(self.limiter, global_limit=5)
+        checked = []
+
+        async def analysis(stream_url, stream_id, stream_name, **kwargs):
+            checked.append(stream_id)
+            await asyncio.sleep(0.1)
+            return {'stream_id': stream_id, 'stream_name': stream_name, 'status': 'OK'}
+
+        # Eight checks of 0.1s through one slot take far longer than the timeout
+        with patch('async_check_engine.analyze_stream_async', side_effect=analysis):
+            stats = engine.check_channels_with_limits(
+                {10: self._streams(range(1, 9), 1)},
+                on_channel_complete=lambda key, results: None,
+                acquire_timeout=0.3
+            )
+
+        self.assertEqual(stats['checked'], 8)
+        self.assertEqual(stats['skipped'], 0)
+        # Streams get the slot in queueing order
+        self.assertEqual(checked, list(range(1, 9)))
+
+    @patch('async_check_engine._get_stream_proxy', return_value=None)
+    def test_account_slot_timeout(self, _mock_proxy):
+        """Streams are skipped once they have been first in line for the timeout."""
+        self.limiter.set_account_limit(1, 1)
+        self.limiter.acquire(1, timeout=0)
+        engine = AsyncCheckEngine(self.limiter, global_limit=5)
+
+        with patch('async_check_engine.analyze_stream_async', side_effect=self._fake_analysis):
+            stats = engine.check_channels_with_limits(
+                {10: self._streams(range(1, 4), 1)},
+                on_channel_complete=lambda key, results: None,
+                acquire_timeout=0.1
+            )
+
+        self.assertEqual(stats['skipped'], 3)
+        self.assertEqual(stats['checked'], 0)
+
+    @patch('async_check_engine._get_stream_proxy', return_value=None)
+    def test_check_streams_with_limits(self, _mock_proxy):
+        """The single-channel interface returns a flat result list."""
+        engine = AsyncCheckEngine(self.limiter, global_limit=3)
+        with patch('async_check_engine.analyze_stream_async', side_effect=self._fake_analysis):
+            results = engine.check_streams_with_limits(self._streams(range(1, 5), 1))
+
+        self.assertEqual(sorted(r['stream_id'] for r in results), [1, 2, 3, 4])
+
+    def test_udi_lookups_off_event_loop(self):
+        """Profile URL transformation, capacity checks and proxy lookups run in the executor, the URL after the slot."""
+        loop_thread = threading.get_ident()
+        calls = []
+
+        def get_proxy(stream_id):
+            calls.append(('proxy', threading.get_ident(), None))
+            return 'http://proxy:3128'
+
+        def transform(stream):
+            calls.append(('url', threading.get_ident(), self.limiter.account_checking_counts.get(1, 0)))
+            return stream['url'] + '?profile=1'
+
+        def can_run(stream):
+            calls.append(('can_run', threading.get_ident(), None))
+            return True, None
+
+        self.limiter.udi_manager = Mock(get_active_streams_for_account=Mock(return_value=0),
+                                        apply_profile_url_transformation=Mock(side_effect=transform),
+                                        check_stream_can_run=Mock(side_effect=can_run))
+        self.limiter.set_account_limit(1, 1)
+        analyzed = []
+
+        async def analysis(stream_url, stream_id, stream_name, proxy=None, **kwargs):
+            analyzed.append((stream_url, proxy))
+            return {'stream_id': stream_id, 'stream_name': stream_name, 'status': 'OK'}
+
+        engine = AsyncCheckEngine(self.limiter, global_limit=2)
+        with patch('async_check_engine.analyze_stream_async', side_effect=analysis), \
+                patch('async_check_engine._get_stream_proxy', side_effect=get_proxy):
+            results = engine.check_streams_with_limits(self._streams(range(1, 3), 1))
+
+        self.assertEqual(sorted(r['stream_id'] for r in results), [1, 2])
+        self.assertEqual(sorted(analyzed), [('http://test.com/1?profile=1', 'http://proxy:3128'),
+                                            ('http://test.com/2?profile=1', 'http://proxy:3128')])
+        self.assertEqual(sorted(call[0] for call in calls), ['can_run', 'can_run', 'proxy', 'proxy', 'url', 'url'])
+        self.assertNotIn(loop_thread, [call[1] for call in calls])
+        # The account slot is held while the URL is computed
+        self.assertEqual([call[2] for call in calls if call[0] == 'url'], [1, 1])
+
+    def test_retries_do_not_block_other_checks(self):
+        """Retry delays are timers on the event loop, so retrying checks overlap."""
+        attempts = []
+
+        async def flaky(url, **kwargs):
+            attempts.append(url)
+            status = 'OK' if attempts.count(url) > 1 else 'Error'
+            return {'video_codec': 'h264', 'audio_codec': 'aac', 'resolution': '1280x720',
+                    'fps': 25, 'bitrate_kbps': 1000.0, 'status': status, 'elapsed_time': 0.0}
+
+        async def run():
+            return await asyncio.gather(*(
+                analyze_stream_async(f'http://test.com/{i}', i, retries=1, retry_delay=0.5)
+                for i in range(20)
+            ))
+
+        with patch('async_check_engine.get_stream_info_and_bitrate_async', side_effect=flaky):
+            start = time.time()
+            results = asyncio.run(run())
+
+        self.assertLess(time.time() - start, 2)
+        self.assertTrue(all(r['status'] == 'OK' for r in results))
+        self.assertEqual(len(attempts), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -87,7 +87,7 @@ class TestAutoCreateEndToEnd(unittest.TestCase):
                 ]
                 
                 # Mock requests
-                with patch('scheduling_service.requests.get') as mock_get:
+                with patch('http_session.DispatcharrSession.get') as mock_get:
                     mock_response = Mock()
                     mock_response.json.return_value = mock_programs
                     mock_response.raise_for_status = Mock()
@@ -185,7 +185,7 @@ class TestAutoCreateEndToEnd(unittest.TestCase):
                     }
                 ]
                 
-                with patch('scheduling_service.requests.get') as mock_get:
+                with patch('http_session.DispatcharrSession.get') as mock_get:
                     mock_response = Mock()
                     mock_response.json.return_value = mock_programs
                     mock_response.raise_for_status = Mock()
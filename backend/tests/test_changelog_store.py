@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the time-partitioned changelog store.
+
+Verifies that:
+- Entries are appended to one partition per day, rolling over by size
+- An append writes only the new line and leaves older partitions untouched
+- Queries only read the partitions of the requested days
+- Partitions older than the retention period are deleted
+- Cursor pagination across two stores returns every entry exactly once
+- A single-file changelog.json is migrated into partitions
+- A failed migration is logged and keeps the legacy file
+- The stream checker changelog uses its changelog_retention_days setting
+"""
+
+import heapq
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automated_stream_manager import ChangelogManager
+from changelog_store import ChangelogStore, decode_cursor, encode_cursor
+
+
+def _entry(timestamp, action='global_check', channel_id=1):
+    return {
+        'timestamp': timestamp.isoformat(),
+        'action': action,
+        'details': {'channel_id': channel_id},
+        'subentries': [{'group': 'check', 'items': [{'channel_id': channel_id}]}]
+    }
+
+
+class TestChangelogStore(unittest.TestCase):
+    """Test partitioning, retention and queries."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.directory = Path(self.temp_dir) / 'changelog'
+        self.now = datetime.now()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_partitions_by_day(self):
+        """Entries go to the partition of their day and are read back newest first."""
+        store = ChangelogStore(self.directory)
+        noon = self.now.replace(hour=12)
+        store.append_many([_entry(noon - timedelta(days=d, minutes=m)) for d in range(3) for m in range(2)])
+
+        self.assertEqual(len(list(self.directory.glob('*.jsonl'))), 3)
+        timestamps = [entry['timestamp'] for _, entry in store.iter_entries()]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+        self.assertEqual(len(timestamps), 6)
+
+    def test_size_rollover(self):
+        """A day continues in a new partition once the size limit is reached."""
+        store = ChangelogStore(self.directory, max_partition_bytes=500)
+        for i in range(20):
+            store.append(_entry(self.now.replace(hour=12) + timedelta(seconds=i)))
+
+        self.assertGreater(store.get_stats()['partitions'], 1)
+        reloaded = ChangelogStore(self.directory)
+        self.assertEqual(len(list(reloaded.iter_entries())), 20)
+
+    def test_append_does_not_rewrite_history(self):
+        """An append only adds its line to today's partition."""
+        store = ChangelogStore(self.directory, retention_days=0)
+        store.append_many([_entry(self.now - timedelta(days=d, minutes=m)) for d in range(30) for m in range(20)])
+        before = {path.name: path.read_bytes() for path in self.directory.glob('*.jsonl')}
+
+        reloaded = ChangelogStore(self.directory, retention_days=0)
+        with patch('changelog_store.open', side_effect=open, create=True) as mock_open, \
+                patch.object(reloaded, '_load', wraps=reloaded._load) as mock_load:
+            reloaded.append(_entry(self.now, channel_id=2))
+
+        # At most today's partition is read (to count its lines), and it is opened for appending
+        self.assertLessEqual(mock_load.call_count, 1)
+        self.assertEqual([c.args[1] for c in mock_open.call_args_list if c.args[1] != 'r'], ['a'])
+        after = {path.name: path.read_bytes() for path in self.directory.glob('*.jsonl')}
+        self.assertEqual(after.keys(), before.keys())
+        changed = [name for name in before if after[name] != before[name]]
+        self.assertEqual(len(changed), 1)
+        self.assertTrue(after[changed[0]].startswith(before[changed[0]]))
+        self.assertEqual(after[changed[0]].count(b'\n'), before[changed[0]].count(b'\n') + 1)
+
+    def test_query_reads_only_requested_days(self):
+        """Old partitions are not parsed for a recent range."""
+        store = ChangelogStore(self.directory, retention_days=0)
+        store.append_many([_entry(self.now - timedelta(days=d)) for d in range(60)])
+
+        reloaded = ChangelogStore(self.directory, retention_days=0)
+        cutoff = (self.now - timedelta(days=7, seconds=1)).timestamp()
+        with patch.object(reloaded, '_load', wraps=reloaded._load) as mock_load:
+            self.assertEqual(len(list(reloaded.iter_entries(since=cutoff))), 8)
+        self.assertLessEqual(mock_load.call_count, 9)
+
+    def test_retention(self):
+        """Partitions older than the retention period are deleted."""
+        store = ChangelogStore(self.directory, retention_days=0)
+        store.append_many([_entry(self.now - timedelta(days=d)) for d in (0, 5, 40)])
+
+        reloaded = ChangelogStore(self.directory, retention_days=30)
+        self.assertEqual(reloaded.get_stats()['days'], 2)
+        self.assertEqual(len(list(self.directory.glob('*.jsonl'))), 2)
+
+    def test_cursor_pagination_across_stores(self):
+        """Paging through two merged stores returns every entry exactly once."""
+        stores = [ChangelogStore(Path(self.temp_dir) / name) for name in ('changelog', 'stream_checker_changelog')]
+        for i in range(25):
+            # Same timestamps in both stores to exercise tie-breaking
+            timestamp = self.now - timedelta(minutes=i // 2)
+            stores[0].append(_entry(timestamp, channel_id=i))
+            stores[1].append(_entry(timestamp, channel_id=100 + i))
+
+        seen = []
+        before = None
+        while True:
+            merged = heapq.merge(*(store.iter_entries(before=before) for store in stores),
+                                 key=lambda item: item[0], reverse=True)
+            page = [item for _, item in zip(range(7), merged)]
+            seen.extend(entry['details']['channel_id'] for _, entry in page)
+            if len(page) < 7:
+                break
+            before = decode_cursor(encode_cursor(page[-1][0]))
+
+        self.assertEqual(sorted(seen), list(range(25)) + list(range(100, 125)))
+
+    def test_invalid_cursor(self):
+        """Malformed cursors raise ValueError."""
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor')
+
+
+class TestChangelogManagerMigration(unittest.TestCase):
+    """Test the ChangelogManager on top of the store."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.changelog_file = Path(self.temp_dir) / 'changelog.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_legacy_changelog_migrated(self):
+        """Entries of an existing changelog.json are imported once."""
+        now = datetime.now()
+        with open(self.changelog_file, 'w') as f:
+            json.dump([_entry(now - timedelta(days=1)), _entry(now, action='single_channel_check')], f)
+
+        manager = ChangelogManager(self.changelog_file)
+        self.assertFalse(self.changelog_file.exists())
+        self.assertTrue(Path(self.temp_dir, 'changelog.json.migrated').exists())
+        self.assertEqual([e['action'] for e in manager.get_recent_entries(7)], ['single_channel_check', 'global_check'])
+
+        manager.add_entry('global_check', {'channel_id': 2}, subentries=[{'group': 'check', 'items': [{}]}])
+        self.assertEqual(len(ChangelogManager(self.changelog_file).get_recent_entries(7)), 3)
+
+    def test_failed_migration_keeps_legacy_file(self):
+        """A migration error does not break the manager and the legacy file is kept for the next start."""
+        with open(self.changelog_file, 'w') as f:
+            json.dump([_entry(datetime.now())], f)
+
+        with patch.object(ChangelogStore, 'append_many', side_effect=OSError('disk full')):
+            manager = ChangelogManager(self.changelog_file)
+        self.assertTrue(self.changelog_file.exists())
+
+        manager.add_entry('global_check', {'channel_id': 2}, subentries=[{'group': 'check', 'items': [{}]}])
+        self.assertEqual(len(manager.get_recent_entries(7)), 1)
+
+    def test_stream_checker_changelog_retention(self):
+        """The stream checker passes its changelog_retention_days setting to the store."""
+        from stream_checker_service import StreamCheckerService
+        with open(Path(self.temp_dir) / 'stream_checker_config.json', 'w') as f:
+            json.dump({'changelog_retention_days': 5}, f)
+
+        with patch('stream_checker_service.CONFIG_DIR', Path(self.temp_dir)):
+            service = StreamCheckerService()
+        self.assertEqual(service.changelog.store.retention_days, 5)
+
+
+class TestChangelogEndpoint(unittest.TestCase):
+    """Test cursor pagination of /api/changelog."""
+
+    def test_paginated_changelog(self):
+        """limit/cursor page through automation and stream checker entries."""
+        from web_api import app
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        now = datetime.now()
+        automation = ChangelogManager(Path(temp_dir) / 'changelog.json')
+        checker = MagicMock()
+        checker.changelog = ChangelogManager(Path(temp_dir) / 'stream_checker_changelog.json')
+        for i in range(5):
+            automation.add_entry('global_check', {}, timestamp=(now - timedelta(minutes=2 * i)).isoformat(),
+                                 subentries=[{'group': 'check', 'items': [{}]}])
+            checker.changelog.add_entry('single_channel_check', {'channel_id': i},
+                                        timestamp=(now - timedelta(minutes=2 * i + 1)).isoformat(),
+                                        subentries=[{'group': 'check', 'items': [{'channel_id': i}]}])
+
+        with patch('web_api.get_automation_manager', return_value=MagicMock(changelog=automation)), \
+                patch('web_api.get_stream_checker_service', return_value=checker), \
+                app.test_client() as client:
+            self.assertEqual(len(client.get('/api/changelog?days=1').get_json()), 10)
+
+            timestamps = []
+            cursor = ''
+            while cursor is not None:
+                page = client.get(f'/api/changelog?days=1&limit=4&cursor={cursor}').get_json()
+                timestamps.extend(entry['timestamp'] for entry in page['entries'])
+                cursor = page['next_cursor']
+
+            self.assertEqual(len(timestamps), 10)
+            self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+            self.assertEqual(client.get('/api/changelog?cursor=bad').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for write-behind persistence of the ChannelUpdateTracker.
+
+Verifies that:
+- Checked stream IDs are stored as compact ranges
+- Marking thousands of channels is not written per channel
+- Pending changes are journaled and replayed, and the journal is compacted
+- Files written by older versions (indented, ID lists) are still read
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream_checker_service import ChannelUpdateTracker, decode_stream_ids, encode_stream_ids
+
+
+class TestStreamIdRanges(unittest.TestCase):
+    """Test the compact checked stream representation."""
+
+    def test_round_trip(self):
+        """IDs are encoded as sorted, de-duplicated ranges."""
+        self.assertEqual(encode_stream_ids([250, 101, 103, 102, 102, 7]), '7,101-103,250')
+        self.assertEqual(decode_stream_ids('7,101-103,250'), [7, 101, 102, 103, 250])
+        self.assertEqual(encode_stream_ids([]), '')
+        self.assertEqual(decode_stream_ids(''), [])
+
+
+class TestWriteBehind(unittest.TestCase):
+    """Test batching of tracker writes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracker_file = Path(self.temp_dir) / 'channel_updates.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_force_check_5k_channels(self):
+        """Marking 5000 channels for force check is one write and takes milliseconds."""
+        tracker = ChannelUpdateTracker(self.tracker_file, flush_interval=60)
+        channel_ids = list(range(1, 5001))
+
+        with patch('stream_checker_service.os.replace', wraps=os.replace) as mock_replace:
+            start = time.perf_counter()
+            tracker.mark_channels_for_force_check(channel_ids)
+            for channel_id in channel_ids[:100]:
+                tracker.mark_channel_for_force_check(channel_id)
+            elapsed = time.perf_counter() - start
+            self.assertEqual(mock_replace.call_count, 0)
+
+            tracker.flush()
+            self.assertEqual(mock_replace.call_count, 1)
+        self.assertLess(elapsed, 0.5)
+
+        reloaded = ChannelUpdateTracker(self.tracker_file)
+        self.assertTrue(all(reloaded.should_force_check(channel_id) for channel_id in channel_ids))
+
+    def test_journal_replay_and_compaction(self):
+        """Small changes are appended to the journal and folded in once it grows."""
+        tracker = ChannelUpdateTracker(self.tracker_file, flush_interval=60, compact_threshold=8)
+        tracker.mark_channels_updated([1, 2, 3])
+        tracker.flush()
+        tracker.mark_channel_checked(1, stream_count=3, checked_stream_ids=[11, 12, 13])
+        tracker.mark_global_check('2026-01-01T03:00:00')
+        tracker.flush()
+
+        self.assertEqual(len(tracker.journal_file.read_text().splitlines()), 5)
+        reloaded = ChannelUpdateTracker(self.tracker_file)
+        self.assertEqual(reloaded.get_checked_stream_ids(1), [11, 12, 13])
+        self.assertEqual(sorted(reloaded.get_channels_needing_check()), [2, 3])
+        self.assertEqual(reloaded.get_last_global_check(), '2026-01-01T03:00:00')
+
+        # The third flush passes the threshold and rewrites the JSON file
+        tracker.mark_channels_updated([4, 5, 6])
+        tracker.flush()
+        self.assertEqual(tracker.journal_file.read_text(), '')
+        with open(self.tracker_file) as f:
+            self.assertEqual(json.load(f)['channels']['1']['checked_streams'], '11-13')
+
+    def test_legacy_file(self):
+        """An indented file with checked_stream_ids lists is converted on load."""
+        with open(self.tracker_file, 'w') as f:
+            json.dump({
+                'channels': {'1': {'needs_check': False, 'stream_count': 3, 'checked_stream_ids': [5, 3, 4]}},
+                'last_global_check': None
+            }, f, indent=2)
+
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        self.assertEqual(tracker.get_checked_stream_ids(1), [3, 4, 5])
+        tracker.mark_channel_updated(1, stream_count=4)
+        self.assertEqual(tracker.get_checked_stream_ids(1), [3, 4, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -83,8 +83,8 @@ class TestCheckOnUpdateConfiguration(unittest.TestCase):
         self.assertEqual(config.get('queue.check_on_update'), False)
         self.assertEqual(config.get('queue.max_channels_per_run'), 100)
         
-        # Verify only max_size remains at default (wasn't updated)
-        self.assertEqual(config.get('queue.max_size'), 1000)
+        # Verify only priority_aging_seconds remains at default (wasn't updated)
+        self.assertEqual(config.get('queue.priority_aging_seconds'), 60)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent channel check queue.
+
+Verifies that:
+- Higher priorities are checked first and waiting channels age up
+- Changing priority_aging_seconds re-sorts the running queue
+- The queue has no capacity limit and the completed history is bounded
+- Queued and in-progress channels survive a restart
+- An interrupted global action is resumed by the stream checker service
+- Queue wait times are reported
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from check_queue import StreamCheckQueue
+
+
+def _drain(queue):
+    channels = []
+    while (channel_id := queue.get_next_channel(timeout=0)) is not None:
+        channels.append(channel_id)
+    return channels
+
+
+class TestQueueOrdering(unittest.TestCase):
+    """Test priority ordering and aging."""
+
+    def test_priority_then_fifo(self):
+        """Higher priorities come first, equal priorities in queueing order."""
+        queue = StreamCheckQueue()
+        queue.add_channels([1, 2], priority=5)
+        queue.add_channels([3, 4], priority=10)
+        queue.add_channel(5, priority=5)
+        self.assertEqual(_drain(queue), [3, 4, 1, 2, 5])
+
+    def test_aging_prevents_starvation(self):
+        """A channel that waited long enough goes before new higher-priority channels."""
+        queue = StreamCheckQueue(aging_interval=60)
+        with patch('check_queue.time.time', return_value=1000.0):
+            queue.add_channel(1, priority=5)
+        with patch('check_queue.time.time', return_value=1200.0):
+            queue.add_channel(2, priority=10)
+        with patch('check_queue.time.time', return_value=1400.0):
+            queue.add_channel(3, priority=10)
+        # Channel 1 is worth 5 + 400/60 levels against 10 + 200/60 and 10
+        self.assertEqual(_drain(queue), [2, 1, 3])
+
+    def test_set_aging_interval_reorders_queue(self):
+        """Queued channels are re-sorted when the aging interval changes."""
+        queue = StreamCheckQueue(aging_interval=60)
+        with patch('check_queue.time.time', return_value=1000.0):
+            queue.add_channel(1, priority=5)
+        with patch('check_queue.time.time', return_value=1200.0):
+            queue.add_channel(2, priority=10)
+        # With 60s per level channel 2 goes first; with 10s channel 1 has aged past it
+        queue.set_aging_interval(10)
+        self.assertEqual(_drain(queue), [1, 2])
+
+    def test_requeue_raises_priority(self):
+        """Queueing a waiting channel again with a higher priority moves it up once."""
+        queue = StreamCheckQueue()
+        queue.add_channels([1, 2, 3], priority=0)
+        self.assertFalse(queue.add_channel(3, priority=10))
+        self.assertEqual(_drain(queue), [3, 1, 2])
+        self.assertEqual(queue.get_status()['total_queued'], 3)
+
+    def test_unbounded_with_bounded_history(self):
+        """More channels than the old limit are queued; completed history is capped."""
+        queue = StreamCheckQueue(max_size=10, history_size=100)
+        self.assertEqual(queue.add_channels(list(range(1500))), 1500)
+        for channel_id in _drain(queue):
+            queue.mark_completed(channel_id)
+
+        status = queue.get_status()
+        self.assertEqual(status['completed'], 100)
+        self.assertEqual(status['total_completed'], 1500)
+        self.assertIn(1499, queue.completed)
+        self.assertNotIn(0, queue.completed)
+
+    def test_latency_metrics(self):
+        """Wait times of dequeued channels and the oldest queued age are reported."""
+        queue = StreamCheckQueue()
+        with patch('check_queue.time.time', return_value=100.0):
+            queue.add_channels([1, 2, 3])
+        with patch('check_queue.time.time', return_value=110.0):
+            queue.get_next_channel(timeout=0)
+        with patch('check_queue.time.time', return_value=130.0):
+            queue.get_next_channel(timeout=0)
+            latency = queue.get_status()['latency']
+
+        self.assertEqual(latency['samples'], 2)
+        self.assertEqual(latency['avg_wait'], 20.0)
+        self.assertEqual(latency['max_wait'], 30.0)
+        self.assertEqual(latency['oldest_queued_age'], 30.0)
+
+
+class TestQueuePersistence(unittest.TestCase):
+    """Test journaling and restoring the queue."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.queue_file = Path(self.temp_dir) / 'stream_check_queue.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_resume_after_restart(self):
+        """Queued and in-progress channels are restored in their original order."""
+        queue = StreamCheckQueue(queue_file=self.queue_file, flush_delay=60)
+        queue.add_channels([1, 2, 3, 4], priority=5)
+        queue.add_channel(5, priority=10)
+        self.assertEqual(queue.get_next_channel(timeout=0), 5)
+        queue.mark_completed(5)
+        self.assertEqual(queue.get_next_channel(timeout=0), 1)
+        queue.set_global_action_started(1234.5)
+        # The process stops while channel 1 is being checked
+
+        restored = StreamCheckQueue(queue_file=self.queue_file)
+        self.assertEqual(restored.global_action_started_at, 1234.5)
+        self.assertEqual(_drain(restored), [1, 2, 3, 4])
+
+    def test_compaction_and_torn_journal(self):
+        """The journal is folded into the snapshot and a torn last line is ignored."""
+        queue = StreamCheckQueue(queue_file=self.queue_file, flush_delay=60, compact_threshold=10)
+        queue.add_channels(list(range(20)))
+        for channel_id in [queue.get_next_channel(timeout=0) for _ in range(15)]:
+            queue.mark_completed(channel_id)
+        queue.flush()
+
+        with open(self.queue_file) as f:
+            self.assertEqual(sorted(json.load(f)['entries'], key=int), [str(i) for i in range(15, 20)])
+        self.assertEqual(queue.journal_file.read_text(), '')
+
+        queue.add_channel(99)
+        with open(queue.journal_file, 'a') as f:
+            f.write('{"op":"add","id":100')
+        self.assertEqual(_drain(StreamCheckQueue(queue_file=self.queue_file)), [15, 16, 17, 18, 19, 99])
+
+    def test_clear_is_persisted(self):
+        """A cleared queue stays empty after a restart."""
+        queue = StreamCheckQueue(queue_file=self.queue_file, flush_delay=60)
+        queue.add_channels([1, 2])
+        queue.set_global_action_started(1.0)
+        queue.clear()
+
+        restored = StreamCheckQueue(queue_file=self.queue_file)
+        self.assertEqual(restored.get_status()['queue_size'], 0)
+        self.assertIsNone(restored.global_action_started_at)
+
+
+class TestGlobalActionResume(unittest.TestCase):
+    """Test that the service picks up an interrupted global action."""
+
+    def test_service_resumes_global_action(self):
+        """The global action start time and remaining channels are restored."""
+        from stream_checker_service import StreamCheckerService
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        with patch('stream_checker_service.CONFIG_DIR', Path(temp_dir)):
+            service = StreamCheckerService()
+            service.check_queue.set_global_action_started(1000.0)
+            service.check_queue.add_channels([7, 8], priority=5)
+
+            restarted = StreamCheckerService()
+        self.assertEqual(restarted._global_action_started_at, 1000.0)
+        self.assertEqual(_drain(restarted.check_queue), [7, 8])
+
+
+    def test_update_config_applies_aging_interval(self):
+        """A priority_aging_seconds change reaches the running queue."""
+        from stream_checker_service import StreamCheckerService
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        with patch('stream_checker_service.CONFIG_DIR', Path(temp_dir)):
+            service = StreamCheckerService()
+            service.update_config({'queue': {'priority_aging_seconds': 15}})
+        self.assertEqual(service.check_queue.aging_interval, 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -391,6 +391,99 @@ class TestSmartStreamScheduler(unittest.TestCase):
         self.assertEqual(sorted(reported_ids), [0, 1, 2])
 
 
+class TestCrossChannelScheduler(unittest.TestCase):
+    """Test cases for SmartStreamScheduler.check_channels_with_limits."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.limiter = AccountStreamLimiter()
+        self.scheduler = SmartStreamScheduler(self.limiter, global_limit=4)
+        self.events = []
+        self.lock = threading.Lock()
+        self.completed = {}
+    
+    def _check(self, delays):
+        """Build a check function that sleeps per stream ID and logs start/end times."""
+        def mock_check(**kwargs):
+            stream_id = kwargs['stream_id']
+            with self.lock:
+                self.events.append(('start', stream_id, time.time()))
+            time.sleep(delays.get(stream_id, 0.05))
+            with self.lock:
+                self.events.append(('end', stream_id, time.time()))
+            return {'stream_id': stream_id, 'status': 'OK'}
+        return mock_check
+    
+    def _on_complete(self, channel_id, results):
+        self.completed[channel_id] = (time.time(), sorted(r['stream_id'] for r in results))
+    
+    def _time_of(self, kind, stream_id):
+        return next(t for k, sid, t in self.events if k == kind and sid == stream_id)
+    
+    @staticmethod
+    def _stream(stream_id, account_id):
+        return {'id': stream_id, 'name': f'Stream {stream_id}', 'url': f'http://test.com/{stream_id}',
+                'm3u_account': account_id}
+    
+    def test_channels_share_the_pool(self):
+        """Small channels run side by side and each completes when its own streams are done."""
+        channel_streams = {
+            10: [self._stream(1, 1)],
+            20: [self._stream(2, 1), self._stream(3, 1)],
+            30: [self._stream(4, 1)],
+        }
+        stats = self.scheduler.check_channels_with_limits(
+            channel_streams, self._check({4: 0.4}), self._on_complete
+        )
+        
+        self.assertEqual(self.completed[10][1], [1])
+        self.assertEqual(self.completed[20][1], [2, 3])
+        self.assertEqual(self.completed[30][1], [4])
+        # Channel 10 is reordered while the slow stream of channel 30 is still running
+        self.assertLess(self.completed[10][0], self._time_of('end', 4))
+        self.assertEqual(stats['channels'], 3)
+        self.assertEqual(stats['streams'], 4)
+        self.assertEqual(stats['checked'], 4)
+        self.assertEqual(stats['peak_concurrency'], 4)
+        self.assertGreater(stats['slot_utilization'], 0)
+        self.assertLessEqual(stats['slot_utilization'], 1)
+    
+    def test_blocked_account_does_not_block_other_accounts(self):
+        """A stream waiting for its account slot does not hold back streams of other accounts."""
+        self.limiter.set_account_limit(1, 1)
+        channel_streams = {
+            10: [self._stream(1, 1), self._stream(2, 1)],
+            20: [self._stream(3, 2)],
+        }
+        self.scheduler.check_channels_with_limits(
+            channel_streams, self._check({1: 0.3, 2: 0.3}), self._on_complete
+        )
+        
+        # Account 1 never runs two checks at once
+        self.assertGreaterEqual(self._time_of('start', 2), self._time_of('end', 1))
+        # Stream 3 starts while stream 1 still holds account 1's only slot
+        self.assertLess(self._time_of('start', 3), self._time_of('end', 1))
+        self.assertEqual(self.completed[10][1], [1, 2])
+        self.assertEqual(self.completed[20][1], [3])
+    
+    def test_empty_channel_and_errors(self):
+        """Channels without streams complete immediately and failed checks yield error results."""
+        def failing_check(**kwargs):
+            raise RuntimeError("ffmpeg crashed")
+        
+        results = {}
+        stats = self.scheduler.check_channels_with_limits(
+            {10: [], 20: [self._stream(1, None)]},
+            failing_check,
+            lambda channel_id, channel_results: results.update({channel_id: channel_results})
+        )
+        
+        self.assertEqual(results[10], [])
+        self.assertEqual(results[20][0]['status'], 'ERROR')
+        self.assertEqual(results[20][0]['error'], 'ffmpeg crashed')
+        self.assertEqual(stats['checked'], 1)
+
+
 class TestInitializeAccountLimits(unittest.TestCase):
     """Test cases for initialize_account_limits function."""
     
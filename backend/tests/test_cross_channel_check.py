@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit tests for cross-channel stream checking in StreamCheckerService.
+
+Verifies that:
+- The worker takes all queued channels and checks them in one shared pool
+- Each channel is reordered with its own results
+- Slot utilization is reported for the run and for the global action
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+# Set up CONFIG_DIR before importing service modules
+os.environ.setdefault('CONFIG_DIR', tempfile.mkdtemp())
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent_stream_limiter import AccountStreamLimiter, SmartStreamScheduler
+from stream_checker_service import StreamCheckerService
+
+
+CHANNEL_STREAMS = {
+    1: [{'id': 11, 'name': 'One HD', 'url': 'http://a/11', 'm3u_account': 1},
+        {'id': 12, 'name': 'One SD', 'url': 'http://a/12', 'm3u_account': 1}],
+    2: [{'id': 21, 'name': 'Two HD', 'url': 'http://b/21', 'm3u_account': 2}],
+}
+
+
+def _analyze(stream_url, stream_id, stream_name, **kwargs):
+    time.sleep(0.05)
+    resolution = '1920x1080' if 'HD' in stream_name else '720x576'
+    return {
+        'stream_id': stream_id, 'stream_name': stream_name, 'stream_url': stream_url,
+        'resolution': resolution, 'fps': 25, 'bitrate_kbps': 4000,
+        'video_codec': 'h264', 'audio_codec': 'aac', 'status': 'OK'
+    }
+
+
+class TestCrossChannelCheck(unittest.TestCase):
+    """Test checking several channels through one pool."""
+
+    def setUp(self):
+        self.service = StreamCheckerService()
+        self.service.changelog = None
+        self.service.update_tracker = Mock()
+        self.service.update_tracker.should_force_check.return_value = True
+        self.service.dead_streams_tracker = Mock()
+        self.service.dead_streams_tracker.is_dead.return_value = False
+
+        udi = MagicMock()
+        udi.get_channel_by_id.side_effect = lambda channel_id: {'id': channel_id, 'name': f'Channel {channel_id}'}
+        udi.get_m3u_accounts.return_value = []
+
+        self.scheduler = SmartStreamScheduler(AccountStreamLimiter(), global_limit=4)
+        patchers = [
+            patch('stream_checker_service.get_udi_manager', return_value=udi),
+            patch('stream_checker_service._get_base_url', return_value='http://localhost:9191'),
+            patch('stream_checker_service.fetch_channel_streams', side_effect=lambda channel_id: CHANNEL_STREAMS[channel_id]),
+            patch('concurrent_stream_limiter.get_smart_scheduler', return_value=self.scheduler),
+            patch('concurrent_stream_limiter.initialize_account_limits'),
+            patch.object(StreamCheckerService, '_analyze_stream_with_proxy', side_effect=_analyze),
+            patch.object(self.service, '_check_channel_limits', return_value=None),
+            patch.object(self.service, '_flush_stream_stats'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+        self.mock_update = patch('stream_checker_service.update_channel_streams').start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_channels_checked_in_one_pool(self):
+        """Each channel is reordered with its own streams and run stats are recorded."""
+        self.service.config.config['concurrent_streams'].update(stagger_delay=0, global_limit=10)
+        self.service._check_channels_cross_channel([1, 2])
+
+        reordered = {call.args[0]: call.args[1] for call in self.mock_update.call_args_list}
+        self.assertEqual(reordered, {1: [11, 12], 2: [21]})
+
+        stats = self.service.last_check_run_stats
+        self.assertEqual(stats['channels'], 2)
+        self.assertEqual(stats['streams'], 3)
+        self.assertEqual(stats['peak_concurrency'], 3)
+        self.assertEqual(stats['global_limit'], 10)
+        self.assertEqual(self.service.get_status()['last_check_run'], stats)
+        self.assertEqual(self.service.check_queue.get_status()['completed'], 2)
+
+    def test_worker_drains_queue(self):
+        """The worker checks all queued channels together."""
+        self.service.check_queue.add_channels([1, 2, 3])
+
+        def stop_after_run(channel_ids):
+            self.service.running = False
+
+        with patch.object(self.service, '_check_channels_cross_channel', side_effect=stop_after_run) as mock_run:
+            self.service.running = True
+            self.service._worker_loop()
+
+        mock_run.assert_called_once_with([1, 2, 3])
+
+    def test_global_action_stats(self):
+        """The global action reports its wall time and the slot utilization of its runs."""
+        self.service._global_action_started_at = time.time() - 60
+        self.service._global_action_runs = [
+            {'channels': 2, 'streams': 10, 'check_time': 20.0, 'busy_slot_seconds': 150.0, 'global_limit': 10},
+            {'channels': 1, 'streams': 2, 'check_time': 5.0, 'busy_slot_seconds': 10.0, 'global_limit': 10},
+        ]
+        self.service._finish_global_action_stats()
+
+        stats = self.service.last_global_action_stats
+        self.assertGreaterEqual(stats['wall_time'], 60)
+        self.assertEqual(stats['channels'], 3)
+        self.assertEqual(stats['streams'], 12)
+        self.assertEqual(stats['slot_utilization'], 0.64)
+        self.assertIsNone(self.service._global_action_started_at)
+
+
+if __name__ == '__main__':
+    unittest.main()
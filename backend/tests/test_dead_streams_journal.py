@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the dead streams tracker journal, indexes and shared instance.
+
+Verifies that:
+- Changes are appended to the journal instead of rewriting the snapshot
+- Reloading replays the journal, also after an interrupted compaction
+- The journal is folded into the snapshot once it grows too long
+- Channel and stream ID indexes follow marks, revivals and removals
+- get_dead_streams_tracker() returns one instance per tracker file
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dead_streams_tracker import DeadStreamsTracker, get_dead_streams_tracker
+
+
+class TestDeadStreamsJournal(unittest.TestCase):
+    """Test journaling and compaction of dead stream changes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracker_file = Path(self.temp_dir) / 'dead_streams.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _journal_lines(self, tracker):
+        with open(tracker.journal_file) as f:
+            return [json.loads(line) for line in f]
+
+    def test_changes_are_journaled(self):
+        """Marking streams appends journal entries and leaves the snapshot alone."""
+        tracker = DeadStreamsTracker(self.tracker_file, flush_delay=60)
+        for i in range(50):
+            tracker.mark_as_dead(f'http://s/{i}', i, f'Stream {i}', channel_id=1)
+        tracker.mark_as_alive('http://s/0')
+
+        self.assertFalse(self.tracker_file.exists())
+        entries = self._journal_lines(tracker)
+        self.assertEqual(len(entries), 51)
+        self.assertEqual(entries[-1], {'op': 'remove', 'urls': ['http://s/0']})
+
+        reloaded = DeadStreamsTracker(self.tracker_file)
+        self.assertEqual(set(reloaded.get_dead_streams()), {f'http://s/{i}' for i in range(1, 50)})
+
+    def test_compaction(self):
+        """A long journal is folded into the snapshot on flush."""
+        tracker = DeadStreamsTracker(self.tracker_file, flush_delay=60, compact_threshold=10)
+        for i in range(12):
+            tracker.mark_as_dead(f'http://s/{i}', i, f'Stream {i}', channel_id=1)
+        tracker.clear_all_dead_streams()
+        tracker.mark_as_dead('http://s/new', 99, 'New', channel_id=2)
+        tracker.flush()
+
+        self.assertEqual(self.tracker_file.read_text().count('"url"'), 1)
+        self.assertEqual(tracker.journal_file.read_text(), '')
+        self.assertEqual(list(DeadStreamsTracker(self.tracker_file).get_dead_streams()), ['http://s/new'])
+
+    def test_replay_after_interrupted_compaction(self):
+        """Replaying a journal already contained in the snapshot gives the same state."""
+        tracker = DeadStreamsTracker(self.tracker_file, flush_delay=60)
+        tracker.mark_as_dead('http://s/1', 1, 'Stream 1', channel_id=1)
+        tracker.mark_as_dead('http://s/2', 2, 'Stream 2', channel_id=1)
+        tracker.mark_as_alive('http://s/1')
+        journal = tracker.journal_file.read_text()
+        tracker.compact()
+        # Simulate a crash between writing the snapshot and truncating the journal
+        tracker.journal_file.write_text(journal + '{"op": "dead", "url": "http://s/3"')
+
+        self.assertEqual(list(DeadStreamsTracker(self.tracker_file).get_dead_streams()), ['http://s/2'])
+
+    def test_indexes(self):
+        """Channel and stream ID lookups follow every change."""
+        tracker = DeadStreamsTracker(self.tracker_file, flush_delay=60)
+        tracker.mark_as_dead('http://s/1', 1, 'Stream 1', channel_id=10)
+        tracker.mark_as_dead('http://s/2', 2, 'Stream 2', channel_id=10)
+        tracker.mark_as_dead('http://s/3', 2, 'Stream 2 backup', channel_id=20)
+        # Marking again moves the stream to the new channel
+        tracker.mark_as_dead('http://s/1', 1, 'Stream 1', channel_id=20)
+
+        self.assertEqual(tracker.get_dead_streams_count_for_channel(10), 1)
+        self.assertEqual(set(tracker.get_dead_streams_for_channel(20)), {'http://s/1', 'http://s/3'})
+        self.assertEqual(set(tracker.get_dead_streams_for_stream_id(2)), {'http://s/2', 'http://s/3'})
+
+        self.assertEqual(tracker.remove_dead_streams_by_channel_id(20), 2)
+        self.assertEqual(tracker.get_dead_streams_count_for_channel(20), 0)
+        self.assertEqual(list(tracker.get_dead_streams_for_stream_id(2)), ['http://s/2'])
+
+        tracker.cleanup_removed_streams(set())
+        self.assertEqual(tracker.get_dead_streams_count_for_channel(10), 0)
+        self.assertEqual(DeadStreamsTracker(self.tracker_file).get_dead_streams(), {})
+
+    def test_shared_instance(self):
+        """One tracker is shared per tracker file."""
+        with patch('dead_streams_tracker.CONFIG_DIR', Path(self.temp_dir)):
+            tracker = get_dead_streams_tracker()
+            self.assertIs(get_dead_streams_tracker(self.tracker_file), tracker)
+        self.assertIsNot(get_dead_streams_tracker(Path(self.temp_dir) / 'other.json'), tracker)
+
+
+if __name__ == '__main__':
+    unittest.main()
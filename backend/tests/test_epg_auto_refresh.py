@@ -109,7 +109,7 @@ class TestEPGAutoRefresh(unittest.TestCase):
                     mock_udi_factory.return_value = mock_udi
                     
                     # Mock requests.get to return EPG data
-                    with patch('scheduling_service.requests.get') as mock_get:
+                    with patch('http_session.DispatcharrSession.get') as mock_get:
                         mock_response = Mock()
                         mock_response.json.return_value = mock_programs
                         mock_response.raise_for_status = Mock()
@@ -255,7 +255,7 @@ class TestEPGAutoRefresh(unittest.TestCase):
                     mock_udi_factory.return_value = mock_udi
                     
                     # Mock requests
-                    with patch('scheduling_service.requests.get') as mock_get:
+                    with patch('http_session.DispatcharrSession.get') as mock_get:
                         mock_response = Mock()
                         mock_response.json.return_value = mock_programs
                         mock_response.raise_for_status = Mock()
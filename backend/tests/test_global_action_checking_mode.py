@@ -70,12 +70,8 @@ class TestGlobalActionCheckingMode(unittest.TestCase):
                     
                     # Verify that only channels with checking enabled were queued
                     queued_channels = []
-                    while not service.check_queue.queue.empty():
-                        try:
-                            _, channel_id = service.check_queue.queue.get_nowait()
-                            queued_channels.append(channel_id)
-                        except queue.Empty:
-                            break
+                    while (channel_id := service.check_queue.get_next_channel(timeout=0)) is not None:
+                        queued_channels.append(channel_id)
                     
                     # Should have 2 channels (1 and 3), not 2
                     self.assertIn(1, queued_channels, "Channel 1 (enabled) should be queued")
@@ -116,8 +112,8 @@ class TestGlobalActionCheckingMode(unittest.TestCase):
                     service._queue_all_channels(force_check=True)
                     
                     # Check that no channels were queued
-                    self.assertTrue(service.check_queue.queue.empty(), 
-                                  "Queue should be empty when all channels are disabled")
+                    self.assertEqual(service.check_queue.get_status()['queue_size'], 0,
+                                     "Queue should be empty when all channels are disabled")
     
     def test_global_action_respects_checking_mode(self):
         """Test that full global action respects checking_mode settings."""
@@ -155,12 +151,8 @@ class TestGlobalActionCheckingMode(unittest.TestCase):
                         
                         # Check that only channel 1 was queued
                         queued_channels = []
-                        while not service.check_queue.queue.empty():
-                            try:
-                                _, channel_id = service.check_queue.queue.get_nowait()
-                                queued_channels.append(channel_id)
-                            except queue.Empty:
-                                break
+                        while (channel_id := service.check_queue.get_next_channel(timeout=0)) is not None:
+                            queued_channels.append(channel_id)
                         
                         self.assertIn(1, queued_channels, "Channel 1 (enabled) should be queued")
                         self.assertNotIn(2, queued_channels, "Channel 2 (disabled) should NOT be queued")
@@ -24,7 +24,7 @@ class TestGroupFiltering(unittest.TestCase):
             {"id": 5, "name": "Another Empty", "channel_count": 0},
         ]
     
-    @patch('udi.manager.UDIStorage')
+    @patch('udi.manager.create_udi_storage')
     @patch('udi.manager.UDIFetcher')
     @patch('udi.manager.UDICache')
     def test_filter_groups_with_no_channels(self, mock_cache, mock_fetcher, mock_storage):
@@ -58,7 +58,7 @@ class TestGroupFiltering(unittest.TestCase):
         self.assertNotIn(3, group_ids, "Empty Group should be filtered out")
         self.assertNotIn(5, group_ids, "Another Empty should be filtered out")
     
-    @patch('udi.manager.UDIStorage')
+    @patch('udi.manager.create_udi_storage')
     @patch('udi.manager.UDIFetcher')
     @patch('udi.manager.UDICache')
     def test_all_groups_have_channels(self, mock_cache, mock_fetcher, mock_storage):
@@ -77,7 +77,7 @@ class TestGroupFiltering(unittest.TestCase):
         # Verify
         self.assertEqual(len(filtered_groups), 2, "All groups should be returned")
     
-    @patch('udi.manager.UDIStorage')
+    @patch('udi.manager.create_udi_storage')
     @patch('udi.manager.UDIFetcher')
     @patch('udi.manager.UDICache')
     def test_no_groups_have_channels(self, mock_cache, mock_fetcher, mock_storage):
@@ -96,7 +96,7 @@ class TestGroupFiltering(unittest.TestCase):
         # Verify
         self.assertEqual(len(filtered_groups), 0, "No groups should be returned")
     
-    @patch('udi.manager.UDIStorage')
+    @patch('udi.manager.create_udi_storage')
     @patch('udi.manager.UDIFetcher')
     @patch('udi.manager.UDICache')
     def test_groups_without_channel_count_field(self, mock_cache, mock_fetcher, mock_storage):
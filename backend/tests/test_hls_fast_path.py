@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Tests for the HLS fast path of the stream analysis.
+
+A local HTTP server serves HLS fixtures (master/media playlists, segments,
+redirects, encrypted and VOD playlists). Verifies that:
+- The highest bandwidth variant is picked and its last segments downloaded concurrently
+- The bitrate is the segment bytes over the playlist durations
+- Only one segment (with the fMP4 init section) is probed
+- Non-HLS URLs, playlists the fast path cannot measure and failed requests use ffmpeg
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_session import get_http_session
+from stream_check_utils import analyze_stream, get_stream_info_and_bitrate_hls, is_hls_url, parse_hls_playlist
+
+SEGMENT_DELAY = 0.2
+
+MASTER_PLAYLIST = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360,CODECS="avc1.4d401e,mp4a.40.2"
+low/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2500000,RESOLUTION=1280x720,CODECS="avc1.64001f,mp4a.40.2"
+high/index.m3u8
+"""
+
+LIVE_PLAYLIST = "#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXT-X-MEDIA-SEQUENCE:100\n" + "".join(
+    f"#EXTINF:4.000,\nseg{i}.ts\n" for i in range(5))
+
+VOD_PLAYLIST = """#EXTM3U
+#EXT-X-PLAYLIST-TYPE:VOD
+#EXT-X-MAP:URI="init.mp4"
+#EXTINF:2.5,
+/vod/seg0.m4s
+#EXTINF:2.5,
+/vod/seg1.m4s
+#EXTINF:2.5,
+/vod/seg2.m4s
+#EXT-X-ENDLIST
+"""
+
+ENCRYPTED_PLAYLIST = """#EXTM3U
+#EXT-X-KEY:METHOD=AES-128,URI="https://keys.example.com/key"
+#EXTINF:4.0,
+seg0.ts
+"""
+
+PROBE_OUTPUT = json.dumps({'streams': [
+    {'codec_type': 'video', 'codec_name': 'h264', 'width': 1280, 'height': 720, 'avg_frame_rate': '25/1'},
+    {'codec_type': 'audio', 'codec_name': 'aac'},
+]}).encode()
+
+
+def segment(size):
+    return b'\x47' * size
+
+
+class HLSFixtureServer(ThreadingHTTPServer):
+    """Serves the HLS fixtures and records requests and segment download concurrency."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.resources = {
+            '/live/master.m3u8': MASTER_PLAYLIST.encode(),
+            '/live/low/index.m3u8': LIVE_PLAYLIST.encode(),
+            '/live/high/index.m3u8': LIVE_PLAYLIST.encode(),
+            '/vod/index.m3u8': VOD_PLAYLIST.encode(),
+            '/vod/init.mp4': b'INIT',
+            '/encrypted.m3u8': ENCRYPTED_PLAYLIST.encode(),
+            '/portal.m3u8': b'<html>Login required</html>',
+        }
+        for i in range(5):
+            self.resources[f'/live/high/seg{i}.ts'] = segment(500000 + i * 1000)
+            self.resources[f'/live/low/seg{i}.ts'] = segment(100000)
+        for i in range(3):
+            self.resources[f'/vod/seg{i}.m4s'] = segment(250000)
+        self.redirects = {'/redirect.m3u8': '/live/high/index.m3u8'}
+        self.requests = []
+        self.active_segments = 0
+        self.peak_segments = 0
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), FixtureHandler)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        path = self.path.split('?')[0]
+        with server.lock:
+            server.requests.append(path)
+        if path in server.redirects:
+            self.send_response(302)
+            self.send_header('Location', server.redirects[path])
+            self.end_headers()
+            return
+        body = server.resources.get(path)
+        if body is None:
+            self.send_error(404)
+            return
+        is_segment = not path.endswith('.m3u8')
+        if is_segment:
+            with server.lock:
+                server.active_segments += 1
+                server.peak_segments = max(server.peak_segments, server.active_segments)
+            time.sleep(SEGMENT_DELAY)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            if is_segment:
+                with server.lock:
+                    server.active_segments -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHLSPlaylistParsing(unittest.TestCase):
+    """Test the playlist parser and HLS URL detection."""
+
+    def test_master_and_media_playlists(self):
+        """Variants and segments are parsed with resolved URLs."""
+        master = parse_hls_playlist(MASTER_PLAYLIST, 'http://host/live/master.m3u8')
+        self.assertEqual([(v['bandwidth'], v['resolution'], v['url']) for v in master['variants']], [
+            (800000, '640x360', 'http://host/live/low/index.m3u8'),
+            (2500000, '1280x720', 'http://host/live/high/index.m3u8'),
+        ])
+
+        vod = parse_hls_playlist(VOD_PLAYLIST, 'http://host/vod/index.m3u8')
+        self.assertEqual(vod['segments'][0], {'url': 'http://host/vod/seg0.m4s', 'duration': 2.5})
+        self.assertEqual(vod['init_url'], 'http://host/vod/init.mp4')
+        self.assertTrue(vod['ended'])
+        self.assertFalse(parse_hls_playlist(ENCRYPTED_PLAYLIST, 'http://host/a.m3u8')['supported'])
+        self.assertIsNone(parse_hls_playlist('<html></html>', 'http://host/a.m3u8'))
+
+    def test_is_hls_url(self):
+        self.assertTrue(is_hls_url('http://host/live/user/pass/1.m3u8?token=abc'))
+        self.assertFalse(is_hls_url('http://host/live/user/pass/1.ts'))
+        self.assertFalse(is_hls_url(None))
+
+
+class TestHLSFastPath(unittest.TestCase):
+    """Test the HLS fast path against the local fixture server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HLSFixtureServer()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.server.peak_segments = 0
+        run_patch = patch('stream_check_utils.subprocess.run',
+                          return_value=MagicMock(returncode=0, stdout=PROBE_OUTPUT, stderr=b''))
+        self.mock_run = run_patch.start()
+        self.addCleanup(run_patch.stop)
+
+    def test_master_playlist(self):
+        """The best variant's last segments are downloaded concurrently over the shared session."""
+        requests_before = get_http_session().request_stats()['total_requests']
+
+        start = time.time()
+        result = get_stream_info_and_bitrate_hls(self.server.url('/live/master.m3u8'), segments=3)
+        elapsed = time.time() - start
+
+        self.assertEqual(result['status'], 'OK')
+        # Segments 2-4 of 502000, 503000 and 504000 bytes over 3 x 4s
+        self.assertAlmostEqual(result['bitrate_kbps'], 1509000 * 8 / 1000 / 12)
+        self.assertEqual(result['bitrate_samples'], 3)
+        self.assertEqual(result['measured_duration'], 12.0)
+        self.assertEqual((result['video_codec'], result['audio_codec']), ('h264', 'aac'))
+        self.assertEqual((result['resolution'], result['fps']), ('1280x720', 25.0))
+
+        self.assertEqual(self.server.requests[:2], ['/live/master.m3u8', '/live/high/index.m3u8'])
+        self.assertEqual(sorted(self.server.requests[2:]), [f'/live/high/seg{i}.ts' for i in (2, 3, 4)])
+        self.assertEqual(self.server.peak_segments, 3)
+        self.assertLess(elapsed, 2 * SEGMENT_DELAY + 0.3)
+        self.assertEqual(get_http_session().request_stats()['total_requests'] - requests_before, 5)
+
+        # Only the first downloaded segment is probed, through stdin
+        self.mock_run.assert_called_once()
+        self.assertEqual(self.mock_run.call_args.kwargs['input'], segment(502000))
+        self.assertIn('pipe:0', self.mock_run.call_args.args[0])
+
+    def test_redirected_media_playlist(self):
+        """Segment URIs are resolved against the playlist URL after redirects."""
+        result = get_stream_info_and_bitrate_hls(self.server.url('/redirect.m3u8'), segments=2)
+
+        self.assertEqual(result['status'], 'OK')
+        self.assertIn('/live/high/seg4.ts', self.server.requests)
+
+    def test_vod_playlist_with_init_section(self):
+        """VOD playlists are measured from the start; the init section is only used for the probe."""
+        result = get_stream_info_and_bitrate_hls(self.server.url('/vod/index.m3u8'), segments=2)
+
+        self.assertAlmostEqual(result['bitrate_kbps'], 500000 * 8 / 1000 / 5)
+        self.assertEqual(result['measured_duration'], 5.0)
+        self.assertNotIn('/vod/seg2.m4s', self.server.requests)
+        self.assertEqual(self.mock_run.call_args.kwargs['input'], b'INIT' + segment(250000))
+
+    def test_unsupported_playlists_fall_back(self):
+        """Encrypted playlists and non-playlist responses return None for the ffmpeg fallback."""
+        self.assertIsNone(get_stream_info_and_bitrate_hls(self.server.url('/encrypted.m3u8')))
+        self.assertIsNone(get_stream_info_and_bitrate_hls(self.server.url('/portal.m3u8')))
+        self.mock_run.assert_not_called()
+
+    def test_missing_playlist(self):
+        """A playlist that cannot be loaded returns None for the ffmpeg fallback without probing."""
+        self.assertIsNone(get_stream_info_and_bitrate_hls(self.server.url('/missing.m3u8')))
+        self.mock_run.assert_not_called()
+
+    @patch('stream_check_utils.probe_stream')
+    @patch('stream_check_utils.get_stream_info_and_bitrate')
+    def test_analyze_stream(self, mock_ffmpeg, mock_probe):
+        """analyze_stream uses the fast path for HLS URLs and ffmpeg for everything else."""
+        mock_ffmpeg.return_value = {'video_codec': 'h264', 'audio_codec': 'aac', 'resolution': '1920x1080',
+                                    'fps': 25, 'bitrate_kbps': 5000.0, 'status': 'OK', 'elapsed_time': 30.0}
+        mock_probe.return_value = dict(mock_ffmpeg.return_value, elapsed_time=0.5)
+        params = dict(retries=0, fast_probe=True, hls_fast_path=True, hls_segments=2)
+
+        result = analyze_stream(self.server.url('/live/master.m3u8'), 1, **params)
+        self.assertEqual(result['status'], 'OK')
+        self.assertEqual(result['bitrate_samples'], 2)
+        self.assertEqual(set(result['tier_timings']), {'analysis'})
+        mock_probe.assert_not_called()
+        mock_ffmpeg.assert_not_called()
+
+        for url in (self.server.url('/live/high/seg0.ts'), self.server.url('/encrypted.m3u8'),
+                    self.server.url('/missing.m3u8')):
+            mock_ffmpeg.reset_mock()
+            result = analyze_stream(url, 2, **params)
+            mock_ffmpeg.assert_called_once()
+            self.assertEqual(result['bitrate_kbps'], 5000.0)
+
+        # Disabled: HLS URLs use ffmpeg too
+        mock_ffmpeg.reset_mock()
+        analyze_stream(self.server.url('/live/master.m3u8'), 3, retries=0)
+        mock_ffmpeg.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
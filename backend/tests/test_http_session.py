@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared Dispatcharr HTTP session.
+
+Verifies that:
+- Connections are kept alive and reused across requests
+- Transient 503 responses are retried for idempotent methods
+- 401 responses trigger a token refresh and a single retry
+- Pool statistics report connections, reuse rate and latency histogram
+"""
+
+import json
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Keep-alive JSON handler driven by the server's scripted responses."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with server.lock:
+            server.requests.append((self.command, self.path, self.headers.get("Authorization")))
+            status = server.script.pop(0) if server.script else 200
+        if server.valid_token and self.headers.get("Authorization") != f"Bearer {server.valid_token}":
+            status = 401
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+    do_PATCH = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPSession(unittest.TestCase):
+    """Test the shared session against a local keep-alive server."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.script = []
+        self.server.valid_token = None
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        # Start every test with a fresh session and counters
+        self._patches = [
+            patch.object(http_session, "_session", None),
+            patch.object(http_session, "_pool_size", http_session.HTTP_POOL_SIZE),
+            patch.object(http_session, "_retired_connections", 0),
+            patch.object(http_session, "_retired_requests", 0),
+            patch.object(http_session, "HTTP_RETRY_BACKOFF", 0),
+            patch.dict(os.environ, {"DISPATCHARR_TOKEN": ""}),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        http_session.get_http_session().close()
+        for p in self._patches:
+            p.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        """Sequential requests share one keep-alive connection."""
+        session = http_session.get_http_session()
+        self.assertIs(session, http_session.get_http_session())
+        for i in range(10):
+            resp = session.get(f"{self.base_url}/api/item/{i}/", timeout=5)
+            self.assertEqual(resp.json(), {"path": f"/api/item/{i}/"})
+
+        stats = http_session.get_pool_stats()
+        self.assertEqual(stats["total_requests"], 10)
+        self.assertEqual(stats["connections_created"], 1)
+        self.assertEqual(stats["reuse_rate"], 0.9)
+        self.assertEqual(stats["idle_connections"], 1)
+        self.assertEqual(stats["status_classes"], {"2xx": 10})
+        self.assertEqual(sum(b["count"] for b in stats["latency"]["buckets"]), 10)
+
+    def test_transient_errors_are_retried(self):
+        """GET requests are retried on 503; POST requests are not."""
+        session = http_session.get_http_session()
+        self.server.script = [503, 503]
+        resp = session.get(f"{self.base_url}/api/x/", timeout=5)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+        self.server.script = [503]
+        resp = session.post(f"{self.base_url}/api/x/", json={}, timeout=5)
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_send_with_auth_refreshes_once_on_401(self):
+        """A 401 refreshes the token and retries the request with new headers."""
+        self.server.valid_token = "new"
+        tokens = {"current": "old"}
+        refresh_calls = []
+
+        def refresh():
+            refresh_calls.append(1)
+            tokens["current"] = "new"
+            return True
+
+        def headers():
+            return {"Authorization": f"Bearer {tokens['current']}"}
+
+        with patch.object(http_session.os, "getenv", side_effect=lambda key, default=None: tokens["current"]):
+            resp = http_session.send_with_auth("PATCH", f"{self.base_url}/api/x/", headers, refresh,
+                                               json={"a": 1}, timeout=5)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(refresh_calls), 1)
+        self.assertEqual([r[2] for r in self.server.requests], ["Bearer old", "Bearer new"])
+
+    def test_failed_refresh_returns_401(self):
+        """When the refresh fails the 401 response is returned to the caller."""
+        self.server.valid_token = "new"
+        resp = http_session.send_with_auth("GET", f"{self.base_url}/api/x/",
+                                           lambda: {"Authorization": "Bearer old"}, lambda: False, timeout=5)
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_configure_pool_size_keeps_counters(self):
+        """Resizing the pool swaps the adapter without losing statistics."""
+        session = http_session.get_http_session()
+        session.get(f"{self.base_url}/api/x/", timeout=5)
+
+        size = http_session.configure_pool_size(http_session.HTTP_POOL_SIZE + 5)
+        self.assertEqual(size, http_session.HTTP_POOL_SIZE + 5)
+        self.assertEqual(session.get_adapter("http://")._pool_maxsize, size)
+        # Never shrinks below the configured minimum
+        self.assertEqual(http_session.configure_pool_size(1), http_session.HTTP_POOL_SIZE)
+
+        session.get(f"{self.base_url}/api/x/", timeout=5)
+        stats = http_session.get_pool_stats()
+        self.assertEqual(stats["total_requests"], 2)
+        self.assertEqual(stats["connections_created"], 2)
+        self.assertEqual(stats["pool_size"], http_session.HTTP_POOL_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Unit tests for incremental (delta-driven) stream discovery.
+
+Verifies that:
+- Only new or renamed streams are matched again on subsequent runs
+- The match record is persisted across manager instances
+- Changing the regex config or the enabled accounts triggers a full re-match
+- force/full_rematch and the feature flag disable incremental matching
+- Streams whose assignment failed are matched again on the next run
+- Streams skipped as dead are matched again once they are revived
+"""
+
+import shutil
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automated_stream_manager import AutomatedStreamManager
+
+
+ACCOUNTS = [{'id': 1, 'name': 'Account 1', 'is_active': True}]
+CHANNELS = [{'id': 10, 'name': 'News'}, {'id': 20, 'name': 'Sports'}]
+
+
+def _match_by_name(streams, channel_ids=None):
+    """Match streams to channel 10 by 'News' and to channel 20 by 'Sports' in their name."""
+    matches = {}
+    for stream in streams:
+        channels = [cid for cid, word in (('10', 'News'), ('20', 'Sports')) if word in stream['name']]
+        if channels:
+            matches[stream['id']] = channels
+    return matches
+
+
+class TestIncrementalDiscovery(unittest.TestCase):
+    """Test incremental stream discovery."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.streams = [
+            {'id': 1, 'name': 'News HD', 'm3u_account': 1, 'url': 'http://s/1'},
+            {'id': 2, 'name': 'Sports HD', 'm3u_account': 1, 'url': 'http://s/2'},
+            {'id': 3, 'name': 'Movies HD', 'm3u_account': 1, 'url': 'http://s/3'},
+        ]
+
+        udi = MagicMock()
+        udi.get_channels.return_value = CHANNELS
+        udi.get_channel_streams.return_value = []
+        udi.get_channel_by_id.return_value = None
+
+        self.patchers = [
+            patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)),
+            patch('automated_stream_manager.get_udi_manager', return_value=udi),
+            patch('automated_stream_manager.get_streams', side_effect=lambda **kwargs: list(self.streams)),
+            patch('automated_stream_manager.get_m3u_accounts', return_value=ACCOUNTS),
+            patch('stream_checker_service.get_stream_checker_service', return_value=Mock(config={})),
+            patch('automated_stream_manager.time.sleep'),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.mock_add = patch('automated_stream_manager.add_streams_to_channel',
+                              side_effect=lambda channel_id, stream_ids, **kwargs: len(stream_ids)).start()
+        self.patchers.append(self.mock_add)
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _make_manager(self):
+        manager = AutomatedStreamManager()
+        manager.config['enabled_features']['changelog_tracking'] = False
+        manager.dead_streams_tracker = None
+        manager.regex_matcher = Mock()
+        manager.regex_matcher.channel_patterns = {'patterns': {'10': {'regex': ['News']}, '20': {'regex': ['Sports']}}}
+        manager.regex_matcher.match_streams.side_effect = _match_by_name
+        return manager
+
+    def _matched_ids(self, manager):
+        return [s['id'] for s in manager.regex_matcher.match_streams.call_args.args[0]]
+
+    def test_only_new_and_renamed_streams_are_matched(self):
+        """A second run matches only streams that are new or renamed."""
+        manager = self._make_manager()
+        self.assertEqual(manager.discover_and_assign_streams(), {'10': 1, '20': 1})
+        self.assertEqual(self._matched_ids(manager), [1, 2, 3])
+
+        self.streams[2] = {'id': 3, 'name': 'Sports 2', 'm3u_account': 1, 'url': 'http://s/3'}
+        self.streams.append({'id': 4, 'name': 'News 2', 'm3u_account': 1, 'url': 'http://s/4'})
+        self.mock_add.reset_mock()
+
+        # The record is persisted, so a new manager instance continues incrementally
+        manager = self._make_manager()
+        self.assertEqual(manager.discover_and_assign_streams(), {'10': 1, '20': 1})
+        self.assertEqual(self._matched_ids(manager), [3, 4])
+        assigned = {call.args[0]: call.args[1] for call in self.mock_add.call_args_list}
+        self.assertEqual(assigned, {10: [4], 20: [3]})
+
+        # Nothing changed: nothing is matched
+        manager.discover_and_assign_streams()
+        self.assertEqual(self._matched_ids(manager), [])
+
+    def test_config_change_triggers_full_rematch(self):
+        """Changing the regex config or enabled accounts re-matches all streams."""
+        manager = self._make_manager()
+        manager.discover_and_assign_streams()
+
+        manager.regex_matcher.channel_patterns = {'patterns': {'10': {'regex': ['News', 'Info']}}}
+        manager.discover_and_assign_streams()
+        self.assertEqual(self._matched_ids(manager), [1, 2, 3])
+
+        manager.config['enabled_m3u_accounts'] = [1]
+        manager.discover_and_assign_streams()
+        self.assertEqual(self._matched_ids(manager), [])
+
+        ACCOUNTS_2 = ACCOUNTS + [{'id': 2, 'name': 'Account 2', 'is_active': True}]
+        with patch('automated_stream_manager.get_m3u_accounts', return_value=ACCOUNTS_2):
+            manager.config['enabled_m3u_accounts'] = [1, 2]
+            manager.discover_and_assign_streams()
+        self.assertEqual(self._matched_ids(manager), [1, 2, 3])
+
+    def test_full_rematch_modes(self):
+        """force, full_rematch and the disabled feature flag match all streams."""
+        manager = self._make_manager()
+        manager.discover_and_assign_streams()
+
+        manager.discover_and_assign_streams(full_rematch=True)
+        self.assertEqual(self._matched_ids(manager), [1, 2, 3])
+
+        manager.discover_and_assign_streams(force=True)
+        self.assertEqual(self._matched_ids(manager), [1, 2, 3])
+
+        manager.config['enabled_features']['incremental_stream_discovery'] = False
+        manager.discover_and_assign_streams()
+        self.assertEqual(self._matched_ids(manager), [1, 2, 3])
+
+    def test_failed_assignment_is_retried(self):
+        """Streams whose assignment failed are matched again on the next run."""
+        manager = self._make_manager()
+
+        def fail_for_sports(channel_id, stream_ids, **kwargs):
+            if channel_id == 20:
+                raise Exception("API error")
+            return len(stream_ids)
+
+        self.mock_add.side_effect = fail_for_sports
+        manager.discover_and_assign_streams()
+        self.mock_add.side_effect = lambda channel_id, stream_ids, **kwargs: len(stream_ids)
+
+        manager.discover_and_assign_streams()
+        self.assertEqual(self._matched_ids(manager), [2])
+
+    def test_revived_stream_is_rematched(self):
+        """A stream skipped while dead is matched and assigned again after it is revived."""
+        manager = self._make_manager()
+        manager._is_dead_stream_removal_enabled = lambda: True
+        manager.discover_and_assign_streams()
+
+        dead_urls = {'http://s/1'}
+        manager.dead_streams_tracker = Mock()
+        manager.dead_streams_tracker.is_dead.side_effect = lambda url: url in dead_urls
+
+        # Dead: skipped and forgotten
+        manager.discover_and_assign_streams()
+        self.assertEqual(self._matched_ids(manager), [])
+        self.assertNotIn('1', manager.match_state.streams)
+
+        # Revived (e.g. through /api/dead-streams/revive)
+        dead_urls.clear()
+        self.mock_add.reset_mock()
+        manager.discover_and_assign_streams()
+        self.assertEqual(self._matched_ids(manager), [1])
+        self.mock_add.assert_called_once()
+        self.assertEqual(self.mock_add.call_args.args[:2], (10, [1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
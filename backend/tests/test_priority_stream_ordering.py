@@ -114,6 +114,7 @@ class TestPriorityStreamOrdering(unittest.TestCase):
         
         mock_udi.get_stream_by_id.side_effect = get_stream_by_id
         mock_udi.get_m3u_account_by_id.side_effect = get_m3u_account_by_id
+        mock_udi.get_m3u_account_scoring_info.side_effect = get_m3u_account_by_id
         
         # Create stream checker service
         service = StreamCheckerService()
@@ -216,6 +217,7 @@ class TestPriorityStreamOrdering(unittest.TestCase):
         
         mock_udi.get_stream_by_id.side_effect = get_stream_by_id
         mock_udi.get_m3u_account_by_id.side_effect = get_m3u_account_by_id
+        mock_udi.get_m3u_account_scoring_info.side_effect = get_m3u_account_by_id
         
         # Create stream checker service
         service = StreamCheckerService()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached M3U profile URL transformers in UDI.
+
+Verifies that:
+- $N backreferences are converted exactly like the previous 99-step loop
+- Compiled transformers are reused and dropped when M3U accounts refresh
+"""
+
+import os
+import random
+import re
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from udi.manager import UDIManager, _DOLLAR_BACKREFERENCE
+
+
+def legacy_convert(replace_pattern):
+    """The previous $N -> \\N conversion."""
+    for i in range(99, 0, -1):
+        replace_pattern = replace_pattern.replace(f'${i}', f'\\{i}')
+    return replace_pattern
+
+
+class TestUrlTransformerCache(unittest.TestCase):
+    """Test compiled profile URL transformers."""
+
+    def setUp(self):
+        self.udi = UDIManager()
+        self.udi._initialized = True
+        self.profile = {'id': 10, 'search_pattern': r'/live/(\w+)/(\w+)/', 'replace_pattern': '/live/free$1/x$2/'}
+        self.udi._m3u_accounts_cache = [{'id': 1, 'profiles': [self.profile]}]
+
+    def test_backreference_conversion_matches_legacy(self):
+        """Random replace patterns are converted exactly like before."""
+        rng = random.Random(7)
+        for _ in range(20000):
+            pattern = ''.join(rng.choice('$$0123456789a\\') for _ in range(rng.randint(0, 10)))
+            self.assertEqual(_DOLLAR_BACKREFERENCE.sub(r'\\\1', pattern), legacy_convert(pattern), pattern)
+
+    def test_compiled_once_until_accounts_refresh(self):
+        """Patterns are compiled once and again after the accounts list is replaced."""
+        stream = {'id': 1, 'url': 'http://host/live/user/pass/1.ts', 'm3u_account': 1}
+        with patch('udi.manager.re.compile', wraps=re.compile) as mock_compile:
+            for _ in range(10):
+                self.assertEqual(self.udi.apply_profile_url_transformation(stream, self.profile),
+                                 'http://host/live/freeuser/xpass/1.ts')
+            self.assertEqual(mock_compile.call_count, 1)
+
+            self.udi._m3u_accounts_cache = list(self.udi._m3u_accounts_cache)
+            self.udi.apply_profile_url_transformation(stream, self.profile)
+            self.assertEqual(mock_compile.call_count, 2)
+
+    def test_changed_patterns_are_not_served_stale(self):
+        """Changing a profile's patterns gives a new transformer."""
+        stream = {'id': 1, 'url': 'http://host/live/user/pass/1.ts'}
+        self.udi.apply_profile_url_transformation(stream, self.profile)
+        self.profile['replace_pattern'] = '/vod/$2/'
+        self.assertEqual(self.udi.apply_profile_url_transformation(stream, self.profile), 'http://host/vod/pass/1.ts')
+
+    def test_unusable_patterns_keep_url(self):
+        """Missing, blank and invalid patterns or invalid results keep the original URL."""
+        stream = {'id': 1, 'url': 'http://host/live/user/pass/1.ts'}
+        for search, replace in [(None, 'x'), ('  ', 'x'), ('(unclosed', 'x'), ('^http', 'ftp'), ('live', r'\9')]:
+            profile = {'id': 11, 'search_pattern': search, 'replace_pattern': replace}
+            self.assertEqual(self.udi.apply_profile_url_transformation(stream, profile), stream['url'])
+
+
+if __name__ == '__main__':
+    unittest.main()
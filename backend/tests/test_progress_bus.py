@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory progress bus and the stream checker event stream.
+
+Verifies that:
+- Subscribers receive only the latest payload of each changed event type
+- Waiting subscribers are woken up by publish() and time out otherwise
+- StreamCheckerProgress keeps progress in memory and persists it only
+  occasionally
+- /api/stream-checker/events sends a snapshot on connect, then only bus
+  events and heartbeats, and stops when the client disconnects
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_bus import ProgressBus
+from stream_checker_service import StreamCheckerProgress
+
+
+class TestProgressBus(unittest.TestCase):
+    """Test publishing and waiting for events."""
+
+    def test_latest_value_per_type(self):
+        """Several publishes between two reads are delivered as one batch."""
+        bus = ProgressBus()
+        for i in range(100):
+            bus.publish('progress', {'current_stream': i})
+        bus.publish('other', 'x')
+
+        sequence, events = bus.wait_for_events(0, timeout=0)
+        self.assertEqual(sequence, 101)
+        self.assertEqual(events, {'progress': {'current_stream': 99}, 'other': 'x'})
+
+        bus.publish('other', 'y')
+        self.assertEqual(bus.wait_for_events(sequence, timeout=0)[1], {'other': 'y'})
+
+    def test_wait_wakes_up_on_publish(self):
+        """A waiting subscriber returns as soon as something is published."""
+        bus = ProgressBus()
+        threading.Timer(0.05, bus.publish, args=('progress', {'current_stream': 1})).start()
+
+        start = time.monotonic()
+        _, events = bus.wait_for_events(0, timeout=5)
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(events, {'progress': {'current_stream': 1}})
+
+    def test_wait_timeout(self):
+        """Without publishes the wait ends after the timeout with no events."""
+        self.assertEqual(ProgressBus().wait_for_events(0, timeout=0.05), (0, {}))
+
+
+class TestStreamCheckerProgress(unittest.TestCase):
+    """Test in-memory progress with occasional persistence."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.progress_file = Path(self.temp_dir) / 'stream_checker_progress.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_updates_not_written_every_time(self):
+        """Many updates lead to one write; flush() writes the latest progress."""
+        bus = ProgressBus()
+        progress = StreamCheckerProgress(self.progress_file, persist_interval=60, bus=bus)
+
+        with patch('stream_checker_service.os.replace', wraps=os.replace) as mock_replace:
+            for i in range(1, 101):
+                progress.update(1, 'Channel 1', i, 100)
+        self.assertEqual(mock_replace.call_count, 1)
+        self.assertEqual(progress.get()['current_stream'], 100)
+        self.assertEqual(bus.get_latest('progress')['current_stream'], 100)
+
+        progress.flush()
+        with open(self.progress_file) as f:
+            self.assertEqual(json.load(f)['current_stream'], 100)
+
+        # A new instance recovers the persisted progress
+        self.assertEqual(StreamCheckerProgress(self.progress_file, bus=bus).get()['current_stream'], 100)
+
+    def test_clear(self):
+        """Clearing removes the progress from memory, bus and disk."""
+        bus = ProgressBus()
+        progress = StreamCheckerProgress(self.progress_file, bus=bus)
+        progress.update(1, 'Channel 1', 1, 2)
+        progress.clear()
+
+        self.assertIsNone(progress.get())
+        self.assertIsNone(bus.get_latest('progress'))
+        self.assertFalse(self.progress_file.exists())
+
+
+class TestStreamCheckerEvents(unittest.TestCase):
+    """Test the Server-Sent Events endpoint."""
+
+    def setUp(self):
+        self.bus = ProgressBus()
+        self.service = MagicMock()
+        self.service.progress.bus = self.bus
+        self.service.progress.get.return_value = {'channel_id': 7, 'percentage': 50.0}
+        self.service.get_status.return_value = {'checking': True, 'queue': {'queue_size': 3}}
+
+    @staticmethod
+    def _next(response):
+        chunk = next(response.response)
+        return chunk.decode() if isinstance(chunk, bytes) else chunk
+
+    @patch('web_api.STREAM_CHECKER_EVENTS_TICK', 0.05)
+    def test_event_stream(self):
+        """A snapshot is sent on connect; after that only what is published on the bus."""
+        from web_api import app
+
+        with patch('web_api.get_stream_checker_service', return_value=self.service), app.test_client() as client:
+            response = client.get('/api/stream-checker/events', buffered=False)
+            try:
+                self.assertEqual(response.mimetype, 'text/event-stream')
+                first = self._next(response)
+                self.assertIn('event: progress\ndata: {"channel_id": 7, "percentage": 50.0}\n\n', first)
+                self.assertIn('event: status\ndata: {"checking": true', first)
+
+                self.bus.publish('progress', {'channel_id': 7, 'percentage': 75.0})
+                # Status is not polled, only sent when the service publishes it
+                self.assertEqual(self._next(response),
+                                 'event: progress\ndata: {"channel_id": 7, "percentage": 75.0}\n\n')
+
+                self.bus.publish('status', {'checking': False})
+                self.assertEqual(self._next(response), 'event: status\ndata: {"checking": false}\n\n')
+                self.service.get_status.assert_called_once()
+            finally:
+                response.close()
+
+    @patch('web_api.STREAM_CHECKER_EVENTS_HEARTBEAT', 0.05)
+    def test_heartbeat_and_disconnect(self):
+        """A heartbeat is sent while nothing is published; closing the response ends the generator."""
+        from web_api import app
+
+        with patch('web_api.get_stream_checker_service', return_value=self.service), app.test_client() as client:
+            response = client.get('/api/stream-checker/events', buffered=False)
+            self._next(response)
+            self.assertEqual(self._next(response), ': heartbeat\n\n')
+
+            response.close()
+            with self.assertRaises(StopIteration):
+                self._next(response)
+
+    @patch('stream_checker_service.StreamCheckConfig')
+    def test_status_published_on_state_change(self, mock_config_class):
+        """The service publishes its status when channels are queued."""
+        from stream_checker_service import StreamCheckerService
+
+        mock_config = MagicMock()
+        mock_config.get = MagicMock(side_effect=lambda key, default=None: default)
+        mock_config_class.return_value = mock_config
+        service = StreamCheckerService()
+        service.progress = StreamCheckerProgress(Path(tempfile.mkdtemp()) / 'progress.json', bus=self.bus)
+
+        service.queue_channel(1)
+        self.assertEqual(self.bus.get_latest('status')['queue']['queue_size'],
+                         service.check_queue.get_status()['queue_size'])
+        self.assertGreater(self.bus.get_latest('status')['queue']['queue_size'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for the proxy status snapshot and single-flight refresh in UDI.
+
+Verifies that:
+- Limiter queries are answered from a snapshot built once per proxy fetch
+- The snapshot is rebuilt after a new fetch or an M3U accounts refresh
+- Parallel callers trigger only one proxy fetch
+- Viewer totals follow stream updates
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from udi.manager import UDIManager
+
+
+PROXY_STATUS = {
+    '100': {'state': 'active', 'm3u_profile_id': 101},
+    '101': {'state': 'active', 'm3u_profile_id': 102},
+    '102': {'state': 'active', 'm3u_profile_id': 102},
+    '103': {'state': 'active', 'm3u_profile_id': 201},
+    '104': {'state': 'idle', 'm3u_profile_id': 201},
+}
+
+
+class TestProxyStatusSnapshot(unittest.TestCase):
+    """Test the snapshot derived from the proxy status."""
+
+    def setUp(self):
+        self.udi = UDIManager()
+        self.udi._initialized = True
+        self.udi.storage = MagicMock()
+        self.udi._m3u_accounts_cache = [
+            {'id': 1, 'name': 'Account 1', 'profiles': [{'id': 101}, {'id': 102}]},
+            {'id': 2, 'name': 'Account 2', 'profiles': [{'id': 201}]},
+        ]
+        self.udi._streams_cache = [
+            {'id': 1, 'm3u_account': 1, 'current_viewers': 2},
+            {'id': 2, 'm3u_account': 1, 'current_viewers': 1},
+            {'id': 3, 'm3u_account': 2, 'current_viewers': 0},
+        ]
+        self.fetch = MagicMock(return_value=PROXY_STATUS)
+        self.udi.fetcher.fetch_proxy_status = self.fetch
+
+    def test_queries_use_one_fetch_and_one_walk(self):
+        """All limiter queries are answered from one fetch."""
+        original = self.udi._is_channel_status_active
+        self.udi._is_channel_status_active = MagicMock(side_effect=original)
+
+        for _ in range(50):
+            self.assertEqual(self.udi.get_active_streams_for_account(1), 3)
+            self.assertEqual(self.udi.get_active_streams_for_account(2), 1)
+            self.assertEqual(self.udi.get_active_streams_for_profile(201), 1)
+            self.assertEqual(self.udi.get_active_streams_count_per_profile(1), {101: 1, 102: 2})
+            self.assertTrue(self.udi.is_channel_active(103))
+            self.assertFalse(self.udi.is_channel_active(104))
+
+        self.assertEqual(self.fetch.call_count, 1)
+        self.assertEqual(self.udi._is_channel_status_active.call_count, len(PROXY_STATUS))
+
+    def test_per_profile_counts_are_copies(self):
+        """Modifying a returned dict does not change the snapshot."""
+        self.udi.get_active_streams_count_per_profile(1)[101] = 99
+        self.assertEqual(self.udi.get_active_streams_count_per_profile(1), {101: 1, 102: 2})
+
+    def test_rebuilt_after_fetch_and_accounts_refresh(self):
+        """A new proxy status or accounts list replaces the snapshot."""
+        self.assertEqual(self.udi.get_active_streams_for_account(2), 1)
+
+        self.fetch.return_value = {'105': {'state': 'active', 'm3u_profile_id': 201}}
+        self.udi._proxy_status_last_fetch = time.time() - 6
+        self.assertEqual(self.udi.get_active_streams_for_account(1), 0)
+        self.assertTrue(self.udi.is_channel_active(105))
+
+        # Profile 201 moved to a new account
+        self.udi._m3u_accounts_cache = [{'id': 3, 'profiles': [{'id': 201}]}]
+        self.assertEqual(self.udi.get_active_streams_for_account(2), 0)
+        self.assertEqual(self.udi.get_active_streams_for_account(3), 1)
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_viewer_totals_follow_stream_updates(self):
+        """Viewer totals are recomputed when streams are updated."""
+        self.assertEqual(self.udi.get_total_viewers_for_account(1), 3)
+        self.assertEqual(self.udi.get_total_viewers_for_profile(201), 0)
+
+        self.udi.update_streams([{'id': 3, 'm3u_account': 2, 'current_viewers': 4}])
+        self.udi.update_stream(1, {'id': 1, 'm3u_account': 1, 'current_viewers': 0})
+        self.assertEqual(self.udi.get_total_viewers_for_account(1), 1)
+        self.assertEqual(self.udi.get_total_viewers_for_account(2), 4)
+
+
+class TestSingleFlightRefresh(unittest.TestCase):
+    """Test that parallel callers do not stampede the proxy endpoint."""
+
+    def setUp(self):
+        self.udi = UDIManager()
+        self.udi._initialized = True
+        self.release = threading.Event()
+        self.calls = 0
+
+        def slow_fetch():
+            self.calls += 1
+            self.release.wait(5)
+            return {'100': {'state': 'active'}}
+
+        self.udi.fetcher.fetch_proxy_status = slow_fetch
+
+    def _run_parallel(self, count):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.udi._get_proxy_status())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_cold_cache_fetches_once(self):
+        """Callers without a cache wait for the running fetch and share it."""
+        threads, results = self._run_parallel(8)
+        time.sleep(0.1)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result == {'100': {'state': 'active'}} for result in results))
+
+    def test_expired_cache_returned_during_refresh(self):
+        """While one thread refreshes, the others get the expired cache at once."""
+        stale = {'200': {'state': 'active'}}
+        self.udi._proxy_status_cache = stale
+        self.udi._proxy_status_last_fetch = time.time() - 60
+
+        refresher = threading.Thread(target=self.udi._get_proxy_status)
+        refresher.start()
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        threads, results = self._run_parallel(8)
+        for thread in threads:
+            thread.join(5)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertTrue(all(result is stale for result in results))
+
+        self.release.set()
+        refresher.join(5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.udi._get_proxy_status(), {'100': {'state': 'active'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Test the compiled regex index used by RegexChannelMatcher.
+
+Verifies that:
+- Matching through the compiled index gives the same results as the
+  original per-call substitution/compile logic
+- The batch match_streams API agrees with match_stream_to_channels
+- The index is only rebuilt when the pattern configuration actually changes
+- The literal prefilter never drops a channel the full scan would match
+"""
+import unittest
+import sys
+import re
+import tempfile
+import json
+import random
+import shutil
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from automated_stream_manager import RegexChannelMatcher, _WHITESPACE_PATTERN, _longest_required_literal
+
+
+def reference_match(config, stream_name, stream_m3u_account=None):
+    """Uncompiled reference implementation of the matching rules."""
+    matches = []
+    case_sensitive = config.get("global_settings", {}).get("case_sensitive", False)
+    search_name = stream_name if case_sensitive else stream_name.lower()
+    for channel_id, channel_config in config.get("patterns", {}).items():
+        if not channel_config.get("enabled", True):
+            continue
+        pattern_m3u_accounts = channel_config.get("m3u_accounts")
+        if pattern_m3u_accounts:
+            if stream_m3u_account is None or stream_m3u_account not in pattern_m3u_accounts:
+                continue
+        escaped_name = re.escape(channel_config.get("name", ""))
+        for pattern in channel_config.get("regex", []):
+            search_pattern = pattern.replace('CHANNEL_NAME', escaped_name)
+            if not case_sensitive:
+                search_pattern = search_pattern.lower()
+            search_pattern = _WHITESPACE_PATTERN.sub(r'\\s+', search_pattern)
+            if re.search(search_pattern, search_name):
+                matches.append(channel_id)
+                break
+    return matches
+
+
+class TestRegexCompiledIndex(unittest.TestCase):
+    """Test compiled regex index correctness and invalidation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test_regex_config.json"
+
+        self.config = {
+            "patterns": {
+                "1": {"name": "ESPN", "regex": [".*CHANNEL_NAME.*"], "enabled": True},
+                "2": {"name": "CNN", "regex": ["^US: CNN", "CNN International"], "enabled": True},
+                "3": {"name": "HBO+", "regex": ["CHANNEL_NAME HD"], "enabled": True, "m3u_accounts": [5]},
+                "4": {"name": "Disabled", "regex": [".*"], "enabled": False},
+                "5": {"name": "Sky Sports", "regex": ["sky sports (main|premier)"], "enabled": True,
+                      "m3u_accounts": []},
+                "6": {"name": "BBC One", "regex": ["BBC\\ One"], "enabled": True, "m3u_accounts": [5, 6]},
+            },
+            "global_settings": {
+                "case_sensitive": False,
+                "require_exact_match": False
+            }
+        }
+        with open(self.config_file, 'w') as f:
+            json.dump(self.config, f)
+
+        self.matcher = RegexChannelMatcher(config_file=self.config_file)
+
+        self.streams = [
+            {"id": 1, "name": "Watch ESPN Live", "m3u_account": 1},
+            {"id": 2, "name": "US: CNN HD", "m3u_account": 1},
+            {"id": 3, "name": "CNN  International", "m3u_account": None},
+            {"id": 4, "name": "HBO+ HD", "m3u_account": 5},
+            {"id": 5, "name": "HBO+ HD", "m3u_account": 6},
+            {"id": 6, "name": "SKY Sports\tPremier", "m3u_account": 2},
+            {"id": 7, "name": "BBC One", "m3u_account": 6},
+            {"id": 8, "name": "BBC  One", "m3u_account": 6},
+            {"id": 9, "name": "Unrelated", "m3u_account": 5},
+        ]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_matches_reference_implementation(self):
+        """Compiled matching returns the same channels as the reference logic."""
+        for stream in self.streams:
+            with self.subTest(stream=stream["name"], account=stream["m3u_account"]):
+                self.assertEqual(
+                    self.matcher.match_stream_to_channels(stream["name"], stream["m3u_account"]),
+                    reference_match(self.config, stream["name"], stream["m3u_account"])
+                )
+
+    def test_case_sensitive_matches_reference_implementation(self):
+        """Compiled matching honours case_sensitive like the reference logic."""
+        self.config["global_settings"]["case_sensitive"] = True
+        with open(self.config_file, 'w') as f:
+            json.dump(self.config, f)
+        self.matcher.reload_patterns()
+
+        for name in ["Watch ESPN Live", "watch espn live", "us: cnn", "US: CNN"]:
+            with self.subTest(name=name):
+                self.assertEqual(
+                    self.matcher.match_stream_to_channels(name, 1),
+                    reference_match(self.config, name, 1)
+                )
+
+    def test_batch_matches_single_stream_api(self):
+        """match_streams returns the same matches as match_stream_to_channels."""
+        batch = self.matcher.match_streams(self.streams)
+        for stream in self.streams:
+            expected = self.matcher.match_stream_to_channels(stream["name"], stream["m3u_account"])
+            self.assertEqual(batch.get(stream["id"], []), expected)
+
+    def test_batch_restricted_to_channels(self):
+        """match_streams can be restricted to a subset of channels."""
+        batch = self.matcher.match_streams(self.streams, channel_ids=["2"])
+        self.assertEqual(set(batch.keys()), {2, 3})
+        for matches in batch.values():
+            self.assertEqual(matches, ["2"])
+
+    def test_index_reused_when_config_unchanged(self):
+        """Reloading an unchanged config keeps the compiled index."""
+        self.matcher.match_stream_to_channels("ESPN")
+        index = self.matcher._compiled_index
+        self.assertIsNotNone(index)
+
+        self.matcher.reload_patterns()
+        self.matcher.match_stream_to_channels("ESPN")
+        self.assertIs(self.matcher._compiled_index, index)
+
+    def test_index_rebuilt_when_config_changes(self):
+        """Changing the config file or adding a pattern rebuilds the index."""
+        self.assertEqual(self.matcher.match_stream_to_channels("Fox News"), [])
+
+        self.config["patterns"]["7"] = {"name": "Fox News", "regex": ["fox news"], "enabled": True}
+        with open(self.config_file, 'w') as f:
+            json.dump(self.config, f)
+        self.matcher.reload_patterns()
+        self.assertEqual(self.matcher.match_stream_to_channels("Fox News"), ["7"])
+
+        self.matcher.add_channel_pattern("8", "Fox", ["^fox"])
+        self.assertEqual(self.matcher.match_stream_to_channels("Fox News"), ["7", "8"])
+
+
+class TestRegexLiteralPrefilter(unittest.TestCase):
+    """Test the literal prefilter index against the full pattern scan."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test_regex_config.json"
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create_matcher(self, config):
+        with open(self.config_file, 'w') as f:
+            json.dump(config, f)
+        return RegexChannelMatcher(config_file=self.config_file)
+
+    def test_required_literal_extraction(self):
+        """Only unconditionally required literals are extracted."""
+        cases = {
+            ".*espn.*": "espn",
+            r"^(?:pl|pl-vip):\s*hbo\ 3(?:\s+(?:hd|4k))?$": "hbo 3",
+            "sky sports (main|premier)": "sky sports ",
+            r"(cnn)+ news": " news",
+            "fox|cnn": None,
+            "(?i)ESPN": None,
+            "a(?i:bc)": None,
+            "(?:bbc)? one": " one",
+            ".*": None,
+        }
+        for pattern, expected in cases.items():
+            with self.subTest(pattern=pattern):
+                self.assertEqual(_longest_required_literal(re.compile(pattern)), expected)
+
+    def test_prefilter_matches_full_scan(self):
+        """Randomized configs give identical results with and without the prefilter."""
+        rng = random.Random(1234)
+        words = ["ESPN", "CNN", "HBO", "Sky", "Sports", "News", "One", "BBC", "TVP", "Polsat", "Max", "2"]
+        templates = [
+            ".*CHANNEL_NAME.*",
+            "^CHANNEL_NAME$",
+            "CHANNEL_NAME (HD|FHD)",
+            "(?:US|UK): CHANNEL_NAME",
+            "CHANNEL_NAME|{word}",
+            "(?i){word} CHANNEL_NAME",
+            "[A-Z]+ {word}",
+            "{word}\\d*",
+            "(?:{word})? CHANNEL_NAME",
+        ]
+
+        for case_sensitive in (False, True):
+            patterns = {}
+            for channel_id in range(1, 80):
+                name = " ".join(rng.sample(words, rng.randint(1, 2)))
+                regex = [rng.choice(templates).format(word=rng.choice(words))
+                         for _ in range(rng.randint(1, 2))]
+                pattern_data = {"name": name, "regex": regex, "enabled": rng.random() > 0.1}
+                if rng.random() < 0.3:
+                    pattern_data["m3u_accounts"] = rng.sample([1, 2, 3], rng.randint(0, 2))
+                patterns[str(channel_id)] = pattern_data
+            config = {"patterns": patterns, "global_settings": {"case_sensitive": case_sensitive}}
+            matcher = self._create_matcher(config)
+            index = matcher._get_compiled_index()
+
+            streams = []
+            for stream_id in range(1, 400):
+                name = rng.choice(["", "US: ", "UK: ", "PL| "]) + " ".join(rng.choices(words, k=rng.randint(1, 3)))
+                if rng.random() < 0.5:
+                    name = name.upper() if rng.random() < 0.5 else name.lower()
+                streams.append({"id": stream_id, "name": name, "m3u_account": rng.choice([None, 1, 2, 3])})
+
+            batch = matcher.match_streams(streams)
+            for stream in streams:
+                search_name = stream["name"] if case_sensitive else stream["name"].lower()
+                full_scan = matcher._match_entries(
+                    stream["name"], search_name, index.entries_for_account(stream["m3u_account"])
+                )
+                with self.subTest(case_sensitive=case_sensitive, stream=stream["name"]):
+                    self.assertEqual(full_scan, reference_match(config, stream["name"], stream["m3u_account"]))
+                    self.assertEqual(batch.get(stream["id"], []), full_scan)
+
+
+if __name__ == '__main__':
+    unittest.main()
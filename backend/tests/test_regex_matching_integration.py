@@ -185,7 +185,7 @@ class TestRegexMatchingIntegration(unittest.TestCase):
                     'regex_pattern': '^Breaking News',
                     'minutes_before': 5
                 }
-                with patch('scheduling_service.requests.get'):
+                with patch('http_session.DispatcharrSession.get'):
                     self.service.create_auto_create_rule(rule_data)
             except Exception as e:
                 errors.append(e)
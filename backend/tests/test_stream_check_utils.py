@@ -9,6 +9,7 @@ essential quality metrics using ffmpeg/ffprobe.
 import unittest
 from unittest.mock import patch, MagicMock
 import json
+import subprocess
 import sys
 import os
 
@@ -19,7 +20,15 @@ from stream_check_utils import (
     check_ffmpeg_installed,
     get_stream_info,
     get_stream_bitrate,
-    analyze_stream
+    get_stream_info_and_bitrate,
+    analyze_stream,
+    probe_stream,
+    get_check_tier_stats,
+    reset_check_tier_stats,
+    get_stream_info_and_bitrate_streaming,
+    get_stream_info_and_bitrate_adaptive,
+    BitrateConvergence,
+    FFmpegOutputParser
 )
 
 
@@ -250,5 +259,531 @@ class TestAnalyzeStream(unittest.TestCase):
         self.assertEqual(result['bitrate_kbps'], 5000.0)
 
 
+class TestProbeStream(unittest.TestCase):
+    """Test the fast probe tier."""
+    
+    @patch('subprocess.run')
+    def test_successful_probe(self, mock_run):
+        """Test that codecs, resolution and FPS are taken from ffprobe."""
+        mock_run.return_value = MagicMock(returncode=0, stderr='', stdout=json.dumps({
+            'streams': [
+                {'codec_type': 'video', 'codec_name': 'h264', 'width': 1920, 'height': 1080, 'avg_frame_rate': '50/1'},
+                {'codec_type': 'audio', 'codec_name': 'aac', 'avg_frame_rate': '0/0'}
+            ]
+        }))
+        
+        result = probe_stream('http://test.stream', timeout=5, analyze_duration=1.5, proxy='http://proxy:8080')
+        
+        self.assertEqual(result['status'], 'OK')
+        self.assertEqual(result['video_codec'], 'h264')
+        self.assertEqual(result['audio_codec'], 'aac')
+        self.assertEqual(result['resolution'], '1920x1080')
+        self.assertEqual(result['fps'], 50.0)
+        command = mock_run.call_args.args[0]
+        self.assertEqual(command[0], 'ffprobe')
+        self.assertIn('1500000', command)
+        self.assertIn('http://proxy:8080', command)
+        self.assertEqual(mock_run.call_args.kwargs['timeout'], 5)
+    
+    @patch('subprocess.run')
+    def test_failed_probe(self, mock_run):
+        """Test that HTTP errors and inputs without streams fail the probe conclusively, timeouts not."""
+        mock_run.return_value = MagicMock(returncode=1, stdout='{}', stderr='Server returned 404 Not Found')
+        result = probe_stream('http://test.stream')
+        self.assertEqual(result['status'], 'Error')
+        self.assertTrue(result['conclusive'])
+        
+        mock_run.return_value = MagicMock(returncode=0, stdout='{"streams": []}', stderr='')
+        result = probe_stream('http://test.stream')
+        self.assertEqual(result['status'], 'Error')
+        self.assertTrue(result['conclusive'])
+        
+        mock_run.return_value = MagicMock(returncode=0, stdout='not json', stderr='')
+        self.assertFalse(probe_stream('http://test.stream')['conclusive'])
+        
+        mock_run.side_effect = subprocess.TimeoutExpired('ffprobe', 5)
+        result = probe_stream('http://test.stream', timeout=5)
+        self.assertEqual(result['status'], 'Timeout')
+        self.assertEqual(result['resolution'], '0x0')
+        self.assertFalse(result['conclusive'])
+
+
+class TestFastProbeTier(unittest.TestCase):
+    """Test the tiered check pipeline in analyze_stream."""
+    
+    FULL_RESULT = {
+        'video_codec': 'h264',
+        'audio_codec': 'aac',
+        'resolution': '1920x1080',
+        'fps': 25.0,
+        'bitrate_kbps': 4000.0,
+        'status': 'OK',
+        'elapsed_time': 30.0
+    }
+    
+    def setUp(self):
+        reset_check_tier_stats()
+    
+    @patch('stream_check_utils.get_stream_info_and_bitrate')
+    @patch('stream_check_utils.probe_stream')
+    def test_failed_probe_skips_full_analysis(self, mock_probe, mock_full):
+        """Test that a stream failing the probe is not analyzed further."""
+        mock_probe.return_value = {
+            'video_codec': 'N/A', 'audio_codec': 'N/A', 'resolution': '0x0',
+            'fps': 0, 'status': 'Error', 'elapsed_time': 0.5, 'conclusive': True
+        }
+        
+        result = analyze_stream('http://test.stream', 1, 'Dead', retries=0, fast_probe=True)
+        
+        mock_full.assert_not_called()
+        self.assertEqual(result['status'], 'Error')
+        self.assertEqual(result['resolution'], '0x0')
+        self.assertIsNone(result['bitrate_kbps'])
+        self.assertTrue(result['rejected_by_probe'])
+        self.assertEqual(result['tier_timings'], {'probe': 0.5})
+    
+    @patch('stream_check_utils.get_stream_info_and_bitrate')
+    @patch('stream_check_utils.probe_stream')
+    def test_passing_probe_runs_full_analysis(self, mock_probe, mock_full):
+        """Test that streams passing the probe get the full bitrate analysis."""
+        mock_probe.return_value = dict(self.FULL_RESULT, bitrate_kbps=None, elapsed_time=1.0)
+        mock_full.return_value = dict(self.FULL_RESULT)
+        
+        result = analyze_stream('http://test.stream', 1, 'Live', retries=0, fast_probe=True,
+                                probe_timeout=7, probe_analyze_duration=1)
+        
+        self.assertEqual(mock_probe.call_args.kwargs['timeout'], 7)
+        self.assertEqual(mock_probe.call_args.kwargs['analyze_duration'], 1)
+        mock_full.assert_called_once()
+        self.assertEqual(result['bitrate_kbps'], 4000.0)
+        self.assertFalse(result['rejected_by_probe'])
+        self.assertEqual(result['tier_timings'], {'probe': 1.0, 'analysis': 30.0})
+    
+    @patch('stream_check_utils.get_stream_info_and_bitrate')
+    @patch('stream_check_utils.probe_stream')
+    def test_inconclusive_probe_runs_full_analysis(self, mock_probe, mock_full):
+        """Test that a probe timeout does not mark a slow-starting stream dead."""
+        mock_probe.return_value = {
+            'video_codec': 'N/A', 'audio_codec': 'N/A', 'resolution': '0x0',
+            'fps': 0, 'status': 'Timeout', 'elapsed_time': 10.0, 'conclusive': False
+        }
+        mock_full.return_value = dict(self.FULL_RESULT)
+        
+        result = analyze_stream('http://test.stream', 1, 'Slow', retries=0, fast_probe=True)
+        
+        mock_full.assert_called_once()
+        self.assertEqual(result['status'], 'OK')
+        self.assertFalse(result['rejected_by_probe'])
+        self.assertEqual(result['tier_timings'], {'probe': 10.0, 'analysis': 30.0})
+        self.assertEqual(get_check_tier_stats()['probe_rejected'], 0)
+    
+    @patch('stream_check_utils.get_stream_info_and_bitrate')
+    @patch('stream_check_utils.probe_stream')
+    def test_tier_stats(self, mock_probe, mock_full):
+        """Test that per-tier timings are aggregated."""
+        mock_full.return_value = dict(self.FULL_RESULT)
+        mock_probe.side_effect = [
+            dict(self.FULL_RESULT, elapsed_time=1.0, conclusive=True),
+            {'video_codec': 'N/A', 'audio_codec': 'N/A', 'resolution': '0x0',
+             'fps': 0, 'status': 'Error', 'elapsed_time': 3.0, 'conclusive': True},
+        ]
+        
+        analyze_stream('http://a', 1, 'Live', retries=0, fast_probe=True)
+        analyze_stream('http://b', 2, 'Dead', retries=0, fast_probe=True)
+        
+        stats = get_check_tier_stats()
+        self.assertEqual(stats['probe_checks'], 2)
+        self.assertEqual(stats['probe_rejected'], 1)
+        self.assertEqual(stats['probe_seconds'], 4.0)
+        self.assertEqual(stats['analysis_checks'], 1)
+        self.assertEqual(stats['avg_analysis_seconds'], 30.0)
+        self.assertEqual(stats['estimated_seconds_saved'], 28.0)
+    
+    @patch('stream_check_utils.get_stream_info_and_bitrate')
+    @patch('stream_check_utils.probe_stream')
+    def test_probe_disabled_by_default(self, mock_probe, mock_full):
+        """Test that analyze_stream only probes when fast_probe is set."""
+        mock_full.return_value = dict(self.FULL_RESULT)
+        result = analyze_stream('http://test.stream', 1, 'Live', retries=0)
+        mock_probe.assert_not_called()
+        self.assertEqual(result['tier_timings'], {'analysis': 30.0})
+
+
+class FakeProcess:
+    """Popen stand-in that serves stderr lines and records how many were read.
+    
+    After terminate() only the terminate_lines (ffmpeg's shutdown output) are served.
+    """
+    
+    def __init__(self, lines, returncode=0, terminate_lines=()):
+        self.lines = lines
+        self.terminate_lines = terminate_lines
+        self.read_count = 0
+        self.returncode = None
+        self.final_returncode = returncode
+        self.killed = False
+        self.terminated = False
+        self.stderr = self
+    
+    def __iter__(self):
+        for line in self.lines:
+            if self.terminated:
+                break
+            self.read_count += 1
+            yield line
+        for line in self.terminate_lines if self.terminated else ():
+            yield line
+    
+    def terminate(self):
+        self.terminated = True
+    
+    def close(self):
+        pass
+    
+    def poll(self):
+        return self.returncode
+    
+    def kill(self):
+        self.killed = True
+        self.returncode = -9
+    
+    def wait(self):
+        if self.returncode is None:
+            self.returncode = self.final_returncode
+        return self.returncode
+
+
+FFMPEG_VERBOSE_OUTPUT = [
+    "Input #0, mpegts, from 'http://test.stream':\n",
+    "  Stream #0:0[0x100]: Video: h264 (High) ([27][0][0][0] / 0x001B), yuv420p, 1920x1080, 50 fps, 50 tbr\n",
+    "  Stream #0:1[0x101]: Audio: aac (LC) ([15][0][0][0] / 0x000F), 48000 Hz, stereo, fltp\n",
+    "Output #0, null, to 'pipe:':\n",
+    "  Stream #0:0: Video: wrapped_avframe, yuv420p, 1920x1080, 50 fps\n",
+    "  Stream #0:1: Audio: pcm_s16le, 48000 Hz, stereo\n",
+    "bitrate=N/A\n",
+    "progress=continue\n",
+    "bitrate=N/A\n",
+    "progress=end\n",
+    "[AVIOContext @ 0x55d0c8] Statistics: 18750000 bytes read, 0 seeks\n",
+    "[http @ 0x55d0c9] Closing connection\n",
+    "Exiting normally, received signal 2.\n",
+]
+
+
+class TestStreamingParser(unittest.TestCase):
+    """Test the incremental ffmpeg output parser."""
+    
+    def test_parser_matches_buffered_parsing(self):
+        """Test that the parser extracts input codecs and bitrate line by line."""
+        parser = FFmpegOutputParser(duration=30)
+        for line in FFMPEG_VERBOSE_OUTPUT:
+            parser.feed(line)
+        result = {}
+        parser.apply_to(result)
+        self.assertEqual(result['video_codec'], 'h264')
+        self.assertEqual(result['audio_codec'], 'aac')
+        self.assertEqual(result['resolution'], '1920x1080')
+        self.assertEqual(result['fps'], 50.0)
+        self.assertEqual(result['bitrate_kbps'], 5000.0)
+        self.assertTrue(parser.complete)
+    
+    def test_statistics_before_end_does_not_complete(self):
+        """Test that statistics during processing do not stop parsing."""
+        parser = FFmpegOutputParser(duration=10)
+        parser.feed("Input #0, mpegts, from 'http://test.stream':")
+        parser.feed("[AVIOContext @ 0x1] Statistics: 500000 bytes read, 0 seeks")
+        self.assertFalse(parser.complete)
+        parser.feed("progress=end")
+        parser.feed("[AVIOContext @ 0x2] Statistics: 12000000 bytes read, 0 seeks")
+        self.assertTrue(parser.complete)
+        self.assertEqual(parser.bytes_read, 12500000)
+        self.assertEqual(parser.bitrate_kbps, 10000.0)
+    
+    def test_segmented_input_statistics_are_summed(self):
+        """Test that HLS segment and playlist statistics are summed and only ffmpeg's exit completes."""
+        parser = FFmpegOutputParser(duration=10)
+        parser.feed("Input #0, hls, from 'http://test.stream/index.m3u8':")
+        for _ in range(4):
+            parser.feed("[AVIOContext @ 0x1] Statistics: 2500000 bytes read, 0 seeks")
+        parser.feed("progress=end")
+        # Open segment and playlist contexts close before the main input
+        parser.feed("[AVIOContext @ 0x2] Statistics: 2499000 bytes read, 0 seeks")
+        self.assertFalse(parser.complete)
+        parser.feed("[AVIOContext @ 0x3] Statistics: 1000 bytes read, 0 seeks")
+        self.assertFalse(parser.complete)
+        parser.feed("Exiting normally, received signal 15.")
+        self.assertTrue(parser.complete)
+        self.assertEqual(parser.bytes_read, 12500000)
+        self.assertEqual(parser.bitrate_kbps, 10000.0)
+    
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_streaming_stops_early(self, mock_popen):
+        """Test that ffmpeg is stopped once all metrics are known."""
+        process = FakeProcess(FFMPEG_VERBOSE_OUTPUT)
+        mock_popen.return_value = process
+        
+        result = get_stream_info_and_bitrate_streaming('http://test.stream', duration=30, proxy='http://proxy:8080')
+        
+        self.assertEqual(result['status'], 'OK')
+        self.assertEqual(result['bitrate_kbps'], 5000.0)
+        self.assertEqual(result['resolution'], '1920x1080')
+        self.assertEqual(process.read_count, 11)
+        self.assertTrue(process.killed)
+        command = mock_popen.call_args.args[0]
+        self.assertIn('-progress', command)
+        self.assertNotIn('debug', command)
+        self.assertIn('http://proxy:8080', command)
+    
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_streaming_failed_stream(self, mock_popen):
+        """Test that a stream ffmpeg cannot open yields no bitrate."""
+        mock_popen.return_value = FakeProcess([
+            "[http @ 0x1] HTTP error 404 Not Found\n",
+            "http://test.stream: Server returned 404 Not Found\n",
+        ], returncode=1)
+        
+        result = get_stream_info_and_bitrate_streaming('http://test.stream', duration=30)
+        
+        self.assertEqual(result['status'], 'OK')
+        self.assertIsNone(result['bitrate_kbps'])
+        self.assertEqual(result['resolution'], '0x0')
+    
+    def test_streaming_invalid_url(self):
+        """Test that invalid URLs are rejected before starting ffmpeg."""
+        with patch('stream_check_utils.subprocess.Popen') as mock_popen:
+            result = get_stream_info_and_bitrate_streaming('file:///etc/passwd')
+        mock_popen.assert_not_called()
+        self.assertEqual(result['status'], 'Error')
+
+
+
+def shutdown_output(out_time, input_kbps):
+    """ffmpeg output after SIGTERM: the final progress block and the input statistics."""
+    return [f"out_time_us={int(out_time * 1000000)}\n", "progress=end\n",
+            f"[AVIOContext @ 0x1] Statistics: {int(input_kbps * 1000 / 8 * out_time)} bytes read, 0 seeks\n",
+            "Exiting normally, received signal 15.\n"]
+
+
+def copy_progress_output(bitrates, interval=0.5, end=False, statistics_bytes=None):
+    """ffmpeg stream copy output with one progress block per bitrate (kbps of the media so far)."""
+    lines = FFMPEG_VERBOSE_OUTPUT[:3] + ["Output #0, mpegts, to '/dev/null':\n",
+                                        "total_size=N/A\n", "out_time_us=N/A\n", "progress=continue\n"]
+    for i, bitrate in enumerate(bitrates, 1):
+        out_time = i * interval
+        lines += [f"total_size={int(bitrate * 1000 / 8 * out_time)}\n",
+                  f"out_time_us={int(out_time * 1000000)}\n",
+                  f"out_time_ms={int(out_time * 1000000)}\n",
+                  f"bitrate={bitrate:.1f}kbits/s\n",
+                  "progress=end\n" if end and i == len(bitrates) else "progress=continue\n"]
+    if statistics_bytes is not None:
+        lines.append(f"[AVIOContext @ 0x1] Statistics: {statistics_bytes} bytes read, 0 seeks\n")
+    return lines
+
+
+class TestAdaptiveDuration(unittest.TestCase):
+    """Test stopping the analysis once the bitrate has converged."""
+    
+    def test_convergence_needs_min_duration_and_stable_window(self):
+        """Samples before min_duration or with a large spread do not converge."""
+        convergence = BitrateConvergence(min_duration=5, tolerance=0.05, window=4)
+        for line in copy_progress_output([8000, 2000, 5000, 4000, 4000, 4000, 4000, 4000, 4000]):
+            convergence.feed(line)
+        self.assertFalse(convergence.converged)
+        self.assertEqual(convergence.samples, 9)
+        
+        for line in copy_progress_output([4000] * 10)[-5:]:
+            convergence.feed(line)
+        self.assertTrue(convergence.converged)
+        self.assertEqual(convergence.confidence, 1.0)
+        self.assertAlmostEqual(convergence.bitrate_kbps, 4000, delta=1)
+    
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_stable_stream_stops_early(self, mock_popen):
+        """A constant bitrate stream is stopped after min_duration instead of 30s."""
+        lines = copy_progress_output([4000.0] * 60, end=True, statistics_bytes=15000000)
+        process = FakeProcess(lines, terminate_lines=shutdown_output(5.0, 4000.0))
+        mock_popen.return_value = process
+        
+        result = get_stream_info_and_bitrate_adaptive('http://test.stream', duration=30, min_duration=5)
+        
+        self.assertTrue(process.terminated)
+        self.assertLess(process.read_count, len(lines) // 4)
+        self.assertAlmostEqual(result['bitrate_kbps'], 4000, delta=1)
+        self.assertEqual(result['resolution'], '1920x1080')
+        self.assertEqual(result['measured_duration'], 5.0)
+        self.assertEqual(result['bitrate_samples'], 11)  # ffmpeg's final progress block after SIGTERM
+        self.assertEqual(result['bitrate_confidence'], 1.0)
+        command = mock_popen.call_args.args[0]
+        self.assertEqual(command[command.index('-c'):command.index('-c') + 4], ['-c', 'copy', '-f', 'mpegts'])
+    
+    @patch('stream_check_utils._log_bitrate_detection_failure')
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_unstable_stream_runs_to_max_duration(self, mock_popen, mock_log):
+        """Without convergence the full duration is analyzed and bytes read give the bitrate."""
+        bitrates = [3000.0 if i % 2 else 5000.0 for i in range(20)]
+        mock_popen.return_value = FakeProcess(copy_progress_output(bitrates, end=True, statistics_bytes=5000000))
+        
+        result = get_stream_info_and_bitrate_adaptive('http://test.stream', duration=10, min_duration=5)
+        
+        self.assertEqual(result['bitrate_kbps'], 4000.0)
+        self.assertEqual(result['bitrate_samples'], 20)
+        self.assertLess(result['bitrate_confidence'], 0.6)
+        self.assertEqual(result['measured_duration'], 10.0)
+        # The early exit check expects the maximum duration
+        self.assertEqual(mock_log.call_args.args[2], 10)
+    
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_converged_result_agrees_with_fixed_duration(self, mock_popen):
+        """The converged bitrate is the input bytes read over the media time, like a fixed-duration analysis."""
+        # 4400 kbps read, 4000 kbps written by the remux (e.g. null packets dropped)
+        input_kbps = 4400.0
+        fixed_lines = FFMPEG_VERBOSE_OUTPUT[:-3] + [
+            f"[AVIOContext @ 0x1] Statistics: {int(input_kbps * 1000 / 8 * 30)} bytes read, 0 seeks\n"]
+        mock_popen.return_value = FakeProcess(fixed_lines)
+        fixed = get_stream_info_and_bitrate_streaming('http://test.stream', duration=30)
+        
+        mock_popen.return_value = FakeProcess(copy_progress_output([4000.0] * 60),
+                                              terminate_lines=shutdown_output(5.5, input_kbps))
+        adaptive = get_stream_info_and_bitrate_adaptive('http://test.stream', duration=30, min_duration=5)
+        
+        self.assertAlmostEqual(fixed['bitrate_kbps'], input_kbps, delta=1)
+        self.assertAlmostEqual(adaptive['bitrate_kbps'], fixed['bitrate_kbps'], delta=1)
+        self.assertEqual(adaptive['measured_duration'], 5.5)
+    
+    @staticmethod
+    def hls_progress_output(segment_bytes, blocks_per_segment=4):
+        """copy_progress_output() of an HLS input, with a Statistics line per segment closed while running."""
+        lines = []
+        blocks = 0
+        for line in copy_progress_output([4000.0] * 60):
+            lines.append(line.replace("Input #0, mpegts,", "Input #0, hls,"))
+            if line == "progress=continue\n":
+                blocks += 1
+                if blocks % blocks_per_segment == 0:
+                    lines.append(f"[AVIOContext @ 0x2] Statistics: {segment_bytes} bytes read, 0 seeks\n")
+        return lines
+    
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_hls_segment_statistics_are_summed(self, mock_popen):
+        """Segments closed before and after SIGTERM add up to the input bytes of the converged analysis."""
+        # 4400 kbps input in 2s segments; the segment open at 5.5s and the playlist close on exit
+        lines = self.hls_progress_output(1100000)
+        shutdown = ["out_time_us=5500000\n", "progress=end\n",
+                    "[AVIOContext @ 0x2] Statistics: 825000 bytes read, 0 seeks\n",
+                    "[AVIOContext @ 0x1] Statistics: 1000 bytes read, 0 seeks\n",
+                    "Exiting normally, received signal 15.\n"]
+        mock_popen.return_value = FakeProcess(lines, terminate_lines=shutdown)
+        
+        result = get_stream_info_and_bitrate_adaptive('http://test.stream/index.m3u8', duration=30, min_duration=5)
+        
+        self.assertEqual(result['measured_duration'], 5.5)
+        self.assertAlmostEqual(result['bitrate_kbps'], 3026000 * 8 / 1000 / 5.5)
+    
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_hls_without_final_statistics_uses_output_estimate(self, mock_popen):
+        """Segment statistics alone are not taken as the input bytes when ffmpeg does not report on exit."""
+        mock_popen.return_value = FakeProcess(self.hls_progress_output(1100000))
+        
+        result = get_stream_info_and_bitrate_adaptive('http://test.stream/index.m3u8', duration=30, min_duration=5)
+        
+        self.assertAlmostEqual(result['bitrate_kbps'], 4000, delta=1)
+    
+    @patch('stream_check_utils._log_bitrate_detection_failure')
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_converged_duration_used_for_early_exit_check(self, mock_popen, mock_log):
+        """A converged analysis is not reported as an early exit."""
+        mock_popen.return_value = FakeProcess(copy_progress_output([4000.0] * 60))
+        
+        get_stream_info_and_bitrate_adaptive('http://test.stream', duration=30, min_duration=6)
+        
+        self.assertEqual(mock_log.call_args.args[2], 6)
+        self.assertEqual(mock_log.call_args.args[3], 0)
+    
+    @patch('stream_check_utils.get_stream_info_and_bitrate_adaptive')
+    def test_analyze_stream_adaptive(self, mock_adaptive):
+        """analyze_stream uses the adaptive analysis and reports its samples and confidence."""
+        mock_adaptive.return_value = dict(TestFastProbeTier.FULL_RESULT, elapsed_time=6.2, bitrate_samples=12,
+                                          bitrate_confidence=0.98, measured_duration=6.0)
+        
+        result = analyze_stream('http://test.stream', 1, ffmpeg_duration=30, adaptive_duration=True,
+                                adaptive_min_duration=6, adaptive_tolerance=0.03)
+        
+        self.assertEqual(mock_adaptive.call_args.kwargs['duration'], 30)
+        self.assertEqual(mock_adaptive.call_args.kwargs['min_duration'], 6)
+        self.assertEqual(mock_adaptive.call_args.kwargs['tolerance'], 0.03)
+        self.assertEqual(result['bitrate_samples'], 12)
+        self.assertEqual(result['bitrate_confidence'], 0.98)
+        self.assertEqual(result['measured_duration'], 6.0)
+        self.assertEqual(result['tier_timings'], {'analysis': 6.2})
+
+
+class TestNonRealtime(unittest.TestCase):
+    """Test measuring the bitrate at network speed over the media time read."""
+    
+    @patch('stream_check_utils._log_bitrate_detection_failure')
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_bitrate_over_media_time(self, mock_popen, mock_log):
+        """Bytes read are divided by the media time read, not the requested duration."""
+        # The stream ended after 8s of media
+        mock_popen.return_value = FakeProcess(copy_progress_output([4000.0] * 16, end=True, statistics_bytes=5000000))
+        
+        result = get_stream_info_and_bitrate_streaming('http://test.stream', duration=10, realtime=False)
+        
+        self.assertEqual(result['bitrate_kbps'], 5000.0)
+        self.assertEqual(result['measured_duration'], 8.0)
+        self.assertEqual(result['resolution'], '1920x1080')
+        command = mock_popen.call_args.args[0]
+        self.assertNotIn('-re', command)
+        self.assertIn('copy', command)
+        # The early exit check compares the media time read with the duration
+        self.assertEqual(mock_log.call_args.args[1:3], (8.0, 10))
+    
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_realtime_keeps_re(self, mock_popen):
+        """The default streaming analysis still reads at the native rate and decodes."""
+        mock_popen.return_value = FakeProcess(FFMPEG_VERBOSE_OUTPUT)
+        
+        get_stream_info_and_bitrate_streaming('http://test.stream', duration=30)
+        
+        command = mock_popen.call_args.args[0]
+        self.assertEqual(command[:2], ['ffmpeg', '-re'])
+        self.assertNotIn('copy', command)
+    
+    @patch('stream_check_utils.subprocess.run')
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_buffered_functions_delegate(self, mock_popen, mock_run):
+        """get_stream_info_and_bitrate and get_stream_bitrate use the streaming analysis."""
+        mock_popen.side_effect = lambda *args, **kwargs: FakeProcess(
+            copy_progress_output([4000.0] * 20, end=True, statistics_bytes=5000000))
+        
+        result = get_stream_info_and_bitrate('http://test.stream', duration=10, realtime=False)
+        bitrate, status, _ = get_stream_bitrate('http://test.stream', duration=10, realtime=False)
+        
+        mock_run.assert_not_called()
+        self.assertEqual(result['bitrate_kbps'], 4000.0)
+        self.assertEqual((bitrate, status), (4000.0, 'OK'))
+    
+    @patch('stream_check_utils.subprocess.Popen')
+    def test_adaptive_without_realtime(self, mock_popen):
+        """Adaptive analyses can also read at network speed."""
+        mock_popen.return_value = FakeProcess(copy_progress_output([4000.0] * 60))
+        
+        result = get_stream_info_and_bitrate_adaptive('http://test.stream', duration=30, min_duration=5,
+                                                      realtime=False)
+        
+        self.assertNotIn('-re', mock_popen.call_args.args[0])
+        self.assertEqual(result['measured_duration'], 5.0)
+    
+    @patch('stream_check_utils.get_stream_info_and_bitrate_streaming')
+    def test_analyze_stream_passes_realtime(self, mock_streaming):
+        """analyze_stream passes the realtime setting to the analysis."""
+        mock_streaming.return_value = dict(TestFastProbeTier.FULL_RESULT, elapsed_time=3.1, measured_duration=30.0)
+        
+        result = analyze_stream('http://test.stream', 1, streaming_parser=True, realtime=False)
+        
+        self.assertFalse(mock_streaming.call_args.kwargs['realtime'])
+        self.assertEqual(result['measured_duration'], 30.0)
+
+
 if __name__ == '__main__':
     unittest.main()
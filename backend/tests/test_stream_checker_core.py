@@ -5,6 +5,7 @@ Core unit tests for Stream Checker service functionality.
 This module consolidates tests for:
 - Stream stats handling and default values
 - Progress tracking and variable initialization
+- Profile URL transformation in the sequential check
 """
 
 import unittest
@@ -226,5 +227,57 @@ class TestProgressTracking(unittest.TestCase):
                             raise
 
 
+
+class TestSequentialUrlTransformation(unittest.TestCase):
+    """Test that the sequential check transforms stream URLs at check time."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    @patch('stream_checker_service.fetch_channel_streams')
+    @patch('stream_checker_service.get_udi_manager')
+    @patch('stream_checker_service._get_base_url')
+    def test_url_transformed_before_each_check(self, mock_base_url, mock_get_udi, mock_fetch_streams):
+        """Each URL is transformed just before its stream is analyzed, not for all streams up front."""
+        mock_base_url.return_value = "http://test:8000"
+        events = []
+        
+        def transform(stream):
+            events.append(('transform', stream['id']))
+            return stream['url'] + '/free'
+        
+        mock_udi = MagicMock()
+        mock_udi.get_channel_by_id.return_value = {'id': 1, 'name': 'Test Channel'}
+        mock_udi.apply_profile_url_transformation.side_effect = transform
+        mock_get_udi.return_value = mock_udi
+        mock_fetch_streams.return_value = [
+            {'id': 1, 'name': 'Stream 1', 'url': 'http://test1'},
+            {'id': 2, 'name': 'Stream 2', 'url': 'http://test2'},
+        ]
+        
+        def analyze(stream_url, stream, result_cache):
+            events.append(('analyze', stream_url))
+            return {'stream_id': stream['id'], 'stream_name': stream['name'], 'stream_url': stream_url,
+                    'resolution': '1920x1080', 'fps': 30, 'video_codec': 'h264', 'audio_codec': 'aac',
+                    'bitrate_kbps': 5000, 'status': 'OK'}
+        
+        with patch('stream_checker_service.CONFIG_DIR', Path(self.temp_dir)):
+            service = StreamCheckerService()
+            with patch.object(service, '_check_channel_limits', return_value=None), \
+                    patch.object(service, '_analyze_stream_cached', side_effect=analyze), \
+                    patch.object(service, '_update_stream_stats', return_value=True), \
+                    patch('stream_checker_service.update_channel_streams'):
+                service._check_channel_sequential(1)
+        
+        self.assertEqual(events, [('transform', 1), ('analyze', 'http://test1/free'),
+                                  ('transform', 2), ('analyze', 'http://test2/free')])
+
+
 if __name__ == '__main__':
     unittest.main()
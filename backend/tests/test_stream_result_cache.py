@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared stream analysis result cache.
+
+Verifies that:
+- Results are shared by streams with the same URL and keep their own identity
+- Entries expire after the TTL and the least recently used entry is evicted
+- Concurrent checks of one URL run a single analysis (single-flight)
+- The cross-channel scheduler serves duplicate URLs without using a slot
+- The asyncio engine only shares an analysis with checks that resolved its URL
+- Force checks outside a global action bypass the cache
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_check_engine import AsyncCheckEngine
+from concurrent_stream_limiter import AccountStreamLimiter, SmartStreamScheduler
+from stream_result_cache import StreamResultCache
+
+
+def _stream(stream_id, url='http://provider/live/1.ts'):
+    return {'id': stream_id, 'name': f'Stream {stream_id}', 'url': url, 'm3u_account': None}
+
+
+def _result(stream_id, bitrate=5000):
+    return {'stream_id': stream_id, 'stream_name': f'Stream {stream_id}', 'status': 'OK', 'bitrate_kbps': bitrate}
+
+
+class TestStreamResultCache(unittest.TestCase):
+    """Test caching, expiry, eviction and single-flight analysis."""
+
+    def test_result_shared_by_url(self):
+        """A second stream with the same URL gets the cached result under its own ID."""
+        cache = StreamResultCache()
+        cache.get_or_compute('http://a', _stream(1), lambda: _result(1))
+        result = cache.get_or_compute('http://a', _stream(2), lambda: self.fail("analysis should not run"))
+
+        self.assertEqual(result['stream_id'], 2)
+        self.assertEqual(result['stream_name'], 'Stream 2')
+        self.assertEqual(result['bitrate_kbps'], 5000)
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_ttl_expiry(self):
+        """Expired entries are analyzed again."""
+        cache = StreamResultCache(ttl=0.05)
+        cache.get_or_compute('http://a', _stream(1), lambda: _result(1, bitrate=1000))
+        time.sleep(0.1)
+        result = cache.get_or_compute('http://a', _stream(1), lambda: _result(1, bitrate=2000))
+
+        self.assertEqual(result['bitrate_kbps'], 2000)
+        self.assertEqual(cache.get_stats()['expired'], 1)
+
+    def test_lru_eviction(self):
+        """The least recently used URL is evicted when the cache is full."""
+        cache = StreamResultCache(max_entries=2)
+        cache.get_or_compute('http://a', _stream(1), lambda: _result(1))
+        cache.get_or_compute('http://b', _stream(2), lambda: _result(2))
+        cache.lookup('http://a')
+        cache.get_or_compute('http://c', _stream(3), lambda: _result(3))
+
+        self.assertIsNotNone(cache.lookup('http://a')[0])
+        self.assertIsNone(cache.lookup('http://b')[0])
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_single_flight(self):
+        """Concurrent checks of one URL share a single analysis."""
+        cache = StreamResultCache()
+        calls = []
+
+        def analyze():
+            calls.append(1)
+            time.sleep(0.2)
+            return _result(1)
+
+        results = {}
+        threads = [
+            threading.Thread(target=lambda i=i: results.update({i: cache.get_or_compute('http://a', _stream(i), analyze)}))
+            for i in range(1, 6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(r['stream_id'] for r in results.values()), [1, 2, 3, 4, 5])
+        self.assertEqual(cache.get_stats()['shared'], 4)
+
+    def test_failed_analysis_not_cached(self):
+        """An exception reaches all waiting checks and is not cached."""
+        cache = StreamResultCache()
+
+        def fail():
+            raise RuntimeError("ffmpeg crashed")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute('http://a', _stream(1), fail)
+        result = cache.get_or_compute('http://a', _stream(1), lambda: _result(1))
+
+        self.assertEqual(result['status'], 'OK')
+        self.assertEqual(cache.get_stats()['misses'], 2)
+
+    def test_async_single_flight(self):
+        """Coroutine analyses of one URL are shared as well."""
+        cache = StreamResultCache()
+        calls = []
+
+        async def analyze():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return _result(1)
+
+        async def run():
+            return await asyncio.gather(*(
+                cache.get_or_compute_async('http://a', _stream(i), analyze) for i in range(1, 4)
+            ))
+
+        results = asyncio.run(run())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r['stream_id'] for r in results], [1, 2, 3])
+
+
+class TestSchedulerResultSharing(unittest.TestCase):
+    """Test that both check engines analyze each URL once across channels."""
+
+    CHANNELS = {
+        1: [_stream(11, 'http://provider/a.ts'), _stream(12, 'http://provider/b.ts')],
+        2: [_stream(21, 'http://provider/a.ts')],
+        3: [_stream(31, 'http://provider/b.ts'), _stream(32, 'http://provider/a.ts')],
+    }
+
+    def setUp(self):
+        self.analyzed = []
+        self.lock = threading.Lock()
+
+    def _check(self, stream_url, stream_id, stream_name, **kwargs):
+        with self.lock:
+            self.analyzed.append(stream_url)
+        time.sleep(0.1)
+        return _result(stream_id)
+
+    def _assert_shared(self, completed, stats):
+        self.assertEqual(sorted(self.analyzed), ['http://provider/a.ts', 'http://provider/b.ts'])
+        self.assertEqual(completed, {1: [11, 12], 2: [21], 3: [31, 32]})
+        self.assertEqual(stats['checked'], 2)
+        self.assertEqual(stats['shared'], 3)
+
+    def test_thread_scheduler(self):
+        """Duplicate URLs wait for the running analysis instead of starting ffmpeg."""
+        completed = {}
+        stats = SmartStreamScheduler(AccountStreamLimiter(), global_limit=5).check_channels_with_limits(
+            self.CHANNELS,
+            check_function=self._check,
+            on_channel_complete=lambda key, results: completed.update({key: sorted(r['stream_id'] for r in results)}),
+            result_cache=StreamResultCache()
+        )
+
+        self._assert_shared(completed, stats)
+
+    @patch('async_check_engine._get_stream_proxy', return_value=None)
+    def test_async_engine(self, _mock_proxy):
+        """The asyncio engine shares analyses the same way."""
+        async def analyze(stream_url, stream_id, stream_name, **kwargs):
+            self.analyzed.append(stream_url)
+            await asyncio.sleep(0.1)
+            return _result(stream_id)
+
+        completed = {}
+        with patch('async_check_engine.analyze_stream_async', side_effect=analyze):
+            stats = AsyncCheckEngine(AccountStreamLimiter(), global_limit=5).check_channels_with_limits(
+                self.CHANNELS,
+                on_channel_complete=lambda key, results: completed.update(
+                    {key: sorted(r['stream_id'] for r in results)}),
+                result_cache=StreamResultCache()
+            )
+
+        self._assert_shared(completed, stats)
+
+
+    @patch('async_check_engine._get_stream_proxy', return_value=None)
+    def test_async_engine_shares_by_analyzed_url(self, _mock_proxy):
+        """A waiting check does not take an analysis of a URL it did not resolve."""
+        resolved = {}
+
+        def transform(stream):
+            resolved[stream['id']] = resolved.get(stream['id'], 0) + 1
+            if stream['id'] == 21:
+                # Stream 21 starts waiting after stream 11 and stays on profile 1
+                time.sleep(0.05)
+                return stream['url'] + '?profile=1'
+            # Profile 1 is full by the time stream 11 holds its slot
+            return stream['url'] + ('?profile=1' if resolved[11] == 1 else '?profile=2')
+
+        async def analyze(stream_url, stream_id, stream_name, **kwargs):
+            self.analyzed.append(stream_url)
+            await asyncio.sleep(0.1)
+            return dict(_result(stream_id), analyzed_url=stream_url)
+
+        limiter = AccountStreamLimiter()
+        limiter.udi_manager = Mock(apply_profile_url_transformation=Mock(side_effect=transform))
+        completed = {}
+        with patch('async_check_engine.analyze_stream_async', side_effect=analyze):
+            AsyncCheckEngine(limiter, global_limit=5).check_channels_with_limits(
+                {1: [_stream(11, 'http://provider/a.ts')], 2: [_stream(21, 'http://provider/a.ts')]},
+                on_channel_complete=lambda key, results: completed.update({key: results[0]['analyzed_url']}),
+                result_cache=StreamResultCache()
+            )
+
+        self.assertEqual(sorted(self.analyzed), ['http://provider/a.ts?profile=1', 'http://provider/a.ts?profile=2'])
+        self.assertEqual(completed, {1: 'http://provider/a.ts?profile=2', 2: 'http://provider/a.ts?profile=1'})
+
+
+class TestServiceResultCache(unittest.TestCase):
+    """Test when the stream checker service uses the result cache."""
+
+    @patch('stream_checker_service.StreamCheckConfig')
+    def setUp(self, mock_config_class):
+        from stream_checker_service import StreamCheckerService
+
+        mock_config = Mock()
+        mock_config.get = Mock(side_effect=lambda key, default=None: default)
+        mock_config_class.return_value = mock_config
+        self.service = StreamCheckerService()
+
+    def test_force_check_bypasses_cache(self):
+        """Single channel and forced queue checks analyze again; the global action shares results."""
+        self.assertIsNotNone(self.service._get_result_cache())
+        self.assertIsNone(self.service._get_result_cache(force_check=True))
+
+        self.service.global_action_in_progress = True
+        self.assertIsNotNone(self.service._get_result_cache(force_check=True))
+
+    @patch('api_utils.get_stream_proxy', return_value=None)
+    @patch('stream_check_utils.analyze_stream')
+    def test_analyze_stream_cached(self, mock_analyze, _mock_proxy):
+        """The analysis runs once per URL through the cache and on every call without it."""
+        mock_analyze.side_effect = lambda stream_url, stream_id, stream_name, **kwargs: _result(stream_id)
+        cache = StreamResultCache()
+
+        first = self.service._analyze_stream_cached('http://provider/a.ts', _stream(1), cache)
+        second = self.service._analyze_stream_cached('http://provider/a.ts', _stream(2), cache)
+        self.assertEqual((first['stream_id'], second['stream_id']), (1, 2))
+        self.assertEqual(mock_analyze.call_count, 1)
+        self.assertEqual(mock_analyze.call_args.kwargs['user_agent'], 'VLC/3.0.14')
+
+        self.service._analyze_stream_cached('http://provider/a.ts', _stream(3), None)
+        self.assertEqual(mock_analyze.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for batch stream scoring.
+
+Verifies that:
+- Batch scores are bit-identical to _calculate_stream_score() for one channel
+  and for streams of several channels, with and without NumPy
+- The per-component breakdown adds up to the score
+- Each channel's quality preference is looked up once per batch
+"""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONFIG_DIR', tempfile.mkdtemp())
+
+import stream_scoring
+from stream_checker_service import StreamCheckerService
+
+
+ACCOUNTS = {
+    1: {'priority': 10, 'priority_mode': 'all_streams', 'name': 'Provider A'},
+    2: {'priority': 5, 'priority_mode': 'same_resolution', 'name': 'Provider B'},
+    3: {'priority': 0, 'priority_mode': 'disabled', 'name': 'Provider C'},
+}
+
+QUALITY_PREFERENCES = {10: 'default', 11: 'prefer_4k', 12: 'avoid_4k', 13: 'max_1080p', 14: 'max_720p'}
+
+
+def _random_stream(rng, stream_id):
+    """Random analysis result including edge cases (dead, no bitrate, bad values)."""
+    return {
+        'stream_id': stream_id,
+        'bitrate_kbps': rng.choice([0, 0, 350, 1200, 4999.5, 8000, 12000, rng.uniform(1, 20000), 'N/A']),
+        'resolution': rng.choice(['3840x2160', '1920x1080', '1280x720', '720x576', '640x360',
+                                  '0x0', 'N/A', '', 'axb', '1920x', '1920x1080x2']),
+        'fps': rng.choice([0, 23.976, 25, 29.97, 50, 60, 120, rng.uniform(1, 90), 'N/A']),
+        'video_codec': rng.choice(['h264', 'H264', 'avc1', 'hevc', 'h265', 'mpeg2video', 'N/A', '']),
+    }
+
+
+class TestBatchScoring(unittest.TestCase):
+    """Compare batch scoring with the per-stream scoring function."""
+
+    def setUp(self):
+        self.service = StreamCheckerService()
+        self.service.config.config['dead_stream_handling']['min_bitrate_kbps'] = 500
+
+        udi = MagicMock()
+        udi.get_stream_by_id.side_effect = lambda stream_id: {'id': stream_id, 'm3u_account': stream_id % 4 or None}
+        udi.get_m3u_account_scoring_info.side_effect = ACCOUNTS.get
+        udi.get_channel_by_id.return_value = {'channel_group_id': None}
+
+        self.settings = MagicMock()
+        self.settings.get_channel_effective_settings.side_effect = (
+            lambda channel_id, group_id: {'quality_preference': QUALITY_PREFERENCES[channel_id]}
+        )
+
+        for target, value in (('stream_checker_service.get_udi_manager', udi),
+                              ('channel_settings_manager.get_channel_settings_manager', self.settings)):
+            patcher = patch(target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        rng = random.Random(42)
+        self.streams = [_random_stream(rng, stream_id) for stream_id in range(0, 2000)]
+        self.channel_ids = [rng.choice([None, 10, 11, 12, 13, 14]) for _ in self.streams]
+
+    def _assert_identical(self):
+        expected = [
+            self.service._calculate_stream_score(stream, channel_id)
+            for stream, channel_id in zip(self.streams, self.channel_ids)
+        ]
+        self.assertEqual(self.service._calculate_stream_scores(self.streams, self.channel_ids)['score'], expected)
+
+        single_channel = [self.service._calculate_stream_score(stream, 13) for stream in self.streams]
+        self.assertEqual(self.service._calculate_stream_scores(self.streams, 13)['score'], single_channel)
+
+    def test_identical_scores(self):
+        """Batch scores equal the per-stream scores exactly."""
+        self._assert_identical()
+
+    def test_identical_scores_without_numpy(self):
+        """The pure-Python fallback gives the same scores."""
+        with patch.object(stream_scoring, 'np', None):
+            self._assert_identical()
+
+    def test_identical_scores_custom_config(self):
+        """Custom weights, H.264 preference and disabled dead stream handling are applied."""
+        self.service.config.config['scoring']['weights'] = {'bitrate': 0.5, 'resolution': 0.3, 'fps': 0.1, 'codec': 0.1}
+        self.service.config.config['scoring']['prefer_h265'] = False
+        self.service.config.config['dead_stream_handling']['enabled'] = False
+        self._assert_identical()
+
+    def test_missing_resolution_fallback(self):
+        """A stream without resolution key, bitrate 0 and FPS > 0 gets the 0.40 fallback score."""
+        # Alive according to its Dispatcharr stats, so the fallback is reached
+        stats = {'resolution': '1920x1080', 'source_fps': 25, 'ffmpeg_output_bitrate': 3000}
+        self.streams = [
+            {'stream_id': 1, 'bitrate_kbps': 0, 'fps': 25, 'video_codec': 'h264', 'stream_stats': stats},
+            {'stream_id': 2, 'fps': 30, 'stream_stats': stats},
+            {'stream_id': 3, 'bitrate_kbps': 0, 'resolution': 'N/A', 'fps': 25, 'stream_stats': stats},
+        ]
+        self.channel_ids = [None, 10, 11]
+        self._assert_identical()
+        with patch.object(stream_scoring, 'np', None):
+            self._assert_identical()
+
+        self.assertEqual(self.service._calculate_stream_score(self.streams[0], None), 0.40)
+        self.assertEqual(self.service._calculate_stream_scores(self.streams[:2], None)['score'], [0.40, 0.40])
+
+    def test_breakdown(self):
+        """Components are returned per stream and add up to the score."""
+        streams = [
+            {'stream_id': 1, 'bitrate_kbps': 4000, 'resolution': '3840x2160', 'fps': 30, 'video_codec': 'hevc'},
+            {'stream_id': 2, 'bitrate_kbps': 0, 'resolution': '1920x1080', 'fps': 25, 'video_codec': 'h264'},
+        ]
+        result = self.service._calculate_stream_scores(streams, 11)
+
+        self.assertEqual(set(result), {'score', *stream_scoring.SCORE_COMPONENTS})
+        self.assertEqual(result['bitrate'][0], 0.2)
+        self.assertEqual(result['resolution'][0], 0.35)
+        self.assertEqual(result['fps'][0], 0.075)
+        self.assertEqual(result['codec'][0], 0.1)
+        self.assertEqual(result['priority'][0], 5.0)
+        self.assertEqual(result['quality_preference'][0], 0.5)
+        self.assertEqual(result['score'][0], round(sum(result[name][0] for name in stream_scoring.SCORE_COMPONENTS), 2))
+        # Streams without bitrate are dead
+        self.assertEqual(result['score'][1], 0.0)
+
+    def test_quality_preference_looked_up_once_per_channel(self):
+        """Each channel's settings are read once, not once per stream."""
+        self.service._calculate_stream_scores(self.streams, self.channel_ids)
+
+        looked_up = [call.args[0] for call in self.settings.get_channel_effective_settings.call_args_list]
+        self.assertEqual(sorted(looked_up), [10, 11, 12, 13, 14])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batched stream stats write-back queue.
+
+Verifies that:
+- Updates for the same stream are coalesced before the flush
+- Each stream is PATCHed once with stats merged into its existing stats
+- The UDI is updated once per flush, only with successfully written streams
+- Queue depth and flush statistics are reported
+- UDIStorage.update_streams writes a batch in place with one file write
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+# Set up CONFIG_DIR before importing modules
+os.environ.setdefault('CONFIG_DIR', tempfile.mkdtemp())
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream_stats_writer import StreamStatsWriter
+from udi.storage import UDIStorage
+
+
+def _make_udi(streams):
+    udi = Mock()
+    udi.get_stream_by_id.side_effect = lambda stream_id: dict(streams[stream_id]) if stream_id in streams else None
+    return udi
+
+
+@patch('stream_stats_writer._get_base_url', return_value='http://test.com')
+class TestStreamStatsWriter(unittest.TestCase):
+    """Test the StreamStatsWriter flush behaviour."""
+
+    def test_flush_coalesces_and_batches_udi_update(self, _mock_base_url):
+        """Repeated updates are merged and written with one UDI batch."""
+        udi = _make_udi({
+            1: {'id': 1, 'url': 'http://a', 'stream_stats': {'resolution': '1280x720', 'video_codec': 'h264'}},
+            2: {'id': 2, 'url': 'http://b', 'stream_stats': json.dumps({'source_fps': 25})},
+        })
+        writer = StreamStatsWriter(max_workers=4)
+        writer.enqueue(1, {'resolution': '1920x1080'})
+        writer.enqueue(1, {'ffmpeg_output_bitrate': 5000})
+        writer.enqueue(2, {'source_fps': 50})
+        self.assertEqual(writer.pending_count(), 2)
+
+        with patch('stream_stats_writer.get_udi_manager', return_value=udi), \
+             patch('stream_stats_writer.patch_request') as mock_patch:
+            written = writer.flush()
+
+        self.assertEqual(written, 2)
+        payloads = {call.args[0]: call.args[1] for call in mock_patch.call_args_list}
+        self.assertEqual(payloads, {
+            'http://test.com/api/channels/streams/1/': {'stream_stats': {
+                'resolution': '1920x1080', 'video_codec': 'h264', 'ffmpeg_output_bitrate': 5000}},
+            'http://test.com/api/channels/streams/2/': {'stream_stats': {'source_fps': 50}},
+        })
+        udi.update_streams.assert_called_once()
+        udi.update_stream.assert_not_called()
+        updated = {s['id']: s for s in udi.update_streams.call_args.args[0]}
+        self.assertEqual(updated[1]['stream_stats']['ffmpeg_output_bitrate'], 5000)
+        self.assertEqual(updated[2]['url'], 'http://b')
+
+        stats = writer.get_stats()
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['total_flushes'], 1)
+        self.assertEqual(stats['total_written'], 2)
+        self.assertEqual(stats['total_coalesced'], 1)
+        self.assertEqual(stats['last_flush_size'], 2)
+
+    def test_failed_patch_is_not_applied_to_udi(self, _mock_base_url):
+        """Streams whose PATCH fails are left out of the UDI update."""
+        udi = _make_udi({
+            1: {'id': 1, 'stream_stats': {}},
+            2: {'id': 2, 'stream_stats': {}},
+            3: {'id': 3, 'stream_stats': {}},
+        })
+        writer = StreamStatsWriter()
+        for stream_id in (1, 2, 3, 4):
+            writer.enqueue(stream_id, {'resolution': '1920x1080'})
+
+        def fake_patch(url, payload):
+            if url.endswith('/2/'):
+                raise Exception("PATCH failed")
+            return Mock(status_code=200)
+
+        with patch('stream_stats_writer.get_udi_manager', return_value=udi), \
+             patch('stream_stats_writer.patch_request', side_effect=fake_patch):
+            written = writer.flush()
+
+        # Stream 4 is unknown to the UDI and stream 2 failed
+        self.assertEqual(written, 2)
+        self.assertEqual(sorted(s['id'] for s in udi.update_streams.call_args.args[0]), [1, 3])
+        self.assertEqual(writer.get_stats()['total_failed'], 2)
+
+    def test_in_flight_requests_are_bounded(self, _mock_base_url):
+        """No more than max_workers PATCH requests run at the same time."""
+        udi = _make_udi({i: {'id': i, 'stream_stats': {}} for i in range(20)})
+        writer = StreamStatsWriter(max_workers=3)
+        for i in range(20):
+            writer.enqueue(i, {'source_fps': 25})
+
+        lock = threading.Lock()
+        state = {'current': 0, 'peak': 0}
+
+        def slow_patch(url, payload):
+            with lock:
+                state['current'] += 1
+                state['peak'] = max(state['peak'], state['current'])
+            time.sleep(0.01)
+            with lock:
+                state['current'] -= 1
+
+        with patch('stream_stats_writer.get_udi_manager', return_value=udi), \
+             patch('stream_stats_writer.patch_request', side_effect=slow_patch):
+            self.assertEqual(writer.flush(), 20)
+
+        self.assertLessEqual(state['peak'], 3)
+        self.assertGreater(state['peak'], 1)
+        self.assertEqual(writer.get_stats()['in_flight'], 0)
+
+    def test_flush_empty_queue(self, _mock_base_url):
+        """Flushing an empty queue does nothing."""
+        writer = StreamStatsWriter()
+        with patch('stream_stats_writer.patch_request') as mock_patch:
+            self.assertEqual(writer.flush(), 0)
+        mock_patch.assert_not_called()
+        self.assertEqual(writer.get_stats()['total_flushes'], 0)
+
+
+class TestUDIStorageBatchUpdate(unittest.TestCase):
+    """Test batched stream updates in the JSON storage."""
+
+    def test_update_streams_replaces_in_place_and_appends(self):
+        """Existing streams keep their position, unknown streams are appended."""
+        storage = UDIStorage(tempfile.mkdtemp())
+        storage.save_streams([{'id': i, 'name': f'S{i}'} for i in range(5)])
+
+        with patch.object(storage, '_save_json', wraps=storage._save_json) as mock_save:
+            self.assertTrue(storage.update_streams([
+                {'id': 3, 'name': 'S3', 'stream_stats': {'resolution': '1920x1080'}},
+                {'id': 1, 'name': 'S1', 'stream_stats': {'source_fps': 50}},
+                {'id': 9, 'name': 'S9'},
+            ]))
+        self.assertEqual(mock_save.call_count, 1)
+
+        streams = storage.load_streams()
+        self.assertEqual([s['id'] for s in streams], [0, 1, 2, 3, 4, 9])
+        self.assertEqual(streams[3]['stream_stats'], {'resolution': '1920x1080'})
+        self.assertEqual(streams[1]['stream_stats'], {'source_fps': 50})
+
+
+if __name__ == '__main__':
+    unittest.main()
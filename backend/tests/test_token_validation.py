@@ -29,7 +29,7 @@ class TestTokenValidation(unittest.TestCase):
         import shutil
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
-    @patch('api_utils.requests.get')
+    @patch('http_session.DispatcharrSession.get')
     @patch('api_utils.os.getenv')
     def test_validate_token_with_valid_token(self, mock_getenv, mock_get):
         """Test that _validate_token returns True for valid tokens."""
@@ -55,7 +55,7 @@ class TestTokenValidation(unittest.TestCase):
         self.assertIn('Authorization', call_args[1]['headers'])
         self.assertEqual(call_args[1]['headers']['Authorization'], 'Bearer valid_token_123')
     
-    @patch('api_utils.requests.get')
+    @patch('http_session.DispatcharrSession.get')
     @patch('api_utils.os.getenv')
     def test_validate_token_with_invalid_token(self, mock_getenv, mock_get):
         """Test that _validate_token returns False for invalid tokens."""
@@ -74,7 +74,7 @@ class TestTokenValidation(unittest.TestCase):
         result = _validate_token('invalid_token')
         self.assertFalse(result)
     
-    @patch('api_utils.requests.get')
+    @patch('http_session.DispatcharrSession.get')
     @patch('api_utils.os.getenv')
     def test_validate_token_with_connection_error(self, mock_getenv, mock_get):
         """Test that _validate_token returns False on connection error."""
@@ -151,7 +151,7 @@ class TestTokenValidationCaching(unittest.TestCase):
         import api_utils
         api_utils._token_validation_cache.clear()
     
-    @patch('api_utils.requests.get')
+    @patch('http_session.DispatcharrSession.get')
     @patch('api_utils.os.getenv')
     def test_token_validation_cache_prevents_duplicate_api_calls(self, mock_getenv, mock_get):
         """Test that cached token validation prevents redundant API calls."""
@@ -184,7 +184,7 @@ class TestTokenValidationCaching(unittest.TestCase):
         self.assertEqual(mock_get.call_count, 1)  # Still only 1 call
     
     @patch('api_utils.time.time')
-    @patch('api_utils.requests.get')
+    @patch('http_session.DispatcharrSession.get')
     @patch('api_utils.os.getenv')
     def test_token_validation_cache_expires(self, mock_getenv, mock_get, mock_time):
         """Test that token validation cache expires after TTL."""
@@ -220,7 +220,7 @@ class TestTokenValidationCaching(unittest.TestCase):
         self.assertEqual(mock_get.call_count, 2)
     
     @patch('api_utils.time.time')
-    @patch('api_utils.requests.get')
+    @patch('http_session.DispatcharrSession.get')
     @patch('api_utils.os.getenv')
     def test_failed_validation_clears_cache(self, mock_getenv, mock_get, mock_time):
         """Test that failed validation clears the cache."""
@@ -2,9 +2,9 @@
 """
 Test that verifies UDI cache is synced after stream stats updates.
 
-This test ensures that when stream stats are updated via _update_stream_stats,
-the UDI cache is properly updated to reflect the new stats, preventing
-inconsistencies between changelog data and actual Dispatcharr data.
+This test ensures that when stream stats queued via _update_stream_stats are
+written back, the UDI cache is properly updated to reflect the new stats,
+preventing inconsistencies between changelog data and actual Dispatcharr data.
 """
 
 import unittest
@@ -26,9 +26,9 @@ sys.path.insert(0, str(backend_dir))
 class TestUDICacheSyncAfterStatsUpdate(unittest.TestCase):
     """Test that UDI cache is synced after stream stats updates."""
     
-    @patch('stream_checker_service.get_udi_manager')
-    @patch('stream_checker_service.patch_request')
-    @patch('stream_checker_service._get_base_url')
+    @patch('stream_stats_writer.get_udi_manager')
+    @patch('stream_stats_writer.patch_request')
+    @patch('stream_stats_writer._get_base_url')
     def test_udi_cache_updated_after_stats_patch(self, mock_base_url, mock_patch, mock_get_udi):
         """Test that UDI cache is updated after successful stats PATCH."""
         from stream_checker_service import StreamCheckerService
@@ -71,8 +71,9 @@ class TestUDICacheSyncAfterStatsUpdate(unittest.TestCase):
         
         result = service._update_stream_stats(stream_data)
         
-        # Verify the result was successful
-        self.assertTrue(result, "Stats update should succeed")
+        # Verify the update was queued and write it back
+        self.assertTrue(result, "Stats update should be queued")
+        service._flush_stream_stats()
         
         # Verify PATCH was called with merged stats
         mock_patch.assert_called_once()
@@ -89,18 +90,18 @@ class TestUDICacheSyncAfterStatsUpdate(unittest.TestCase):
         self.assertEqual(patch_payload['stream_stats'], expected_stats)
         
         # **CRITICAL CHECK**: Verify UDI cache was updated with the new stats
-        mock_udi.update_stream.assert_called_once()
-        update_call_args = mock_udi.update_stream.call_args
-        updated_stream_id = update_call_args[0][0]
-        updated_stream_data = update_call_args[0][1]
+        mock_udi.update_streams.assert_called_once()
+        updated_streams = mock_udi.update_streams.call_args[0][0]
+        self.assertEqual(len(updated_streams), 1)
+        updated_stream_data = updated_streams[0]
         
-        self.assertEqual(updated_stream_id, 123, "Should update the correct stream ID")
+        self.assertEqual(updated_stream_data['id'], 123, "Should update the correct stream ID")
         self.assertEqual(updated_stream_data['stream_stats'], expected_stats, 
                         "UDI cache should be updated with the new stats")
     
-    @patch('stream_checker_service.get_udi_manager')
-    @patch('stream_checker_service.patch_request')
-    @patch('stream_checker_service._get_base_url')
+    @patch('stream_stats_writer.get_udi_manager')
+    @patch('stream_stats_writer.patch_request')
+    @patch('stream_stats_writer._get_base_url')
     def test_udi_cache_not_updated_on_patch_failure(self, mock_base_url, mock_patch, mock_get_udi):
         """Test that UDI cache is not updated if PATCH fails."""
         from stream_checker_service import StreamCheckerService
@@ -132,17 +133,20 @@ class TestUDICacheSyncAfterStatsUpdate(unittest.TestCase):
             'bitrate_kbps': 5000
         }
         
-        result = service._update_stream_stats(stream_data)
+        self.assertTrue(service._update_stream_stats(stream_data))
+        service._flush_stream_stats()
         
-        # Verify the result was failure
-        self.assertFalse(result, "Stats update should fail when PATCH fails")
+        # Verify the PATCH was attempted and the write counted as failed
+        mock_patch.assert_called_once()
+        self.assertEqual(service.stats_writer.get_stats()['last_flush_size'], 1)
         
         # Verify UDI cache was NOT updated
+        mock_udi.update_streams.assert_not_called()
         mock_udi.update_stream.assert_not_called()
     
-    @patch('stream_checker_service.get_udi_manager')
-    @patch('stream_checker_service.patch_request')
-    @patch('stream_checker_service._get_base_url')
+    @patch('stream_stats_writer.get_udi_manager')
+    @patch('stream_stats_writer.patch_request')
+    @patch('stream_stats_writer._get_base_url')
     def test_udi_cache_handles_json_string_stats(self, mock_base_url, mock_patch, mock_get_udi):
         """Test that UDI cache update works when existing stats are JSON string."""
         from stream_checker_service import StreamCheckerService
@@ -178,13 +182,13 @@ class TestUDICacheSyncAfterStatsUpdate(unittest.TestCase):
         
         result = service._update_stream_stats(stream_data)
         
-        # Verify the result was successful
-        self.assertTrue(result, "Stats update should succeed with JSON string stats")
+        # Verify the update was queued and write it back
+        self.assertTrue(result, "Stats update should be queued with JSON string stats")
+        service._flush_stream_stats()
         
         # Verify UDI cache was updated
-        mock_udi.update_stream.assert_called_once()
-        update_call_args = mock_udi.update_stream.call_args
-        updated_stream_data = update_call_args[0][1]
+        mock_udi.update_streams.assert_called_once()
+        updated_stream_data = mock_udi.update_streams.call_args[0][0][0]
         
         # The updated stats should be a dict (not JSON string)
         self.assertIsInstance(updated_stream_data['stream_stats'], dict,
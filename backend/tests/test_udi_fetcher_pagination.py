@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit tests for concurrent paginated fetching in UDIFetcher.
+
+Verifies that:
+- Remaining pages are derived from the first page's count/next link
+- Items are returned in page order regardless of completion order
+- Serial mode (max_workers=1) and unknown pagination styles follow 'next' links
+- Concurrent 401 responses trigger a single token refresh
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from udi import fetcher as fetcher_module
+from udi.fetcher import UDIFetcher
+from http_session import DispatcharrSession
+
+
+class FakePaginatedAPI:
+    """Serves a list of items with DRF-style page-number or limit/offset pagination."""
+
+    def __init__(self, total, style='page', max_page_size=None):
+        self.items = [{'id': i} for i in range(1, total + 1)]
+        self.style = style
+        self.max_page_size = max_page_size
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url):
+        with self.lock:
+            self.requested.append(url)
+        query = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        base = url.split('?')[0]
+        if self.style == 'page':
+            size = int(query.get('page_size', 100))
+            if self.max_page_size:
+                size = min(size, self.max_page_size)
+            page = int(query.get('page', 1))
+            start = (page - 1) * size
+            has_next = start + size < len(self.items)
+            next_url = f"{base}?page={page + 1}&page_size={size}" if has_next else None
+        else:
+            size = int(query.get('limit', query.get('page_size', 100)))
+            start = int(query.get('offset', 0))
+            has_next = start + size < len(self.items)
+            next_url = f"{base}?limit={size}&offset={start + size}" if has_next else None
+        # Finish later pages first to exercise ordering
+        time.sleep(0.001 * (len(self.items) - start) / max(size, 1))
+        return {'count': len(self.items), 'next': next_url, 'results': self.items[start:start + size]}
+
+
+class TestUDIFetcherPagination(unittest.TestCase):
+    """Test concurrent and serial pagination."""
+
+    def _fetch(self, api, **fetcher_kwargs):
+        fetcher = UDIFetcher(**fetcher_kwargs)
+        with patch.object(fetcher, '_fetch_url', side_effect=api):
+            return fetcher._fetch_paginated('http://test.com/api/channels/streams/')
+
+    def test_concurrent_page_number_pagination(self):
+        """All pages are fetched concurrently and returned in order."""
+        api = FakePaginatedAPI(total=1050)
+        items = self._fetch(api, page_size=100, max_workers=4)
+        self.assertEqual(items, api.items)
+        self.assertEqual(len(api.requested), 11)
+
+    def test_concurrent_offset_pagination(self):
+        """Limit/offset pagination is supported."""
+        api = FakePaginatedAPI(total=250, style='offset')
+        items = self._fetch(api, page_size=50, max_workers=3)
+        self.assertEqual(items, api.items)
+        self.assertEqual(len(api.requested), 5)
+
+    def test_server_capped_page_size(self):
+        """Page count is derived from the size of the first page, not the request."""
+        api = FakePaginatedAPI(total=95, max_page_size=10)
+        items = self._fetch(api, page_size=100, max_workers=4)
+        self.assertEqual(items, api.items)
+
+    def test_serial_mode_follows_next_links(self):
+        """max_workers=1 keeps the original serial behavior."""
+        api = FakePaginatedAPI(total=350)
+        items = self._fetch(api, page_size=100, max_workers=1)
+        self.assertEqual(items, api.items)
+        self.assertEqual(len(api.requested), 4)
+
+    def test_single_page_and_list_responses(self):
+        """Single pages and non-paginated list responses are returned as-is."""
+        api = FakePaginatedAPI(total=20)
+        self.assertEqual(self._fetch(api, page_size=100, max_workers=4), api.items)
+
+        fetcher = UDIFetcher(max_workers=4)
+        with patch.object(fetcher, '_fetch_url', return_value=[{'id': 1}, {'id': 2}]):
+            self.assertEqual(fetcher._fetch_paginated('http://test.com/api/x/'), [{'id': 1}, {'id': 2}])
+
+    def test_failed_page_stops_pagination(self):
+        """A failed page returns the items fetched before it, like serial mode."""
+        api = FakePaginatedAPI(total=500)
+
+        def flaky(url):
+            if 'page=3' in url:
+                return None
+            return api(url)
+
+        fetcher = UDIFetcher(page_size=100, max_workers=4)
+        with patch.object(fetcher, '_fetch_url', side_effect=flaky):
+            items = fetcher._fetch_paginated('http://test.com/api/channels/streams/')
+        self.assertEqual(items, api.items[:200])
+
+    def test_refresh_all_keeps_entity_keys(self):
+        """refresh_all fetches entity types concurrently into the same result structure."""
+        fetcher = UDIFetcher(max_workers=4)
+        names = ['channels', 'streams', 'channel_groups', 'logos', 'm3u_accounts', 'channel_profiles']
+        patches = [patch.object(fetcher, f'fetch_{name}', return_value=[{'id': i}])
+                   for i, name in enumerate(names)]
+        for p in patches:
+            p.start()
+        try:
+            data = fetcher.refresh_all()
+        finally:
+            for p in patches:
+                p.stop()
+        self.assertEqual(list(data.keys()), names)
+        for i, name in enumerate(names):
+            self.assertEqual(data[name], [{'id': i}])
+
+
+class TestConcurrentTokenRefresh(unittest.TestCase):
+    """Test that concurrent 401 responses only refresh the token once."""
+
+    def test_single_refresh_for_concurrent_401(self):
+        """Only the first request to see a 401 logs in again."""
+        tokens = {'current': 'old'}
+        refresh_calls = []
+
+        def fake_refresh():
+            refresh_calls.append(1)
+            time.sleep(0.05)
+            tokens['current'] = 'new'
+            return True
+
+        def fake_request(method, url, headers=None, timeout=None):
+            response = Mock()
+            if headers['Authorization'] == 'Bearer old':
+                response.status_code = 401
+                error = requests.exceptions.HTTPError(response=response)
+                response.raise_for_status.side_effect = error
+            else:
+                response.status_code = 200
+                response.raise_for_status.return_value = None
+                response.json.return_value = {'ok': True}
+            return response
+
+        def fake_headers():
+            return {'Authorization': f"Bearer {tokens['current']}"}
+
+        with patch.object(fetcher_module, '_refresh_token', side_effect=fake_refresh), \
+             patch.object(fetcher_module, '_get_auth_headers', side_effect=fake_headers), \
+             patch.object(fetcher_module.os, 'getenv', side_effect=lambda key, default=None: tokens['current']), \
+             patch.object(DispatcharrSession, 'request', side_effect=fake_request):
+            fetcher = UDIFetcher(max_workers=4)
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(fetcher._fetch_url('http://test.com/x')))
+                       for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(results, [{'ok': True}] * 4)
+        self.assertEqual(len(refresh_calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the UDI ID indexes of M3U accounts, logos and channel groups and
+the precomputed M3U account scoring table.
+
+Verifies that:
+- Accounts, logos and groups are looked up by ID without scanning the caches
+- Indexes follow refreshes that replace the cached lists
+- The scoring table is rebuilt only when accounts or the priority config change
+- Stream scoring uses the scoring table instead of copied account dicts
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from m3u_priority_config import M3UPriorityConfig
+from udi.manager import UDIManager
+
+
+class TestUDIIdIndexes(unittest.TestCase):
+    """Test ID-indexed lookups and the scoring table."""
+
+    def setUp(self):
+        with patch.dict(os.environ, {'CONFIG_DIR': tempfile.mkdtemp()}):
+            self.priority_config = M3UPriorityConfig()
+        patcher = patch('udi.manager.get_m3u_priority_config', return_value=self.priority_config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.manager = UDIManager()
+        self.manager._initialized = True
+        self.manager._m3u_accounts_cache = [
+            {'id': 1, 'name': 'Provider A', 'priority': 10},
+            {'id': 2, 'name': 'Provider B', 'priority': 0},
+        ]
+        self.manager._logos_cache = [{'id': 7, 'name': 'Logo 7'}]
+        self.manager._channel_groups_cache = [{'id': 3, 'name': 'Sports', 'channel_count': 4}]
+        self.manager._build_indexes()
+
+    def test_lookups_by_id(self):
+        """Logos, groups and accounts are found through the indexes."""
+        self.assertEqual(self.manager.get_logo_by_id(7)['name'], 'Logo 7')
+        self.assertIsNone(self.manager.get_logo_by_id(8))
+        self.assertEqual(self.manager.get_channel_group_by_id(3)['name'], 'Sports')
+
+        account = self.manager.get_m3u_account_by_id(1)
+        self.assertEqual(account['name'], 'Provider A')
+        self.assertEqual(account['priority_mode'], 'disabled')
+        # The public lookup still returns a copy
+        self.assertNotIn('priority_mode', self.manager._m3u_accounts_cache[0])
+
+    def test_index_follows_replaced_cache(self):
+        """Replacing a cached list (e.g. by a refresh) rebuilds its index."""
+        self.manager._m3u_accounts_cache = [{'id': 5, 'name': 'Provider E', 'priority': 1}]
+
+        self.assertIsNone(self.manager.get_m3u_account_by_id(1))
+        self.assertEqual(self.manager.get_m3u_account_scoring_info(5)['name'], 'Provider E')
+
+    def test_scoring_table_rebuilt_on_priority_change(self):
+        """The scoring table is cached until the priority configuration changes."""
+        table = self.manager.get_m3u_account_scoring_table()
+        self.assertIs(self.manager.get_m3u_account_scoring_table(), table)
+        self.assertEqual(table[1], {'priority': 10, 'priority_mode': 'disabled', 'name': 'Provider A'})
+
+        self.priority_config.set_priority_mode(1, 'all_streams')
+
+        self.assertEqual(self.manager.get_m3u_account_scoring_info(1)['priority_mode'], 'all_streams')
+        self.assertEqual(self.manager.get_m3u_accounts()[0]['priority_mode'], 'all_streams')
+
+    def test_scoring_uses_table(self):
+        """Scoring a large channel reads the scoring table, not copied account dicts."""
+        os.environ.setdefault('CONFIG_DIR', tempfile.mkdtemp())
+        from stream_checker_service import StreamCheckerService
+
+        self.priority_config.set_priority_mode(1, 'all_streams')
+        self.manager._streams_cache = [{'id': i, 'm3u_account': 1 if i % 2 else 2} for i in range(1, 501)]
+        self.manager._build_indexes()
+        service = StreamCheckerService()
+
+        with patch('stream_checker_service.get_udi_manager', return_value=self.manager), \
+                patch.object(self.manager, 'get_m3u_account_by_id') as mock_lookup:
+            scores = [
+                service._calculate_stream_score({
+                    'stream_id': i, 'bitrate_kbps': 4000, 'resolution': '1920x1080',
+                    'fps': 25, 'video_codec': 'h264'
+                })
+                for i in range(1, 501)
+            ]
+
+        mock_lookup.assert_not_called()
+        # Account 1 streams get the all_streams boost of priority * 0.5
+        self.assertEqual(round(scores[0] - scores[1], 2), 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
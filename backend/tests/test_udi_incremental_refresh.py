@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental (delta) UDI refresh.
+
+Verifies that:
+- Pages are revalidated with If-None-Match and 304 responses reuse the previous page
+- Pages without ETag are detected as unchanged by their content hash
+- A failed page fails the whole delta fetch instead of looking like removals
+- A full fetch drops the page state of the last delta fetch
+- refresh_streams(incremental=True) patches the caches and indexes in place
+  and reports added, changed and removed IDs
+- Nothing is written to storage when nothing changed
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+# Set up CONFIG_DIR before importing UDI modules
+os.environ.setdefault('CONFIG_DIR', tempfile.mkdtemp())
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from udi.fetcher import UDIFetcher
+from udi.manager import UDIManager
+from udi.storage import UDIStorage
+
+
+class FakeConditionalAPI:
+    """Serves paginated items, optionally with ETags and 304 responses."""
+
+    def __init__(self, items, page_size=2, etags=True):
+        self.items = items
+        self.page_size = page_size
+        self.etags = etags
+        self.fail_page = None
+        self.statuses = []
+
+    def __call__(self, method, url, get_headers, refresh_token, **kwargs):
+        headers = get_headers()
+        query = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        page = int(query.get('page', 1))
+        if page == self.fail_page:
+            self.statuses.append(500)
+            resp = Mock(status_code=500, headers={})
+            resp.raise_for_status.side_effect = requests.exceptions.HTTPError("500 Server Error")
+            return resp
+
+        start = (page - 1) * self.page_size
+        has_next = start + self.page_size < len(self.items)
+        base = url.split('?')[0]
+        body = json.dumps({
+            'count': len(self.items),
+            'next': f"{base}?page={page + 1}&page_size={self.page_size}" if has_next else None,
+            'results': self.items[start:start + self.page_size],
+        }).encode()
+        etag = f'"{hash(body)}"'
+
+        resp = Mock(headers={'ETag': etag} if self.etags else {})
+        if self.etags and headers.get('If-None-Match') == etag:
+            resp.status_code = 304
+        else:
+            resp.status_code = 200
+            resp.content = body
+            resp.json.return_value = json.loads(body)
+        self.statuses.append(resp.status_code)
+        return resp
+
+
+def _streams(count):
+    return [{'id': i, 'name': f'Stream {i}', 'url': f'http://s/{i}'} for i in range(1, count + 1)]
+
+
+@patch('udi.fetcher._get_auth_headers', return_value={'Authorization': 'Bearer test'})
+class TestUDIFetcherDelta(unittest.TestCase):
+    """Test conditional page fetching."""
+
+    def _fetch(self, fetcher, api):
+        with patch('udi.fetcher.send_with_auth', side_effect=api):
+            return fetcher._fetch_paginated_delta('http://test.com/api/channels/streams/')
+
+    def test_etag_revalidation(self, _mock_headers):
+        """Unchanged pages are answered with 304 and reuse the previous data."""
+        api = FakeConditionalAPI(_streams(5), page_size=2)
+        fetcher = UDIFetcher(page_size=2, max_workers=2)
+
+        items, unchanged = self._fetch(fetcher, api)
+        self.assertEqual(items, api.items)
+        self.assertEqual(unchanged, set())
+
+        api.items[4] = {'id': 5, 'name': 'Renamed', 'url': 'http://s/5'}
+        api.statuses = []
+        items, unchanged = self._fetch(fetcher, api)
+        self.assertEqual(items, api.items)
+        self.assertEqual(unchanged, {1, 2, 3, 4})
+        self.assertEqual(sorted(api.statuses), [200, 304, 304])
+
+    def test_content_hash_without_etag(self, _mock_headers):
+        """Without ETags, pages with identical content are detected by hash."""
+        api = FakeConditionalAPI(_streams(4), page_size=2, etags=False)
+        fetcher = UDIFetcher(page_size=2, max_workers=1)
+
+        self._fetch(fetcher, api)
+        api.items[0] = {'id': 1, 'name': 'Renamed', 'url': 'http://s/1'}
+        items, unchanged = self._fetch(fetcher, api)
+        self.assertEqual(items, api.items)
+        self.assertEqual(unchanged, {3, 4})
+
+    def test_failed_page_fails_fetch(self, _mock_headers):
+        """A failed page returns None instead of a partial list."""
+        api = FakeConditionalAPI(_streams(6), page_size=2)
+        api.fail_page = 2
+        fetcher = UDIFetcher(page_size=2, max_workers=2)
+        self.assertIsNone(self._fetch(fetcher, api))
+
+    def test_full_fetch_resets_page_state(self, _mock_headers):
+        """After a full fetch, the next delta fetch revalidates no page against stale state."""
+        api = FakeConditionalAPI(_streams(4), page_size=2)
+        fetcher = UDIFetcher(page_size=2, max_workers=1)
+        self._fetch(fetcher, api)
+
+        with patch('udi.fetcher.send_with_auth', side_effect=api):
+            self.assertEqual(fetcher._fetch_paginated('http://test.com/api/channels/streams/'), api.items)
+        api.statuses = []
+        items, unchanged = self._fetch(fetcher, api)
+        self.assertEqual(items, api.items)
+        self.assertEqual(unchanged, set())
+        self.assertEqual(api.statuses, [200, 200])
+
+
+class TestUDIManagerIncrementalRefresh(unittest.TestCase):
+    """Test applying a delta to the UDI caches."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = UDIManager()
+        self.manager.storage = UDIStorage(storage_dir=Path(self.temp_dir) / 'udi')
+        self.manager.fetcher = Mock()
+        self.manager.fetcher.fetch_streams.return_value = _streams(4)
+        self.assertTrue(self.manager.refresh_streams())
+
+    def test_incremental_refresh_patches_indexes(self):
+        """Added, changed and removed streams are applied in place."""
+        streams_by_id = self.manager._streams_by_id
+        unchanged_stream = streams_by_id[1]
+        fetched = [
+            {'id': 1, 'name': 'Stream 1', 'url': 'http://s/1'},
+            {'id': 2, 'name': 'Stream 2', 'url': 'http://s/2-new'},
+            {'id': 4, 'name': 'Stream 4 HD', 'url': 'http://s/4'},
+            {'id': 5, 'name': 'Stream 5', 'url': 'http://s/5'},
+        ]
+        self.manager.fetcher.fetch_streams_delta.return_value = (fetched, set())
+
+        self.assertTrue(self.manager.refresh_streams(incremental=True))
+
+        delta = self.manager.get_last_refresh_delta('streams')
+        self.assertEqual(delta, {'added': [5], 'changed': [2, 4], 'removed': [3]})
+        # Indexes are patched, not rebuilt
+        self.assertIs(self.manager._streams_by_id, streams_by_id)
+        self.assertIs(self.manager.get_stream_by_id(1), unchanged_stream)
+        self.assertIsNone(self.manager.get_stream_by_id(3))
+        self.assertIsNone(self.manager.get_stream_by_url('http://s/2'))
+        self.assertIsNone(self.manager.get_stream_by_url('http://s/3'))
+        self.assertEqual(self.manager.get_stream_by_url('http://s/2-new')['id'], 2)
+        self.assertEqual(self.manager.get_valid_stream_ids(), {1, 2, 4, 5})
+        self.assertEqual([s['id'] for s in self.manager.get_streams()], [1, 2, 4, 5])
+        self.assertEqual(self.manager.storage.load_streams(), fetched)
+
+    def test_unchanged_refresh_skips_storage(self):
+        """An empty delta does not rewrite storage."""
+        self.manager.fetcher.fetch_streams_delta.return_value = (_streams(4), {1, 2, 3, 4})
+        with patch.object(self.manager.storage, 'save_streams') as mock_save:
+            self.assertTrue(self.manager.refresh_streams(incremental=True))
+        mock_save.assert_not_called()
+        self.assertEqual(self.manager.get_last_refresh_delta('streams'),
+                         {'added': [], 'changed': [], 'removed': []})
+
+    def test_failed_delta_fetch_keeps_cache(self):
+        """A failed delta fetch leaves the cached streams untouched."""
+        self.manager.fetcher.fetch_streams_delta.return_value = None
+        self.assertFalse(self.manager.refresh_streams(incremental=True))
+        self.assertEqual(self.manager.get_valid_stream_ids(), {1, 2, 3, 4})
+
+    @patch('udi.manager.get_dispatcharr_config')
+    def test_incremental_channel_refresh(self, mock_config):
+        """Channels are diffed the same way; a full refresh clears the delta."""
+        mock_config.return_value.is_configured.return_value = True
+        self.manager.fetcher.fetch_channels.return_value = [{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}]
+        self.assertTrue(self.manager.refresh_channels())
+        self.assertIsNone(self.manager.get_last_refresh_delta('channels'))
+
+        self.manager.fetcher.fetch_channels_delta.return_value = ([{'id': 2, 'name': 'B2'}], set())
+        self.assertTrue(self.manager.refresh_channels(incremental=True))
+        self.assertEqual(self.manager.get_last_refresh_delta('channels'),
+                         {'added': [], 'changed': [2], 'removed': [1]})
+        self.assertIsNone(self.manager.get_channel_by_id(1, fetch_if_missing=False))
+        self.assertEqual(self.manager.get_channel_by_id(2)['name'], 'B2')
+
+
+if __name__ == '__main__':
+    unittest.main()
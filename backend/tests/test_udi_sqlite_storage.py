@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite UDI storage backend.
+
+Verifies that:
+- Records round-trip in their original order
+- Single-record and batch updates are upserts by ID
+- Profile channels and metadata are stored like the JSON backend
+- Existing JSON storage is migrated once on first use
+- create_udi_storage() selects the configured backend
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from udi.storage import UDIStorage, create_udi_storage
+from udi.sqlite_storage import UDISQLiteStorage
+
+
+class TestUDISQLiteStorage(unittest.TestCase):
+    """Test the SQLite storage backend."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = UDISQLiteStorage(self.temp_dir)
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_empty_storage(self):
+        """A new database is empty and not initialized."""
+        self.assertFalse(self.storage.is_initialized())
+        self.assertEqual(self.storage.load_streams(), [])
+        self.assertEqual(self.storage.load_profile_channels(), {})
+        self.assertEqual(self.storage.load_metadata(), {})
+        self.assertIsNone(self.storage.get_stream_by_id(1))
+
+    def test_save_and_load_preserves_order(self):
+        """Saved records load back in their original order."""
+        streams = [{'id': i, 'name': f'Stream {i}', 'url': f'http://s/{i}'} for i in (5, 3, 9, 1)]
+        self.assertTrue(self.storage.save_streams(streams))
+        self.assertTrue(self.storage.is_initialized())
+        self.assertEqual(self.storage.load_streams(), streams)
+        self.assertIsNotNone(self.storage.get_last_updated('streams'))
+
+        # Saving again replaces the previous data
+        self.assertTrue(self.storage.save_streams(streams[:2]))
+        self.assertEqual(self.storage.load_streams(), streams[:2])
+
+    def test_update_is_upsert(self):
+        """Updates replace records in place and append unknown ones."""
+        self.storage.save_channels([{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}])
+        self.assertTrue(self.storage.update_channel(1, {'id': 1, 'name': 'A2'}))
+        self.assertTrue(self.storage.update_channel(7, {'id': 7, 'name': 'G'}))
+        self.assertEqual([c['name'] for c in self.storage.load_channels()], ['A2', 'B', 'G'])
+        self.assertEqual(self.storage.get_channel_by_id(7), {'id': 7, 'name': 'G'})
+
+        self.storage.save_streams([{'id': i, 'stream_stats': {}} for i in range(4)])
+        self.assertTrue(self.storage.update_stream(2, {'id': 2, 'stream_stats': {'source_fps': 50}}))
+        self.assertTrue(self.storage.update_streams([
+            {'id': 0, 'stream_stats': {'resolution': '1920x1080'}},
+            {'id': 8, 'stream_stats': {}},
+        ]))
+        streams = self.storage.load_streams()
+        self.assertEqual([s['id'] for s in streams], [0, 1, 2, 3, 8])
+        self.assertEqual(streams[0]['stream_stats'], {'resolution': '1920x1080'})
+        self.assertEqual(self.storage.get_stream_by_id(2)['stream_stats'], {'source_fps': 50})
+
+    def test_profile_channels_and_metadata(self):
+        """Profile channels are keyed by integer profile ID; metadata round-trips."""
+        self.storage.save_profile_channels({1: {'channels': [1, 2]}, 2: {'channels': []}})
+        self.storage.save_profile_channels_by_id(2, {'channels': [3]})
+        self.assertEqual(self.storage.load_profile_channels(), {1: {'channels': [1, 2]}, 2: {'channels': [3]}})
+        self.assertEqual(self.storage.load_profile_channels_by_id(2), {'channels': [3]})
+        self.assertIsNone(self.storage.load_profile_channels_by_id(9))
+
+        metadata = {'last_full_refresh': '2024-01-01T00:00:00', 'version': '1.0.0'}
+        self.assertTrue(self.storage.save_metadata(metadata))
+        self.assertEqual(self.storage.load_metadata(), metadata)
+
+    def test_data_persists_across_instances(self):
+        """Data written by one instance is visible to the next."""
+        self.storage.save_logos([{'id': 4, 'name': 'Logo'}])
+        self.storage.close()
+        self.storage = UDISQLiteStorage(self.temp_dir)
+        self.assertEqual(self.storage.get_logo_by_id(4), {'id': 4, 'name': 'Logo'})
+
+    def test_clear_all(self):
+        """clear_all removes all records and metadata."""
+        self.storage.save_streams([{'id': 1}])
+        self.assertTrue(self.storage.clear_all())
+        self.assertFalse(self.storage.is_initialized())
+        self.assertEqual(self.storage.load_metadata(), {})
+
+
+class TestUDISQLiteMigration(unittest.TestCase):
+    """Test the one-time migration from JSON storage."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_migrates_json_storage_once(self):
+        """Existing JSON files are imported on first use only."""
+        json_storage = UDIStorage(self.temp_dir)
+        channels = [{'id': 2, 'name': 'B'}, {'id': 1, 'name': 'A'}]
+        streams = [{'id': 10, 'url': 'http://x'}]
+        json_storage.save_channels(channels)
+        json_storage.save_streams(streams)
+        json_storage.save_m3u_accounts([{'id': 1, 'name': 'Account'}])
+        json_storage.save_profile_channels({3: {'channels': [1]}})
+
+        storage = UDISQLiteStorage(self.temp_dir)
+        try:
+            self.assertEqual(storage.load_channels(), channels)
+            self.assertEqual(storage.load_streams(), streams)
+            self.assertEqual(storage.load_profile_channels(), {3: {'channels': [1]}})
+            metadata = storage.load_metadata()
+            self.assertIn('migrated_from_json', metadata)
+            self.assertIn('channels_last_updated', metadata)
+
+            storage.update_stream(10, {'id': 10, 'url': 'http://y'})
+        finally:
+            storage.close()
+
+        # A second start does not re-import the (stale) JSON data
+        storage = UDISQLiteStorage(self.temp_dir)
+        try:
+            self.assertEqual(storage.get_stream_by_id(10)['url'], 'http://y')
+        finally:
+            storage.close()
+
+    def test_create_udi_storage_backend_selection(self):
+        """The factory returns the requested backend, JSON by default."""
+        self.assertIsInstance(create_udi_storage('json', self.temp_dir), UDIStorage)
+        self.assertIsInstance(create_udi_storage('unknown', self.temp_dir), UDIStorage)
+        storage = create_udi_storage('sqlite', self.temp_dir)
+        try:
+            self.assertIsInstance(storage, UDISQLiteStorage)
+        finally:
+            storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
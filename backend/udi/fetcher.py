@@ -8,13 +8,19 @@ import os
 import sys
 import time
 import json
-from typing import Dict, List, Optional, Any
+import math
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Set, Tuple
+from urllib.parse import urlparse, parse_qs, urlencode
 import requests
 from pathlib import Path
 from dotenv import load_dotenv, set_key
 
 from logging_config import setup_logging, log_api_request, log_api_response
 
+from http_session import get_http_session, send_with_auth
+
 # Import Dispatcharr configuration manager
 from dispatcharr_config import get_dispatcharr_config
 
@@ -32,6 +38,11 @@ _token_validation_cache: Dict[str, float] = {}
 # Default TTL for token validation cache (in seconds)
 TOKEN_VALIDATION_TTL = int(os.getenv("TOKEN_VALIDATION_TTL", "60"))
 
+# Page size requested from paginated Dispatcharr endpoints
+UDI_FETCH_PAGE_SIZE = int(os.getenv("UDI_FETCH_PAGE_SIZE", "100"))
+# Maximum concurrent page requests per paginated endpoint (1 = fetch pages serially)
+UDI_FETCH_WORKERS = int(os.getenv("UDI_FETCH_WORKERS", "4"))
+
 
 def _get_base_url() -> Optional[str]:
     """Get the base URL from configuration.
@@ -84,7 +95,7 @@ def _validate_token(token: str) -> bool:
         }
         log_api_request(logger, "GET", test_url, params={'page_size': 1})
         start_time = time.time()
-        resp = requests.get(test_url, headers=headers, timeout=5, params={'page_size': 1})
+        resp = get_http_session().get(test_url, headers=headers, timeout=5, params={'page_size': 1})
         elapsed = time.time() - start_time
         log_api_response(logger, "GET", test_url, resp.status_code, elapsed)
         
@@ -138,7 +149,7 @@ def _login() -> bool:
     logger.info(f"Attempting to log in to {base_url}...")
 
     try:
-        resp = requests.post(
+        resp = get_http_session().post(
             login_url,
             headers={"Content-Type": "application/json"},
             json={"username": username, "password": password},
@@ -233,9 +244,19 @@ def _refresh_token() -> bool:
 class UDIFetcher:
     """Fetches data from the Dispatcharr API for the UDI system."""
     
-    def __init__(self):
-        """Initialize the UDI fetcher."""
+    def __init__(self, page_size: Optional[int] = None, max_workers: Optional[int] = None):
+        """Initialize the UDI fetcher.
+        
+        Args:
+            page_size: Items per page for paginated endpoints (default: UDI_FETCH_PAGE_SIZE)
+            max_workers: Concurrent page requests per endpoint; 1 fetches pages
+                         serially by following 'next' links (default: UDI_FETCH_WORKERS)
+        """
         self.base_url = _get_base_url()
+        self.page_size = max(1, page_size or UDI_FETCH_PAGE_SIZE)
+        self.max_workers = max(1, max_workers or UDI_FETCH_WORKERS)
+        # Per-endpoint page state of the last delta fetch: {base_url: {page_url: state}}
+        self._page_state: Dict[str, Dict[str, Dict[str, Any]]] = {}
     
     def _fetch_url(self, url: str) -> Optional[Any]:
         """Fetch data from a URL with authentication and retry logic.
@@ -249,46 +270,62 @@ class UDIFetcher:
         try:
             start_time = time.time()
             log_api_request(logger, "GET", url)
-            resp = requests.get(url, headers=_get_auth_headers(), timeout=30)
+            resp = send_with_auth("GET", url, _get_auth_headers, _refresh_token, timeout=30)
             elapsed = time.time() - start_time
             log_api_response(logger, "GET", url, resp.status_code, elapsed)
             
             resp.raise_for_status()
             return resp.json()
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                if _refresh_token():
-                    logger.info("Retrying request with new token...")
-                    resp = requests.get(url, headers=_get_auth_headers(), timeout=30)
-                    resp.raise_for_status()
-                    return resp.json()
-            logger.error(f"Error fetching {url}: {e}")
-            return None
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
-    def _fetch_paginated(self, base_url: str, page_size: int = 100) -> List[Dict[str, Any]]:
+    def _fetch_paginated(self, base_url: str, page_size: Optional[int] = None) -> List[Dict[str, Any]]:
         """Fetch paginated data from an API endpoint.
         
+        The first page is fetched to learn the total 'count'. When concurrent
+        fetching is enabled (max_workers > 1), the URLs of the remaining pages
+        are derived from the first page's 'next' link and fetched in a bounded
+        thread pool. Pages are always assembled in page order, so the result is
+        the same as following the 'next' links one by one.
+        
+        A full fetch replaces the cached data of the endpoint, so the page
+        state of its last delta fetch is dropped and the next delta fetch
+        compares every page again.
+        
         Args:
             base_url: The base URL for the endpoint
-            page_size: Number of items per page
+            page_size: Number of items per page (default: self.page_size)
             
         Returns:
             List of all items from all pages
         """
-        all_items: List[Dict[str, Any]] = []
-        url = f"{base_url}?page_size={page_size}"
+        self._page_state.pop(base_url, None)
+        page_size = page_size or self.page_size
+        response = self._fetch_url(f"{base_url}?page_size={page_size}")
+        if not response:
+            return []
+        
+        if not (isinstance(response, dict) and 'results' in response):
+            return list(response) if isinstance(response, list) else []
+        
+        all_items: List[Dict[str, Any]] = list(response.get('results', []))
+        next_url = response.get('next')
         
-        while url:
-            response = self._fetch_url(url)
+        if next_url and self.max_workers > 1:
+            page_urls = self._build_page_urls(next_url, response.get('count'), len(all_items))
+            if page_urls:
+                next_url = self._fetch_pages_concurrently(page_urls, all_items)
+        
+        # Serial mode, or fallback for pagination styles we cannot predict
+        while next_url:
+            response = self._fetch_url(next_url)
             if not response:
                 break
             
             if isinstance(response, dict) and 'results' in response:
                 all_items.extend(response.get('results', []))
-                url = response.get('next')
+                next_url = response.get('next')
             else:
                 if isinstance(response, list):
                     all_items.extend(response)
@@ -296,6 +333,185 @@ class UDIFetcher:
         
         return all_items
     
+    def _build_page_urls(self, next_url: str, count: Any, first_page_size: int) -> Optional[List[str]]:
+        """Derive the URLs of all remaining pages from the first 'next' link.
+        
+        Supports page-number ('page=N') and limit/offset ('offset=N') pagination.
+        The effective page size is taken from the first page, since the server
+        may cap the requested page_size.
+        
+        Args:
+            next_url: The 'next' link of the first page
+            count: Total item count reported by the first page
+            first_page_size: Number of items on the first page
+            
+        Returns:
+            Ordered list of page URLs, or None if they cannot be derived
+        """
+        if not isinstance(count, int) or first_page_size <= 0:
+            return None
+        
+        parsed = urlparse(next_url)
+        query = parse_qs(parsed.query, keep_blank_values=True)
+        
+        def with_param(name: str, value: int) -> str:
+            query[name] = [str(value)]
+            return parsed._replace(query=urlencode(query, doseq=True)).geturl()
+        
+        try:
+            if 'page' in query:
+                first_page = int(query['page'][0])
+                total_pages = math.ceil(count / first_page_size)
+                return [with_param('page', page) for page in range(first_page, total_pages + 1)]
+            if 'offset' in query:
+                first_offset = int(query['offset'][0])
+                return [with_param('offset', offset) for offset in range(first_offset, count, first_page_size)]
+        except (ValueError, IndexError):
+            pass
+        
+        return None
+    
+    def _fetch_pages_concurrently(self, page_urls: List[str], all_items: List[Dict[str, Any]]) -> Optional[str]:
+        """Fetch pages in a bounded thread pool and append their items in page order.
+        
+        Args:
+            page_urls: Ordered list of page URLs to fetch
+            all_items: List to extend with the items of each page
+            
+        Returns:
+            The 'next' link to continue from serially (e.g. if items were added
+            while fetching, or a page failed), or None when all data was fetched
+        """
+        workers = min(self.max_workers, len(page_urls))
+        logger.debug(f"Fetching {len(page_urls)} pages with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="udi-page") as executor:
+            responses = list(executor.map(self._fetch_url, page_urls))
+        
+        for url, response in zip(page_urls, responses):
+            if not (isinstance(response, dict) and 'results' in response):
+                logger.warning(f"Page fetch failed for {url}, stopping pagination")
+                return None
+            all_items.extend(response.get('results', []))
+        
+        return responses[-1].get('next') if responses else None
+    
+    def _fetch_page_conditional(self, url: str, previous: Optional[Dict[str, Any]]) -> Optional[Tuple[Any, bool, Dict[str, Any]]]:
+        """Fetch a page and tell whether it changed since the previous fetch.
+        
+        If the previous response carried an ETag, the request is made
+        conditional (If-None-Match) and a 304 reuses the previous page data.
+        Otherwise the page is considered unchanged when the SHA-1 of its body
+        matches the previous fetch.
+        
+        Args:
+            url: The page URL
+            previous: Page state returned by the previous fetch of this URL
+            
+        Returns:
+            Tuple of (response data, unchanged, page state), or None if failed
+        """
+        etag = previous.get('etag') if previous else None
+        
+        def get_headers() -> Dict[str, str]:
+            headers = _get_auth_headers()
+            if etag:
+                headers['If-None-Match'] = etag
+            return headers
+        
+        try:
+            start_time = time.time()
+            log_api_request(logger, "GET", url)
+            resp = send_with_auth("GET", url, get_headers, _refresh_token, timeout=30)
+            elapsed = time.time() - start_time
+            log_api_response(logger, "GET", url, resp.status_code, elapsed)
+            
+            if resp.status_code == 304 and previous and 'data' in previous:
+                return previous['data'], True, previous
+            
+            resp.raise_for_status()
+            digest = hashlib.sha1(resp.content).hexdigest()
+            data = resp.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return None
+        
+        state: Dict[str, Any] = {'digest': digest}
+        new_etag = resp.headers.get('ETag')
+        if new_etag:
+            # Only kept when the server can answer with 304 Not Modified
+            state['etag'] = new_etag
+            state['data'] = data
+        unchanged = bool(previous) and previous.get('digest') == digest
+        return data, unchanged, state
+    
+    def _fetch_paginated_delta(self, base_url: str, page_size: Optional[int] = None) -> Optional[Tuple[List[Dict[str, Any]], Set[Any]]]:
+        """Fetch all items of a paginated endpoint, detecting unchanged pages.
+        
+        Works like _fetch_paginated(), but every page is revalidated against
+        the previous delta fetch of the same endpoint (see
+        _fetch_page_conditional()). The IDs of items on unchanged pages are
+        returned so callers can skip comparing them. Unlike _fetch_paginated(),
+        a failed page fails the whole fetch, since a partial list would
+        look like removed items.
+        
+        Args:
+            base_url: The base URL for the endpoint
+            page_size: Number of items per page (default: self.page_size)
+            
+        Returns:
+            Tuple of (all items, IDs of items on unchanged pages), or None if failed
+        """
+        page_size = page_size or self.page_size
+        previous = self._page_state.get(base_url, {})
+        
+        def fetch(url: str) -> Optional[Tuple[Any, bool, Dict[str, Any]]]:
+            return self._fetch_page_conditional(url, previous.get(url))
+        
+        first_url = f"{base_url}?page_size={page_size}"
+        first = fetch(first_url)
+        if first is None:
+            return None
+        pages = [(first_url, first)]
+        
+        data = first[0]
+        next_url = data.get('next') if isinstance(data, dict) and 'results' in data else None
+        
+        if next_url and self.max_workers > 1:
+            page_urls = self._build_page_urls(next_url, data.get('count'), len(data.get('results', [])))
+            if page_urls:
+                workers = min(self.max_workers, len(page_urls))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="udi-page") as executor:
+                    results = list(executor.map(fetch, page_urls))
+                if any(result is None for result in results):
+                    return None
+                pages.extend(zip(page_urls, results))
+                next_url = results[-1][0].get('next') if isinstance(results[-1][0], dict) else None
+        
+        while next_url:
+            result = fetch(next_url)
+            if result is None:
+                return None
+            pages.append((next_url, result))
+            next_url = result[0].get('next') if isinstance(result[0], dict) else None
+        
+        items: List[Dict[str, Any]] = []
+        unchanged_ids: Set[Any] = set()
+        state: Dict[str, Dict[str, Any]] = {}
+        for url, (data, unchanged, page_state) in pages:
+            if isinstance(data, dict):
+                page_items = list(data.get('results', []))
+            else:
+                page_items = list(data) if isinstance(data, list) else []
+            items.extend(page_items)
+            if unchanged:
+                unchanged_ids.update(item.get('id') for item in page_items)
+            state[url] = page_state
+        
+        self._page_state[base_url] = state
+        unchanged_pages = sum(1 for _, (_, unchanged, _) in pages if unchanged)
+        logger.debug(f"Delta fetch of {base_url}: {unchanged_pages}/{len(pages)} pages unchanged")
+        return items, unchanged_ids
+    
     def fetch_channels(self) -> List[Dict[str, Any]]:
         """Fetch all channels from Dispatcharr.
         
@@ -311,6 +527,19 @@ class UDIFetcher:
         logger.info(f"Fetched {len(channels)} channels")
         return channels
     
+    def fetch_channels_delta(self) -> Optional[Tuple[List[Dict[str, Any]], Set[Any]]]:
+        """Fetch all channels, detecting pages unchanged since the last delta fetch.
+        
+        Returns:
+            Tuple of (channel dictionaries, IDs of channels on unchanged pages),
+            or None if the fetch failed
+        """
+        if not self.base_url:
+            logger.error("DISPATCHARR_BASE_URL not set")
+            return None
+        
+        return self._fetch_paginated_delta(f"{self.base_url}/api/channels/channels/")
+    
     def fetch_channel_by_id(self, channel_id: int) -> Optional[Dict[str, Any]]:
         """Fetch a specific channel by ID.
         
@@ -357,6 +586,19 @@ class UDIFetcher:
         logger.info(f"Fetched {len(streams)} streams")
         return streams
     
+    def fetch_streams_delta(self) -> Optional[Tuple[List[Dict[str, Any]], Set[Any]]]:
+        """Fetch all streams, detecting pages unchanged since the last delta fetch.
+        
+        Returns:
+            Tuple of (stream dictionaries, IDs of streams on unchanged pages),
+            or None if the fetch failed
+        """
+        if not self.base_url:
+            logger.error("DISPATCHARR_BASE_URL not set")
+            return None
+        
+        return self._fetch_paginated_delta(f"{self.base_url}/api/channels/streams/")
+    
     def fetch_stream_by_id(self, stream_id: int) -> Optional[Dict[str, Any]]:
         """Fetch a specific stream by ID.
         
@@ -492,13 +734,25 @@ class UDIFetcher:
             logger.error("DISPATCHARR_BASE_URL not set")
             return {}
         
-        profile_channels = {}
-        for profile_id in profile_ids:
+        def fetch_profile(profile_id: int) -> Optional[Dict[str, Any]]:
             try:
                 url = f"{self.base_url}/api/channels/profiles/{profile_id}/"
                 logger.debug(f"Fetching channels for profile {profile_id} from {url}")
-                profile_data = self._fetch_url(url)
-                
+                return self._fetch_url(url)
+            except Exception as e:
+                logger.error(f"Error fetching channels for profile {profile_id}: {e}")
+                return None
+        
+        if self.max_workers > 1 and len(profile_ids) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(profile_ids)),
+                                    thread_name_prefix="udi-profile") as executor:
+                responses = list(executor.map(fetch_profile, profile_ids))
+        else:
+            responses = [fetch_profile(profile_id) for profile_id in profile_ids]
+        
+        profile_channels = {}
+        for profile_id, profile_data in zip(profile_ids, responses):
+            try:
                 if profile_data:
                     # Parse the channels field
                     channels_data = profile_data.get('channels', '')
@@ -585,15 +839,23 @@ class UDIFetcher:
         """
         logger.info("Starting full data refresh from Dispatcharr API...")
         
-        data = {
-            'channels': self.fetch_channels(),
-            'streams': self.fetch_streams(),
-            'channel_groups': self.fetch_channel_groups(),
-            'logos': self.fetch_logos(),
-            'm3u_accounts': self.fetch_m3u_accounts(),
-            'channel_profiles': self.fetch_channel_profiles()
+        entity_fetchers = {
+            'channels': self.fetch_channels,
+            'streams': self.fetch_streams,
+            'channel_groups': self.fetch_channel_groups,
+            'logos': self.fetch_logos,
+            'm3u_accounts': self.fetch_m3u_accounts,
+            'channel_profiles': self.fetch_channel_profiles
         }
         
+        if self.max_workers > 1:
+            # Entity types are independent, fetch them concurrently
+            with ThreadPoolExecutor(max_workers=len(entity_fetchers), thread_name_prefix="udi-refresh") as executor:
+                futures = {name: executor.submit(fetch) for name, fetch in entity_fetchers.items()}
+                data = {name: future.result() for name, future in futures.items()}
+        else:
+            data = {name: fetch() for name, fetch in entity_fetchers.items()}
+        
         logger.info(
             f"Full refresh complete: {len(data['channels'])} channels, "
             f"{len(data['streams'])} streams, {len(data['channel_groups'])} groups, "
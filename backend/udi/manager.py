@@ -5,7 +5,7 @@ The UDIManager is a singleton class that:
 - Manages all data access for channels, streams, groups, logos, and M3U accounts
 - Provides cached data with configurable TTL
 - Supports background refresh
-- Handles data persistence via JSON storage
+- Handles data persistence via JSON (default) or SQLite storage
 
 Usage:
     from udi import get_udi_manager
@@ -23,12 +23,13 @@ Usage:
     udi.refresh_all()
 """
 
+import re
 import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Dict, List, Optional, Any, Pattern, Set, Tuple
 
-from udi.storage import UDIStorage
+from udi.storage import create_udi_storage
 from udi.fetcher import UDIFetcher
 from udi.cache import UDICache
 
@@ -45,6 +46,56 @@ logger = setup_logging(__name__)
 # Constants for channel status
 CHANNEL_STATE_ACTIVE = 'active'
 
+# $1 ... $99 style backreferences in profile replace patterns
+_DOLLAR_BACKREFERENCE = re.compile(r'\$([1-9][0-9]?)')
+
+
+def _diff_records(
+    old_by_id: Dict[int, Dict[str, Any]],
+    records: List[Dict[str, Any]],
+    unchanged_ids: Set[Any]
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[int]], Dict[int, Dict[str, Any]]]:
+    """Compare freshly fetched records with the cached ones by ID.
+
+    Records whose ID is in unchanged_ids (i.e. on a page that did not change
+    since the last fetch) are not compared again.
+
+    Args:
+        old_by_id: Cached records indexed by ID
+        records: Freshly fetched records in API order
+        unchanged_ids: IDs of records known to be unchanged
+
+    Returns:
+        Tuple of (merged list in API order reusing unchanged cached records,
+        delta dict with 'added', 'changed' and 'removed' ID lists,
+        added and changed records indexed by ID)
+    """
+    merged: List[Dict[str, Any]] = []
+    added: List[int] = []
+    changed: List[int] = []
+    updated: Dict[int, Dict[str, Any]] = {}
+    seen: Set[Any] = set()
+
+    for record in records:
+        record_id = record.get('id')
+        if record_id is None:
+            merged.append(record)
+            continue
+        seen.add(record_id)
+        old = old_by_id.get(record_id)
+        if old is None:
+            added.append(record_id)
+        elif record_id in unchanged_ids or old == record:
+            merged.append(old)
+            continue
+        else:
+            changed.append(record_id)
+        updated[record_id] = record
+        merged.append(record)
+
+    removed = [record_id for record_id in old_by_id if record_id not in seen]
+    return merged, {'added': added, 'changed': changed, 'removed': removed}, updated
+
 
 class UDIManager:
     """
@@ -58,11 +109,10 @@ class UDIManager:
     """
     
     def __init__(self):
-        """Initialize the UDI Manager with file-based storage."""
-        # Use file-based storage only
-        from udi.storage import UDIStorage
-        self.storage = UDIStorage()
-        logger.info("Using file storage for UDI")
+        """Initialize the UDI Manager with the configured storage backend."""
+        # JSON file storage by default, SQLite with UDI_STORAGE_BACKEND=sqlite
+        self.storage = create_udi_storage()
+        logger.info(f"Using {type(self.storage).__name__} for UDI")
         
         self.fetcher = UDIFetcher()
         self.cache = UDICache()
@@ -87,11 +137,38 @@ class UDIManager:
         self._streams_by_url: Dict[str, Dict[str, Any]] = {}
         self._valid_stream_ids: Set[int] = set()
         self._profiles_by_id: Dict[int, Dict[str, Any]] = {}
+        # ID indexes of accounts, logos and groups as (indexed list, index) pairs,
+        # rebuilt when the cached list is replaced
+        self._id_indexes: Dict[str, Tuple[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]] = {}
+        # Per-account scoring data (priority, priority_mode, name) and the
+        # accounts list / priority config version it was built from
+        self._account_scoring_table: Dict[int, Dict[str, Any]] = {}
+        self._account_scoring_source: Tuple[Optional[List[Dict[str, Any]]], int] = (None, -1)
+        
+        # Added/changed/removed IDs of the last incremental refresh per entity type
+        self._last_refresh_delta: Dict[str, Dict[str, List[int]]] = {}
         
         # Proxy status cache for real-time stream viewer information
         self._proxy_status_cache: Dict[str, Any] = {}
         self._proxy_status_last_fetch: float = 0
         self._proxy_status_ttl: float = 5.0  # Cache proxy status for 5 seconds
+        # Held by the thread fetching the proxy status so that parallel check
+        # threads do not all hit the proxy endpoint when the cache expires
+        self._proxy_status_refresh_lock = threading.Lock()
+        self._proxy_status_fetch_count: int = 0
+        # Per-account/profile usage derived from the proxy status as
+        # (proxy status, accounts list, snapshot), rebuilt once per fetch
+        self._proxy_snapshot: Tuple[Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]], Dict[str, Any]] = (None, None, {})
+        # Profile ID -> account ID as (indexed accounts list, index)
+        self._profile_account_index: Tuple[Optional[List[Dict[str, Any]]], Dict[int, int]] = (None, {})
+        # Per-account current_viewers totals as (streams list, streams version, totals);
+        # the version is bumped when streams are replaced in place
+        self._streams_version: int = 0
+        self._account_viewers: Tuple[Optional[List[Dict[str, Any]]], int, Dict[int, int]] = (None, -1, {})
+        # Compiled profile URL transformers keyed by (profile ID, search_pattern,
+        # replace_pattern) as (accounts list, transformers); None marks profiles
+        # without a usable transformation. Dropped when the accounts are refreshed.
+        self._url_transformers: Tuple[Optional[List[Dict[str, Any]]], Dict[Tuple[Any, Any, Any], Optional[Tuple[Pattern, str]]]] = (None, {})
         
         logger.info("UDI Manager created")
     
@@ -195,6 +272,65 @@ class UDIManager:
         self._streams_by_url = {st.get('url'): st for st in self._streams_cache if st.get('url')}
         self._valid_stream_ids = set(self._streams_by_id.keys())
         self._profiles_by_id = {p.get('id'): p for p in self._channel_profiles_cache if p.get('id') is not None}
+        self._id_indexes = {}
+        for entity in ('m3u_accounts', 'logos', 'channel_groups'):
+            self._get_id_index(entity)
+    
+    def _get_id_index(self, entity: str) -> Dict[int, Dict[str, Any]]:
+        """Get the ID index of a cached entity list ('m3u_accounts', 'logos' or 'channel_groups').
+        
+        The index is rebuilt whenever the cached list has been replaced (full or
+        partial refresh), so lookups never scan the list.
+        """
+        items = getattr(self, f'_{entity}_cache')
+        indexed = self._id_indexes.get(entity)
+        if indexed is None or indexed[0] is not items:
+            index = {item.get('id'): item for item in items or [] if item.get('id') is not None}
+            indexed = (items, index)
+            self._id_indexes[entity] = indexed
+        return indexed[1]
+    
+    def get_m3u_account_scoring_table(self) -> Dict[int, Dict[str, Any]]:
+        """Get the per-account data used for stream scoring.
+        
+        The table is rebuilt only when the M3U accounts are refreshed or the
+        priority configuration changes. Entries are shared and must not be
+        modified.
+        
+        Returns:
+            Dict mapping M3U account ID to {'priority', 'priority_mode', 'name'}
+        """
+        self._ensure_initialized()
+        priority_config = get_m3u_priority_config()
+        accounts = self._m3u_accounts_cache
+        source = (accounts, priority_config.version)
+        if self._account_scoring_source[0] is not accounts or self._account_scoring_source[1] != source[1]:
+            table = {}
+            for account_id, account in self._get_id_index('m3u_accounts').items():
+                try:
+                    priority_mode = priority_config.get_priority_mode(account_id)
+                except Exception as e:
+                    logger.error(f"Error merging priority_mode: {e}")
+                    priority_mode = 'disabled'
+                table[account_id] = {
+                    'priority': account.get('priority', 0),
+                    'priority_mode': priority_mode,
+                    'name': account.get('name', 'Unknown')
+                }
+            self._account_scoring_table = table
+            self._account_scoring_source = source
+        return self._account_scoring_table
+    
+    def get_m3u_account_scoring_info(self, account_id: int) -> Optional[Dict[str, Any]]:
+        """Get the scoring data of one M3U account (see get_m3u_account_scoring_table).
+        
+        Args:
+            account_id: M3U account ID
+            
+        Returns:
+            Dict with priority, priority_mode and name, or None if not found
+        """
+        return self.get_m3u_account_scoring_table().get(account_id)
     
     # === Data Access Methods ===
     
@@ -344,10 +480,7 @@ class UDIManager:
             Channel group dictionary or None if not found
         """
         self._ensure_initialized()
-        for group in self._channel_groups_cache:
-            if group.get('id') == group_id:
-                return group
-        return None
+        return self._get_id_index('channel_groups').get(group_id)
     
     def get_channels_by_group(self, group_id: int) -> Optional[List[Dict[str, Any]]]:
         """Get all channels that belong to a specific channel group.
@@ -391,10 +524,7 @@ class UDIManager:
             Logo dictionary or None if not found
         """
         self._ensure_initialized()
-        for logo in self._logos_cache:
-            if logo.get('id') == logo_id:
-                return logo
-        return None
+        return self._get_id_index('logos').get(logo_id)
     
     def get_m3u_accounts(self) -> List[Dict[str, Any]]:
         """Get all M3U accounts with priority_mode merged from local config.
@@ -407,14 +537,11 @@ class UDIManager:
         accounts = self._m3u_accounts_cache.copy()
         
         # Merge priority_mode from local configuration
-        try:
-            priority_config = get_m3u_priority_config()
-            for account in accounts:
-                account_id = account.get('id')
-                if account_id:
-                    account['priority_mode'] = priority_config.get_priority_mode(account_id)
-        except Exception as e:
-            logger.error(f"Error merging priority_mode: {e}")
+        scoring_table = self.get_m3u_account_scoring_table()
+        for account in accounts:
+            account_id = account.get('id')
+            if account_id in scoring_table:
+                account['priority_mode'] = scoring_table[account_id]['priority_mode']
         
         return accounts
     
@@ -442,16 +569,12 @@ class UDIManager:
                 return account
         
         # Fallback to in-memory cache
-        for account in self._m3u_accounts_cache:
-            if account.get('id') == account_id:
-                result = account.copy()
-                # Merge priority_mode from local configuration
-                try:
-                    priority_config = get_m3u_priority_config()
-                    result['priority_mode'] = priority_config.get_priority_mode(account_id)
-                except Exception as e:
-                    logger.error(f"Error merging priority_mode: {e}")
-                return result
+        account = self._get_id_index('m3u_accounts').get(account_id)
+        if account is not None:
+            result = account.copy()
+            # Merge priority_mode from local configuration
+            result['priority_mode'] = self.get_m3u_account_scoring_table()[account_id]['priority_mode']
+            return result
         
         logger.debug(f"M3U account {account_id} not found in UDI")
         return None
@@ -571,9 +694,14 @@ class UDIManager:
             logger.error(f"Error refreshing UDI data: {e}")
             return False
     
-    def refresh_channels(self) -> bool:
+    def refresh_channels(self, incremental: bool = False) -> bool:
         """Refresh only channels data.
         
+        Args:
+            incremental: If True, only apply channels that were added, changed
+                         or removed since the last refresh (see
+                         get_last_refresh_delta()) instead of rebuilding the cache
+        
         Returns:
             True if refresh successful
         """
@@ -583,11 +711,15 @@ class UDIManager:
             logger.warning("Cannot refresh channels: Dispatcharr credentials not configured")
             return False
         
+        if incremental:
+            return self._refresh_channels_incremental()
+        
         logger.info("Refreshing channels...")
         try:
             channels = self.fetcher.fetch_channels()
             self._channels_cache = channels
             self._channels_by_id = {ch.get('id'): ch for ch in channels if ch.get('id') is not None}
+            self._last_refresh_delta.pop('channels', None)
             self.storage.save_channels(channels)
             self.cache.mark_refreshed('channels')
             return True
@@ -638,12 +770,20 @@ class UDIManager:
             logger.error(f"Error refreshing channel {channel_id}: {e}")
             return False
     
-    def refresh_streams(self) -> bool:
+    def refresh_streams(self, incremental: bool = False) -> bool:
         """Refresh only streams data.
         
+        Args:
+            incremental: If True, only apply streams that were added, changed
+                         or removed since the last refresh (see
+                         get_last_refresh_delta()) instead of rebuilding the cache
+        
         Returns:
             True if refresh successful
         """
+        if incremental:
+            return self._refresh_streams_incremental()
+        
         logger.info("Refreshing streams...")
         try:
             streams = self.fetcher.fetch_streams()
@@ -651,6 +791,7 @@ class UDIManager:
             self._streams_by_id = {st.get('id'): st for st in streams if st.get('id') is not None}
             self._streams_by_url = {st.get('url'): st for st in streams if st.get('url')}
             self._valid_stream_ids = set(self._streams_by_id.keys())
+            self._last_refresh_delta.pop('streams', None)
             self.storage.save_streams(streams)
             self.cache.mark_refreshed('streams')
             return True
@@ -658,6 +799,96 @@ class UDIManager:
             logger.error(f"Error refreshing streams: {e}")
             return False
     
+    def _refresh_channels_incremental(self) -> bool:
+        """Apply the channels changed since the last refresh to the caches.
+        
+        Returns:
+            True if refresh successful
+        """
+        logger.info("Refreshing channels (incremental)...")
+        try:
+            fetched = self.fetcher.fetch_channels_delta()
+            if fetched is None:
+                logger.warning("Incremental channel refresh failed, keeping cached channels")
+                return False
+            channels, unchanged_ids = fetched
+            
+            with self._lock:
+                merged, delta, updated = _diff_records(self._channels_by_id, channels, unchanged_ids)
+                for channel_id in delta['removed']:
+                    self._channels_by_id.pop(channel_id, None)
+                self._channels_by_id.update(updated)
+                self._channels_cache = merged
+                self._last_refresh_delta['channels'] = delta
+                if updated or delta['removed']:
+                    self.storage.save_channels(merged)
+            
+            self.cache.mark_refreshed('channels')
+            logger.info(
+                f"Channels refreshed: {len(delta['added'])} added, "
+                f"{len(delta['changed'])} changed, {len(delta['removed'])} removed"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing channels: {e}")
+            return False
+    
+    def _refresh_streams_incremental(self) -> bool:
+        """Apply the streams changed since the last refresh to the caches.
+        
+        Returns:
+            True if refresh successful
+        """
+        logger.info("Refreshing streams (incremental)...")
+        try:
+            fetched = self.fetcher.fetch_streams_delta()
+            if fetched is None:
+                logger.warning("Incremental stream refresh failed, keeping cached streams")
+                return False
+            streams, unchanged_ids = fetched
+            
+            with self._lock:
+                merged, delta, updated = _diff_records(self._streams_by_id, streams, unchanged_ids)
+                for stream_id in delta['removed'] + delta['changed']:
+                    old = self._streams_by_id.get(stream_id)
+                    url = old.get('url') if old else None
+                    if url and self._streams_by_url.get(url) is old:
+                        del self._streams_by_url[url]
+                for stream_id in delta['removed']:
+                    self._streams_by_id.pop(stream_id, None)
+                    self._valid_stream_ids.discard(stream_id)
+                for stream_id, stream in updated.items():
+                    self._streams_by_id[stream_id] = stream
+                    self._valid_stream_ids.add(stream_id)
+                    if stream.get('url'):
+                        self._streams_by_url[stream['url']] = stream
+                self._streams_cache = merged
+                self._last_refresh_delta['streams'] = delta
+                if updated or delta['removed']:
+                    self.storage.save_streams(merged)
+            
+            self.cache.mark_refreshed('streams')
+            logger.info(
+                f"Streams refreshed: {len(delta['added'])} added, "
+                f"{len(delta['changed'])} changed, {len(delta['removed'])} removed"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing streams: {e}")
+            return False
+    
+    def get_last_refresh_delta(self, entity_type: str) -> Optional[Dict[str, List[int]]]:
+        """Get the IDs affected by the last incremental refresh of an entity type.
+        
+        Args:
+            entity_type: 'channels' or 'streams'
+            
+        Returns:
+            Dict with 'added', 'changed' and 'removed' ID lists, or None if the
+            last refresh was a full refresh
+        """
+        return self._last_refresh_delta.get(entity_type)
+    
     def refresh_channel_groups(self) -> bool:
         """Refresh only channel groups data.
         
@@ -755,7 +986,10 @@ class UDIManager:
                         # Refresh data that needs updating based on TTL
                         for entity_type in ['channels', 'streams', 'channel_groups', 'logos', 'm3u_accounts', 'channel_profiles']:
                             if self.cache.needs_refresh(entity_type):
-                                getattr(self, f'refresh_{entity_type}')()
+                                if entity_type in ('channels', 'streams'):
+                                    getattr(self, f'refresh_{entity_type}')(incremental=True)
+                                else:
+                                    getattr(self, f'refresh_{entity_type}')()
                     except Exception as e:
                         logger.error(f"Error in background refresh: {e}")
             logger.info("Background refresh stopped")
@@ -827,10 +1061,46 @@ class UDIManager:
             else:
                 self._streams_cache.append(stream_data)
                 self._valid_stream_ids.add(stream_id)
+            self._streams_version += 1
             
             # Save to storage
             return self.storage.update_stream(stream_id, stream_data)
     
+    def update_streams(self, streams: List[Dict[str, Any]]) -> bool:
+        """Update multiple streams in the cache with a single storage write.
+        
+        Used for batched write-back (e.g. stream stats after a channel check)
+        so that a batch costs one storage write instead of one per stream.
+        
+        Args:
+            streams: The updated stream dicts (each must contain 'id')
+            
+        Returns:
+            True if successful
+        """
+        if not streams:
+            return True
+        
+        with self._lock:
+            positions = {st.get('id'): i for i, st in enumerate(self._streams_cache)}
+            for stream_data in streams:
+                stream_id = stream_data['id']
+                self._streams_by_id[stream_id] = stream_data
+                if stream_data.get('url'):
+                    self._streams_by_url[stream_data['url']] = stream_data
+                
+                index = positions.get(stream_id)
+                if index is not None:
+                    self._streams_cache[index] = stream_data
+                else:
+                    positions[stream_id] = len(self._streams_cache)
+                    self._streams_cache.append(stream_data)
+                    self._valid_stream_ids.add(stream_id)
+            self._streams_version += 1
+            
+            # Save to storage
+            return self.storage.update_streams(streams)
+    
     def update_profile_channels(self, profile_id: int, profile_channels_data: Dict[str, Any]) -> bool:
         """Update profile channels data in the cache.
         
@@ -938,16 +1208,26 @@ class UDIManager:
         Returns:
             M3U account ID or None if profile not found
         """
-        accounts = self.get_m3u_accounts()
-        
-        for account in accounts:
-            profiles = account.get('profiles', [])
-            if isinstance(profiles, list):
-                for profile in profiles:
-                    if profile.get('id') == profile_id:
-                        return account.get('id')
+        return self._get_profile_account_index().get(profile_id)
+    
+    def _get_profile_account_index(self) -> Dict[int, int]:
+        """Get the profile ID -> M3U account ID index.
         
-        return None
+        The index is rebuilt whenever the cached accounts list has been replaced.
+        """
+        accounts = self._m3u_accounts_cache
+        indexed = self._profile_account_index
+        if indexed[0] is not accounts:
+            index = {}
+            for account in accounts or []:
+                profiles = account.get('profiles', [])
+                if isinstance(profiles, list):
+                    for profile in profiles:
+                        if isinstance(profile, dict) and profile.get('id') is not None:
+                            index.setdefault(profile['id'], account.get('id'))
+            indexed = (accounts, index)
+            self._profile_account_index = indexed
+        return indexed[1]
     
     def _is_channel_status_active(self, status: Dict[str, Any]) -> bool:
         """Check if a channel status indicates it's active.
@@ -982,6 +1262,11 @@ class UDIManager:
     def _get_proxy_status(self, force_refresh: bool = False) -> Dict[str, Any]:
         """Get cached proxy status or fetch fresh if needed.
         
+        Only one thread fetches at a time. When the cache has expired while
+        another thread is already fetching, the expired cache is returned
+        instead of waiting; callers without a usable cache wait for the
+        running fetch and reuse its result.
+        
         Args:
             force_refresh: If True, always fetch fresh data
             
@@ -989,6 +1274,7 @@ class UDIManager:
             Dictionary with proxy status information
         """
         current_time = time.time()
+        fetch_count = self._proxy_status_fetch_count
         
         # Check if cache is valid
         if not force_refresh and self._proxy_status_cache:
@@ -996,6 +1282,15 @@ class UDIManager:
             if age < self._proxy_status_ttl:
                 logger.debug(f"Using cached proxy status (age: {age:.1f}s)")
                 return self._proxy_status_cache
+            if not self._proxy_status_refresh_lock.acquire(blocking=False):
+                logger.debug(f"Proxy status refresh in progress, using expired cache (age: {age:.1f}s)")
+                return self._proxy_status_cache
+        else:
+            self._proxy_status_refresh_lock.acquire()
+            # Another thread may have fetched while this one was waiting
+            if self._proxy_status_cache and self._proxy_status_fetch_count != fetch_count:
+                self._proxy_status_refresh_lock.release()
+                return self._proxy_status_cache
         
         # Fetch fresh data
         try:
@@ -1003,34 +1298,43 @@ class UDIManager:
             proxy_status = self.fetcher.fetch_proxy_status()
             self._proxy_status_cache = proxy_status
             self._proxy_status_last_fetch = current_time
+            self._proxy_status_fetch_count += 1
             return proxy_status
         except Exception as e:
             logger.warning(f"Failed to fetch proxy status: {e}")
             # Return cached data even if expired, or empty dict
             return self._proxy_status_cache if self._proxy_status_cache else {}
+        finally:
+            self._proxy_status_refresh_lock.release()
     
-    def _count_active_streams(self, account_id: int) -> int:
-        """Count streams with active viewers for an account.
+    def _get_proxy_snapshot(self) -> Dict[str, Any]:
+        """Get the stream usage derived from the current proxy status.
         
-        This method uses real-time proxy status from /proxy/ts/status to determine 
-        which streams are actually running. It correlates the m3u_profile_id from 
-        active channels to find which profiles (and their parent accounts) are in use.
+        The proxy status is walked once per fetch (or M3U accounts refresh)
+        instead of once per limiter query. The snapshot is shared and must not
+        be modified.
         
-        Args:
-            account_id: M3U account ID
-            
         Returns:
-            Number of active streams for this account
+            Dict with:
+            - active_channels: Set of active channel IDs (as strings, like the proxy status keys)
+            - account_counts: Account ID -> number of active streams
+            - profile_counts: Account ID -> {profile ID: number of active streams}
         """
-        # Get real-time proxy status
         proxy_status = self._get_proxy_status()
+        accounts = self._m3u_accounts_cache
+        cached = self._proxy_snapshot
+        if cached[0] is proxy_status and cached[1] is accounts:
+            return cached[2]
         
-        # Count active channels that are using profiles from this account
-        active_count = 0
+        profile_accounts = self._get_profile_account_index()
+        active_channels: Set[str] = set()
+        account_counts: Dict[int, int] = {}
+        profile_counts: Dict[int, Dict[int, int]] = {}
         
         for channel_id_str, status in proxy_status.items():
             if not self._is_channel_status_active(status):
                 continue
+            active_channels.add(channel_id_str)
             
             # Get the m3u_profile_id from the proxy status
             profile_id = status.get('m3u_profile_id')
@@ -1039,34 +1343,64 @@ class UDIManager:
                 continue
             
             # Find which account owns this profile
-            profile_account_id = self._find_account_for_profile(profile_id)
-            if profile_account_id is None:
+            account_id = profile_accounts.get(profile_id)
+            if account_id is None:
                 logger.debug(f"Profile {profile_id} not found in any M3U account")
                 continue
             
-            # If this profile belongs to the account we're checking, count it
-            if profile_account_id == account_id:
-                active_count += 1
-                logger.debug(f"Channel {channel_id_str} is using profile {profile_id} from account {account_id}")
+            account_counts[account_id] = account_counts.get(account_id, 0) + 1
+            counts = profile_counts.setdefault(account_id, {})
+            counts[profile_id] = counts.get(profile_id, 0) + 1
+        
+        snapshot = {
+            'active_channels': active_channels,
+            'account_counts': account_counts,
+            'profile_counts': profile_counts
+        }
+        self._proxy_snapshot = (proxy_status, accounts, snapshot)
+        return snapshot
+    
+    def _count_active_streams(self, account_id: int) -> int:
+        """Count streams with active viewers for an account.
+        
+        This method uses real-time proxy status from /proxy/ts/status to determine 
+        which streams are actually running. It correlates the m3u_profile_id from 
+        active channels to find which profiles (and their parent accounts) are in use.
         
+        Args:
+            account_id: M3U account ID
+            
+        Returns:
+            Number of active streams for this account
+        """
+        active_count = self._get_proxy_snapshot()['account_counts'].get(account_id, 0)
         logger.debug(f"Account {account_id} has {active_count} active streams")
         return active_count
     
     def _sum_total_viewers(self, account_id: int) -> int:
         """Sum all current_viewers for an account.
         
+        The per-account totals are rebuilt only when the streams change.
+        
         Args:
             account_id: M3U account ID
             
         Returns:
             Total number of viewers
         """
-        total_viewers = 0
-        for stream in self._streams_cache:
-            if stream.get('m3u_account') == account_id:
+        streams = self._streams_cache
+        cached = self._account_viewers
+        if cached[0] is not streams or cached[1] != self._streams_version:
+            version = self._streams_version
+            totals: Dict[int, int] = {}
+            for stream in streams or []:
                 current_viewers = stream.get('current_viewers', 0)
-                total_viewers += current_viewers
-        return total_viewers
+                if current_viewers:
+                    stream_account = stream.get('m3u_account')
+                    totals[stream_account] = totals.get(stream_account, 0) + current_viewers
+            cached = (streams, version, totals)
+            self._account_viewers = cached
+        return cached[2].get(account_id, 0)
     
     def get_active_streams_for_profile(self, profile_id: int) -> int:
         """Calculate the number of active streams for a specific M3U account profile.
@@ -1125,19 +1459,9 @@ class UDIManager:
         """
         self._ensure_initialized()
         
-        # Get real-time proxy status
-        proxy_status = self._get_proxy_status()
-        
-        # Check if this channel is in the proxy status
-        channel_id_str = str(channel_id)
-        if channel_id_str in proxy_status:
-            status = proxy_status[channel_id_str]
-            is_active = self._is_channel_status_active(status)
-            logger.debug(f"Channel {channel_id} is {'active' if is_active else 'inactive'} (from proxy status)")
-            return is_active
-        
-        logger.debug(f"Channel {channel_id} is not in proxy status, assuming inactive")
-        return False
+        is_active = str(channel_id) in self._get_proxy_snapshot()['active_channels']
+        logger.debug(f"Channel {channel_id} is {'active' if is_active else 'inactive'} (from proxy status)")
+        return is_active
     
     def get_total_viewers_for_profile(self, profile_id: int) -> int:
         """Calculate the total number of viewers for a specific M3U account profile.
@@ -1193,29 +1517,7 @@ class UDIManager:
         """
         self._ensure_initialized()
         
-        # Get real-time proxy status
-        proxy_status = self._get_proxy_status()
-        
-        # Count active streams per profile
-        profile_counts: Dict[int, int] = {}
-        
-        for channel_id_str, status in proxy_status.items():
-            if not self._is_channel_status_active(status):
-                continue
-            
-            # Get the m3u_profile_id from the proxy status
-            profile_id = status.get('m3u_profile_id')
-            if not profile_id:
-                continue
-            
-            # Find which account owns this profile
-            profile_account_id = self._find_account_for_profile(profile_id)
-            if profile_account_id != account_id:
-                continue
-            
-            # Increment count for this profile
-            profile_counts[profile_id] = profile_counts.get(profile_id, 0) + 1
-        
+        profile_counts = dict(self._get_proxy_snapshot()['profile_counts'].get(account_id, {}))
         logger.debug(f"Account {account_id} profile usage: {profile_counts}")
         return profile_counts
     
@@ -1314,71 +1616,68 @@ class UDIManager:
             account_name = account.get('name', f'Account {account_id}') if account else f'Account {account_id}'
             return (False, f"All profiles in {account_name} are at capacity")
     
-    def apply_profile_url_transformation(self, stream: Dict[str, Any], profile: Optional[Dict[str, Any]] = None) -> str:
-        """Apply search/replace pattern transformation to a stream URL.
+    def _get_url_transformer(self, profile: Dict[str, Any]) -> Optional[Tuple[Pattern, str]]:
+        """Get the compiled search pattern and Python replacement template of a profile.
         
-        When using M3U account profiles with search_pattern and replace_pattern,
-        this method transforms the stream URL according to the profile configuration.
-        This is essential for free profiles that need different URL formats than
-        the main account URL.
+        Transformers are cached until the M3U accounts are refreshed.
         
         Args:
-            stream: Stream dictionary with 'url' and optionally 'm3u_account'
-            profile: Optional profile dictionary. If not provided, will find available profile for stream
+            profile: Profile dictionary with search_pattern and replace_pattern
             
         Returns:
-            Transformed URL string. If no transformation is needed, returns original URL.
+            Tuple of (compiled search pattern, replacement template), or None if
+            the profile has no usable search/replace patterns
         """
-        import re
-        
-        original_url = stream.get('url', '')
-        if not original_url:
-            return original_url
-        
-        # If no profile provided, try to find one
-        if profile is None:
-            profile = self.find_available_profile_for_stream(stream)
-        
-        # If still no profile, return original URL
-        if not profile:
-            return original_url
+        accounts = self._m3u_accounts_cache
+        if self._url_transformers[0] is not accounts:
+            self._url_transformers = (accounts, {})
+        transformers = self._url_transformers[1]
         
-        # Get search and replace patterns
         search_pattern = profile.get('search_pattern')
         replace_pattern = profile.get('replace_pattern')
+        key = (profile.get('id'), search_pattern, replace_pattern)
+        if key in transformers:
+            return transformers[key]
         
-        # If patterns are not configured, return original URL
+        transformer = None
         # Check explicitly for None or empty strings (including whitespace-only strings)
-        if not search_pattern or not replace_pattern:
+        if search_pattern and replace_pattern:
+            search_pattern = search_pattern.strip()
+            replace_pattern = replace_pattern.strip()
+            if not search_pattern or not replace_pattern:
+                logger.debug(f"Profile {profile.get('id')} has empty search_pattern or replace_pattern after stripping whitespace")
+            else:
+                try:
+                    # Convert $1, $2 style backreferences to \1, \2 for Python's re.sub()
+                    # This handles patterns from other regex engines (e.g., JavaScript, Perl).
+                    # Two-digit references are taken first ($10 is group 10, not $1 + 0)
+                    transformer = (re.compile(search_pattern),
+                                   _DOLLAR_BACKREFERENCE.sub(r'\\\1', replace_pattern))
+                except re.error as e:
+                    logger.error(f"Invalid regex pattern in profile {profile.get('id')}: {e}")
+        transformers[key] = transformer
+        return transformer
+    
+    def _transform_url(self, stream: Dict[str, Any], profile: Optional[Dict[str, Any]]) -> str:
+        """Apply a profile's search/replace transformation to a stream URL."""
+        original_url = stream.get('url', '')
+        if not original_url or not profile:
             return original_url
         
-        # Strip whitespace and check again
-        search_pattern = search_pattern.strip()
-        replace_pattern = replace_pattern.strip()
-        
-        if not search_pattern or not replace_pattern:
-            logger.debug(f"Profile {profile.get('id')} has empty search_pattern or replace_pattern after stripping whitespace")
+        transformer = self._get_url_transformer(profile)
+        if transformer is None:
             return original_url
+        search_regex, template = transformer
         
         try:
             # First, test if the pattern matches the URL
             # If it doesn't match, don't apply any transformation
-            if not re.search(search_pattern, original_url):
-                logger.debug(f"Search pattern '{search_pattern}' does not match URL for stream {stream.get('id')}, skipping transformation")
+            if not search_regex.search(original_url):
+                logger.debug(f"Search pattern '{search_regex.pattern}' does not match URL for stream {stream.get('id')}, skipping transformation")
                 return original_url
             
-            # Convert $1, $2 style backreferences to \1, \2 for Python's re.sub()
-            # This handles patterns from other regex engines (e.g., JavaScript, Perl)
-            # Maximum supported backreference number (Python regex supports up to 99 groups)
-            MAX_BACKREFERENCE_COUNT = 99
-            python_replace_pattern = replace_pattern
-            # Replace $1, $2, ... $99 with \1, \2, ... \99
-            # Start from highest to avoid replacing $10 as $1 + 0
-            for i in range(MAX_BACKREFERENCE_COUNT, 0, -1):
-                python_replace_pattern = python_replace_pattern.replace(f'${i}', f'\\{i}')
-            
             # Apply regex transformation
-            transformed_url = re.sub(search_pattern, python_replace_pattern, original_url)
+            transformed_url = search_regex.sub(template, original_url)
             
             # Validate the transformed URL has a valid protocol
             if not transformed_url.startswith(('http://', 'https://', 'rtmp://', 'rtmps://')):
@@ -1398,6 +1697,30 @@ class UDIManager:
             logger.error(f"Error applying URL transformation for stream {stream.get('id')}: {e}")
             return original_url
     
+    def apply_profile_url_transformation(self, stream: Dict[str, Any], profile: Optional[Dict[str, Any]] = None) -> str:
+        """Apply search/replace pattern transformation to a stream URL.
+        
+        When using M3U account profiles with search_pattern and replace_pattern,
+        this method transforms the stream URL according to the profile configuration.
+        This is essential for free profiles that need different URL formats than
+        the main account URL.
+        
+        Args:
+            stream: Stream dictionary with 'url' and optionally 'm3u_account'
+            profile: Optional profile dictionary. If not provided, will find available profile for stream
+            
+        Returns:
+            Transformed URL string. If no transformation is needed, returns original URL.
+        """
+        if not stream.get('url', ''):
+            return stream.get('url', '')
+        
+        # If no profile provided, try to find one
+        if profile is None:
+            profile = self.find_available_profile_for_stream(stream)
+        
+        return self._transform_url(stream, profile)
+    
     def _ensure_initialized(self) -> None:
         """Ensure UDI Manager is initialized before data access.
         
@@ -0,0 +1,337 @@
+"""
+SQLite storage backend for the Universal Data Index (UDI) system.
+
+Stores every record as a JSON document in a per-entity table keyed by the
+record ID, so single-record reads and upserts do not touch the rest of the
+data set. The database runs in WAL mode and is created next to the JSON files.
+Existing JSON data is migrated into the database on first use.
+
+Select this backend with UDI_STORAGE_BACKEND=sqlite.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from udi.storage import CONFIG_DIR, UDIStorage
+
+from logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Entity types stored as ordered lists of records with an 'id' field
+ENTITY_TABLES = ('channels', 'streams', 'channel_groups', 'logos', 'm3u_accounts', 'channel_profiles')
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+class UDISQLiteStorage:
+    """SQLite-based storage for UDI data with primary-key lookups and upserts.
+
+    Provides the same interface as UDIStorage. Records keep the order in which
+    they were first saved; updates replace a record in place.
+    """
+
+    def __init__(self, storage_dir: Optional[Path] = None):
+        """Initialize the SQLite storage.
+
+        Args:
+            storage_dir: Directory containing the database (and any JSON files
+                        to migrate). Defaults to CONFIG_DIR/udi/
+        """
+        if storage_dir is None:
+            storage_dir = CONFIG_DIR / 'udi'
+
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.db_file = self.storage_dir / 'udi.sqlite3'
+
+        # A single connection shared by all threads, serialized by this lock
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+        self._migrate_from_json()
+
+        logger.info(f"UDI SQLite storage initialized at {self.db_file}")
+
+    @contextmanager
+    def _transaction(self):
+        """Hold the connection lock and run the block in a single transaction."""
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                yield
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _create_schema(self) -> None:
+        with self._lock:
+            for table in ENTITY_TABLES:
+                # seq preserves insertion order, id is the primary-key index
+                self._conn.execute(
+                    f'CREATE TABLE IF NOT EXISTS {table} '
+                    f'(seq INTEGER PRIMARY KEY, id INTEGER UNIQUE, data TEXT NOT NULL)'
+                )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS profile_channels (profile_id INTEGER PRIMARY KEY, data TEXT NOT NULL)'
+            )
+            self._conn.execute('CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+    def _migrate_from_json(self) -> None:
+        """Import existing JSON storage files into an empty database (one-time)."""
+        if self.is_initialized():
+            return
+
+        json_storage = UDIStorage(self.storage_dir)
+        if not json_storage.is_initialized():
+            return
+
+        logger.info(f"Migrating UDI JSON storage in {self.storage_dir} to SQLite...")
+        metadata = json_storage.load_metadata()
+        with self._transaction():
+            for table in ENTITY_TABLES:
+                self._replace_records(table, getattr(json_storage, f'load_{table}')())
+            for profile_id, data in json_storage.load_profile_channels().items():
+                self._upsert_profile_channels(profile_id, data)
+            metadata['migrated_from_json'] = datetime.now().isoformat()
+            self._replace_metadata(metadata)
+        logger.info("UDI storage migration to SQLite complete")
+
+    # Record helpers (callers must hold self._lock)
+    def _replace_records(self, table: str, records: List[Dict[str, Any]]) -> None:
+        self._conn.execute(f'DELETE FROM {table}')
+        self._upsert_records(table, [(record.get('id'), record) for record in records])
+
+    def _upsert_records(self, table: str, keyed_records: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        self._conn.executemany(
+            f'INSERT INTO {table} (id, data) VALUES (?, ?) '
+            f'ON CONFLICT(id) DO UPDATE SET data = excluded.data',
+            [(record_id, _dumps(record)) for record_id, record in keyed_records]
+        )
+
+    def _upsert_profile_channels(self, profile_id: int, data: Dict[str, Any]) -> None:
+        self._conn.execute(
+            'INSERT INTO profile_channels (profile_id, data) VALUES (?, ?) '
+            'ON CONFLICT(profile_id) DO UPDATE SET data = excluded.data',
+            (int(profile_id), _dumps(data))
+        )
+
+    def _replace_metadata(self, metadata: Dict[str, Any]) -> None:
+        self._conn.execute('DELETE FROM metadata')
+        self._conn.executemany(
+            'INSERT INTO metadata (key, value) VALUES (?, ?)',
+            [(key, _dumps(value)) for key, value in metadata.items()]
+        )
+
+    def _load_records(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(f'SELECT data FROM {table} ORDER BY seq').fetchall()
+        # One parse of the joined documents is much faster than one per row
+        return json.loads('[' + ','.join(row[0] for row in rows) + ']')
+
+    def _save_records(self, table: str, records: List[Dict[str, Any]]) -> bool:
+        try:
+            with self._transaction():
+                self._replace_records(table, records)
+                self._set_metadata_field(f'{table}_last_updated')
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save {table} to {self.db_file}: {e}")
+            return False
+
+    def _get_record(self, table: str, record_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f'SELECT data FROM {table} WHERE id = ?', (record_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _update_records(self, table: str, keyed_records: List[Tuple[Any, Dict[str, Any]]]) -> bool:
+        try:
+            with self._transaction():
+                self._upsert_records(table, keyed_records)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update {table} in {self.db_file}: {e}")
+            return False
+
+    # Channels
+    def load_channels(self) -> List[Dict[str, Any]]:
+        """Load all channels from storage."""
+        return self._load_records('channels')
+
+    def save_channels(self, channels: List[Dict[str, Any]]) -> bool:
+        """Replace all channels in storage."""
+        return self._save_records('channels', channels)
+
+    def get_channel_by_id(self, channel_id: int) -> Optional[Dict[str, Any]]:
+        """Get a specific channel by ID."""
+        return self._get_record('channels', channel_id)
+
+    def update_channel(self, channel_id: int, channel_data: Dict[str, Any]) -> bool:
+        """Insert or update a single channel."""
+        return self._update_records('channels', [(channel_id, channel_data)])
+
+    # Streams
+    def load_streams(self) -> List[Dict[str, Any]]:
+        """Load all streams from storage."""
+        return self._load_records('streams')
+
+    def save_streams(self, streams: List[Dict[str, Any]]) -> bool:
+        """Replace all streams in storage."""
+        return self._save_records('streams', streams)
+
+    def get_stream_by_id(self, stream_id: int) -> Optional[Dict[str, Any]]:
+        """Get a specific stream by ID."""
+        return self._get_record('streams', stream_id)
+
+    def update_stream(self, stream_id: int, stream_data: Dict[str, Any]) -> bool:
+        """Insert or update a single stream."""
+        return self._update_records('streams', [(stream_id, stream_data)])
+
+    def update_streams(self, streams_data: List[Dict[str, Any]]) -> bool:
+        """Insert or update multiple streams in one transaction."""
+        return self._update_records('streams', [(stream['id'], stream) for stream in streams_data])
+
+    # Channel Groups
+    def load_channel_groups(self) -> List[Dict[str, Any]]:
+        """Load all channel groups from storage."""
+        return self._load_records('channel_groups')
+
+    def save_channel_groups(self, groups: List[Dict[str, Any]]) -> bool:
+        """Replace all channel groups in storage."""
+        return self._save_records('channel_groups', groups)
+
+    # Logos
+    def load_logos(self) -> List[Dict[str, Any]]:
+        """Load all logos from storage."""
+        return self._load_records('logos')
+
+    def save_logos(self, logos: List[Dict[str, Any]]) -> bool:
+        """Replace all logos in storage."""
+        return self._save_records('logos', logos)
+
+    def get_logo_by_id(self, logo_id: int) -> Optional[Dict[str, Any]]:
+        """Get a specific logo by ID."""
+        return self._get_record('logos', logo_id)
+
+    # M3U Accounts
+    def load_m3u_accounts(self) -> List[Dict[str, Any]]:
+        """Load all M3U accounts from storage."""
+        return self._load_records('m3u_accounts')
+
+    def save_m3u_accounts(self, accounts: List[Dict[str, Any]]) -> bool:
+        """Replace all M3U accounts in storage."""
+        return self._save_records('m3u_accounts', accounts)
+
+    # Channel Profiles
+    def load_channel_profiles(self) -> List[Dict[str, Any]]:
+        """Load all channel profiles from storage."""
+        return self._load_records('channel_profiles')
+
+    def save_channel_profiles(self, profiles: List[Dict[str, Any]]) -> bool:
+        """Replace all channel profiles in storage."""
+        return self._save_records('channel_profiles', profiles)
+
+    # Profile Channels (channel-profile associations)
+    def load_profile_channels(self) -> Dict[int, Dict[str, Any]]:
+        """Load profile channels data, keyed by profile ID."""
+        with self._lock:
+            rows = self._conn.execute('SELECT profile_id, data FROM profile_channels').fetchall()
+        return {profile_id: json.loads(data) for profile_id, data in rows}
+
+    def save_profile_channels(self, profile_channels: Dict[int, Dict[str, Any]]) -> bool:
+        """Replace all profile channels data."""
+        try:
+            with self._transaction():
+                self._conn.execute('DELETE FROM profile_channels')
+                for profile_id, data in profile_channels.items():
+                    self._upsert_profile_channels(profile_id, data)
+                self._set_metadata_field('profile_channels_last_updated')
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save profile channels to {self.db_file}: {e}")
+            return False
+
+    def load_profile_channels_by_id(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        """Load channel data for a specific profile."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM profile_channels WHERE profile_id = ?', (int(profile_id),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_profile_channels_by_id(self, profile_id: int, channels_data: Dict[str, Any]) -> bool:
+        """Insert or update channel data for a specific profile."""
+        try:
+            with self._lock:
+                self._upsert_profile_channels(profile_id, channels_data)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save profile channels for profile {profile_id}: {e}")
+            return False
+
+    # Metadata
+    def load_metadata(self) -> Dict[str, Any]:
+        """Load UDI metadata."""
+        with self._lock:
+            rows = self._conn.execute('SELECT key, value FROM metadata').fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_metadata(self, metadata: Dict[str, Any]) -> bool:
+        """Replace UDI metadata."""
+        try:
+            with self._transaction():
+                self._replace_metadata(metadata)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save metadata to {self.db_file}: {e}")
+            return False
+
+    def _set_metadata_field(self, field: str) -> None:
+        self._conn.execute(
+            'INSERT INTO metadata (key, value) VALUES (?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            (field, _dumps(datetime.now().isoformat()))
+        )
+
+    def get_last_updated(self, entity_type: str) -> Optional[str]:
+        """Get the last updated timestamp for an entity type."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM metadata WHERE key = ?', (f'{entity_type}_last_updated',)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def clear_all(self) -> bool:
+        """Clear all stored data."""
+        try:
+            with self._transaction():
+                for table in ENTITY_TABLES + ('profile_channels', 'metadata'):
+                    self._conn.execute(f'DELETE FROM {table}')
+            logger.info("UDI storage cleared")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to clear UDI storage: {e}")
+            return False
+
+    def is_initialized(self) -> bool:
+        """Check if the database contains channels, streams, groups or M3U accounts."""
+        with self._lock:
+            return any(
+                self._conn.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone()
+                for table in ('channels', 'streams', 'channel_groups', 'm3u_accounts')
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
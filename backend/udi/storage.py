@@ -19,6 +19,9 @@ logger = setup_logging(__name__)
 # Use current directory as fallback if CONFIG_DIR is not set or not accessible
 CONFIG_DIR = Path(os.environ.get('CONFIG_DIR', str(Path(__file__).parent.parent / 'data')))
 
+# Storage backend for UDI data: 'json' (default) or 'sqlite'
+UDI_STORAGE_BACKEND = os.environ.get('UDI_STORAGE_BACKEND', 'json').strip().lower()
+
 
 class UDIStorage:
     """JSON file-based storage for UDI data with thread-safe operations."""
@@ -230,6 +233,28 @@ class UDIStorage:
             
             return self._save_json(self.streams_file, streams)
     
+    def update_streams(self, streams_data: List[Dict[str, Any]]) -> bool:
+        """Update multiple streams in storage with a single file write.
+        
+        Args:
+            streams_data: Updated stream dictionaries (each must contain 'id')
+            
+        Returns:
+            True if successful
+        """
+        with self._streams_lock:
+            streams = self._load_json(self.streams_file) or []
+            positions = {stream.get('id'): i for i, stream in enumerate(streams)}
+            for stream_data in streams_data:
+                index = positions.get(stream_data['id'])
+                if index is not None:
+                    streams[index] = stream_data
+                else:
+                    positions[stream_data['id']] = len(streams)
+                    streams.append(stream_data)
+            
+            return self._save_json(self.streams_file, streams)
+    
     # Channel Groups
     def load_channel_groups(self) -> List[Dict[str, Any]]:
         """Load all channel groups from storage.
@@ -499,3 +524,22 @@ class UDIStorage:
             self.channel_groups_file.exists(),
             self.m3u_accounts_file.exists()
         ])
+
+
+def create_udi_storage(backend: Optional[str] = None, storage_dir: Optional[Path] = None):
+    """Create the configured UDI storage backend.
+    
+    Args:
+        backend: 'json' or 'sqlite'. Defaults to UDI_STORAGE_BACKEND.
+        storage_dir: Directory for storing UDI data. Defaults to CONFIG_DIR/udi/
+        
+    Returns:
+        A UDIStorage or UDISQLiteStorage instance
+    """
+    backend = backend or UDI_STORAGE_BACKEND
+    if backend == 'sqlite':
+        from udi.sqlite_storage import UDISQLiteStorage
+        return UDISQLiteStorage(storage_dir)
+    if backend != 'json':
+        logger.warning(f"Unknown UDI storage backend '{backend}', using JSON storage")
+    return UDIStorage(storage_dir)
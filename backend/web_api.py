@@ -6,6 +6,8 @@ Provides REST API endpoints for the React frontend to interact with
 the automated stream management system.
 """
 
+import heapq
+import itertools
 import json
 import logging
 import os
@@ -18,11 +20,13 @@ from pathlib import Path
 from typing import Dict, Any
 from werkzeug.utils import secure_filename
 
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, Response, request, jsonify, send_from_directory, send_file, stream_with_context
 from flask_cors import CORS
 
 from automated_stream_manager import AutomatedStreamManager, RegexChannelMatcher
+from changelog_store import decode_cursor, encode_cursor
 from api_utils import _get_base_url
+from http_session import get_http_session, get_pool_stats
 from stream_checker_service import get_stream_checker_service
 from scheduling_service import get_scheduling_service
 from channel_settings_manager import get_channel_settings_manager
@@ -69,6 +73,14 @@ CONCURRENT_STREAMS_ENABLED_KEY = 'concurrent_streams.enabled'
 DEAD_STREAMS_DEFAULT_PER_PAGE = 20
 DEAD_STREAMS_MAX_PER_PAGE = 100
 
+# Changelog pagination constants
+CHANGELOG_DEFAULT_PER_PAGE = 50
+CHANGELOG_MAX_PER_PAGE = 500
+
+# Seconds between two messages of the stream checker event stream, and between heartbeats
+STREAM_CHECKER_EVENTS_TICK = 1.0
+STREAM_CHECKER_EVENTS_HEARTBEAT = 15.0
+
 # EPG refresh processor constants
 EPG_REFRESH_INITIAL_DELAY_SECONDS = 5  # Delay before first EPG refresh
 EPG_REFRESH_ERROR_RETRY_SECONDS = 300  # Retry interval after errors (5 minutes)
@@ -1387,7 +1399,7 @@ def get_profile_channels(profile_id):
             
             # Get profile details directly from Dispatcharr
             profile_url = f"{base_url}/api/channels/profiles/{profile_id}/"
-            resp = requests.get(profile_url, headers=_get_auth_headers(), timeout=30)
+            resp = get_http_session().get(profile_url, headers=_get_auth_headers(), timeout=30)
             resp.raise_for_status()
             profile_data = resp.json()
             
@@ -1472,7 +1484,7 @@ def create_profile_snapshot(profile_id):
             
             # Get profile details directly from Dispatcharr
             profile_url = f"{base_url}/api/channels/profiles/{profile_id}/"
-            resp = requests.get(profile_url, headers=_get_auth_headers(), timeout=30)
+            resp = get_http_session().get(profile_url, headers=_get_auth_headers(), timeout=30)
             resp.raise_for_status()
             profile_data = resp.json()
             
@@ -1628,28 +1640,54 @@ def disable_empty_channels_in_profile_endpoint(profile_id):
 
 @app.route('/api/changelog', methods=['GET'])
 def get_changelog():
-    """Get recent changelog entries from both automation and stream checker."""
+    """Get recent changelog entries from both automation and stream checker.
+    
+    Query parameters:
+        days: Number of days to look back (default: 7)
+        limit: Page size; when given, the response is
+            {"entries": [...], "next_cursor": ...} instead of a plain list
+        cursor: next_cursor of the previous page
+    """
     try:
         days = request.args.get('days', 7, type=int)
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        
+        before = None
+        if cursor:
+            try:
+                before = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        if limit is not None and (limit < 1 or limit > CHANGELOG_MAX_PER_PAGE):
+            limit = CHANGELOG_DEFAULT_PER_PAGE
         
         # Get automation changelog entries
         manager = get_automation_manager()
-        automation_changelog = manager.changelog.get_recent_entries(days)
+        sources = [manager.changelog.iter_recent_entries(days, before=before)]
         
         # Get stream checker changelog entries
-        stream_checker_changelog = []
         try:
             checker = get_stream_checker_service()
             if checker.changelog:
-                stream_checker_changelog = checker.changelog.get_recent_entries(days)
+                sources.append(checker.changelog.iter_recent_entries(days, before=before))
         except Exception as e:
             logger.warning(f"Could not get stream checker changelog: {e}")
         
-        # Merge and sort by timestamp (newest first)
-        merged_changelog = automation_changelog + stream_checker_changelog
-        merged_changelog.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        # Merge by timestamp (newest first); partitions are only read as far as needed
+        merged_changelog = heapq.merge(*sources, key=lambda item: item[0], reverse=True)
+        
+        if limit is None and before is None:
+            return jsonify([entry for _, entry in merged_changelog])
         
-        return jsonify(merged_changelog)
+        page_size = limit or CHANGELOG_DEFAULT_PER_PAGE
+        page = list(itertools.islice(merged_changelog, page_size + 1))
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        return jsonify({
+            "entries": [entry for _, entry in page],
+            "next_cursor": encode_cursor(page[-1][0]) if has_more else None
+        })
     except Exception as e:
         logger.error(f"Error getting changelog: {e}")
         return jsonify({"error": str(e)}), 500
@@ -2188,7 +2226,7 @@ def update_m3u_account_priority(account_id):
             
             # PATCH request to update priority
             url = f"{base_url}/api/m3u/accounts/{account_id}/"
-            resp = requests.patch(
+            resp = get_http_session().patch(
                 url,
                 headers=headers,
                 json={"priority": priority},
@@ -2587,6 +2625,15 @@ def get_stream_checker_status():
         logger.error(f"Error getting stream checker status: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/http-pool/status', methods=['GET'])
+def get_http_pool_status():
+    """Get connection pool statistics of the shared Dispatcharr HTTP session."""
+    try:
+        return jsonify(get_pool_stats())
+    except Exception as e:
+        logger.error(f"Error getting HTTP pool status: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/stream-checker/start', methods=['POST'])
 def start_stream_checker():
     """Start the stream checker service."""
@@ -2783,6 +2830,52 @@ def get_stream_checker_progress():
         logger.error(f"Error getting stream checker progress: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/stream-checker/events', methods=['GET'])
+def stream_checker_events():
+    """Stream stream checker status and progress as Server-Sent Events.
+    
+    Replaces polling /api/stream-checker/status and /progress. On connect the
+    current progress and status are sent; after that only what the service
+    publishes on the progress bus, at most once per tick (latest values only):
+        event: progress  - Progress of the current check (null when idle)
+        event: status    - Full stream checker status, on state changes
+    A comment line is sent as heartbeat while nothing is published. The
+    generator ends when the client disconnects.
+    """
+    service = get_stream_checker_service()
+    bus = service.progress.bus
+    
+    def message(event_type, data):
+        return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+    
+    def generate():
+        try:
+            # Events published while the snapshot is taken are sent again afterwards
+            sequence = bus.sequence
+            yield message('progress', service.progress.get()) + message('status', service.get_status())
+            
+            while True:
+                tick_started = time.monotonic()
+                sequence, events = bus.wait_for_events(sequence, timeout=STREAM_CHECKER_EVENTS_HEARTBEAT)
+                if not events:
+                    yield ': heartbeat\n\n'
+                    continue
+                yield ''.join(message(event_type, data) for event_type, data in events.items())
+                
+                # Batch everything published during the rest of the tick into the next message
+                remaining = STREAM_CHECKER_EVENTS_TICK - (time.monotonic() - tick_started)
+                if remaining > 0:
+                    time.sleep(remaining)
+        except GeneratorExit:
+            # Raised at a yield once the response is closed (client disconnected)
+            logger.debug("Stream checker event stream client disconnected")
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/stream-checker/check-channel', methods=['POST'])
 def check_specific_channel():
     """Manually check a specific channel immediately (add to queue with high priority)."""
@@ -581,16 +581,16 @@ export default function AutomationSettings() {
               </CardHeader>
               <CardContent className="space-y-4">
                 <div className="space-y-2">
-                  <Label htmlFor="max_queue_size">Maximum Queue Size</Label>
+                  <Label htmlFor="priority_aging_seconds">Priority Aging (seconds)</Label>
                   <Input
-                    id="max_queue_size"
+                    id="priority_aging_seconds"
                     type="number"
-                    min="10"
-                    max="10000"
-                    value={streamCheckerConfig.queue?.max_size ?? 1000}
-                    onChange={(e) => handleStreamCheckerConfigChange('queue.max_size', parseInt(e.target.value))}
+                    min="1"
+                    max="3600"
+                    value={streamCheckerConfig.queue?.priority_aging_seconds ?? 60}
+                    onChange={(e) => handleStreamCheckerConfigChange('queue.priority_aging_seconds', parseInt(e.target.value))}
                   />
-                  <p className="text-sm text-muted-foreground">Maximum number of channels in the checking queue</p>
+                  <p className="text-sm text-muted-foreground">Waiting time that raises a queued channel by one priority level, so global checks are not held back by frequent M3U update checks</p>
                 </div>
 
                 <div className="space-y-2">
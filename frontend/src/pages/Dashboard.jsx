@@ -22,11 +22,18 @@ export default function Dashboard() {
   useEffect(() => {
     loadStatus()
     loadPlaylists()
+    // Stream checker status is pushed by the server between the slow polls
+    const events = streamCheckerAPI.subscribeEvents({
+      status: setStreamCheckerStatus
+    })
     const interval = setInterval(() => {
       loadStatus()
       loadPlaylists()
     }, 30000)
-    return () => clearInterval(interval)
+    return () => {
+      events.close()
+      clearInterval(interval)
+    }
   }, [])
 
   const loadStatus = async () => {
@@ -54,13 +54,19 @@ export default function StreamChecker() {
 
   useEffect(() => {
     loadData()
-    // Poll for updates - use shorter interval when checking is active
-    const pollInterval = (status?.checking || status?.global_action_in_progress || (status?.queue?.queue_size > 0)) ? 1000 : 3000
+    // Status and progress are pushed by the server; the slow poll only refreshes config and accounts
+    const events = streamCheckerAPI.subscribeEvents({
+      status: setStatus,
+      progress: setProgress
+    })
     const interval = setInterval(() => {
       loadData()
-    }, pollInterval)
-    return () => clearInterval(interval)
-  }, [status?.checking, status?.global_action_in_progress, status?.queue?.queue_size])
+    }, 30000)
+    return () => {
+      events.close()
+      clearInterval(interval)
+    }
+  }, [])
 
   const loadData = async () => {
     try {
@@ -657,6 +663,101 @@ export default function StreamChecker() {
                       </p>
                     </div>
                   </div>
+
+                  <div className="flex items-center justify-between">
+                    <div className="space-y-0.5">
+                      <Label htmlFor="realtime">Real-time Reading</Label>
+                      <p className="text-xs text-muted-foreground">
+                        Read streams at their native rate. When disabled, streams are read as fast as the provider delivers them and the bitrate is measured over the media time read
+                      </p>
+                    </div>
+                    <Switch
+                      id="realtime"
+                      checked={editedConfig?.stream_analysis?.realtime !== false}
+                      onCheckedChange={(checked) => updateConfigValue('stream_analysis.realtime', checked)}
+                      disabled={!configEditing}
+                    />
+                  </div>
+
+                  <div className="flex items-center justify-between">
+                    <div className="space-y-0.5">
+                      <Label htmlFor="hls_fast_path">HLS Fast Path</Label>
+                      <p className="text-xs text-muted-foreground">
+                        Measure HLS (.m3u8) streams from a few downloaded segments instead of running FFmpeg
+                      </p>
+                    </div>
+                    <Switch
+                      id="hls_fast_path"
+                      checked={editedConfig?.stream_analysis?.hls_fast_path === true}
+                      onCheckedChange={(checked) => updateConfigValue('stream_analysis.hls_fast_path', checked)}
+                      disabled={!configEditing}
+                    />
+                  </div>
+
+                  <div className="space-y-2">
+                    <Label htmlFor="hls_segments">HLS Segments</Label>
+                    <Input
+                      id="hls_segments"
+                      type="number"
+                      value={editedConfig?.stream_analysis?.hls_segments ?? 3}
+                      onChange={(e) => updateConfigValue('stream_analysis.hls_segments', parseInt(e.target.value))}
+                      disabled={!configEditing || !editedConfig?.stream_analysis?.hls_fast_path}
+                      min={1}
+                      max={10}
+                    />
+                    <p className="text-xs text-muted-foreground">
+                      Number of segments downloaded concurrently to measure the bitrate
+                    </p>
+                  </div>
+
+                  <div className="flex items-center justify-between">
+                    <div className="space-y-0.5">
+                      <Label htmlFor="adaptive_duration">Adaptive Duration</Label>
+                      <p className="text-xs text-muted-foreground">
+                        Stop analyzing a stream once its bitrate is stable (FFmpeg Duration becomes the maximum)
+                      </p>
+                    </div>
+                    <Switch
+                      id="adaptive_duration"
+                      checked={editedConfig?.stream_analysis?.adaptive_duration === true}
+                      onCheckedChange={(checked) => updateConfigValue('stream_analysis.adaptive_duration', checked)}
+                      disabled={!configEditing}
+                    />
+                  </div>
+
+                  <div className="grid gap-4 md:grid-cols-2">
+                    <div className="space-y-2">
+                      <Label htmlFor="adaptive_min_duration">Minimum Duration (seconds)</Label>
+                      <Input
+                        id="adaptive_min_duration"
+                        type="number"
+                        value={editedConfig?.stream_analysis?.adaptive_min_duration ?? 5}
+                        onChange={(e) => updateConfigValue('stream_analysis.adaptive_min_duration', parseInt(e.target.value))}
+                        disabled={!configEditing || !editedConfig?.stream_analysis?.adaptive_duration}
+                        min={2}
+                        max={60}
+                      />
+                      <p className="text-xs text-muted-foreground">
+                        Seconds analyzed before a stable bitrate may end the analysis
+                      </p>
+                    </div>
+
+                    <div className="space-y-2">
+                      <Label htmlFor="adaptive_tolerance">Bitrate Tolerance (%)</Label>
+                      <Input
+                        id="adaptive_tolerance"
+                        type="number"
+                        value={Math.round((editedConfig?.stream_analysis?.adaptive_tolerance ?? 0.05) * 100)}
+                        onChange={(e) => updateConfigValue('stream_analysis.adaptive_tolerance', parseInt(e.target.value) / 100)}
+                        disabled={!configEditing || !editedConfig?.stream_analysis?.adaptive_duration}
+                        min={1}
+                        max={50}
+                      />
+                      <p className="text-xs text-muted-foreground">
+                        Maximum variation of the recent bitrate estimates to consider the bitrate stable
+                      </p>
+                    </div>
+                  </div>
                 </TabsContent>
 
                 {/* Concurrent Checking Tab */}
@@ -101,6 +101,15 @@ export const streamCheckerAPI = {
   getConfig: () => api.get('/stream-checker/config'),
   updateConfig: (config) => api.put('/stream-checker/config', config),
   getProgress: () => api.get('/stream-checker/progress'),
+  // Server-Sent Events with status and progress updates; handlers maps event types to callbacks.
+  // Returns the EventSource (call close() to unsubscribe); the browser reconnects automatically.
+  subscribeEvents: (handlers) => {
+    const source = new EventSource(`${baseURL}/stream-checker/events`);
+    Object.entries(handlers).forEach(([eventType, handler]) => {
+      source.addEventListener(eventType, (event) => handler(JSON.parse(event.data)));
+    });
+    return source;
+  },
   checkChannel: (channelId) => api.post('/stream-checker/check-channel', { channel_id: channelId }),
   // Use longer timeout for single channel check as it can take time
   checkSingleChannel: (channelId) => api.post('/stream-checker/check-single-channel', { channel_id: channelId }, { timeout: 120000 }),